@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Benchmark: CLI startup - imports time of the CLI module (python -X importtime, cumulative time of
+    wfleet.scraper.scraper) vs the whole scraper engine stack, wall time of the lightweight command
+    (--version) and check, that the heavy dependencies aren't imported by the CLI module. Exit code 1 -
+    CLI imports are over the limit or heavy modules are imported.
+
+    Usage: python benchmarks/bench_cli_startup.py [--runs 10] [--limit-ms 100]
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from typing import List
+
+CLI_MODULE: str = "wfleet.scraper.scraper"
+ENGINE_MODULE: str = "wfleet.scraper.engine.scraper_engine"
+HEAVY_MODULES: List[str] = ["bs4", "openpyxl", "requests", "numpy", "xlrd", "xlwt", ENGINE_MODULE]
+
+
+def import_time_ms(module: str) -> float:
+    """Cumulative import time of the module (fresh interpreter), ms."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():  # import time: self [us] | cumulative | imported package
+        parts: List[str] = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"Import time of [{module}] isn't found!")
+
+
+def command_time_ms(*args: str) -> float:
+    start: float = time.perf_counter()
+    subprocess.run([sys.executable, "-m", CLI_MODULE, *args], capture_output=True, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def imported_heavy_modules() -> List[str]:
+    code: str = (f"import sys, {CLI_MODULE}; "
+                 f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def measure(name: str, function, runs: int) -> float:
+    times: List[float] = [function() for _ in range(runs)]
+    print(f"{name:<45} min {min(times):8.1f} ms  median {statistics.median(times):8.1f} ms")
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CLI startup benchmark.")
+    parser.add_argument("--runs", type=int, default=10, help="number of runs")
+    parser.add_argument("--limit-ms", type=float, default=100, help="CLI module imports limit, ms")
+    arguments = parser.parse_args()
+
+    cli: float = measure(f"imports: {CLI_MODULE}", lambda: import_time_ms(CLI_MODULE), arguments.runs)
+    measure(f"imports: {ENGINE_MODULE}", lambda: import_time_ms(ENGINE_MODULE), arguments.runs)
+    measure("command: --version (wall time)", lambda: command_time_ms("--version"), arguments.runs)
+    heavy: List[str] = imported_heavy_modules()
+    print(f"Heavy modules imported by the CLI: {heavy if heavy else 'none'}")
+
+    if cli > arguments.limit_ms or heavy:
+        print(f"FAILED: CLI imports {cli:.1f} ms (limit {arguments.limit_ms} ms), heavy modules: {heavy}.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Benchmark: ships upsert into the scraper DB (ScraperSQLiteDB.save_ships()) - one transaction per
+    ship (the old per-row way) vs batched executemany() transactions; insert of the new ships and
+    update (upsert) of the existing ones. Each case uses a new DB file in the temp dir.
+
+    Usage: python benchmarks/bench_db_upsert.py [--rows 100000] [--per-row-rows 5000]
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import os
+import time
+import argparse
+import tempfile
+from datetime import datetime
+from typing import List
+from wfleet.scraper.entities.ship import ShipDto
+from wfleet.scraper.db.scraper_db_sqlite import ScraperSQLiteDB
+
+TIMESTAMP: datetime = datetime(2026, 10, 1, 10, 0, 0)
+
+
+def build_ships(rows: int) -> List[ShipDto]:
+    return [ShipDto(str(1000000 + i), str(i), "", "rsclassorg", TIMESTAMP, flag="Russia",
+                    main_name=f"SHIP {i}", home_port="Saint-Petersburg", call_sign=f"U{i}",
+                    ship_type="Tanker", build_date="1999")
+            for i in range(rows)]
+
+
+def measure(name: str, ships: List[ShipDto], batch_size: int, upsert: bool = False) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with ScraperSQLiteDB(os.path.join(temp_dir, "scraper.sqlite")) as db:
+            if upsert:  # the same identities are in the DB already - update path
+                db.save_ships(ships)
+            start: float = time.perf_counter()
+            count: int = db.save_ships(ships, batch_size=batch_size)
+            elapsed: float = time.perf_counter() - start
+    print(f"{name:<40} {elapsed:8.3f} s  {count / elapsed:12,.0f} rows/s  (rows: {count})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scraper DB ships upsert benchmark.")
+    parser.add_argument("--rows", type=int, default=100000, help="number of rows")
+    parser.add_argument("--per-row-rows", type=int, default=5000, help="number of rows for the per-row case")
+    args = parser.parse_args()
+
+    ships: List[ShipDto] = build_ships(args.rows)
+    print(f"Rows: {args.rows}")
+
+    measure("per-row transactions (old path)", ships[:args.per_row_rows], 1)
+    measure("batched executemany(), batch 1000", ships, 1000)
+    measure("batched executemany(), batch 10000", ships, 10000)
+    measure("batched upsert of existing, batch 10000", ships, 10000, upsert=True)
+
+
+if __name__ == "__main__":
+    main()
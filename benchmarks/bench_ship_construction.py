@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Benchmark: ShipDto construction - per-row path (the old ShipDto.ship_from_dict() way: config and
+    strptime for each row, attributes are set one by one) vs bulk constructors (ships_from_dicts(),
+    ships_from_tuples() and ShipBatch).
+
+    Usage: python benchmarks/bench_ship_construction.py [--rows 1000000]
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import time
+import argparse
+from datetime import datetime
+from typing import Callable, List
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS, ships_from_dicts, ships_from_tuples
+from wfleet.scraper.entities.ship_batch import ShipBatch
+
+FLAGS: List[str] = ["Russia", "Panama", "Liberia", "Malta", "Cyprus"]
+TYPES: List[str] = ["Tanker", "Bulk Carrier", "Tug", "Passenger", "Container"]
+
+
+def build_dicts(rows: int) -> List[dict]:
+    timestamp: str = datetime(2026, 10, 1, 10, 0, 0).strftime(Config().timestamp_pattern)
+    return [{"imo_number": str(1000000 + i), "source_system": "seaweb", "timestamp": timestamp,
+             "ship_name": f"SHIP {i}", "ship_type": TYPES[i % len(TYPES)], "gross": str(i % 5000),
+             "deadweight": str(i % 9000), "call_sign": f"U{i % 100000}", "mmsi_no": str(273000000 + i),
+             "build_year": str(1950 + i % 70), "flag": FLAGS[i % len(FLAGS)], "status": "In Service",
+             "ship_operator": f"Operator {i % 1000}", "ship_operator_address": "Address",
+             "ship_operator_seaweb_id": str(i % 1000), "ship_builder": f"Builder {i % 300}",
+             "ship_builder_seaweb_id": str(i % 300)} for i in range(rows)]
+
+
+def ship_from_dict_per_row(ship_dict: dict) -> ShipDto:
+    """Per-row construction (the old implementation of ShipDto.ship_from_dict())."""
+    config = Config()
+    timestamp: datetime = datetime.strptime(ship_dict['timestamp'], config.timestamp_pattern)
+    ship = ShipDto(ship_dict['imo_number'], "-", "-", ship_dict['source_system'], timestamp)
+    ship.main_name = ship_dict['ship_name']
+    ship.ship_type = ship_dict['ship_type']
+    ship.gross = ship_dict['gross']
+    ship.deadweight = ship_dict['deadweight']
+    ship.call_sign = ship_dict['call_sign']
+    ship.mmsi_number = ship_dict['mmsi_no']
+    ship.build_date = ship_dict['build_year']
+    ship.flag = ship_dict['flag']
+    ship.status = ship_dict['status']
+    ship.ship_operator = ship_dict['ship_operator']
+    ship.ship_operator_address = ship_dict['ship_operator_address']
+    ship.ship_operator_seaweb_id = ship_dict['ship_operator_seaweb_id']
+    ship.ship_builder = ship_dict['ship_builder']
+    ship.ship_builder_seaweb_id = ship_dict['ship_builder_seaweb_id']
+    return ship
+
+
+def build_tuples(rows: int) -> List[tuple]:
+    timestamp: str = datetime(2026, 10, 1, 10, 0, 0).strftime(Config().timestamp_pattern)
+    return [(str(1000000 + i), str(i), "", "rsclassorg", timestamp, FLAGS[i % len(FLAGS)], f"SHIP {i}")
+            for i in range(rows)]
+
+
+def measure(name: str, function: Callable, rows: int) -> None:
+    start: float = time.perf_counter()
+    result = function()
+    elapsed: float = time.perf_counter() - start
+    print(f"{name:<40} {elapsed:8.3f} s  {rows / elapsed:12,.0f} rows/s  (result: {len(result)})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ShipDto construction benchmark.")
+    parser.add_argument("--rows", type=int, default=1000000, help="number of rows")
+    rows: int = parser.parse_args().rows
+
+    dicts: List[dict] = build_dicts(rows)
+    tuples: List[tuple] = build_tuples(rows)
+    print(f"Rows: {rows}")
+
+    measure("per-row ship from dict (old path)", lambda: [ship_from_dict_per_row(row) for row in dicts], rows)
+    measure("bulk ships_from_dicts()", lambda: ships_from_dicts(dicts), rows)
+    measure("bulk ShipBatch.from_dicts()", lambda: ShipBatch.from_dicts(dicts), rows)
+    measure("bulk ships_from_tuples()", lambda: ships_from_tuples(tuples, SHIP_FIELDS[:7]), rows)
+    measure("bulk ShipBatch.from_tuples()", lambda: ShipBatch.from_tuples(tuples, SHIP_FIELDS[:7]), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Benchmark: raw data workbook ingestion - full mode load_workbook() + sheet.cell() for each field (the
+    old Morflot/RivReg parse_raw_data()) vs streaming read-only ingestion (read_ships_from_workbook()).
+    Synthetic workbook in the Morflot layout is generated. Time and peak memory (tracemalloc) are measured.
+
+    Usage: python benchmarks/bench_workbook_ingestion.py [--rows 50000]
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import time
+import argparse
+import tempfile
+import tracemalloc
+from typing import Callable, List
+from openpyxl import Workbook, load_workbook
+from wfleet.scraper.entities.ship import ShipDto
+from wfleet.scraper.engine.scrapers.scraper_morflotru import (parse_raw_data, SYSTEM_MORFLOTRU,
+                                                              MORFLOT_HEADER_ROWS)
+
+
+def generate_workbook(rows: int, xlsx_file: str) -> None:
+    """Synthetic raw data workbook (regular workbook - shared strings, as in the files from the sources)."""
+    book = Workbook()
+    sheet = book.active
+    for header in range(MORFLOT_HEADER_ROWS):
+        sheet.append([f"header {header}"] * 13)
+    for i in range(rows):
+        sheet.append([i, "", "", f"SHIP {i}", f"P-{i % 100}", 1000000 + i, f"M-{i}", "", "Saint-Petersburg",
+                      f"Owner {i % 1000}", "Address", str(1020000000000 + i), "01.01.2020"])
+    book.save(xlsx_file)
+
+
+def parse_full_mode(xlsx_file: str) -> List[ShipDto]:
+    """Full mode workbook, cell by cell (the old parse_raw_data())."""
+    result: List[ShipDto] = list()
+    sheet = load_workbook(filename=xlsx_file).active
+    for i in range(MORFLOT_HEADER_ROWS + 1, sheet.max_row + 1):
+        imo_number = sheet.cell(row=i, column=6).value
+        proprietary_number1 = sheet.cell(row=i, column=7).value
+        proprietary_number2 = sheet.cell(row=i, column=8).value
+        if imo_number is None and proprietary_number1 is None and proprietary_number2 is None:
+            continue
+        ship = ShipDto(str(imo_number), proprietary_number1, proprietary_number2 or "", SYSTEM_MORFLOTRU)
+        ship.main_name = sheet.cell(row=i, column=4).value
+        ship.home_port = sheet.cell(row=i, column=9).value
+        ship.project = sheet.cell(row=i, column=5).value
+        ship.owner = sheet.cell(row=i, column=10).value
+        ship.owner_address = sheet.cell(row=i, column=11).value
+        ship.owner_ogrn = sheet.cell(row=i, column=12).value
+        ship.owner_ogrn_date = sheet.cell(row=i, column=13).value
+        result.append(ship)
+    return result
+
+
+def parse_streaming(xlsx_file: str) -> int:
+    """Streaming ingestion - ships are consumed one by one (as by the streaming xlsx writer)."""
+    return sum(1 for _ in parse_raw_data(xlsx_file))
+
+
+def measure(name: str, function: Callable[[str], object], xlsx_file: str) -> None:
+    tracemalloc.start()
+    start: float = time.perf_counter()
+    result = function(xlsx_file)
+    elapsed: float = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count: int = result if isinstance(result, int) else len(result)
+    print(f"{name:<40} {elapsed:8.3f} s  peak memory {peak / 1024 / 1024:8.1f} MB  (ships: {count})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Raw data workbook ingestion benchmark.")
+    parser.add_argument("--rows", type=int, default=50000, help="number of rows in the workbook")
+    rows: int = parser.parse_args().rows
+
+    with tempfile.TemporaryDirectory() as directory:
+        xlsx_file: str = directory + "/raw_data.xlsx"
+        generate_workbook(rows, xlsx_file)
+        print(f"Rows: {rows}")
+        measure("full mode load_workbook() + cell()", parse_full_mode, xlsx_file)
+        measure("streaming read_ships_from_workbook()", parse_streaming, xlsx_file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Benchmark: ships export to excel - legacy xlwt cell-by-cell writer (the old save_ships_2_excel(),
+    whole workbook in memory, .xls - max 65,536 rows) vs streaming xlsx writer (ShipsXlsxWriter).
+    Time and peak memory (tracemalloc) are measured.
+
+    Usage: python benchmarks/bench_xlsx_writer.py [--rows 60000]
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import time
+import argparse
+import tempfile
+import tracemalloc
+from typing import Callable, Iterator
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS
+from wfleet.scraper.utils.utilities_xls import ShipsXlsxWriter
+
+XLS_MAX_ROWS: int = 65536  # legacy xls sheet rows limit
+
+
+def generate_ships(rows: int) -> Iterator[ShipDto]:
+    for i in range(rows):
+        yield ShipDto(str(1000000 + i), str(i), "", "rsclassorg", flag="Russia", main_name=f"SHIP {i}",
+                      home_port="Saint-Petersburg", call_sign=f"U{i}", ship_type="Tanker", build_date="1999")
+
+
+def save_legacy_xls(rows: int, xls_file: str) -> None:
+    """Legacy writer: xlwt workbook, cell by cell (rows are capped by the xls sheet limit)."""
+    import xlwt
+    book = xlwt.Workbook()
+    sheet = book.add_sheet("ships")
+    for column, name in enumerate(SHIP_FIELDS):
+        sheet.write(0, column, name)
+    for row, ship in enumerate(generate_ships(min(rows, XLS_MAX_ROWS - 1)), start=1):
+        for column, name in enumerate(SHIP_FIELDS):
+            value = getattr(ship, name)
+            sheet.write(row, column, value if isinstance(value, str) else str(value))
+    book.save(xls_file)
+
+
+def save_streaming_xlsx(rows: int, xlsx_file: str) -> None:
+    with ShipsXlsxWriter(xlsx_file) as writer:
+        writer.write_many(generate_ships(rows))
+
+
+def measure(name: str, function: Callable[[int, str], None], rows: int, file: str) -> None:
+    tracemalloc.start()
+    start: float = time.perf_counter()
+    function(rows, file)
+    elapsed: float = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<40} {elapsed:8.3f} s  peak memory {peak / 1024 / 1024:8.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ships excel export benchmark.")
+    parser.add_argument("--rows", type=int, default=60000, help="number of ships")
+    rows: int = parser.parse_args().rows
+    print(f"Rows: {rows} (legacy xls writer is capped at {XLS_MAX_ROWS - 1} rows)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        measure("legacy xlwt cell-by-cell (.xls)", save_legacy_xls, rows, directory + "/ships.xls")
+        measure("streaming ShipsXlsxWriter (.xlsx)", save_streaming_xlsx, rows, directory + "/ships.xlsx")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Scraper Cache Blobs Module. Content-addressed store of raw pages: each unique content is stored
+    once (blob, named by the content hash), cache files are hardlinks to the blobs. Many Seaweb pages
+    are byte-identical for large groups of ships (empty panels, 'Access is denied.' page), so this
+    saves disk space, and pages with the known 'empty' content hash may be skipped by parsers.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import os
+import re
+import uuid
+import logging
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Optional, Pattern, Tuple
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.cache.cache_manifest import CacheManifest, content_hash, file_content_hash
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+# markers of the pages without data
+EMPTY_PAGE_MARKERS: Tuple[str, ...] = ("Access is denied.",)
+# regex for html tags and script/style blocks - page without visible text is empty
+HTML_TAG_REGEX: Pattern = re.compile(r"<[^>]*>")
+HTML_SCRIPT_REGEX: Pattern = re.compile(r"<(script|style)[^>]*>.*?</\1>", re.IGNORECASE | re.DOTALL)
+
+
+def is_empty_page(content: bytes) -> bool:
+    """Check - is raw page empty (no data): page with the 'empty' marker or without visible text."""
+    text: str = content.decode(Config().encoding, errors="ignore")
+    if any(marker in text for marker in EMPTY_PAGE_MARKERS):
+        return True
+    return not HTML_TAG_REGEX.sub("", HTML_SCRIPT_REGEX.sub("", text)).replace("&nbsp;", "").strip()
+
+
+@dataclass
+class DedupReport:
+    files: int = 0  # processed files
+    linked: int = 0  # files replaced by hardlinks to the existing blobs
+    saved: int = 0  # saved bytes
+    empty: int = 0  # found 'empty' content hashes
+    stale: int = 0  # skipped files - content on the disk doesn't match the manifest hash
+
+
+class BlobStore:
+    """Content-addressed blobs store: <blobs dir>/<hash[:2]>/<hash>. Should be on the same file system
+    as the cache (hardlinks), otherwise files are just copied."""
+
+    def __init__(self, blobs_dir: Optional[str] = None) -> None:
+        self.blobs_dir: str = blobs_dir if blobs_dir else Config().cache_blobs_dir
+        log.debug(f"__init__(): initializing BlobStore in [{self.blobs_dir}].")
+        os.makedirs(self.blobs_dir, exist_ok=True)
+
+    def blob_path(self, digest: str) -> str:
+        return self.blobs_dir + "/" + digest[:2] + "/" + digest
+
+    def write(self, content: bytes, file: str) -> Tuple[str, bool]:
+        """Write content to the file as a hardlink to the blob (blob is created if needed).
+        :return: tuple (content hash, is new blob created)
+        """
+        if not file or Path(file).exists():
+            raise ScraperException(f"File name {file} is empty or file already exists!")
+
+        digest: str = content_hash(content)
+        blob: str = self.blob_path(digest)
+        created: bool = False
+        if not os.path.exists(blob):  # new content - write the blob (atomically)
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            tmp_blob: str = blob + "." + uuid.uuid4().hex
+            with open(tmp_blob, mode="wb") as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_blob, blob)
+            created = True
+
+        try:
+            os.link(blob, file)
+        except OSError as e:  # other file system / links limit - just a copy of the content
+            log.debug(f"Can't link blob {blob} to {file}, writing a copy. Reason: {e}")
+            with open(file, mode="wb") as target:
+                target.write(content)
+
+        return digest, created
+
+    def dedup_file(self, file: str, digest: str) -> Optional[int]:
+        """Deduplicate existing cache file with the known content hash: the first file with the content
+        becomes the blob, the rest are replaced by hardlinks to it. The file is re-hashed - file with the
+        other content (stale manifest) is skipped.
+        :return: saved bytes, None - file is skipped
+        """
+        actual_digest: str = file_content_hash(file)
+        if actual_digest != digest:  # the file was changed after it was recorded - won't replace it
+            log.warning(f"File {file} content hash {actual_digest} doesn't match the manifest hash {digest}, "
+                        f"skipped!")
+            return None
+
+        blob: str = self.blob_path(digest)
+        if not os.path.exists(blob):  # the first file with such content - link it as the blob
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            os.link(file, blob)
+            return 0
+
+        if os.path.samefile(blob, file):  # already deduplicated
+            return 0
+
+        size: int = os.path.getsize(file)
+        tmp_file: str = file + "." + uuid.uuid4().hex
+        os.link(blob, tmp_file)
+        os.replace(tmp_file, file)  # atomic - the file is always present
+        return size
+
+    def prune(self) -> Tuple[int, int]:
+        """Remove blobs without links from the cache (all cache files were removed).
+        :return: tuple (removed blobs, removed bytes)
+        """
+        blobs, size = 0, 0
+        with os.scandir(self.blobs_dir) as buckets:
+            for bucket in buckets:
+                if not bucket.is_dir():
+                    continue
+                with os.scandir(bucket.path) as entries:
+                    for entry in entries:
+                        stat = entry.stat()
+                        if stat.st_nlink <= 1:
+                            os.remove(entry.path)
+                            blobs, size = blobs + 1, size + stat.st_size
+        return blobs, size
+
+
+def dedup_cache(manifest: CacheManifest, store: BlobStore) -> DedupReport:
+    """Sweep the existing cache (by the manifest): replace identical raw files by hardlinks to the blobs,
+    mark 'empty' content hashes in the manifest and prune orphan blobs."""
+    log.debug("dedup_cache(): deduplicating raw files cache.")
+
+    report: DedupReport = DedupReport()
+    empty_hashes = manifest.empty_hashes()
+    last_digest: str = ''
+    for path, digest in manifest.hashes():  # ordered by the hash - one classification per content
+        if not os.path.isfile(path):  # removed from the disk - outdated manifest
+            log.warning(f"File {path} from the manifest doesn't exist!")
+            continue
+
+        saved: Optional[int] = store.dedup_file(path, digest)
+        if saved is None:  # stale manifest record - the file has the other content
+            report.stale += 1
+            continue
+        report.files += 1
+        report.linked += 1 if saved else 0
+        report.saved += saved
+
+        if digest != last_digest:  # the file content is verified by the dedup - classify it
+            last_digest = digest
+            if digest not in empty_hashes:
+                with open(path, mode="rb") as file:
+                    if is_empty_page(file.read()):
+                        manifest.mark_empty(digest, "dedup")
+                        empty_hashes.add(digest)
+                        report.empty += 1
+
+    blobs, size = store.prune()
+    log.info(f"Cache dedup: files {report.files}, linked {report.linked}, saved {report.saved} byte(s), "
+             f"empty hashes {report.empty}, stale {report.stale}, pruned blobs {blobs} ({size} byte(s)).")
+    return report
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
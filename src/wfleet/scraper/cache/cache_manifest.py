@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Scraper Cache Manifest Module. SQLite manifest of every cached raw file (entity, page key, path,
+    size, content hash, fetched at, HTTP status). Manifest is kept up to date by the HTTP layer on
+    every write, so questions like "which ships are cached", "how much is stale" or "what failed"
+    are answered by queries instead of the cache tree walk.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+# manifest entities types
+MANIFEST_ENTITY_SHIP: str = "ship"  # Seaweb ship
+MANIFEST_ENTITY_SHIPCOMPANY: str = "shipcompany"  # Seaweb ship's company
+MANIFEST_ENTITY_SHIPBUILDER: str = "shipbuilder"  # Seaweb ship's builder
+MANIFEST_ENTITY_RUN: str = "run"  # scraper run (raw files cache)
+
+# timestamp format for the manifest (ISO format - sortable as a string)
+MANIFEST_TIMESTAMP_PATTERN: str = "%Y-%m-%d %H:%M:%S"
+# batch size for the manifest rebuild
+MANIFEST_BATCH_SIZE: int = 10000
+
+# manifest DB script
+MANIFEST_DB_SCRIPT: str = """
+    CREATE TABLE IF NOT EXISTS raw_files (
+        path         TEXT NOT NULL PRIMARY KEY,
+        entity       TEXT NOT NULL,
+        entity_id    TEXT NOT NULL,
+        page_key     TEXT NOT NULL,
+        size         INTEGER NOT NULL,
+        content_hash TEXT,
+        fetched_at   TEXT NOT NULL,
+        http_status  INTEGER
+    );
+    CREATE INDEX IF NOT EXISTS raw_files_entity_idx ON raw_files(entity, entity_id, page_key);
+    CREATE INDEX IF NOT EXISTS raw_files_status_idx ON raw_files(http_status);
+    CREATE INDEX IF NOT EXISTS raw_files_fetched_idx ON raw_files(fetched_at);
+    CREATE INDEX IF NOT EXISTS raw_files_hash_idx ON raw_files(content_hash);
+    CREATE TABLE IF NOT EXISTS empty_hashes (
+        content_hash TEXT NOT NULL PRIMARY KEY,
+        reason       TEXT
+    );
+"""
+
+UPSERT_RAW_FILE_SQL: str = """
+    INSERT INTO raw_files(path, entity, entity_id, page_key, size, content_hash, fetched_at, http_status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(path) DO UPDATE SET entity = excluded.entity, entity_id = excluded.entity_id,
+        page_key = excluded.page_key, size = excluded.size, content_hash = excluded.content_hash,
+        fetched_at = excluded.fetched_at, http_status = excluded.http_status
+"""
+
+
+def content_hash(content: bytes) -> str:
+    """Content hash for the raw file (used by the manifest and for the deduplication)."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_content_hash(file_path: str) -> str:
+    with open(file_path, mode="rb") as file:
+        return content_hash(file.read())
+
+
+class CacheManifest:
+    """SQLite manifest of the cached raw files. Manifest is thread-safe (one connection, guarded by lock)."""
+
+    def __init__(self, db_file: Optional[str] = None) -> None:
+        self.__db_file: str = db_file if db_file else Config().cache_manifest_db
+        log.debug(f"__init__(): initializing CacheManifest in [{self.__db_file}].")
+
+        Path(self.__db_file).parent.mkdir(parents=True, exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(self.__db_file, check_same_thread=False)
+        self.__connection.execute("PRAGMA journal_mode = WAL")
+        self.__connection.execute("PRAGMA synchronous = NORMAL")
+        self.__connection.executescript(MANIFEST_DB_SCRIPT)
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__connection.close()
+
+    def record(self, path: str, entity: str, entity_id: str, page_key: str, content: Optional[bytes],
+               http_status: Optional[int], fetched_at: Optional[datetime] = None,
+               digest: Optional[str] = None) -> None:
+        """Record (insert or update) one raw file in the manifest. Content None - file isn't written
+        (i.e. failed request), it is recorded with zero size and without hash. Content hash may be
+        provided (if already calculated)."""
+        size: int = len(content) if content is not None else 0
+        if content is not None and not digest:
+            digest = content_hash(content)
+        timestamp: str = (fetched_at if fetched_at else datetime.now()).strftime(MANIFEST_TIMESTAMP_PATTERN)
+        with self.__lock, self.__connection:
+            self.__connection.execute(UPSERT_RAW_FILE_SQL, (path, entity, entity_id, page_key, size, digest,
+                                                            timestamp, http_status))
+
+    def record_many(self, rows: Iterable[Tuple]) -> None:
+        """Record batch of rows: (path, entity, entity_id, page_key, size, content_hash, fetched_at,
+        http_status) in one transaction."""
+        with self.__lock, self.__connection:
+            self.__connection.executemany(UPSERT_RAW_FILE_SQL, rows)
+
+    def remove_prefix(self, path_prefix: str) -> int:
+        """Remove all records with the provided path prefix (i.e. removed dir), returns removed count."""
+        with self.__lock, self.__connection:
+            cursor = self.__connection.execute("DELETE FROM raw_files WHERE substr(path, 1, ?) = ?",
+                                               (len(path_prefix), path_prefix))
+            return cursor.rowcount
+
+    def remove_path(self, path: str) -> int:
+        """Remove records of the removed item: the file itself or all files under the dir, returns
+        removed count."""
+        with self.__lock, self.__connection:
+            sql: str = "DELETE FROM raw_files WHERE path = ? OR substr(path, 1, ?) = ?"
+            cursor = self.__connection.execute(sql, (path, len(path) + 1, f"{path}/"))
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        """Clear raw files records (known empty content hashes are kept - they don't depend on the disk)."""
+        with self.__lock, self.__connection:
+            self.__connection.execute("DELETE FROM raw_files")
+
+    def mark_empty(self, digest: str, reason: str = '') -> None:
+        """Mark content hash as 'empty' page (no data, i.e. 'Access is denied.') - parsers skip such pages."""
+        with self.__lock, self.__connection:
+            self.__connection.execute("INSERT OR REPLACE INTO empty_hashes(content_hash, reason) "
+                                      "VALUES (?, ?)", (digest, reason))
+
+    def empty_hashes(self) -> Set[str]:
+        return {digest for digest, in self.query("SELECT content_hash FROM empty_hashes")}
+
+    def empty_pages(self, entity: str, entity_id: str) -> Set[str]:
+        """Page keys of the entity with the known 'empty' content."""
+        rows = self.query("SELECT r.page_key FROM raw_files r "
+                          "JOIN empty_hashes e ON r.content_hash = e.content_hash "
+                          "WHERE r.entity = ? AND r.entity_id = ?", (entity, entity_id))
+        return {page_key for page_key, in rows}
+
+    def hashes(self) -> List[Tuple[str, str]]:
+        """Written raw files with content hashes: (path, content hash), ordered by hash."""
+        return self.query("SELECT path, content_hash FROM raw_files WHERE content_hash IS NOT NULL "
+                          "ORDER BY content_hash")
+
+    def query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self.__lock:
+            return self.__connection.execute(sql, params).fetchall()
+
+    def count(self, entity: Optional[str] = None) -> int:
+        """Number of recorded files (of the provided entity type or all)."""
+        if entity:
+            return self.query("SELECT COUNT(*) FROM raw_files WHERE entity = ?", (entity,))[0][0]
+        return self.query("SELECT COUNT(*) FROM raw_files")[0][0]
+
+    def entity_ids(self, entity: str, page_key: Optional[str] = None, http_status: Optional[int] = 200,
+                   exclude_hashes: Optional[Set[str]] = None) -> List[str]:
+        """IDs of the cached entities of the provided type (sorted). If page key is provided - only
+        entities with this page, if http status is provided - only pages with this status, pages with
+        the excluded content hashes are skipped."""
+        sql: str = "SELECT DISTINCT entity_id, content_hash FROM raw_files WHERE entity = ?"
+        params: list = [entity]
+        if page_key:
+            sql += " AND page_key = ?"
+            params.append(page_key)
+        if http_status is not None:
+            sql += " AND http_status = ?"
+            params.append(http_status)
+        rows = self.query(sql, tuple(params))
+        excluded: Set[str] = exclude_hashes if exclude_hashes else set()
+        return sorted({entity_id for entity_id, digest in rows if digest not in excluded})
+
+    def pages(self, entity: str, entity_id: str) -> Dict[str, str]:
+        """Cached pages of the entity: page key -> path."""
+        rows = self.query("SELECT page_key, path FROM raw_files WHERE entity = ? AND entity_id = ?",
+                          (entity, entity_id))
+        return {page_key: path for page_key, path in rows}
+
+    def split_by_marker(self, entity: str, page_key: str, marker: str) -> Tuple[Set[str], Set[str]]:
+        """Split cached entities (with the provided page, status 200) into two sets: with the marker text
+        (or empty - see mark_empty()) in the page and without it. Pages with the same content have the
+        same hash, so hashes marked as empty aren't read at all and only one sample page per other
+        hash is read, found marker pages are marked as empty (aren't read next time).
+        :return: tuple (entities ids with the marker, entities ids without the marker)
+        """
+        rows = self.query("SELECT entity_id, content_hash, path FROM raw_files WHERE entity = ? AND "
+                          "page_key = ? AND http_status = 200", (entity, page_key))
+        marked_hashes: Set[str] = self.empty_hashes()
+        samples: Dict[str, str] = dict()  # content hash -> sample path (not marked hashes)
+        for _, digest, path in rows:
+            if digest not in marked_hashes:
+                samples.setdefault(digest, path)
+
+        for digest, path in samples.items():
+            with open(path, mode="r") as file:
+                if marker in file.read():
+                    marked_hashes.add(digest)
+                    self.mark_empty(digest, marker)
+
+        marked: Set[str] = {entity_id for entity_id, digest, _ in rows if digest in marked_hashes}
+        return marked, {entity_id for entity_id, _, _ in rows} - marked
+
+    def sizes_by_entity(self, entity: str) -> Dict[str, Tuple[int, int, float]]:
+        """Size accounting for entities of the provided type: entity id -> (size, files, last fetched
+        timestamp)."""
+        rows = self.query("SELECT entity_id, SUM(size), COUNT(*), MAX(fetched_at) FROM raw_files "
+                          "WHERE entity = ? GROUP BY entity_id", (entity,))
+        return {entity_id: (size, files, datetime.strptime(fetched, MANIFEST_TIMESTAMP_PATTERN).timestamp())
+                for entity_id, size, files, fetched in rows}
+
+    def hashes_by_entity(self, entity: str) -> Dict[str, List[Tuple[str, int]]]:
+        """Written files of entities of the provided type: entity id -> [(content hash, size)]."""
+        result: Dict[str, List[Tuple[str, int]]] = dict()
+        for entity_id, digest, size in self.query("SELECT entity_id, content_hash, size FROM raw_files "
+                                                  "WHERE entity = ? AND content_hash IS NOT NULL", (entity,)):
+            result.setdefault(entity_id, list()).append((digest, size))
+        return result
+
+    def failed(self) -> List[Tuple[str, str, str, int]]:
+        """Failed pages: (entity, entity_id, page_key, http_status)."""
+        return self.query("SELECT entity, entity_id, page_key, http_status FROM raw_files "
+                          "WHERE http_status IS NOT NULL AND http_status <> 200 ORDER BY entity, entity_id")
+
+    def report(self, stale_before: Optional[datetime] = None) -> Dict[str, Dict[str, int]]:
+        """Manifest report by entity type: entities, files, size, failed and stale (fetched before the
+        provided timestamp) files."""
+        stale: str = stale_before.strftime(MANIFEST_TIMESTAMP_PATTERN) if stale_before else ""
+        rows = self.query("SELECT entity, COUNT(DISTINCT entity_id), COUNT(*), SUM(size), "
+                          "SUM(CASE WHEN http_status <> 200 THEN 1 ELSE 0 END), "
+                          "SUM(CASE WHEN fetched_at < ? THEN 1 ELSE 0 END) FROM raw_files GROUP BY entity",
+                          (stale,))
+        return {entity: {"entities": entities, "files": files, "size": size, "failed": failed, "stale": stale}
+                for entity, entities, files, size, failed, stale in rows}
+
+
+def _scan_entities_dir(entities_dir: str, entity: str) -> Iterable[Tuple]:
+    """Scan entities dir (<entities dir>/<entity id>/<page key>.<ext>) and yield manifest rows."""
+    if not entities_dir or not Path(entities_dir).is_dir():
+        return
+    with os.scandir(entities_dir) as entities:
+        for entity_dir in entities:
+            if not entity_dir.is_dir():  # codes files etc.
+                continue
+            with os.scandir(entity_dir.path) as pages:
+                for page in pages:
+                    if not page.is_file():
+                        continue
+                    stat = page.stat()
+                    fetched_at: str = datetime.fromtimestamp(stat.st_mtime) \
+                        .strftime(MANIFEST_TIMESTAMP_PATTERN)
+                    yield (page.path, entity, entity_dir.name, os.path.splitext(page.name)[0], stat.st_size,
+                           file_content_hash(page.path), fetched_at, 200)
+
+
+def rebuild_manifest_from_disk(manifest: CacheManifest) -> int:
+    """Rebuild manifest from the cache on disk (Seaweb entities and scraper runs raw files).
+    :return: number of recorded files
+    """
+    log.debug("rebuild_manifest_from_disk(): rebuilding cache manifest.")
+    config = Config()
+    manifest.clear()
+
+    sources: List[Tuple[str, str]] = [
+        (config.seaweb_raw_ships_dir, MANIFEST_ENTITY_SHIP),
+        (config.seaweb_raw_companies_dir, MANIFEST_ENTITY_SHIPCOMPANY),
+        (config.seaweb_raw_builders_dir, MANIFEST_ENTITY_SHIPBUILDER),
+        (config.cache_raw_files_dir, MANIFEST_ENTITY_RUN),
+    ]
+
+    counter: int = 0
+    batch: List[Tuple] = list()
+    for entities_dir, entity in sources:
+        for row in _scan_entities_dir(entities_dir, entity):
+            batch.append(row)
+            if len(batch) >= MANIFEST_BATCH_SIZE:
+                manifest.record_many(batch)
+                counter += len(batch)
+                batch.clear()
+    manifest.record_many(batch)
+    counter += len(batch)
+
+    log.info(f"Cache manifest is rebuilt, recorded files: {counter}.")
+    return counter
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
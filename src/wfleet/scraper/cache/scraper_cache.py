@@ -6,20 +6,25 @@
     This module should'n be called directly - rather be imported and functions used.
 
     Created:  Dmitrii Gusev, 01.01.2022
-    Modified: Dmitrii Gusev, 24.04.2022
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
 import os
 import re
-import shutil
+import time
+import uuid
 import logging
+import threading
 from datetime import datetime
-from typing import Pattern
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Set, Tuple
 from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
 from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
 from wfleet.scraper.config.scraper_config import Config, MSG_MODULE_ISNT_RUNNABLE
-
-# todo: create cache class in order to merge cache properties and cache operations..?
+from wfleet.scraper.cache.cache_manifest import (CacheManifest, MANIFEST_ENTITY_SHIP,
+                                                 MANIFEST_ENTITY_SHIPCOMPANY, MANIFEST_ENTITY_SHIPBUILDER)
+from wfleet.scraper.cache.cache_blobs import BlobStore
 
 # timestamp pattern for cache dir
 DIR_TIMESTAMP_PATTERN: str = "%Y-%m-%d_%H-%M-%S"  # example: 2021-02-01_22:01:20
@@ -31,15 +36,119 @@ DIR_SUFFIX_DRY_RUN: str = "-dryrun"
 DIR_SUFFIX_LIMITED_REQUESTS_RUN = "-requests-limited"
 # exception list used by cache cleanup functions
 CACHE_EXCEPTION_LIST: list = ["readme.txt"]
+# cache eviction policies (used for the disk quota enforcement)
+CACHE_POLICY_NONE: str = "none"  # no eviction by the policy (quota, if set, removes the oldest entries first)
+CACHE_POLICY_AGE: str = "age"  # remove entries older than max age, then the oldest first
+CACHE_POLICY_LRU: str = "lru"  # remove the least recently used (accessed) entries first
+CACHE_POLICY_KEEP_LAST: str = "keep_last"  # keep last N runs for each scraper, then the oldest first
+CACHE_POLICIES: tuple = (CACHE_POLICY_NONE, CACHE_POLICY_AGE, CACHE_POLICY_LRU, CACHE_POLICY_KEEP_LAST)
+# cache entries kinds
+CACHE_ENTRY_RUN: str = "run"  # scraper run directory in the raw files cache
+CACHE_ENTRY_ENTITY: str = "entity"  # entity (ship/company/builder) directory in the Seaweb cache
 
 # init module logging
 log = logging.getLogger(__name__)
 log.debug(f"Logging for module {__name__} is configured.")
 
 
+@dataclass
+class CleanupReport:
+    """Cache cleanup/eviction report: number of removed items, files and freed bytes."""
+    items: int = 0  # number of removed (top-level) items
+    files: int = 0  # number of removed files
+    bytes: int = 0  # freed bytes
+
+    def add(self, other: "CleanupReport") -> None:
+        self.items += other.items
+        self.files += other.files
+        self.bytes += other.bytes
+
+
+def _delete_tree(path: str) -> CleanupReport:
+    """Delete file or directory tree (os.scandir based walk) and count freed files/bytes."""
+    report = CleanupReport(items=1)
+    if not os.path.isdir(path) or os.path.islink(path):  # single file (or link)
+        stat = os.lstat(path)
+        report.files, report.bytes = 1, stat.st_size if stat.st_nlink <= 1 else 0
+        os.remove(path)
+        return report
+
+    dirs: List[str] = [path]  # dirs for processing
+    visited: List[str] = list()  # processed dirs, removed in the reversed order (the deepest first)
+    while dirs:
+        current: str = dirs.pop()
+        visited.append(current)
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):  # cached dirent type - no extra stat call
+                    dirs.append(entry.path)
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                # hardlink - freed with the last link
+                report.bytes += stat.st_size if stat.st_nlink <= 1 else 0
+                report.files += 1
+                os.unlink(entry.path)
+    for current in reversed(visited):
+        os.rmdir(current)
+
+    return report
+
+
+class CacheTrash:
+    """Trash dir for the deferred deletion of cache entries. Entries are moved into the trash with
+    one atomic rename each (trash should be on the same file system as the cache), then they are
+    deleted in the background by the thread pool."""
+
+    def __init__(self, trash_dir: Optional[str] = None, workers: Optional[int] = None) -> None:
+        config = Config()
+        self.trash_dir: str = trash_dir if trash_dir else config.cache_trash_dir
+        self.__executor = ThreadPoolExecutor(max_workers=workers if workers else config.cache_cleanup_workers,
+                                             thread_name_prefix="cache-trash")
+        self.__futures: List[Future] = list()
+        self.__report = CleanupReport()
+        self.__lock = threading.Lock()
+        os.makedirs(self.trash_dir, exist_ok=True)
+
+    def move(self, path: str) -> Optional[str]:
+        """Move item into the trash (atomic rename) and schedule its deletion. Returns path in the trash."""
+        trashed: str = self.trash_dir + "/" + uuid.uuid4().hex + "-" + os.path.basename(path)
+        try:
+            os.rename(path, trashed)
+        except OSError as e:
+            log.error(f"Failed to move {path} to trash. Reason: {e}")
+            return None
+        self.__submit(trashed)
+        return trashed
+
+    def purge(self) -> None:
+        """Schedule deletion of everything in the trash (i.e. leftovers of the interrupted cleanup)."""
+        with os.scandir(self.trash_dir) as entries:
+            for entry in entries:
+                self.__submit(entry.path)
+
+    def __submit(self, path: str) -> None:
+        future: Future = self.__executor.submit(_delete_tree, path)
+        future.add_done_callback(self.__done)
+        self.__futures.append(future)
+
+    def __done(self, future: Future) -> None:
+        if future.exception():
+            log.error(f"Failed to delete trash item. Reason: {future.exception()}")
+            return
+        with self.__lock:
+            self.__report.add(future.result())
+
+    def wait(self) -> CleanupReport:
+        """Wait for all scheduled deletions and return cleanup report."""
+        wait_futures(self.__futures)
+        self.__executor.shutdown(wait=True)
+        with self.__lock:
+            return self.__report
+
+
 def _cache_find_invalid_entries() -> list:
-    """Perform cleanup in the scraper raw files cache directory. Returns list of deleted directories.
-    In case of dry run mode - returns list of directories for removal.
+    """Search for invalid entries in the scraper raw files cache directory (os.scandir based, dirent
+    type is cached - no additional stat calls).
     :return: list of items (dirs/files) intended for deletion
     """
     log.debug("cache_find_invalid_entries(): search for invalid entries in scraper cache.")
@@ -48,28 +157,33 @@ def _cache_find_invalid_entries() -> list:
     config = Config()
     cache_dir: str = config.cache_raw_files_dir
 
-    for item in os.listdir(cache_dir):
-        match_object = DIR_TIMESTAMP_REGEX.search(item)
-        full_path: Path = Path(cache_dir + '/' + item)  # absolute (full) path
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            item: str = entry.name
+            match_object = DIR_TIMESTAMP_REGEX.search(item)
+            is_dir: bool = entry.is_dir()
 
-        # find any "garbage" - no dirs and dirs with wrong names
-        if not full_path.is_dir() or not match_object or item.endswith(DIR_SUFFIX_DRY_RUN):
+            # find any "garbage" - no dirs and dirs with wrong names
+            if not is_dir or not match_object or item.endswith(DIR_SUFFIX_DRY_RUN):
 
-            if item in CACHE_EXCEPTION_LIST:  # skip item from exception list
-                log.debug(f"Item [{item}] is in exceptions list - skipped.")
-                continue
+                if item in CACHE_EXCEPTION_LIST:  # skip item from exception list
+                    log.debug(f"Item [{item}] is in exceptions list - skipped.")
+                    continue
 
-            log.debug(f"Found invalid entry [{item}] -> is dir = {full_path.is_dir()}")
-            invalid_items.append(str(full_path))  # add entry to the invalid items list
+                log.debug(f"Found invalid entry [{item}] -> is dir = {is_dir}")
+                invalid_items.append(cache_dir + '/' + item)  # add entry to the invalid items list
 
     return invalid_items
 
 
-def _cache_remove_invalid_entries(invalid_items: list, dry_run: bool) -> None:
-    """Physically remove invalid entries in the cache directory. Internal method - shouldn't be used
-    separately.
+def _cache_remove_invalid_entries(invalid_items: list, dry_run: bool, trash: Optional[CacheTrash] = None,
+                                  manifest: Optional[CacheManifest] = None) -> None:
+    """Remove invalid entries in the cache directory: move them into the trash, they are deleted in the
+    background. Internal method - shouldn't be used separately.
     :invalid_items: list of items for deletion
     :param dry_run: in case of value True - DRY RUN MODE is on and no cleanup will be done.
+    :param trash: trash for the deferred deletion
+    :param manifest: cache manifest - records of the removed entries are dropped
     :return: null
     """
     log.debug("_cache_remove_invalid_entries(): cleaning up scraper cache.")
@@ -83,23 +197,39 @@ def _cache_remove_invalid_entries(invalid_items: list, dry_run: bool) -> None:
         log.warning("Dry run mode is on! No deletion...")
         return
 
+    if trash is None:
+        raise ScraperException("Provided empty trash for the deletion!")
+
     for item in invalid_items:
-        try:
-            if os.path.isdir(item):
-                shutil.rmtree(item)
-            else:
-                os.remove(item)
-        except Exception as e:
-            log.error(f"Failed to delete {item}. Reason: {e}")
+        if trash.move(item) and manifest is not None:
+            manifest.remove_path(item)
 
 
-def cache_cleanup(dry_run: bool) -> None:
-    """Perform cache cleanup - just a link mthod calling internal implementation methods.
+def cache_cleanup(dry_run: bool, wait: bool = True,
+                  manifest: Optional[CacheManifest] = None) -> Optional[CacheTrash]:
+    """Perform cache cleanup - just a link mthod calling internal implementation methods. Invalid entries
+    are moved to the trash and deleted in the background.
     :param dry_run: dry run - true/false
+    :param wait: wait for the background deletion (and log cleanup report) or return the trash instance
+    :param manifest: cache manifest - records of the removed entries are dropped
+    :return: trash with the scheduled deletions (None in case of dry run or wait)
     """
     log.debug("cache_cleanup(): perform cache cleanup.")
     invalid_items: list = _cache_find_invalid_entries()
-    _cache_remove_invalid_entries(invalid_items, dry_run)
+    if dry_run:
+        _cache_remove_invalid_entries(invalid_items, dry_run)
+        return None
+
+    trash = CacheTrash()
+    trash.purge()  # leftovers from the previous (interrupted) cleanup
+    _cache_remove_invalid_entries(invalid_items, dry_run, trash, manifest)
+    if not wait:
+        return trash
+
+    report: CleanupReport = trash.wait()
+    log.info(f"Cache cleanup: removed {report.items} item(s), {report.files} file(s), "
+             f"{report.bytes} byte(s).")
+    return None
 
 
 def _cache_generate_raw_dir_name(timestamp: datetime, name: str, dry_run: bool, requests_number: int) -> str:
@@ -117,8 +247,8 @@ def _cache_generate_raw_dir_name(timestamp: datetime, name: str, dry_run: bool,
     if not name:  # fail-fast, in case of empty dir name
         raise ScraperException("Provided empty cache directory name!")
 
-    # generate the base name - without any suffixes
-    result: str = timestamp.strftime(DIR_TIMESTAMP_PATTERN) + '_' + name
+    # generate the base name - without any suffixes (aligned with DIR_TIMESTAMP_REGEX)
+    result: str = timestamp.strftime(DIR_TIMESTAMP_PATTERN) + '-' + name
 
     if dry_run:  # dry-run mode is on
         result += DIR_SUFFIX_DRY_RUN
@@ -128,14 +258,313 @@ def _cache_generate_raw_dir_name(timestamp: datetime, name: str, dry_run: bool,
     return result
 
 
-def cache_get_raw_dir() -> str:
-    # todo: build raw dir path and create it (if exists and is a dir - OK) and return it
-    pass
+@dataclass
+class CacheEntry:
+    """One cache entry (scraper run dir or Seaweb entity dir) with size accounting info. Hardlinked
+    files (deduplicated pages - links to the blobs) aren't included into the size, they are accounted
+    per inode (blob) - see ScraperCache."""
+    kind: str  # entry kind: run/entity
+    group: str  # entries group: scraper name for runs, entities dir name for entities
+    path: str  # full path to the entry
+    size: int  # total size of not linked files in the entry (bytes)
+    files: int  # number of files in the entry
+    mtime: float  # last modification time (seconds since epoch)
+    atime: float  # last access time (seconds since epoch)
+    # hardlinked files: inode (device, inode number) -> (size, links in the entry, total links)
+    shared: Dict[Tuple[int, int], Tuple[int, int, int]] = field(default_factory=dict)
+
+
+def _add_shared(shared: Dict[Tuple[int, int], Tuple[int, int, int]], stat: os.stat_result) -> None:
+    """Account hardlinked file (one more link of the inode in the entry)."""
+    inode: Tuple[int, int] = (stat.st_dev, stat.st_ino)
+    size, links, total_links = shared.get(inode, (stat.st_size, 0, stat.st_nlink))
+    shared[inode] = (size, links + 1, total_links)
+
+
+def _dir_size(path: str) -> tuple:
+    """Calculate total size (bytes) of not linked files, number of files and hardlinked files (by inode)
+    in the dir (recursively).
+    :return: tuple (size, files, max mtime, max atime, shared)
+    """
+    size, files = 0, 0
+    mtime, atime = 0.0, 0.0
+    shared: Dict[Tuple[int, int], Tuple[int, int, int]] = dict()
+    dirs: List[str] = [path]
+    while dirs:
+        with os.scandir(dirs.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.path)
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_nlink > 1:  # hardlink (i.e. to the blob) - accounted per inode
+                    _add_shared(shared, stat)
+                else:
+                    size += stat.st_size
+                files += 1
+                mtime, atime = max(mtime, stat.st_mtime), max(atime, stat.st_atime)
+    return size, files, mtime, atime, shared
+
+
+class _EvictionAccounting:
+    """Freed space accounting for the evicted entries: hardlinked inode is freed with its last link in
+    the cache entries (if the only link outside of the cache is the blob - it is pruned after eviction)."""
+
+    def __init__(self, entries: List[CacheEntry]) -> None:
+        self.__links: Dict[Tuple[int, int], int] = dict()  # inode -> links in the cache entries
+        for entry in entries:
+            for inode, (_, entry_links, _) in entry.shared.items():
+                self.__links[inode] = self.__links.get(inode, 0) + entry_links
+        self.__freed: Set[Tuple[int, int]] = set()  # freed inodes
+
+    def evict(self, entry: CacheEntry) -> int:
+        """Evict the entry, returns freed bytes."""
+        freed: int = entry.size
+        for inode, (size, entry_links, total_links) in entry.shared.items():
+            outside_links: int = total_links - self.__links[inode]  # i.e. the blob itself
+            self.__links[inode] -= entry_links
+            if self.__links[inode] <= 0 and outside_links <= 1 and inode not in self.__freed:
+                self.__freed.add(inode)
+                freed += size
+        return freed
+
+
+class ScraperCache:
+    """Scraper's local cache manager: raw files cache (scraper runs dirs) and Seaweb cache (entities
+    dirs). Tracks size of each run dir / entity and enforces the disk quota with the eviction policy.
+    If the cache manifest is provided - entities sizes are taken from it (no entities dirs walk).
+    Hardlinked files (links to the blobs) are counted once per inode and are freed by the eviction only
+    with the last link (orphan blobs are pruned after the eviction, if the blobs store is provided)."""
+
+    def __init__(self, raw_files_dir: Optional[str] = None, entities_dirs: Optional[List[str]] = None,
+                 quota_bytes: Optional[int] = None, policy: Optional[str] = None,
+                 max_age_days: Optional[int] = None, keep_last: Optional[int] = None,
+                 trash_dir: Optional[str] = None, manifest: Optional[CacheManifest] = None,
+                 blobs: Optional[BlobStore] = None) -> None:
+        log.debug("__init__(): initializing ScraperCache.")
+        config = Config()
+
+        self.raw_files_dir: str = raw_files_dir if raw_files_dir else config.cache_raw_files_dir
+        self.entities_dirs: List[str] = entities_dirs if entities_dirs is not None else \
+            [config.seaweb_raw_ships_dir, config.seaweb_raw_companies_dir, config.seaweb_raw_builders_dir]
+        self.quota_bytes: int = quota_bytes if quota_bytes is not None else \
+            config.cache_quota_mb * 1024 * 1024
+        self.policy: str = policy if policy else config.cache_policy
+        self.max_age_days: int = max_age_days if max_age_days is not None else config.cache_max_age_days
+        self.keep_last: int = keep_last if keep_last is not None else config.cache_keep_last
+        self.trash_dir: str = trash_dir if trash_dir else config.cache_trash_dir
+        self.manifest: Optional[CacheManifest] = manifest
+        self.blobs: Optional[BlobStore] = blobs
+        # entities dirs -> manifest entities types
+        self.__manifest_entities: Dict[str, str] = {
+            config.seaweb_raw_ships_dir: MANIFEST_ENTITY_SHIP,
+            config.seaweb_raw_companies_dir: MANIFEST_ENTITY_SHIPCOMPANY,
+            config.seaweb_raw_builders_dir: MANIFEST_ENTITY_SHIPBUILDER,
+        }
+
+        if self.policy not in CACHE_POLICIES:  # fail-fast - unknown policy
+            raise ScraperException(f"Unknown cache policy: [{self.policy}]!")
+
+        self.__entries: Optional[Dict[str, CacheEntry]] = None  # size accounting (lazy scan)
+
+    def get_raw_dir(self, name: str, timestamp: Optional[datetime] = None, dry_run: bool = False,
+                    requests_number: int = 0) -> str:
+        """Build raw dir path for the scraper run and create it (if exists and is a dir - OK)."""
+        dir_name: str = _cache_generate_raw_dir_name(timestamp if timestamp else datetime.now(), name,
+                                                     dry_run, requests_number)
+        raw_dir: Path = Path(self.raw_files_dir + '/' + dir_name)
+        if raw_dir.exists() and not raw_dir.is_dir():
+            raise ScraperException(f"Raw dir [{raw_dir}] exists and is not a dir!")
+
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        log.debug(f"Raw dir for the scraper run: [{raw_dir}].")
+        return str(raw_dir)
+
+    def get_raw_file(self, name: str, file_name: str, timestamp: Optional[datetime] = None,
+                     dry_run: bool = False, requests_number: int = 0) -> str:
+        """Build raw file path in the scraper run raw dir (the raw dir is created)."""
+        if not file_name:  # fail-fast, in case of empty file name
+            raise ScraperException("Provided empty raw file name!")
+        return self.get_raw_dir(name, timestamp, dry_run, requests_number) + '/' + file_name
+
+    def entries(self, refresh: bool = False) -> List[CacheEntry]:
+        """All cache entries (runs + entities) with their sizes, scanned once and then cached."""
+        if self.__entries is None or refresh:
+            self.__entries = dict()
+            for entry in self.__scan_runs() + self.__scan_entities():
+                self.__entries[entry.path] = entry
+            log.debug(f"Scanned cache entries: {len(self.__entries)}, total size: {self.total_size()}.")
+        return list(self.__entries.values())
+
+    def runs(self, name: str) -> List[CacheEntry]:
+        """Runs of the scraper (by the scraper name), sorted by the run time - the oldest first."""
+        return sorted((entry for entry in self.entries()
+                       if entry.kind == CACHE_ENTRY_RUN and entry.group == name),
+                      key=lambda entry: entry.mtime)
+
+    def __scan_runs(self) -> List[CacheEntry]:
+        result: List[CacheEntry] = list()
+        if not Path(self.raw_files_dir).is_dir():
+            return result
+        with os.scandir(self.raw_files_dir) as items:
+            for item in items:
+                match_object = DIR_TIMESTAMP_REGEX.search(item.name)
+                if not item.is_dir() or not match_object:  # garbage - see cache_cleanup()
+                    continue
+                size, files, mtime, atime, shared = _dir_size(item.path)
+                group: str = item.name[match_object.end():]
+                # run time is encoded in the dir name
+                run_time = datetime.strptime(match_object.group(1)[:-1], DIR_TIMESTAMP_PATTERN).timestamp()
+                result.append(CacheEntry(CACHE_ENTRY_RUN, group, item.path, size, files, run_time,
+                                         max(atime, run_time), shared))
+        return result
+
+    def __scan_entities(self) -> List[CacheEntry]:
+        result: List[CacheEntry] = list()
+        for entities_dir in self.entities_dirs:
+            if not entities_dir or not Path(entities_dir).is_dir():
+                continue
+            group: str = Path(entities_dir).name
+            entity: Optional[str] = self.__manifest_entities.get(entities_dir)
+            if self.manifest is not None and entity:  # size accounting by the manifest
+                blobs_stats: Dict[str, Optional[os.stat_result]] = dict()
+                hashes: Dict[str, List[Tuple[str, int]]] = self.manifest.hashes_by_entity(entity)
+                for entity_id, (size, files, fetched) in self.manifest.sizes_by_entity(entity).items():
+                    shared: Dict[Tuple[int, int], Tuple[int, int, int]] = dict()
+                    for digest, file_size in hashes.get(entity_id, list()):
+                        stat: Optional[os.stat_result] = self.__blob_stat(digest, blobs_stats)
+                        if stat is not None and stat.st_nlink > 1:  # linked to the blob - accounted per blob
+                            _add_shared(shared, stat)
+                            size -= file_size
+                    result.append(CacheEntry(CACHE_ENTRY_ENTITY, group, entities_dir + '/' + entity_id, size,
+                                             files, fetched, fetched, shared))
+                continue
+            with os.scandir(entities_dir) as items:
+                for item in items:
+                    if not item.is_dir():  # codes files etc.
+                        continue
+                    size, files, mtime, atime, shared = _dir_size(item.path)
+                    result.append(CacheEntry(CACHE_ENTRY_ENTITY, group, item.path, size, files, mtime, atime,
+                                             shared))
+        return result
+
+    def __blob_stat(self, digest: str, blobs_stats: Dict[str, Optional[os.stat_result]]) -> \
+            Optional[os.stat_result]:
+        """Stat of the blob by the content hash (None - no blob), one stat call per hash."""
+        if self.blobs is None:
+            return None
+        if digest not in blobs_stats:
+            try:
+                blobs_stats[digest] = os.stat(self.blobs.blob_path(digest))
+            except OSError:
+                blobs_stats[digest] = None
+        return blobs_stats[digest]
+
+    @staticmethod
+    def __size(entries: List[CacheEntry]) -> int:
+        """Size of the entries: not linked files + each hardlinked inode (blob) once."""
+        shared: Dict[Tuple[int, int], int] = dict()
+        for entry in entries:
+            shared.update((inode, size) for inode, (size, _, _) in entry.shared.items())
+        return sum(entry.size for entry in entries) + sum(shared.values())
+
+    def total_size(self) -> int:
+        return self.__size(self.entries())
+
+    def sizes_by_group(self) -> Dict[str, int]:
+        """Total size (bytes) of entries by group (scraper name / entities dir)."""
+        groups: Dict[str, List[CacheEntry]] = dict()
+        for entry in self.entries():
+            groups.setdefault(entry.group, list()).append(entry)
+        return {group: self.__size(entries) for group, entries in groups.items()}
+
+    def select_for_eviction(self) -> List[CacheEntry]:
+        """Select entries to be removed according to the cache policy and the disk quota."""
+        entries: List[CacheEntry] = self.entries()
+        victims: List[CacheEntry] = list()
+
+        if self.policy == CACHE_POLICY_AGE and self.max_age_days > 0:  # expired entries
+            expiration: float = time.time() - self.max_age_days * 24 * 60 * 60
+            victims.extend(entry for entry in entries if entry.mtime < expiration)
+        elif self.policy == CACHE_POLICY_KEEP_LAST and self.keep_last > 0:  # runs over the last N runs
+            runs: Dict[str, List[CacheEntry]] = dict()
+            for entry in entries:
+                if entry.kind == CACHE_ENTRY_RUN:
+                    runs.setdefault(entry.group, list()).append(entry)
+            for group_runs in runs.values():
+                victims.extend(sorted(group_runs, key=lambda run: run.mtime, reverse=True)[self.keep_last:])
+
+        # disk quota - evict the rest of entries in the policy order until the cache fits the quota
+        if self.quota_bytes > 0:
+            accounting = _EvictionAccounting(entries)
+            remaining: int = self.__size(entries) - sum(accounting.evict(victim) for victim in victims)
+            sort_key = (lambda entry: entry.atime) if self.policy == CACHE_POLICY_LRU else \
+                (lambda entry: entry.mtime)
+            selected = set(victim.path for victim in victims)
+            for entry in sorted(entries, key=sort_key):
+                if remaining <= self.quota_bytes:
+                    break
+                if entry.path not in selected:
+                    victims.append(entry)
+                    remaining -= accounting.evict(entry)
+
+        return victims
+
+    def enforce_quota(self, dry_run: bool) -> List[CacheEntry]:
+        """Remove entries selected by the policy/quota. In case of dry run - only returns them."""
+        if self.policy == CACHE_POLICY_NONE and self.quota_bytes <= 0:  # eviction isn't configured (default)
+            log.info("Cache eviction is off (no policy and no quota).")
+            return list()
+
+        victims: List[CacheEntry] = self.select_for_eviction()
+        log.info(f"Cache entries for eviction: {len(victims)}, "
+                 f"size: {sum(victim.size for victim in victims)}.")
+
+        if dry_run:  # dry run mode is on
+            log.warning("Dry run mode is on! No eviction...")
+            return victims
+
+        trash = CacheTrash(self.trash_dir)
+        for victim in victims:
+            if not trash.move(victim.path):
+                continue
+            if self.__entries is not None:  # update size accounting
+                self.__entries.pop(victim.path, None)
+            if self.manifest is not None:
+                self.manifest.remove_path(victim.path)
+        report: CleanupReport = trash.wait()
+        if self.blobs is not None:  # blobs without links in the cache are freed now
+            blobs, size = self.blobs.prune()
+            report.bytes += size
+            log.info(f"Pruned orphan blobs: {blobs}, {size} byte(s).")
+        log.info(f"Cache eviction: removed {report.items} item(s), {report.files} file(s), "
+                 f"{report.bytes} byte(s).")
+
+        return victims
+
 
+def cache_get_raw_dir(name: str, timestamp: Optional[datetime] = None, dry_run: bool = False,
+                      requests_number: int = 0) -> str:
+    """Build raw dir path for the scraper run (in the default cache) and create it."""
+    return ScraperCache().get_raw_dir(name, timestamp, dry_run, requests_number)
 
-def cache_get_raw_file(file_name: str) -> str:
-    # todo: us cache_get_raw_dir() function...
-    pass
+
+def cache_get_raw_file(name: str, file_name: str, timestamp: Optional[datetime] = None,
+                       dry_run: bool = False, requests_number: int = 0) -> str:
+    """Build raw file path in the scraper run raw dir (in the default cache)."""
+    return ScraperCache().get_raw_file(name, file_name, timestamp, dry_run, requests_number)
+
+
+def cache_enforce_quota(dry_run: bool, manifest: Optional[CacheManifest] = None) -> None:
+    """Enforce disk quota for the default cache (by the configured policy).
+    :param dry_run: dry run - true/false
+    :param manifest: cache manifest (opened/closed by the caller) - records of the evicted entries are dropped
+    """
+    log.debug("cache_enforce_quota(): enforcing cache disk quota.")
+    cache = ScraperCache(manifest=manifest, blobs=BlobStore() if Config().cache_dedup else None)
+    for group, size in sorted(cache.sizes_by_group().items()):
+        log.info(f"Cache group [{group}]: {size} byte(s).")
+    cache.enforce_quota(dry_run)
 
 
 if __name__ == "__main__":
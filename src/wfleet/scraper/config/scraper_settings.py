@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Scraper runtime settings - typed per-source performance knobs (concurrency, rate, timeouts, retries,
+    batch sizes and sinks), layered: built-in defaults -> settings file in the cache dir (JSON) ->
+    environment variables -> CLI flags (each next layer overrides the previous one). In each layer the
+    source specific values override the values for all sources. Settings are loaded lazily - on the
+    first use (not on import).
+
+    Settings file (see Config.settings_file), keys - SourceSettings fields:
+        {"workers": 8, "sources": {"rsclassorg": {"workers": 40, "rate_limit": 10}}}
+    Environment variables: WFLEET_<KEY> (all sources), WFLEET_<SOURCE>_<KEY> (source), i.e.
+        WFLEET_TIMEOUT=10, WFLEET_RSCLASSORG_WORKERS=40, WFLEET_SEAWEB_SINKS=db,jsonl
+    CLI flags: --set key=value (all sources), --set source.key=value (source).
+
+    Knobs honoured by the sources (others are ignored by the source):
+      - rsclassorg: workers, rate_limit, timeout, retries, requests_limit, sinks
+      - seaweb: rate_limit, timeout (default - no timeout), requests_limit (default - from the config),
+        sinks
+      - morflotru, rivregru (one file download): timeout, batch_size, requests_limit (marks the run dir),
+        sinks
+    Requests limit of the scrap CLI command (--req-count), if set, overrides the requests_limit setting.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+SETTINGS_ENV_PREFIX: str = "WFLEET_"
+SETTINGS_FILE_SOURCES_KEY: str = "sources"
+ALL_SOURCES: str = ""  # layer values for all sources
+
+
+@dataclass(frozen=True)
+class SourceSettings:
+    """Performance settings of the source (scraper)."""
+    workers: int = 8  # workers (threads) for the concurrent requests, 1 - single-threaded
+    rate_limit: float = 0.0  # max requests per second, 0 - no limit
+    timeout: float = 5.0  # HTTP request timeout, seconds, 0 - no timeout
+    retries: int = 0  # retries of the failed HTTP request
+    batch_size: int = 1000  # ships in one batch, written into the sinks
+    requests_limit: int = 0  # max HTTP requests of the crawl, 0 - no limit
+    sinks: Tuple[str, ...] = ("db", "excel")  # output sinks names
+
+    @property
+    def http_timeout(self) -> Optional[float]:
+        """HTTP request timeout for the HTTP clients, None - no timeout."""
+        return self.timeout if self.timeout > 0 else None
+
+
+def _to_tuple(value: Any) -> Tuple[str, ...]:
+    """Sinks: comma-separated string (env, CLI) or list (file)."""
+    items = value.split(",") if isinstance(value, str) else value
+    return tuple(str(item).strip() for item in items if str(item).strip())
+
+
+# setting -> (converter, validator)
+SETTINGS_TYPES: Dict[str, Tuple[Callable[[Any], Any], Callable[[Any], bool]]] = {
+    "workers": (int, lambda value: value >= 1),
+    "rate_limit": (float, lambda value: value >= 0),
+    "timeout": (float, lambda value: value >= 0),
+    "retries": (int, lambda value: value >= 0),
+    "batch_size": (int, lambda value: value >= 1),
+    "requests_limit": (int, lambda value: value >= 0),
+    "sinks": (_to_tuple, lambda value: len(value) > 0),
+}
+
+# built-in source specific defaults (on top of the defaults for all sources)
+SOURCES_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    # 10 workers -> 650 sec, 20 workers -> 409 sec, 40 workers -> 323 sec, 100 workers -> 304 sec (on Mac)
+    "rsclassorg": {"workers": 30, "retries": 5},
+    # seaweb: single client session, no requests timeout (large pages), limited crawl
+    "seaweb": {"workers": 1, "timeout": 0, "requests_limit": Config().default_requests_limit},
+}
+
+
+def convert_setting(key: str, value: Any, origin: str = "") -> Any:
+    """Typed and validated setting value, ScraperException - unknown setting or wrong value."""
+    if key not in SETTINGS_TYPES:  # fail-fast - unknown setting
+        raise ScraperException(f"Unknown setting [{key}] ({origin}), known settings: {list(SETTINGS_TYPES)}!")
+    converter, is_valid = SETTINGS_TYPES[key]
+    try:
+        converted = converter(value)
+    except (TypeError, ValueError) as error:
+        raise ScraperException(f"Wrong value [{value}] of the setting [{key}] ({origin})!") from error
+    if not is_valid(converted):
+        raise ScraperException(f"Wrong value [{value}] of the setting [{key}] ({origin})!")
+    return converted
+
+
+def parse_override(override: str) -> Tuple[str, str, Any]:
+    """CLI override 'key=value' or 'source.key=value' -> (source, key, value), source '' - all sources."""
+    name, separator, value = override.partition("=")
+    if not separator:  # fail-fast - not an assignment
+        raise ScraperException(f"Wrong setting [{override}], expected: key=value or source.key=value!")
+    source, _, key = name.strip().rpartition(".")
+    return source, key, convert_setting(key, value.strip(), f"CLI: {override}")
+
+
+class ScraperSettings:
+    """Layered settings of the sources. Layers (file and environment) are read on the first use."""
+
+    def __init__(self, settings_file: Optional[str] = None,
+                 environ: Optional[Mapping[str, str]] = None) -> None:
+        self.__settings_file: Optional[str] = settings_file  # None - from the config
+        self.__environ: Optional[Mapping[str, str]] = environ  # None - process environment
+        self.__overrides: Dict[str, Dict[str, Any]] = dict()  # CLI layer: source -> settings
+        self.__layers: Optional[list] = None  # loaded layers: [source -> settings]
+        self.__sources: Dict[str, SourceSettings] = dict()  # resolved settings cache
+        self.__lock = threading.Lock()
+
+    def set_overrides(self, overrides: Iterable[str]) -> None:
+        """Set CLI layer: 'key=value' (all sources) or 'source.key=value' (source)."""
+        parsed: Dict[str, Dict[str, Any]] = dict()
+        for override in overrides:
+            source, key, value = parse_override(override)
+            parsed.setdefault(source, dict())[key] = value
+        with self.__lock:
+            self.__overrides = parsed
+            self.__sources.clear()
+
+    def reload(self) -> None:
+        """Drop loaded layers - file and environment are read again on the next use."""
+        with self.__lock:
+            self.__layers = None
+            self.__sources.clear()
+
+    def __file_layer(self) -> Dict[str, Dict[str, Any]]:
+        file: str = self.__settings_file if self.__settings_file is not None else Config().settings_file
+        if not file or not Path(file).is_file():
+            return dict()
+        log.debug(f"Loading settings file [{file}].")
+        try:
+            with open(file, mode="r", encoding=Config().encoding) as settings_file:
+                content = json.load(settings_file)
+        except ValueError as error:
+            raise ScraperException(f"Wrong settings file [{file}]: {error}!") from error
+        if not isinstance(content, dict):  # fail-fast - wrong file structure
+            raise ScraperException(f"Wrong settings file [{file}]: JSON object expected!")
+
+        sources = content.pop(SETTINGS_FILE_SOURCES_KEY, dict())
+        layer: Dict[str, Dict[str, Any]] = {ALL_SOURCES: {key: convert_setting(key, value, file)
+                                                          for key, value in content.items()}}
+        for source, values in sources.items():
+            layer[source] = {key: convert_setting(key, value, file) for key, value in values.items()}
+        return layer
+
+    def __environment_layer(self) -> Dict[str, Dict[str, Any]]:
+        environ: Mapping[str, str] = self.__environ if self.__environ is not None else os.environ
+        layer: Dict[str, Dict[str, Any]] = dict()
+        for name, value in environ.items():
+            if not name.startswith(SETTINGS_ENV_PREFIX):
+                continue
+            variable: str = name[len(SETTINGS_ENV_PREFIX):].lower()
+            for key in SETTINGS_TYPES:  # WFLEET_<KEY> or WFLEET_<SOURCE>_<KEY>
+                if variable == key or variable.endswith("_" + key):
+                    source: str = variable[:-len(key)].rstrip("_")
+                    layer.setdefault(source, dict())[key] = convert_setting(key, value, name)
+                    break
+        return layer
+
+    def __loaded_layers(self) -> list:
+        if self.__layers is None:
+            defaults: Dict[str, Any] = {"batch_size": Config().sink_batch_size,
+                                        "sinks": Config().default_sinks}
+            self.__layers = [{ALL_SOURCES: defaults, **SOURCES_DEFAULTS}, self.__file_layer(),
+                             self.__environment_layer()]
+        return self.__layers
+
+    def source(self, name: str) -> SourceSettings:
+        """Settings of the source (scraper name, see scraper registry)."""
+        with self.__lock:
+            settings: Optional[SourceSettings] = self.__sources.get(name)
+            if settings is None:
+                values: Dict[str, Any] = dict()
+                for layer in self.__loaded_layers() + [self.__overrides]:
+                    values.update(layer.get(ALL_SOURCES, dict()))
+                    values.update(layer.get(name, dict()) if name != ALL_SOURCES else dict())
+                settings = replace(SourceSettings(), **values)
+                self.__sources[name] = settings
+                log.debug(f"Settings of the source [{name}]: {settings}.")
+            return settings
+
+
+SETTINGS: ScraperSettings = ScraperSettings()  # settings instance (nothing is loaded until the first use)
+
+
+def source_settings(name: str) -> SourceSettings:
+    """Settings of the source (scraper name, see scraper registry)."""
+    return SETTINGS.source(name)
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
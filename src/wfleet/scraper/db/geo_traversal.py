@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Geo Tree Traversal Module. Breadth-first crawl of the CIK geo points hierarchy (geo_points table,
+    see sqlitedb) level by level: the whole unprocessed frontier is selected by one query, children
+    of the frontier nodes are expanded concurrently (thread pool - expanding is I/O, i.e. HTTP), then
+    children are inserted and the frontier is marked processed in bulk (one transaction per chunk).
+    Subtrees are selected/reset for the re-crawl by the recursive CTE - a handful of queries per
+    level instead of one round-trip per node.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import logging
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+from wfleet.scraper.db.sqlitedb import db_connect, DB_BATCH_SIZE
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+# geo point processed statuses
+GEO_POINT_NOT_PROCESSED: int = 0
+GEO_POINT_PROCESSED: int = 1
+GEO_POINT_FAILED: int = -1  # expanding failed - not retried until the re-crawl
+
+GEO_NODE_COLUMNS: str = "g.geo_point_id, g.id, g.intid, g.cik_text, g.levelid, g.children"
+
+# frontier - not processed nodes with processed (or without) parent
+FRONTIER_SQL: str = f"""
+    SELECT {GEO_NODE_COLUMNS} FROM geo_points g LEFT JOIN geo_points p ON p.geo_point_id = g.parent_id
+    WHERE g.processed = {GEO_POINT_NOT_PROCESSED}
+        AND (g.parent_id IS NULL OR p.processed <> {GEO_POINT_NOT_PROCESSED})
+    ORDER BY g.geo_point_id
+"""
+
+# max depth of the subtree select - CIK tree has a few levels, the cap stops the recursion on the cycles
+# (i.e. in the DB filled by the old versions, which re-parented existing nodes)
+GEO_TREE_MAX_DEPTH: int = 32
+
+# subtree(s) of the root nodes with the depth (root - 0), placeholder - root nodes ids, parameter - max
+# depth (None - the cap)
+SUBTREE_CTE: str = f"""
+    WITH RECURSIVE subtree(geo_point_id, depth) AS (
+        SELECT geo_point_id, 0 FROM geo_points WHERE geo_point_id IN ({{roots}})
+        UNION
+        SELECT g.geo_point_id, s.depth + 1 FROM geo_points g JOIN subtree s ON g.parent_id = s.geo_point_id
+        WHERE s.depth < coalesce(?, {GEO_TREE_MAX_DEPTH})
+    )
+"""
+
+# children upsert - CIK id is unique, processed status and parent of the existing child are kept (node is
+# never re-parented - re-parenting under its own descendant makes a cycle)
+UPSERT_CHILD_SQL: str = """
+    INSERT INTO geo_points(id, intid, cik_text, levelid, children, parent_id, processed)
+    VALUES (?, ?, ?, ?, ?, ?, 0)
+    ON CONFLICT(id) DO UPDATE SET intid = excluded.intid, cik_text = excluded.cik_text,
+        levelid = excluded.levelid, children = excluded.children
+"""
+MARK_PROCESSED_SQL: str = "UPDATE geo_points SET processed = ? WHERE geo_point_id = ?"
+
+
+@dataclass(frozen=True)
+class GeoNode:
+    """Geo point (node of the geo tree)."""
+    geo_point_id: int
+    id: int
+    intid: Optional[int]
+    cik_text: str
+    levelid: int
+    children: str
+    depth: int = 0  # depth in the selected subtree
+
+
+@dataclass
+class TraversalStats:
+    levels: int = 0  # processed frontiers
+    processed: int = 0  # expanded nodes
+    failed: int = 0  # nodes failed to expand
+    added: int = 0  # added (or updated) children
+    queries: int = 0  # DB round-trips (selects and write transactions)
+
+
+# node expander: node -> children rows (id, intid, cik_text, levelid, children)
+GeoExpander = Callable[[GeoNode], Iterable[Sequence]]
+
+
+class GeoTreeTraversal:
+    """Geo tree traversal engine (breadth-first, frontier by frontier)."""
+
+    def __init__(self, dbname: str, expand: GeoExpander, workers: int = 8,
+                 chunk_size: int = DB_BATCH_SIZE) -> None:
+        """
+        :param dbname: geo DB file (see sqlitedb.db_create())
+        :param expand: node expander - returns children of the node (called concurrently)
+        :param workers: number of the expanding threads
+        :param chunk_size: frontier nodes expanded and written in one transaction
+        """
+        if not dbname or workers < 1 or chunk_size < 1:  # fail-fast - wrong parameters
+            raise ScraperException(f"Wrong traversal parameters: DB [{dbname}], workers {workers}, "
+                                   f"chunk size {chunk_size}!")
+        self.__dbname: str = dbname
+        self.__expand: GeoExpander = expand
+        self.__workers: int = workers
+        self.__chunk_size: int = chunk_size
+        self.stats: TraversalStats = TraversalStats()
+
+    def frontier(self, connection: sqlite3.Connection) -> List[GeoNode]:
+        """Current frontier - not processed nodes, which parents are processed (or roots)."""
+        self.stats.queries += 1
+        return [GeoNode(*row) for row in connection.execute(FRONTIER_SQL)]
+
+    def subtree(self, roots: Sequence[int], max_depth: Optional[int] = None,
+                not_processed: bool = False) -> List[GeoNode]:
+        """Nodes of the subtrees (one recursive query), ordered by the depth (the node reachable by several
+        paths - once, with the min depth).
+        :param roots: root nodes ids (geo_point_id)
+        :param max_depth: max depth of the subtree (root - 0), None - whole subtree (up to the depth cap)
+        :param not_processed: only not processed nodes
+        """
+        if not roots:
+            return list()
+        sql: str = (SUBTREE_CTE.format(roots=", ".join("?" * len(roots))) +
+                    f"SELECT {GEO_NODE_COLUMNS}, min(s.depth) "
+                    "FROM subtree s JOIN geo_points g USING (geo_point_id)" +
+                    (f" WHERE g.processed = {GEO_POINT_NOT_PROCESSED}" if not_processed else "") +
+                    " GROUP BY g.geo_point_id ORDER BY min(s.depth), g.geo_point_id")
+        with closing(db_connect(self.__dbname)) as connection:
+            self.stats.queries += 1
+            return [GeoNode(*row) for row in connection.execute(sql, (*roots, max_depth))]
+
+    def reset(self, roots: Optional[Sequence[int]] = None) -> int:
+        """Mark subtrees (whole tree - if no roots) as not processed (for the re-crawl) by one statement,
+        returns number of reset nodes."""
+        with closing(db_connect(self.__dbname)) as connection, connection:
+            self.stats.queries += 1
+            if not roots:
+                return connection.execute("UPDATE geo_points SET processed = ?",
+                                          (GEO_POINT_NOT_PROCESSED,)).rowcount
+            # CTE in the sub-query - statement starts with UPDATE (otherwise the cursor has no rowcount)
+            sql: str = ("UPDATE geo_points SET processed = ? WHERE geo_point_id IN (" +
+                        SUBTREE_CTE.format(roots=", ".join("?" * len(roots))) +
+                        "SELECT geo_point_id FROM subtree)")
+            return connection.execute(sql, (GEO_POINT_NOT_PROCESSED, *roots, None)).rowcount
+
+    def __expand_node(self, node: GeoNode) -> Tuple[GeoNode, Optional[List[Sequence]]]:
+        try:
+            return node, list(self.__expand(node))
+        except Exception as error:  # failed node is marked - crawl continues
+            log.warning(f"Expanding of geo point [{node.geo_point_id}] failed: {error}")
+            return node, None
+
+    def __write(self, connection: sqlite3.Connection,
+                results: List[Tuple[GeoNode, Optional[List[Sequence]]]]) -> None:
+        children: List[tuple] = [(*child[:5], node.geo_point_id) for node, node_children in results
+                                 if node_children for child in node_children]
+        statuses: List[tuple] = [(GEO_POINT_PROCESSED if node_children is not None else GEO_POINT_FAILED,
+                                  node.geo_point_id) for node, node_children in results]
+        with connection:  # children and frontier statuses - one transaction
+            connection.executemany(UPSERT_CHILD_SQL, children)
+            connection.executemany(MARK_PROCESSED_SQL, statuses)
+        self.stats.queries += 1
+        self.stats.added += len(children)
+        self.stats.processed += sum(1 for _, node_children in results if node_children is not None)
+        self.stats.failed += sum(1 for _, node_children in results if node_children is None)
+
+    def crawl(self, max_levels: Optional[int] = None) -> TraversalStats:
+        """Crawl not processed part of the tree, frontier by frontier, until nothing left (or max levels)."""
+        log.info(f"crawl(): crawling geo tree in [{self.__dbname}] with {self.__workers} worker(s).")
+        with closing(db_connect(self.__dbname)) as connection, ThreadPoolExecutor(self.__workers) as executor:
+            while max_levels is None or self.stats.levels < max_levels:
+                nodes: List[GeoNode] = self.frontier(connection)
+                if not nodes:
+                    break
+                for start in range(0, len(nodes), self.__chunk_size):
+                    self.__write(connection, list(executor.map(self.__expand_node,
+                                                               nodes[start:start + self.__chunk_size])))
+                self.stats.levels += 1
+                log.debug(f"Geo tree level {self.stats.levels}: {len(nodes)} node(s) expanded.")
+        log.info(f"Geo tree crawl finished: {self.stats}.")
+        return self.stats
+
+    def recrawl(self, roots: Optional[Sequence[int]] = None) -> TraversalStats:
+        """Re-crawl subtrees (whole tree - if no roots): reset and crawl."""
+        self.reset(roots)
+        return self.crawl()
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
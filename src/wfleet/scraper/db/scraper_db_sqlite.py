@@ -2,61 +2,522 @@
 # -*- coding: utf-8 -*-
 
 """
-    Scraper module for SQLite DBMS interaction (pure python).
+    Scraper module for SQLite DBMS interaction (pure python). Scraper DB keeps the ships (keyed by the
+    composite ship identity) and the scraper runs telemetry. One connection per DB instance (WAL mode,
+    tuned pragmas), ships are upserted by batches - executemany() with the same (cached, prepared)
+    statement, one transaction per batch. Ships full-text search - FTS5 index over the names, owners,
+    operators and builders, updated by the triggers. Ships attributes history (SCD-2) - versions with the
+    validity intervals, appended by the triggers on the attributes changes, indexed point-in-time queries.
 
     See additional resources here:
       - https://habr.com/ru/post/321510/ - pure python
       - https://habr.com/ru/post/322086/ - peewee ORM
+      - https://www.sqlite.org/wal.html - WAL mode
+      - https://www.sqlite.org/lang_upsert.html - upsert
+      - https://www.sqlite.org/fts5.html - full-text search
+      - https://en.wikipedia.org/wiki/Slowly_changing_dimension - SCD type 2 (history)
 
     Created:  Dmitrii Gusev, 19.06.2022
-    Modified: Dmitrii Gusev, 20.06.2022
+    Modified: Dmitrii Gusev, 19.10.2026
 
 """
 
+import re
 import sqlite3
 import logging
+import threading
+from pathlib import Path
+from itertools import islice
+from datetime import datetime
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from wfleet.scraper.config.scraper_config import Config
 from wfleet.scraper.utils.utilities import read_file_as_text
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS, SHIP_TIMESTAMP_FIELDS, iter_ships_from_tuples
 from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
 from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
 
 log = logging.getLogger(__name__)
 log.debug(f"Logging for module {__name__} is configured.")
 
+# connection pragmas: WAL - readers don't block the writer, NORMAL sync is durable in WAL mode
+# (except the power loss), bigger page cache and memory mapped I/O for the bulk upserts
+DB_PRAGMAS: Tuple[str, ...] = (
+    "journal_mode = WAL",
+    "synchronous = NORMAL",
+    "temp_store = MEMORY",
+    "cache_size = -65536",  # KiB (64 MiB)
+    "mmap_size = 268435456",  # bytes (256 MiB)
+    "busy_timeout = 10000",  # ms
+)
+
+SHIPS_TABLE: str = "ships"
+SHIP_IDENTITY_FIELDS: Tuple[str, ...] = ("imo_number", "proprietary_number1", "proprietary_number2",
+                                         "source_system")
+
+# ships table: the ship identity is unique, id - explicit rowid alias (INTEGER PRIMARY KEY), so the rowid
+# is stable (VACUUM may renumber the implicit rowid) and may be used as the search index content rowid
+CREATE_SHIPS_TABLE_SQL: str = f"""
+    CREATE TABLE IF NOT EXISTS {SHIPS_TABLE} (
+        id INTEGER PRIMARY KEY,
+        {', '.join(name + (' TEXT NOT NULL' if name in SHIP_IDENTITY_FIELDS else ' TEXT')
+                   for name in SHIP_FIELDS)},
+        UNIQUE ({', '.join(SHIP_IDENTITY_FIELDS)})
+    )
+"""
+
+# scraper DB script (the same scraper executions table, as in the DB schema file)
+SCRAPER_DB_SCRIPT: str = f"""
+    CREATE TABLE IF NOT EXISTS scraper_executions (
+        id              INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE,
+        start_timestamp TEXT NOT NULL,
+        end_timestamp   TEXT NOT NULL,
+        duration        INTEGER NOT NULL
+    );
+    {CREATE_SHIPS_TABLE_SQL};
+    CREATE INDEX IF NOT EXISTS ships_imo_idx ON {SHIPS_TABLE}(imo_number);
+"""
+
+# ships upsert - the ship identity is a key, init datetime (the first time the ship is seen) isn't updated;
+# the ship of the older run (i.e. loaded after the newer one) doesn't update the row - the row (and its
+# history) is never moved back in time
+UPSERT_SHIP_SQL: str = (
+    f"INSERT INTO {SHIPS_TABLE} ({', '.join(SHIP_FIELDS)}) VALUES ({', '.join('?' * len(SHIP_FIELDS))}) "
+    f"ON CONFLICT({', '.join(SHIP_IDENTITY_FIELDS)}) DO UPDATE SET " +
+    ", ".join(f"{name} = excluded.{name}" for name in SHIP_FIELDS
+              if name not in SHIP_IDENTITY_FIELDS and name != "init_datetime") +
+    f" WHERE excluded.timestamp IS NULL OR {SHIPS_TABLE}.timestamp IS NULL "
+    f"OR excluded.timestamp >= {SHIPS_TABLE}.timestamp")
+SELECT_SHIPS_SQL: str = f"SELECT {', '.join(SHIP_FIELDS)} FROM {SHIPS_TABLE}"
+
+# full-text ships search: FTS5 index over the ships names, owners, operators and builders, kept up to date by
+# the triggers - incrementally, on each upsert. External content index (the text isn't copied) - content is
+# the ships table, content rowid - ships id. Cyrillic-aware: unicode61 tokenizer folds case (and latin
+# diacritics), Cyrillic 'ё' is folded into 'е' for the indexed text and for the queries (so the index is
+# updated by the triggers and rebuilt by the explicit folded values, not by the FTS5 'rebuild' command).
+SHIPS_SEARCH_TABLE: str = "ships_search"
+SHIPS_SEARCH_FIELDS: Tuple[str, ...] = ("main_name", "secondary_name", "owner", "ship_operator",
+                                        "ship_builder", "home_port")
+SHIPS_SEARCH_WEIGHTS: Tuple[float, ...] = (10.0, 5.0, 2.0, 2.0, 1.0, 1.0)  # bm25() columns weights
+SEARCH_FOLDING: Tuple[Tuple[str, str], ...] = (("ё", "е"), ("Ё", "Е"))
+
+
+def _search_folded(expression: str) -> str:
+    """SQL expression with the search folding (see SEARCH_FOLDING)."""
+    for source, target in SEARCH_FOLDING:
+        expression = f"replace({expression}, '{source}', '{target}')"
+    return expression
+
+
+_SEARCH_COLUMNS: str = ", ".join(SHIPS_SEARCH_FIELDS)
+_NEW_SEARCH_VALUES: str = ", ".join(_search_folded("new." + name) for name in SHIPS_SEARCH_FIELDS)
+_OLD_SEARCH_VALUES: str = ", ".join(_search_folded("old." + name) for name in SHIPS_SEARCH_FIELDS)
+SHIPS_SEARCH_SCRIPT: str = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SHIPS_SEARCH_TABLE} USING fts5({_SEARCH_COLUMNS},
+        content='{SHIPS_TABLE}', content_rowid='id', tokenize='unicode61 remove_diacritics 2');
+    CREATE TRIGGER IF NOT EXISTS ships_search_insert AFTER INSERT ON {SHIPS_TABLE} BEGIN
+        INSERT INTO {SHIPS_SEARCH_TABLE}(rowid, {_SEARCH_COLUMNS}) VALUES (new.id, {_NEW_SEARCH_VALUES});
+    END;
+    CREATE TRIGGER IF NOT EXISTS ships_search_delete AFTER DELETE ON {SHIPS_TABLE} BEGIN
+        INSERT INTO {SHIPS_SEARCH_TABLE}({SHIPS_SEARCH_TABLE}, rowid, {_SEARCH_COLUMNS})
+        VALUES ('delete', old.id, {_OLD_SEARCH_VALUES});
+    END;
+    CREATE TRIGGER IF NOT EXISTS ships_search_update AFTER UPDATE OF {_SEARCH_COLUMNS} ON {SHIPS_TABLE} BEGIN
+        INSERT INTO {SHIPS_SEARCH_TABLE}({SHIPS_SEARCH_TABLE}, rowid, {_SEARCH_COLUMNS})
+        VALUES ('delete', old.id, {_OLD_SEARCH_VALUES});
+        INSERT INTO {SHIPS_SEARCH_TABLE}(rowid, {_SEARCH_COLUMNS}) VALUES (new.id, {_NEW_SEARCH_VALUES});
+    END;
+"""
+CLEAR_SHIPS_SEARCH_SQL: str = f"INSERT INTO {SHIPS_SEARCH_TABLE}({SHIPS_SEARCH_TABLE}) VALUES ('delete-all')"
+REBUILD_SHIPS_SEARCH_SQL: str = (
+    f"INSERT INTO {SHIPS_SEARCH_TABLE}(rowid, {_SEARCH_COLUMNS}) SELECT id, "
+    f"{', '.join(_search_folded(name) for name in SHIPS_SEARCH_FIELDS)} FROM {SHIPS_TABLE}")
+SEARCH_SHIPS_SQL: str = (
+    f"SELECT {', '.join('s.' + name for name in SHIP_FIELDS)} FROM {SHIPS_SEARCH_TABLE} "
+    f"JOIN {SHIPS_TABLE} s ON s.id = {SHIPS_SEARCH_TABLE}.rowid WHERE {SHIPS_SEARCH_TABLE} MATCH ?")
+
+# ships table of the previous versions (composite primary key, implicit rowid) -> table with the id: the
+# table is re-created, the search index (linked to the old rowids) is dropped and rebuilt, ships triggers
+# are dropped with the old table and created again (history isn't changed)
+_PREVIOUS_SHIPS_TABLE: str = f"{SHIPS_TABLE}_previous"
+MIGRATE_SHIPS_SCRIPT: str = f"""
+    BEGIN;
+    DROP TABLE IF EXISTS {SHIPS_SEARCH_TABLE};
+    ALTER TABLE {SHIPS_TABLE} RENAME TO {_PREVIOUS_SHIPS_TABLE};
+    {CREATE_SHIPS_TABLE_SQL};
+    INSERT INTO {SHIPS_TABLE}({', '.join(SHIP_FIELDS)})
+        SELECT {', '.join(SHIP_FIELDS)} FROM {_PREVIOUS_SHIPS_TABLE};
+    DROP TABLE {_PREVIOUS_SHIPS_TABLE};
+    COMMIT;
+"""
+SEARCH_TOKENS_REGEX = re.compile(r"\w+", re.UNICODE)
+
+# ships attributes history (SCD-2): one row per attribute version with the validity interval - valid from
+# the ship timestamp (scraped) of the change until the next change (valid to NULL - current value), and
+# the recording (transaction) time. Versions are appended by the triggers only when the attribute value
+# actually changes, so history grows with the number of changes, not with the number of runs. Update of
+# the row back in time (older timestamp) isn't versioned - the current versions stay open; deleted ship -
+# its current versions are closed by the deletion time.
+SHIPS_HISTORY_TABLE: str = "ships_history"
+SHIP_HISTORY_FIELDS: Tuple[str, ...] = tuple(name for name in SHIP_FIELDS
+                                             if name not in SHIP_IDENTITY_FIELDS + SHIP_TIMESTAMP_FIELDS)
+_IDENTITY_COLUMNS: str = ", ".join(SHIP_IDENTITY_FIELDS)
+_NEW_IDENTITY: str = ", ".join("new." + name for name in SHIP_IDENTITY_FIELDS)
+_NEW_VALID_FROM: str = "coalesce(new.timestamp, datetime('now', 'localtime'))"
+# the row isn't moved back in time (no timestamp - the current time)
+_NOT_BACKWARD: str = "(new.timestamp IS NULL OR old.timestamp IS NULL OR new.timestamp >= old.timestamp)"
+
+
+def _history_fields_select(**columns: str) -> str:
+    """Rows of the history fields (UNION ALL of SELECTs): the field name and the columns - alias -> expression
+    template (i.e. 'new.{}')."""
+    return " UNION ALL ".join(
+        "SELECT " + ", ".join([f"'{name}' AS field"] + [template.format(name) + " AS " + alias
+                                                        for alias, template in columns.items()])
+        for name in SHIP_HISTORY_FIELDS)
+
+
+# changed attributes of the updated ship row (trigger)
+_CHANGED_FIELDS: str = (f"({_history_fields_select(old_value='old.{}', value='new.{}')}) AS changed "
+                        f"WHERE changed.old_value IS NOT changed.value")
+
+SHIPS_HISTORY_SCRIPT: str = f"""
+    CREATE TABLE IF NOT EXISTS {SHIPS_HISTORY_TABLE} (
+        {', '.join(name + ' TEXT NOT NULL' for name in SHIP_IDENTITY_FIELDS)},
+        field       TEXT NOT NULL,
+        value       TEXT,
+        valid_from  TEXT NOT NULL,
+        valid_to    TEXT,
+        recorded_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+    );
+    CREATE INDEX IF NOT EXISTS ships_history_ship_idx
+        ON {SHIPS_HISTORY_TABLE}({_IDENTITY_COLUMNS}, field, valid_from);
+    CREATE INDEX IF NOT EXISTS ships_history_as_of_idx ON {SHIPS_HISTORY_TABLE}(field, valid_from, valid_to);
+    CREATE TRIGGER IF NOT EXISTS ships_history_insert AFTER INSERT ON {SHIPS_TABLE} BEGIN
+        INSERT INTO {SHIPS_HISTORY_TABLE}({_IDENTITY_COLUMNS}, field, value, valid_from)
+        SELECT {_NEW_IDENTITY}, field, value, {_NEW_VALID_FROM}
+        FROM ({_history_fields_select(value='new.{}')}) AS inserted WHERE inserted.value <> '';
+    END;
+    DROP TRIGGER IF EXISTS ships_history_update;  -- re-created: the DB of the older version has no guard
+    CREATE TRIGGER ships_history_update AFTER UPDATE OF {', '.join(SHIP_HISTORY_FIELDS)}
+    ON {SHIPS_TABLE} WHEN {_NOT_BACKWARD}
+        AND ({' OR '.join(f'old.{name} IS NOT new.{name}' for name in SHIP_HISTORY_FIELDS)}) BEGIN
+        UPDATE {SHIPS_HISTORY_TABLE} SET valid_to = {_NEW_VALID_FROM}
+        WHERE {' AND '.join(f'{name} = new.{name}' for name in SHIP_IDENTITY_FIELDS)} AND valid_to IS NULL
+            AND field IN (SELECT field FROM {_CHANGED_FIELDS});
+        INSERT INTO {SHIPS_HISTORY_TABLE}({_IDENTITY_COLUMNS}, field, value, valid_from)
+        SELECT {_NEW_IDENTITY}, field, value, {_NEW_VALID_FROM} FROM {_CHANGED_FIELDS};
+    END;
+    CREATE TRIGGER IF NOT EXISTS ships_history_delete AFTER DELETE ON {SHIPS_TABLE} BEGIN
+        UPDATE {SHIPS_HISTORY_TABLE} SET valid_to = max(valid_from, datetime('now', 'localtime'))
+        WHERE {' AND '.join(f'{name} = old.{name}' for name in SHIP_IDENTITY_FIELDS)} AND valid_to IS NULL;
+    END;
+"""
+# initial versions for the existing ships (history is added to the DB of the previous version)
+SEED_SHIPS_HISTORY_SQL: str = (
+    f"INSERT INTO {SHIPS_HISTORY_TABLE}({_IDENTITY_COLUMNS}, field, value, valid_from) "
+    f"SELECT * FROM (SELECT {', '.join('s.' + name for name in SHIP_IDENTITY_FIELDS)}, f.field, "
+    "CASE f.field " +
+    " ".join(f"WHEN '{name}' THEN s.{name}" for name in SHIP_HISTORY_FIELDS) + " END AS value, "
+    f"coalesce(s.timestamp, datetime('now', 'localtime')) FROM {SHIPS_TABLE} s "
+    f"CROSS JOIN ({_history_fields_select()}) AS f) WHERE value <> ''")
+_VERSION_COLUMNS: str = "field, value, valid_from, valid_to, recorded_at"
+_SHIP_WHERE: str = " AND ".join(name + " = ?" for name in SHIP_IDENTITY_FIELDS)
+# ship attribute value at the moment: valid from <= moment < valid to
+_AS_OF_WHERE: str = "valid_from <= ? AND (valid_to IS NULL OR valid_to > ?)"
+
+_ship_values = attrgetter(*SHIP_FIELDS)  # ship -> values tuple (in the fields order)
+_TIMESTAMP_POSITIONS: Tuple[int, ...] = tuple(SHIP_FIELDS.index(name) for name in SHIP_TIMESTAMP_FIELDS)
+
+
+def ship_db_values(ship: ShipDto) -> list:
+    """Ship values for the DB - timestamps in ISO format (sortable as strings)."""
+    values: list = list(_ship_values(ship))
+    for position in _TIMESTAMP_POSITIONS:
+        if isinstance(values[position], datetime):
+            values[position] = values[position].isoformat(sep=" ")
+    return values
+
+
+def _ship_db_row(row: Sequence) -> list:
+    """DB row -> ship values (ISO timestamps are parsed)."""
+    values: list = list(row)
+    for position in _TIMESTAMP_POSITIONS:
+        if values[position]:
+            values[position] = datetime.fromisoformat(values[position])
+    return values
+
+
+@dataclass(frozen=True)
+class ShipAttributeVersion:
+    """Version of the ship attribute value, valid from (inclusive) - to (exclusive, None - current value)."""
+    field: str
+    value: Optional[str]
+    valid_from: datetime
+    valid_to: Optional[datetime]
+    recorded_at: datetime
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "ShipAttributeVersion":
+        field, value, valid_from, valid_to, recorded_at = row
+        return cls(field, value, datetime.fromisoformat(valid_from),
+                   datetime.fromisoformat(valid_to) if valid_to else None,
+                   datetime.fromisoformat(recorded_at))
+
+
+def _check_history_fields(fields: Iterable[str]) -> None:
+    unknown: set = set(fields) - set(SHIP_HISTORY_FIELDS)
+    if unknown:  # fail-fast - attributes without history
+        raise ScraperException(f"Fields {sorted(unknown)} have no history!")
+
+
+def insert_run_telemetry(connection: sqlite3.Connection, start_timestamp: datetime) -> int:
+    """Insert scraper run record (not finished - end = start, duration 0) by the connection, returns its id.
+    Write operation for the connection transaction (see ScraperDbWriter)."""
+    start: str = start_timestamp.isoformat(sep=" ")
+    cursor = connection.execute("INSERT INTO scraper_executions(start_timestamp, end_timestamp, duration) "
+                                "VALUES (?, ?, 0)", (start, start))
+    return cursor.lastrowid
+
+
+def finish_run_telemetry(connection: sqlite3.Connection, run_id: int, end_timestamp: datetime) -> int:
+    """Finish scraper run record (end timestamp and duration, seconds) by the connection, returns number
+    of updated records. Write operation for the connection transaction (see ScraperDbWriter)."""
+    row = connection.execute("SELECT start_timestamp FROM scraper_executions WHERE id = ?",
+                             (run_id,)).fetchone()
+    if not row:  # fail-fast - unknown run
+        raise ScraperException(f"Scraper run [{run_id}] not found!")
+    duration: int = int((end_timestamp - datetime.fromisoformat(row[0])).total_seconds())
+    cursor = connection.execute("UPDATE scraper_executions SET end_timestamp = ?, duration = ? WHERE id = ?",
+                                (end_timestamp.isoformat(sep=" "), duration, run_id))
+    return cursor.rowcount
+
 
 class ScraperSQLiteDB:
-    """Scraper SQLite DB Class."""
+    """Scraper SQLite DB Class. One connection (guarded by lock) - instance may be shared by the threads."""
 
-    def __init__(self, db_file: str) -> None:
+    def __init__(self, db_file: Optional[str] = None) -> None:
+        db_file = db_file if db_file is not None else Config().db_name
         log.debug(f'Initializing Scraper SQLite DB in: [{db_file}].')
         if not db_file:
             raise ScraperException("Provided empty DB file!")
 
         self.__db_file = db_file
+        Path(db_file).parent.mkdir(parents=True, exist_ok=True)
+        self.__lock = threading.Lock()
+        # connection may be used by the writer threads (not by the creator thread)
+        self.__connection = sqlite3.connect(db_file, check_same_thread=False)
+        for pragma in DB_PRAGMAS:
+            self.__connection.execute(f"PRAGMA {pragma}")
+        if self.__table_exists(SHIPS_TABLE) and "id" not in self.__columns(SHIPS_TABLE):
+            self.__migrate_ships_table()
+        self.__connection.executescript(SCRAPER_DB_SCRIPT)
+        search_exists: bool = self.__table_exists(SHIPS_SEARCH_TABLE)
+        history_exists: bool = self.__table_exists(SHIPS_HISTORY_TABLE)
+        self.__connection.executescript(SHIPS_SEARCH_SCRIPT)
+        self.__connection.executescript(SHIPS_HISTORY_SCRIPT)
+        if not search_exists:  # new search index for the existing ships
+            self.__rebuild_search_index()
+        if not history_exists:  # new history - initial versions of the existing ships
+            with self.__connection:
+                self.__connection.execute(SEED_SHIPS_HISTORY_SQL)
+        log.debug(f"Connected to DB [{self.__db_file}].")
+
+    def __table_exists(self, name: str) -> bool:
+        return self.__connection.execute("SELECT count(*) FROM sqlite_master WHERE name = ?",
+                                         (name,)).fetchone()[0] > 0
+
+    def __columns(self, table: str) -> List[str]:
+        return [row[1] for row in self.__connection.execute(f"PRAGMA table_info({table})")]
+
+    def __migrate_ships_table(self) -> None:
+        log.info(f"Migrating ships table of the previous version in DB [{self.__db_file}].")
+        try:
+            self.__connection.executescript(MIGRATE_SHIPS_SCRIPT)
+        except sqlite3.Error:
+            if self.__connection.in_transaction:  # script is interrupted - nothing is changed
+                self.__connection.rollback()
+            raise
+
+    @property
+    def db_file(self) -> str:
+        return self.__db_file
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__connection.close()
+
+    def __enter__(self) -> "ScraperSQLiteDB":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
     def execute_script(self, script_file: str) -> None:
         log.debug(f'Executing sql script: [{script_file}].')
         if not script_file:
             raise ScraperException('Provided empty script file!')
 
-        # connect to DB
-        connection = sqlite3.connect(self.__db_file)
-        cursor = connection.cursor()
-        log.debug(f"Connected to DB [{self.__db_file}].")
         db_script: str = read_file_as_text(script_file)
-        cursor.executescript(db_script)
-        # execute script
-        # for query in db_script.split(";"):
-        #     log.debug(f'Now executing: [{query}].')
-        #     cursor.execute(query)
-        connection.commit()
-        connection.close()
-
-    def add_scraper_run_telemetry(self) -> int:
-        pass
-
-    def update_scraper_run_telemetry(self) -> int:
-        pass
+        with self.__lock:
+            self.__connection.executescript(db_script)  # commits the pending transaction before the script
+            self.__connection.commit()
+
+    def execute_pragma(self, pragma: str) -> None:
+        """Execute connection pragma (i.e. 'synchronous = FULL')."""
+        with self.__lock:
+            self.__connection.execute(f"PRAGMA {pragma}")
+
+    def write_transaction(self, operations: Sequence[Callable[[sqlite3.Connection], Any]]) -> list:
+        """Execute write operations (connection -> result) in one transaction, returns their results.
+        Any error - the whole transaction is rolled back."""
+        with self.__lock, self.__connection:
+            return [operation(self.__connection) for operation in operations]
+
+    def upsert_ships(self, ships: Sequence[ShipDto]) -> int:
+        """Upsert the batch of ships (keyed by the ship identity) in one transaction, returns batch size."""
+        with self.__lock, self.__connection:
+            self.__connection.executemany(UPSERT_SHIP_SQL, [ship_db_values(ship) for ship in ships])
+        return len(ships)
+
+    def save_ships(self, ships: Iterable[ShipDto], batch_size: Optional[int] = None) -> int:
+        """Upsert ships (any iterable, consumed once) by the batches, returns number of saved ships.
+        :param ships: ships to save
+        :param batch_size: ships in one batch (transaction), default - from the config
+        """
+        size: int = batch_size if batch_size else Config().db_batch_size
+        iterator = iter(ships)
+        count: int = 0
+        batch: List[ShipDto] = list(islice(iterator, size))
+        while batch:
+            count += self.upsert_ships(batch)
+            batch = list(islice(iterator, size))
+        log.debug(f"save_ships(): saved {count} ship(s) into the DB [{self.__db_file}].")
+        return count
+
+    def ships_count(self, source_system: Optional[str] = None) -> int:
+        sql: str = f"SELECT count(*) FROM {SHIPS_TABLE}" + \
+            (" WHERE source_system = ?" if source_system else "")
+        with self.__lock:
+            return self.__connection.execute(sql, (source_system,) if source_system else ()).fetchone()[0]
+
+    def iter_ships(self, source_system: Optional[str] = None) -> Iterator[ShipDto]:
+        """Stream ships from the DB (all or of the source system), rows are fetched by the chunks."""
+        sql: str = SELECT_SHIPS_SQL + (" WHERE source_system = ?" if source_system else "")
+        with self.__lock:  # separate cursor - reading doesn't hold the lock between the chunks
+            cursor = self.__connection.execute(sql, (source_system,) if source_system else ())
+
+        size: int = Config().db_batch_size
+
+        def rows() -> Iterator[list]:
+            while True:
+                with self.__lock:
+                    chunk = cursor.fetchmany(size)
+                if not chunk:
+                    return
+                yield from (_ship_db_row(row) for row in chunk)
+
+        return iter_ships_from_tuples(rows())
+
+    def get_ship(self, imo_number: str, proprietary_number1: str, proprietary_number2: str,
+                 source_system: str) -> Optional[ShipDto]:
+        """Ship by the identity, None - not found."""
+        sql: str = SELECT_SHIPS_SQL + " WHERE " + " AND ".join(name + " = ?" for name in SHIP_IDENTITY_FIELDS)
+        with self.__lock:
+            row = self.__connection.execute(sql, (imo_number, proprietary_number1, proprietary_number2,
+                                                  source_system)).fetchone()
+        return ShipDto(*_ship_db_row(row)) if row else None
+
+    def __rebuild_search_index(self) -> None:
+        with self.__connection:
+            self.__connection.execute(CLEAR_SHIPS_SEARCH_SQL)
+            self.__connection.execute(REBUILD_SHIPS_SEARCH_SQL)
+
+    def rebuild_search_index(self) -> None:
+        """Rebuild full-text search index from the ships table (i.e. after the direct DB changes)."""
+        with self.__lock:
+            self.__rebuild_search_index()
+
+    def search_ships(self, text: str, limit: Optional[int] = None, source_system: Optional[str] = None,
+                     fields: Optional[Sequence[str]] = None) -> List[ShipDto]:
+        """Full-text ships search, the best matches first (bm25 rank, names are weighted). Each word of the
+        text is a prefix (partial names), all words should match.
+        :param text: search text (free text, FTS syntax isn't used - words only)
+        :param limit: max number of found ships, default - from the config
+        :param source_system: search ships of the source system only
+        :param fields: search in the fields only (see SHIPS_SEARCH_FIELDS), default - all fields
+        """
+        folded: str = text if text else ""
+        for source, target in SEARCH_FOLDING:
+            folded = folded.replace(source, target)
+        tokens: List[str] = SEARCH_TOKENS_REGEX.findall(folded)
+        if not tokens:
+            return list()
+        if fields and set(fields) - set(SHIPS_SEARCH_FIELDS):  # fail-fast - not indexed fields
+            raise ScraperException(f"Fields {sorted(set(fields) - set(SHIPS_SEARCH_FIELDS))} "
+                                   f"aren't searchable!")
+
+        query: str = " ".join(f'"{token}"*' for token in tokens)
+        if fields:
+            query = "{" + " ".join(fields) + "} : (" + query + ")"
+        sql: str = SEARCH_SHIPS_SQL + (" AND s.source_system = ?" if source_system else "") + \
+            f" ORDER BY bm25({SHIPS_SEARCH_TABLE}, {', '.join(map(str, SHIPS_SEARCH_WEIGHTS))}) LIMIT ?"
+        params: tuple = (query,) + ((source_system,) if source_system else ()) + \
+            (limit if limit else Config().db_search_limit,)
+        with self.__lock:
+            rows: list = self.__connection.execute(sql, params).fetchall()
+        return [ShipDto(*_ship_db_row(row)) for row in rows]
+
+    def ship_history(self, imo_number: str, proprietary_number1: str, proprietary_number2: str,
+                     source_system: str,
+                     fields: Optional[Sequence[str]] = None) -> List[ShipAttributeVersion]:
+        """Versions of the ship attributes (all or of the fields only), ordered by the field and valid
+        from."""
+        if fields:
+            _check_history_fields(fields)
+        sql: str = (f"SELECT {_VERSION_COLUMNS} FROM {SHIPS_HISTORY_TABLE} WHERE {_SHIP_WHERE}" +
+                    (f" AND field IN ({', '.join('?' * len(fields))})" if fields else "") +
+                    " ORDER BY field, valid_from")
+        with self.__lock:
+            rows: list = self.__connection.execute(sql, (imo_number, proprietary_number1, proprietary_number2,
+                                                         source_system, *(fields or ()))).fetchall()
+        return [ShipAttributeVersion.from_row(row) for row in rows]
+
+    def ship_as_of(self, imo_number: str, proprietary_number1: str, proprietary_number2: str,
+                   source_system: str, moment: datetime) -> Dict[str, Optional[str]]:
+        """Ship attributes at the moment: field -> value (empty - the ship wasn't known at the moment)."""
+        point: str = moment.isoformat(sep=" ")
+        sql: str = f"SELECT field, value FROM {SHIPS_HISTORY_TABLE} WHERE {_SHIP_WHERE} AND {_AS_OF_WHERE}"
+        with self.__lock:
+            return dict(self.__connection.execute(sql, (imo_number, proprietary_number1, proprietary_number2,
+                                                        source_system, point, point)))
+
+    def fleet_as_of(self, field: str, moment: datetime,
+                    source_system: Optional[str] = None) -> Dict[Tuple[str, str, str, str], Optional[str]]:
+        """Attribute of all ships (of the source system) at the moment: ship identity -> value (i.e. owners
+        of the fleet in 2019)."""
+        _check_history_fields((field,))
+        point: str = moment.isoformat(sep=" ")
+        sql: str = (f"SELECT {_IDENTITY_COLUMNS}, value FROM {SHIPS_HISTORY_TABLE} WHERE field = ? AND "
+                    f"{_AS_OF_WHERE}" + (" AND source_system = ?" if source_system else ""))
+        params: tuple = (field, point, point) + ((source_system,) if source_system else ())
+        with self.__lock:
+            return {tuple(row[:4]): row[4] for row in self.__connection.execute(sql, params)}
+
+    def add_scraper_run_telemetry(self, start_timestamp: Optional[datetime] = None) -> int:
+        """Add scraper run (execution) record, returns its id.
+        Run isn't finished - end = start, duration 0."""
+        start: datetime = start_timestamp if start_timestamp else datetime.now()
+        with self.__lock, self.__connection:
+            return insert_run_telemetry(self.__connection, start)
+
+    def update_scraper_run_telemetry(self, run_id: int, end_timestamp: Optional[datetime] = None) -> int:
+        """Finish scraper run record: end timestamp and duration (seconds), returns number of updated
+        records."""
+        end: datetime = end_timestamp if end_timestamp else datetime.now()
+        with self.__lock, self.__connection:
+            return finish_run_telemetry(self.__connection, run_id, end)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Scraper DB Writer Module. SQLite allows only one writer at a time, so the concurrent scrapers
+    (i.e. rs-class.org workers) don't write into the DB directly: they put write requests (ships
+    batches, any SQL statements - pages, telemetry) into the bounded queue of the single writer
+    thread. Writer groups queued requests into one transaction (group commit - one sync for many
+    requests) and resolves the request futures after the commit, so producers know, when their
+    data is durable.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import queue
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import Future
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.entities.ship import ShipDto
+from wfleet.scraper.db.scraper_db_sqlite import (ScraperSQLiteDB, UPSERT_SHIP_SQL, ship_db_values,
+                                                 insert_run_telemetry, finish_run_telemetry)
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+# write request: operation (connection -> result), number of rows, future for the result
+WriteRequest = Tuple[Callable[[sqlite3.Connection], Any], int, Future]
+
+
+def _executemany(sql: str, rows: List[Sequence]) -> Callable[[sqlite3.Connection], int]:
+    def operation(connection: sqlite3.Connection) -> int:
+        connection.executemany(sql, rows)
+        return len(rows)
+    return operation
+
+
+class ScraperDbWriter:
+    """Single writer thread of the scraper DB. Thread-safe - any number of producers. Bounded queue - the
+    producers wait, if the writer is behind (disk is the limit). Futures of the requests are resolved after
+    the commit of the transaction with the request (result of the operation) or failed with the error."""
+
+    def __init__(self, db: ScraperSQLiteDB, queue_size: Optional[int] = None, max_rows: Optional[int] = None,
+                 durable: bool = False) -> None:
+        """
+        :param db: scraper DB (writer uses its connection)
+        :param queue_size: max requests in the queue, default - from the config
+        :param max_rows: max rows of the requests grouped into one transaction, default - from the config
+        :param durable: full sync on each commit (durable after the power loss), otherwise - WAL default
+        """
+        config = Config()
+        self.__db: ScraperSQLiteDB = db
+        self.__max_rows: int = max_rows if max_rows else config.db_writer_max_rows
+        self.__queue: queue.Queue = queue.Queue(maxsize=queue_size if queue_size
+                                                else config.db_writer_queue_size)
+        self.__lock = threading.Lock()  # guards closing vs submitting
+        self.__closed: bool = False
+        self.transactions: int = 0  # committed transactions
+        self.requests: int = 0  # committed requests
+        if durable:
+            db.execute_pragma("synchronous = FULL")
+
+        self.__thread = threading.Thread(target=self.__run, name="scraper-db-writer", daemon=True)
+        self.__thread.start()
+        log.debug(f"Started DB writer for [{db.db_file}].")
+
+    def __run(self) -> None:
+        stop: bool = False
+        while not stop:
+            request = self.__queue.get()
+            if request is None:  # writer is closed
+                return
+            group: List[WriteRequest] = [request]
+            rows: int = request[1]
+            while rows < self.__max_rows:  # group already queued requests into one transaction
+                try:
+                    request = self.__queue.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                group.append(request)
+                rows += request[1]
+            self.__write([request for request in group if request[2].set_running_or_notify_cancel()])
+
+    def __write(self, group: List[WriteRequest]) -> None:
+        if not group:
+            return
+        try:
+            results: list = self.__db.write_transaction([operation for operation, _, _ in group])
+        except BaseException as error:
+            if len(group) > 1:  # find the failed request - the others are written one by one
+                log.warning(f"DB writer transaction of {len(group)} request(s) failed: {error}, retrying.")
+                for request in group:
+                    self.__write([request])
+            else:
+                log.error(f"DB write request failed: {error}")
+                group[0][2].set_exception(error)
+            return
+
+        self.transactions += 1
+        self.requests += len(group)
+        for (_, _, future), result in zip(group, results):
+            future.set_result(result)
+
+    def submit(self, operation: Callable[[sqlite3.Connection], Any], rows: int = 1) -> Future:
+        """Submit write operation (connection -> result), returns future of the operation result.
+        :param operation: write operation, executed in the writer thread (in the writer transaction)
+        :param rows: number of rows written by the operation (for the transactions grouping)
+        """
+        future: Future = Future()
+        with self.__lock:  # request can't be queued after the closing marker
+            if self.__closed:  # fail-fast - closed writer
+                raise ScraperException("DB writer is closed!")
+            self.__queue.put((operation, rows, future))
+        return future
+
+    def submit_sql(self, sql: str, rows: Iterable[Sequence]) -> Future:
+        """Submit SQL statement for the rows (executemany), returns future of the number of rows."""
+        values: List[Sequence] = list(rows)
+        return self.submit(_executemany(sql, values), len(values))
+
+    def submit_ships(self, ships: Sequence[ShipDto]) -> Future:
+        """Submit ships batch upsert, returns future of the number of ships. Ships are converted into the
+        DB values in the producer thread."""
+        return self.submit_sql(UPSERT_SHIP_SQL, (ship_db_values(ship) for ship in ships))
+
+    def submit_run_start(self, start_timestamp: Optional[datetime] = None) -> Future:
+        """Submit scraper run (execution) record, returns future of the run id."""
+        start: datetime = start_timestamp if start_timestamp else datetime.now()
+        return self.submit(lambda connection: insert_run_telemetry(connection, start))
+
+    def submit_run_finish(self, run_id: int, end_timestamp: Optional[datetime] = None) -> Future:
+        """Submit finish of the scraper run record, returns future of the number of updated records. End
+        timestamp (default - now) is taken on submit, not on write."""
+        end: datetime = end_timestamp if end_timestamp else datetime.now()
+        return self.submit(lambda connection: finish_run_telemetry(connection, run_id, end))
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until all the requests submitted before are committed."""
+        self.submit(lambda connection: None, 0).result(timeout)
+
+    def close(self) -> None:
+        """Close the writer - queued requests are written, then the writer thread is stopped."""
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+        self.__queue.put(None)
+        self.__thread.join()
+        log.debug(f"DB writer for [{self.__db.db_file}] is closed: {self.requests} request(s) in "
+                  f"{self.transactions} transaction(s).")
+
+    def __enter__(self) -> "ScraperDbWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
@@ -2,23 +2,28 @@
 # -*- coding: utf-8 -*-
 
 """
-    SQLite persistence layer for FleetScraper.
+    SQLite persistence layer for FleetScraper. All statements are parameterized, rows are inserted
+    by batches (executemany, one commit per batch). Geo points lookup path is covered by the
+    unique id index, GeoDB keeps one connection and id -> geo_point_id cache during the geo tree loads.
 
     Created:  Dmitrii Gusev, 17.03.2021
-    Modified:
+    Modified: Dmitrii Gusev, 19.10.2026
 
 """
 
 import logging
 import sqlite3 as sql
-from pyutilities.pylog import setup_logging
+from itertools import islice
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-# setup logging for the whole script
-setup_logging(default_path="logging.yml")
 log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
 
 # common constants
 DB_NAME = "db_files/sqlite/scrapdb.sqlite"
+DB_BATCH_SIZE = 1000  # rows inserted/updated in one transaction (one commit per batch)
+DB_SELECT_CHUNK_SIZE = 500  # ids in one 'IN (...)' select (below SQLite variables limit)
 
 # database script
 DB_SCRIPT = """
@@ -29,20 +34,73 @@ DB_SCRIPT = """
     DROP TABLE IF EXISTS geo_points;
     -- create tables
     CREATE TABLE areas (id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE, name TEXT);
-    CREATE TABLE commissions(id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE, city TEXT, 
+    CREATE TABLE commissions(id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE, city TEXT,
       territory_commission TEXT, sector_commission TEXT, people_count INTEGER);
-    CREATE TABLE addresses(id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE, street TEXT, buildings TEXT, 
+    CREATE TABLE addresses(id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE, street TEXT, buildings TEXT,
       commission_id INTEGER REFERENCES commissions(id) ON DELETE RESTRICT);
     -- geo points from CIK RF database
-    CREATE TABLE geo_points(geo_point_id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE, id INTEGER, 
-      intid INTEGER, cik_text TEXT, levelid INTEGER, children TEXT, 
+    CREATE TABLE geo_points(geo_point_id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT UNIQUE, id INTEGER,
+      intid INTEGER, cik_text TEXT, levelid INTEGER, children TEXT,
       parent_id INTEGER REFERENCES geo_points(geo_point_id) ON DELETE RESTRICT, processed INTEGER DEFAULT 0);
+    -- geo point lookup path (by id, the rest of the attributes - one row check)
     CREATE UNIQUE INDEX geo_point_id_unique ON geo_points(id);
+    -- geo tree traversal: children of the node, not processed nodes
+    CREATE INDEX geo_points_parent_idx ON geo_points(parent_id);
+    CREATE INDEX geo_points_processed_idx ON geo_points(processed);
 """
 
+INSERT_AREA_SQL = "INSERT INTO areas(name) VALUES (?)"
+INSERT_COMMISSION_SQL = ("INSERT INTO commissions(city, territory_commission, sector_commission, "
+                         "people_count) VALUES (?, ?, ?, ?)")
+INSERT_ADDRESS_SQL = "INSERT INTO addresses(street, buildings, commission_id) VALUES (?, ?, ?)"
+INSERT_GEO_POINT_SQL = ("INSERT INTO geo_points(id, intid, cik_text, levelid, children, parent_id, "
+                        "processed) VALUES (?, ?, ?, ?, ?, ?, ?)")
+UPDATE_GEO_POINT_PROCESSED_SQL = "UPDATE geo_points SET processed = ? WHERE geo_point_id = ?"
+SELECT_GEO_POINT_ID_SQL = ("SELECT geo_point_id FROM geo_points "
+                           "WHERE id = ? AND intid IS ? AND cik_text = ? AND levelid = ?")
+
+# geo point row: id, intid, cik_text, levelid, children, parent_id, processed
+GeoPoint = Tuple[int, Optional[int], str, int, str, Optional[int], int]
+
+
+def db_connect(dbname: str) -> sql.Connection:
+    """Connection with the pragmas for the bulk loads (WAL - readers don't block the writer)."""
+    connection = sql.connect(dbname)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    return connection
+
+
+def _batches(rows: Iterable[Sequence], size: int = DB_BATCH_SIZE) -> Iterable[List[Sequence]]:
+    iterator = iter(rows)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+def _geo_point_row(geo_point: Sequence) -> GeoPoint:
+    """Geo point (list/tuple) -> row for insert, empty intid -> NULL."""
+    id, intid, cik_text, levelid, children, parent_id, processed = geo_point
+    return id, intid if intid else None, cik_text, levelid, children, parent_id, processed
+
+
+def db_execute_many(dbname: str, insert_sql: str, rows: Iterable[Sequence],
+                    batch_size: int = DB_BATCH_SIZE) -> int:
+    """Execute parameterized statement for all rows by batches (one commit per batch), return rows count."""
+    count = 0
+    with closing(db_connect(dbname)) as connection:
+        for batch in _batches(rows, batch_size):
+            with connection:  # one transaction per batch
+                connection.executemany(insert_sql, batch)
+            count += len(batch)
+    return count
+
 
 class GeoDB(object):
-    """Class for utilizing sqlite3 connection."""
+    """Class for utilizing sqlite3 connection. One connection for all operations, id -> geo_point_id
+    cache is filled on geo points inserts and lookups (geo tree loads). Single rows inserts are committed
+    by batches (and on commit/close)."""
 
     def __init__(self, dbname):
         # init logger
@@ -51,67 +109,107 @@ class GeoDB(object):
         self.log.debug("Creating GeoDB instance.")
         self.__dbname = dbname
         self.__connection = None
-        self.__cursor = None
+        self.__ids: Dict[int, int] = dict()  # CIK id -> geo_point_id
+        self.__pending: int = 0  # single rows inserted, but not committed yet
 
-    # todo: create decorator for closing connection on exception
-    # todo: create executor method for utilizing with all other methods
-    def db_mark_geo_point_as_processed(self, dbname, geo_point_id, processed_status=1):
-        """"""
-        log.debug(
-            "GeoDB.db_mark_geo_point_as_processed(): mark point [{}] as processed with status [{}].".format(
-                geo_point_id, processed_status
-            )
-        )
-        update_sql = "UPDATE geo_points SET processed = {} WHERE geo_point_id = {}".format(
-            processed_status, geo_point_id
-        )
-        # check connection
+    def __connect(self, dbname=None) -> sql.Connection:
         if not self.__connection:
-            self.__connection = sql.connect(dbname)
-            self.__cursor = self.__connection.cursor()
-        try:
-            # performing db operations
-            self.__cursor.execute(update_sql)
+            self.__connection = db_connect(dbname if dbname else self.__dbname)
+        return self.__connection
+
+    def commit(self):
+        if self.__connection and self.__pending:
             self.__connection.commit()
-        except StandardError as se:
-            self.log.error("Error occured: {}".format(se.message))
+        self.__pending = 0
+
+    def close(self):
+        if self.__connection:
+            self.commit()
             self.__connection.close()
+            self.__connection = None
+        self.__ids.clear()
+
+    def __insert_one(self, dbname, insert_sql: str, values: Sequence) -> int:
+        """Insert one row (no commit per row - see commit()), return inserted id."""
+        last_id = self.__connect(dbname).execute(insert_sql, values).lastrowid
+        self.__pending += 1
+        if self.__pending >= DB_BATCH_SIZE:
+            self.commit()
+        return last_id
+
+    def db_add_commission(self, dbname, city, territory_commission, sector_commission, people_count) -> int:
+        """Add one commission, return inserted id."""
+        self.log.debug(f"GeoDB.db_add_commission(): adding commission [{city}, {territory_commission}, "
+                       f"{sector_commission}, {people_count}].")
+        return self.__insert_one(dbname, INSERT_COMMISSION_SQL,
+                                 (city, territory_commission, sector_commission, people_count))
+
+    def db_add_address(self, dbname, street, buildings, commission_id) -> int:
+        """Add one address, return inserted id."""
+        self.log.debug(f"GeoDB.db_add_address(): adding address [{street}, {buildings}, {commission_id}].")
+        return self.__insert_one(dbname, INSERT_ADDRESS_SQL, (street, buildings, commission_id))
+
+    def db_add_single_geo_point(self, dbname, id, intid, cik_text, levelid, children, parent_id,
+                                processed=0) -> int:
+        """Add one geo point, return inserted id (cached - id -> geo_point_id)."""
+        self.log.debug(f"GeoDB.db_add_single_geo_point(): adding geopoint [{id}, {intid}, {cik_text}, "
+                       f"{levelid}].")
+        last_id = self.__insert_one(dbname, INSERT_GEO_POINT_SQL,
+                                    _geo_point_row((id, intid, cik_text, levelid, children, parent_id,
+                                                    processed)))
+        self.__ids[id] = last_id
+        return last_id
+
+    def db_mark_geo_point_as_processed(self, dbname, geo_point_id, processed_status=1):
+        """Mark one geo point as processed."""
+        log.debug(f"GeoDB.db_mark_geo_point_as_processed(): mark point [{geo_point_id}] as processed "
+                  f"with status [{processed_status}].")
+        self.db_mark_geo_points_as_processed(dbname, [geo_point_id], processed_status)
+
+    def db_mark_geo_points_as_processed(self, dbname, geo_points_ids, processed_status=1):
+        """Mark multiple geo points as processed (one commit per batch)."""
+        connection = self.__connect(dbname)
+        try:
+            for batch in _batches((processed_status, geo_point_id) for geo_point_id in geo_points_ids):
+                with connection:  # commit or rollback
+                    connection.executemany(UPDATE_GEO_POINT_PROCESSED_SQL, batch)
+        except sql.Error as se:
+            self.log.error(f"Error occured: {se}")
+            self.close()
+            raise
 
     def db_add_multiple_geo_points(self, dbname, list_of_geo_points):
-        """"""
+        """Add multiple geo points (one commit per batch), inserted points are cached (id -> geo_point_id)."""
         # log.debug('db_add_multiple_geo_points(): adding multiple geo points.')  # <- too much output
         # if list is empty - quick return
-        if not list_of_geo_points or len(list_of_geo_points) == 0:
+        if not list_of_geo_points:
             self.log.debug("List of geo points is empty. Nothing to add.")
             return
-        # list isn't empty - processing
-        sql_list = []
-        insert_sql = (
-            "INSERT INTO geo_points(id, intid, cik_text, levelid, children, parent_id, processed) "
-            "VALUES ({}, {}, '{}', {}, '{}', {}, {})"
-        )
-        # process all specified geo points
-        for geo_point in list_of_geo_points:
-            # get info from list entry
-            id = geo_point[0]
-            intid = geo_point[1]
-            cik_text = geo_point[2]
-            levelid = geo_point[3]
-            children = geo_point[4]
-            parent_id = geo_point[5]
-            processed = geo_point[6]
-            # add values to query and add query to list
-            sql_list.append(insert_sql.format(id, intid, cik_text, levelid, children, parent_id, processed))
-        # check connection
-        if not self.__connection:
-            self.__connection = sql.connect(dbname)
-            self.__cursor = self.__connection.cursor()
-        # execute multip[le sqls
-        for query in sql_list:
-            self.__cursor.execute(query)
-        # commit all added points
-        self.__connection.commit()
-        self.log.debug("Geo points list [len = {}] has been added.".format(len(list_of_geo_points)))
+
+        connection = self.__connect(dbname)
+        count = 0
+        for batch in _batches(_geo_point_row(geo_point) for geo_point in list_of_geo_points):
+            with connection:
+                connection.executemany(INSERT_GEO_POINT_SQL, batch)
+            self.__cache_ids(connection, [row[0] for row in batch])
+            count += len(batch)
+        self.log.debug(f"Geo points list [len = {count}] has been added.")
+
+    def __cache_ids(self, connection: sql.Connection, ids: List[int]) -> None:
+        for start in range(0, len(ids), DB_SELECT_CHUNK_SIZE):
+            chunk = ids[start:start + DB_SELECT_CHUNK_SIZE]
+            self.__ids.update(connection.execute(f"SELECT id, geo_point_id FROM geo_points WHERE id IN "
+                                                 f"({', '.join('?' * len(chunk))})", chunk))
+
+    def db_get_geo_point_id(self, dbname, id) -> int:
+        """Geo point id by the CIK id (cached), -1 - not found."""
+        if id not in self.__ids:
+            row = self.__connect(dbname).execute("SELECT geo_point_id FROM geo_points WHERE id = ?",
+                                                 (id,)).fetchone()
+            if not row:  # not found - not cached (may be added later)
+                return -1
+            self.__ids[id] = row[0]
+        return self.__ids[id]
 
 
 def db_create(dbname):
@@ -121,13 +219,10 @@ def db_create(dbname):
     :return:
     """
     log.debug("db_create: creating database structure.")
-    # connect to sqlite db
-    conn = sql.connect(dbname)
-    cur = conn.cursor()
-    log.debug("Connected to DB [{}].".format(dbname))
-    # execute db setup script
-    for query in DB_SCRIPT.split(";"):
-        cur.execute(query)
+    # connect to sqlite db and execute db setup script
+    with closing(db_connect(dbname)) as connection:
+        log.debug(f"Connected to DB [{dbname}].")
+        connection.executescript(DB_SCRIPT)
     log.debug("DB structure created.")
 
 
@@ -138,15 +233,8 @@ def db_add_areas(dbname, areas_list):
     :param areas_list:
     :return:
     """
-    log.debug("db_add_areas(): adding areas {}.".format(areas_list))
-    insert_sql = 'INSERT INTO areas(name) VALUES ("{}")'
-    # connect to db and in cycle insert records
-    connection = sql.connect(dbname)
-    cursor = connection.cursor()
-    log.debug("Connected to DB [{}].".format(dbname))
-    for area in areas_list:
-        cursor.execute(insert_sql.format(area))
-    connection.commit()
+    log.debug(f"db_add_areas(): adding areas {areas_list}.")
+    db_execute_many(dbname, INSERT_AREA_SQL, ((area,) for area in areas_list))
     log.debug("All areas added.")
 
 
@@ -154,16 +242,17 @@ def db_add_commissions(dbname, commissions_list):
     """
     Add multiple commissions at a time.
     :param dbname:
-    :param commissions_list:
-    :return:
+    :param commissions_list: commissions - (city, territory_commission, sector_commission, people_count)
+    :return: number of added commissions
     """
     log.debug("db_add_commissions(): adding commissions.")
-    raise StandardError("Not implemented!")
+    return db_execute_many(dbname, INSERT_COMMISSION_SQL, commissions_list)
 
 
 def db_add_commission(dbname, city, territory_commission, sector_commission, people_count):
     """
-    Add one commission at a time, return inserted id.
+    Add one commission at a time, return inserted id. One-off insert (own connection), for the loads -
+    GeoDB.db_add_commission() or db_add_commissions().
     :param dbname:
     :param city:
     :param territory_commission:
@@ -171,149 +260,73 @@ def db_add_commission(dbname, city, territory_commission, sector_commission, peo
     :param people_count:
     :return:
     """
-    log.debug(
-        "db_add_commission(): adding commission [{}, {}, {}, {}].".format(
-            city, territory_commission, sector_commission, people_count
-        )
-    )
-    insert_sql = (
-        "INSERT INTO commissions(city, territory_commission, sector_commission, people_count) "
-        "VALUES ('{}', '{}', '{}', {})".format(city, territory_commission, sector_commission, people_count)
-    )
-    connection = sql.connect(dbname)
-    cursor = connection.cursor()
-    log.debug("Connected to DB [{}].".format(dbname))
-    cursor.execute(insert_sql)
-    last_id = cursor.lastrowid
-    connection.commit()
-    log.debug("Last inserted id = [{}].".format(last_id))
-    return last_id
+    with closing(GeoDB(dbname)) as geo_db:
+        return geo_db.db_add_commission(dbname, city, territory_commission, sector_commission, people_count)
+
+
+def db_add_addresses(dbname, addresses_list):
+    """
+    Add multiple addresses at a time.
+    :param dbname:
+    :param addresses_list: addresses - (street, buildings, commission_id)
+    :return: number of added addresses
+    """
+    log.debug("db_add_addresses(): adding addresses.")
+    return db_execute_many(dbname, INSERT_ADDRESS_SQL, addresses_list)
 
 
 def db_add_address(dbname, street, buildings, commission_id):
     """
-    Add one address at a time, return inserted id.
+    Add one address at a time, return inserted id. One-off insert (own connection), for the loads -
+    GeoDB.db_add_address() or db_add_addresses().
     :param dbname:
     :param street:
     :param buildings:
     :param commission_id:
     :return:
     """
-    log.debug("db_add_address(): adding address [{}, {}, {}].".format(street, buildings, commission_id))
-    insert_sql = "INSERT INTO addresses(street, buildings, commission_id) VALUES ('{}', '{}', '{}')".format(
-        street, buildings, commission_id
-    )
-    connection = sql.connect(dbname)
-    cursor = connection.cursor()
-    log.debug("Connected to DB [{}].".format(dbname))
-    cursor.execute(insert_sql)
-    last_id = cursor.lastrowid
-    connection.commit()
-    log.debug("Last inserted id = [{}].".format(last_id))
-    return last_id
+    with closing(GeoDB(dbname)) as geo_db:
+        return geo_db.db_add_address(dbname, street, buildings, commission_id)
 
 
 def db_add_single_geo_point(dbname, id, intid, cik_text, levelid, children, parent_id, processed=0):
-    """"""
-    if not intid:
-        intid = "NULL"
-    insert_sql = (
-        "INSERT INTO geo_points(id, intid, cik_text, levelid, children, parent_id, processed) "
-        "VALUES ({}, {}, '{}', {}, '{}', {}, {})".format(
-            id, intid, cik_text, levelid, children, parent_id, processed
-        )
-    )
-    log.debug("db_add_geo_point(): adding geopoint.\n\tSQL -> [{}].".format(insert_sql))
-
-    connection = sql.connect(dbname)
-    try:
-        cursor = connection.cursor()
-        cursor.execute(insert_sql)
-        last_id = cursor.lastrowid
-        connection.commit()
-        log.debug("Geo point has been added. Last inserted id = [{}].".format(last_id))
-        return last_id
-    finally:
-        connection.close()
+    """Add one geo point, return inserted id. One-off insert (own connection), for the tree loads -
+    GeoDB.db_add_single_geo_point() and GeoDB.db_add_multiple_geo_points()."""
+    with closing(GeoDB(dbname)) as geo_db:
+        last_id = geo_db.db_add_single_geo_point(dbname, id, intid, cik_text, levelid, children, parent_id,
+                                                 processed)
+    log.debug(f"Geo point has been added. Last inserted id = [{last_id}].")
+    return last_id
 
 
 # todo: remove this method - it has been moved to GeoDB object
 def db_add_multiple_geo_points(dbname, list_of_geo_points):
-    """"""
-    # log.debug('db_add_multiple_geo_points(): adding multiple geo points.')  # <- too much output
-
+    """Add multiple geo points (one commit per batch)."""
     # if list is empty - quick return
-    if not list_of_geo_points or len(list_of_geo_points) == 0:
+    if not list_of_geo_points:
         log.debug("List of geo points is empty. Nothing to add.")
         return
 
-    # list isn't empty - processing
-    sql_list = []
-    insert_sql = (
-        "INSERT INTO geo_points(id, intid, cik_text, levelid, children, parent_id, processed) "
-        "VALUES ({}, {}, '{}', {}, '{}', {}, {})"
-    )
-    # process all specified geo points
-    for geo_point in list_of_geo_points:
-        # get info from list entry
-        id = geo_point[0]
-        intid = geo_point[1]
-        cik_text = geo_point[2]
-        levelid = geo_point[3]
-        children = geo_point[4]
-        parent_id = geo_point[5]
-        processed = geo_point[6]
-        # add values to query and add query to list
-        sql_list.append(insert_sql.format(id, intid, cik_text, levelid, children, parent_id, processed))
-
-    # execute multip[le sqls
-    connection = sql.connect(dbname)
-    cursor = connection.cursor()
-    for query in sql_list:
-        cursor.execute(query)
-    # commit all added points
-    connection.commit()
-    log.debug("Geo points list [len = {}] has been added.".format(len(list_of_geo_points)))
+    count = db_execute_many(dbname, INSERT_GEO_POINT_SQL,
+                            (_geo_point_row(point) for point in list_of_geo_points))
+    log.debug(f"Geo points list [len = {count}] has been added.")
 
 
 def db_get_not_processed_geo_points_ids(dbname):
-    """"""
+    """Not processed geo points: (geo_point_id, id, intid, cik_text)."""
     log.debug("db_get_not_processed_geo_points_ids(): processing.")
     select_sql = "SELECT geo_point_id, id, intid, cik_text FROM geo_points WHERE processed = 0"
-    connection = sql.connect(dbname)
-    cursor = connection.cursor()
-    cursor.execute(select_sql)
-    # iterate over rows and put them into result
-    result = []
-    for row in cursor:
-        result.append(row)
-    return result
+    with closing(db_connect(dbname)) as connection:
+        return connection.execute(select_sql).fetchall()
 
 
 def db_get_geo_point_id(dbname, id, intid, cik_text, levelid):
-    """"""
-    if not intid:
-        intid = "is NULL"
-    else:
-        intid = "= {}".format(intid)
-    select_sql = "SELECT geo_point_id FROM geo_points WHERE id = {} AND intid {} AND cik_text = '{}' AND levelid = {}".format(
-        id, intid, cik_text, levelid
-    )
-    log.debug("db_get_geo_point_id(): selecting id.\n\tSQL -> [{}]".format(select_sql))
-    connection = sql.connect(dbname)
-    cursor = connection.cursor()
-    cursor.execute(select_sql)
-
-    # process result
-    result = cursor.fetchone()
-    if result:  # something found
-        id = result[0]
-    else:  # nothing found
-        id = -1
-
-    connection.close()
-    # cursor.close()
-    return id
+    """Geo point id by its attributes (indexed lookup), -1 - not found."""
+    log.debug(f"db_get_geo_point_id(): selecting id for [{id}, {intid}, {cik_text}, {levelid}].")
+    with closing(db_connect(dbname)) as connection:
+        result = connection.execute(SELECT_GEO_POINT_ID_SQL, (id, intid if intid else None, cik_text,
+                                                              levelid)).fetchone()
+    return result[0] if result else -1  # -1 - nothing found
 
 
 if __name__ == "__main__":
@@ -5,12 +5,15 @@
     Scrapers Abstractions. Define base interface / behavior / properties for all Scrapers.
 
     Created:  Dmitrii Gusev, 02.05.2021
-    Modified: Dmitrii Gusev, 09.01.2022
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
 import logging
 from datetime import datetime
+from typing import Optional, Tuple
 from abc import ABC, abstractmethod
+from wfleet.scraper.db.scraper_db_writer import ScraperDbWriter
+from wfleet.scraper.engine.sinks import ShipSink, create_sink
 
 SCRAPE_RESULT_OK = "Scraped OK!"
 
@@ -21,6 +24,8 @@ log.debug(f"Logging for module {__name__} is configured.")
 
 class ScraperAbstractClass(ABC):
     """Base Abstract Class for all scrapers. Define base behavior and properties for all scrapers."""
+    sinks: Tuple[str, ...] = ()  # output sinks names for the scraped ships, empty - default sinks
+    db_writer: Optional[ScraperDbWriter] = None  # scraper DB writer of the run, none - sink opens its own
 
     def __init__(self):
         """Base Constructor for scrapers. Define necessary fields."""
@@ -36,3 +41,7 @@ class ScraperAbstractClass(ABC):
             Any value <= 0 - no limit.
         :return: text message - scrap result
         """
+
+    def open_sink(self, raw_dir: str) -> ShipSink:
+        """Open output sink(s) for the scraped ships in the scraper run dir (written in the background)."""
+        return create_sink(self.sinks, raw_dir, db_writer=self.db_writer)
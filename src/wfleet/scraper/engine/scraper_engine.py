@@ -6,79 +6,179 @@
     directly - rather should be imported and functions used.
 
     Created:  Dmitrii Gusev, 24.12.2021
-    Modified: Dmitrii Gusev, 29.05.2022
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
-# todo: add DB support for scraper runs telemetry
 # todo: add execution time measurement for particular scrapers
 
+import json
 import logging
-from datetime import datetime
+from dataclasses import asdict
+from concurrent.futures import Future
+from typing import List, Optional, Sequence
+from datetime import datetime, timedelta
 from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
-from wfleet.scraper.engine.scrapers.scraper_clarksonsnet import ClarksonsNetScraper
-from wfleet.scraper.engine.scrapers.scraper_gims import GimsRuScraper
-from wfleet.scraper.engine.scrapers.scraper_rivregru import RivRegRuScraper
-from wfleet.scraper.engine.scrapers.scraper_morflotru import MorflotRuScraper
-from wfleet.scraper.engine.scrapers.scraper_marinetrafficcom import MarineTrafficComScraper
-from wfleet.scraper.engine.scrapers.scraper_vesselfindercom import VesselFinderComScraper
-from wfleet.scraper.engine.scrapers.scraper_rsclassorg import RsClassOrgScraper
-from wfleet.scraper.engine.scrapers.seaweb.seaweb import SeawebScraper
+from wfleet.scraper.engine.scraper_abstract import ScraperAbstractClass
+from wfleet.scraper.engine.scraper_registry import SCRAPERS, DEFAULT_SCRAPERS
+from wfleet.scraper.config.scraper_settings import SourceSettings, source_settings
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.utils.imo_index import build_imo_index
+from wfleet.scraper.utils.codes_engine import CodesProcessorFactory
+from wfleet.scraper.cache.cache_manifest import (CacheManifest, MANIFEST_ENTITY_SHIP,
+                                                 rebuild_manifest_from_disk)
+from wfleet.scraper.cache.cache_blobs import BlobStore, dedup_cache
+from wfleet.scraper.cache.scraper_cache import ScraperCache
+from wfleet.scraper.engine.snapshot_diff import diff_runs
+from wfleet.scraper.db.scraper_db_sqlite import ScraperSQLiteDB
+from wfleet.scraper.db.scraper_db_writer import ScraperDbWriter
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
 
 # init module logging
 log = logging.getLogger(__name__)
 log.debug(f"Logging for module {__name__} is configured.")
 
 
-def scrap_all_data(dry_run: bool = False, requests_limit: int = 0):
+def scrap_all_data(dry_run: bool = False, requests_limit: int = 0, sinks: Sequence[str] = (),
+                   scrapers_names: Sequence[str] = ()):
     """Perform data scraping with all scrapers/parsers.
     :param dry_run: dry run mode true/false.
-    :param requests_limit: limit http/https requests # for some parsers.
+    :param requests_limit: limit http/https requests # for some parsers, 0 - from the source settings.
+    :param sinks: output sinks names for the scraped ships, empty - sinks from the source settings.
+    :param scrapers_names: scrapers to run (see scraper registry), empty - all default scrapers.
     """
-    log.debug("scrap_all_data(): processing all data sources.")
+    log.debug(f"scrap_all_data(): processing data sources: {scrapers_names or 'all'}. Sinks: {sinks}.")
 
     # scraper run timestamp
     timestamp: datetime = datetime.now()
 
-    # --- run scraper for clarcksons.net
-    clarksons_scraper: ClarksonsNetScraper = ClarksonsNetScraper()
-    clarksons_scraper.scrap(timestamp, dry_run=dry_run, requests_limit=requests_limit)
-
-    # --- run scraper class for GIMS
-    gims_scraper: GimsRuScraper = GimsRuScraper()
-    gims_scraper.scrap(timestamp, dry_run=dry_run, requests_limit=requests_limit)
-
-    # --- run scraper for rivreg.ru
-    riv_scraper: RivRegRuScraper = RivRegRuScraper()
-    riv_scraper.scrap(timestamp, dry_run=dry_run, requests_limit=requests_limit)
-
-    # --- scraper class for morflot.ru
-    morflot_scraper: MorflotRuScraper = MorflotRuScraper()
-    morflot_scraper.scrap(timestamp, dry_run=dry_run, requests_limit=requests_limit)
-
-    # --- run scraper for marinetraffic.com
-    mtraffic_scraper: MarineTrafficComScraper = MarineTrafficComScraper()
-    mtraffic_scraper.scrap(timestamp, dry_run=dry_run, requests_limit=requests_limit)
-
-    # --- run scraper for vesselfinder.com
-    vf_scraper: VesselFinderComScraper = VesselFinderComScraper()
-    vf_scraper.scrap(timestamp, dry_run=dry_run, requests_limit=requests_limit)
-
-    # --- scraper for rs-class.org
-    rs_scraper: RsClassOrgScraper = RsClassOrgScraper()
-    rs_scraper.scrap(timestamp, dry_run=dry_run, requests_limit=requests_limit)
+    # scrapers are loaded (imported) by the registry - only the used ones
+    names: Sequence[str] = scrapers_names or DEFAULT_SCRAPERS
+    scrapers: List[ScraperAbstractClass] = [SCRAPERS.create(name) for name in names]
+    # scraper run telemetry and the scraper DB sink (not for the dry run - DB isn't touched) - written by
+    # the one DB writer thread of the run (SQLite - one writer at a time)
+    scraper_db: Optional[ScraperSQLiteDB] = None if dry_run else ScraperSQLiteDB()
+    writer: Optional[ScraperDbWriter] = ScraperDbWriter(scraper_db) if scraper_db else None
+    run_id: int = writer.submit_run_start(timestamp).result() if writer else 0
+    try:
+        for name, scraper in zip(names, scrapers):
+            settings: SourceSettings = source_settings(name)
+            scraper.sinks = tuple(sinks) if sinks else settings.sinks
+            scraper.db_writer = writer
+            limit: int = requests_limit or settings.requests_limit  # CLI limit > source settings limit
+            scraper.scrap(timestamp, dry_run=dry_run, requests_limit=limit)
+    finally:
+        if writer:
+            finished: Future = writer.submit_run_finish(run_id)
+            writer.close()  # queued requests are written
+            scraper_db.close()
+            finished.result()
 
 
 def execute_seaweb_scrap(dry_run: bool = False):
     log.debug("execute_seaweb_scrap(): processing Seaweb scraping data.")
-    seaweb_scraper: SeawebScraper = SeawebScraper()
+    seaweb_scraper: ScraperAbstractClass = SCRAPERS.create("seaweb")
     seaweb_scraper.scrap(datetime.now(), dry_run)
 
 
 def execute_seaweb_parse(dry_run: bool = False):
     log.debug("execute_seaweb_parse(): processing Seaweb parsing data.")
-    seaweb_scraper: SeawebScraper = SeawebScraper()
+    seaweb_scraper = SCRAPERS.create("seaweb")
     seaweb_scraper.parse(dry_run)
 
 
+def execute_imo_index_build(dry_run: bool = False):
+    log.debug("execute_imo_index_build(): (re)building IMO numbers index.")
+    config = Config()
+    index = CodesProcessorFactory.imo_index()
+
+    if not dry_run:  # dry run mode - won't rebuild the index
+        manifest = CacheManifest()
+        # scraped/denied ships - from the cache manifest (if it is filled in), otherwise - from the disk
+        build_imo_index(index, CodesProcessorFactory.imo_codes().codes(), config.seaweb_raw_ships_dir,
+                        config.main_ship_data_file,
+                        manifest if manifest.count(MANIFEST_ENTITY_SHIP) > 0 else None)
+        manifest.close()
+
+    log.info(f"IMO index: known {len(index.known())}, scraped {len(index.scraped())}, "
+             f"denied {len(index.denied())}, next crawl plan {len(index.plan())}.")
+
+
+def execute_imo_candidates_seed(dry_run: bool = False, limit: int = 0):
+    log.debug(f"execute_imo_candidates_seed(): seeding IMO candidates, limit: {limit}.")
+    if dry_run:  # dry run mode - won't do anything!
+        log.warning("Dry run mode is on! IMO candidates won't be changed.")
+        return
+
+    added: int = CodesProcessorFactory.seed_imo_candidates(limit)
+    CodesProcessorFactory.close_all()
+    log.info(f"Added IMO candidates: {added}.")
+
+
+def execute_manifest_rebuild(dry_run: bool = False):
+    log.debug("execute_manifest_rebuild(): rebuilding cache manifest from the disk.")
+    if dry_run:  # dry run mode - won't do anything!
+        log.warning("Dry run mode is on! Cache manifest won't be rebuilt.")
+        return
+
+    manifest = CacheManifest()
+    rebuild_manifest_from_disk(manifest)
+    manifest.close()
+
+
+def execute_manifest_report(stale_days: int = 0):
+    log.debug(f"execute_manifest_report(): cache manifest report, stale days: {stale_days}.")
+    manifest = CacheManifest()
+    stale_before = datetime.now() - timedelta(days=stale_days) if stale_days > 0 else None
+
+    for entity, stats in sorted(manifest.report(stale_before).items()):
+        log.info(f"Cache [{entity}]: entities {stats['entities']}, files {stats['files']}, "
+                 f"size {stats['size']}, failed {stats['failed']}, stale {stats['stale']}.")
+    for entity, entity_id, page_key, http_status in manifest.failed():
+        log.info(f"Failed page: [{entity}/{entity_id}/{page_key}], HTTP status: {http_status}.")
+    manifest.close()
+
+
+def execute_scrapers_list():
+    """Log the registered scrapers (built-in and from the entry points) with their settings, the scrapers
+    aren't loaded."""
+    for name in SCRAPERS.names():
+        default: str = " (default)" if name in DEFAULT_SCRAPERS else ""
+        log.info(f"Scraper: {name}{default}, {source_settings(name)}.")
+
+
+def execute_cache_dedup(dry_run: bool = False):
+    log.debug("execute_cache_dedup(): deduplicating raw files cache.")
+    if dry_run:  # dry run mode - won't do anything!
+        log.warning("Dry run mode is on! Cache won't be deduplicated.")
+        return
+
+    manifest = CacheManifest()
+    if manifest.count() == 0:  # no manifest yet - build it from the disk
+        rebuild_manifest_from_disk(manifest)
+    dedup_cache(manifest, BlobStore())
+    manifest.close()
+
+
+def execute_runs_diff(scraper_name: str, old_run: str = "", new_run: str = "", output: str = ""):
+    """Diff of two cached runs of the scraper (by default - the last two runs). Changes are written into
+    the output file (JSON lines) or into the log."""
+    log.debug(f"execute_runs_diff(): diff of the scraper [{scraper_name}] runs.")
+    if not old_run or not new_run:  # the last two runs of the scraper
+        runs = ScraperCache().runs(scraper_name)
+        if len(runs) < 2:  # fail-fast - nothing to compare
+            raise ScraperException(f"Scraper [{scraper_name}] has less than two cached runs!")
+        old_run, new_run = old_run or runs[-2].path, new_run or runs[-1].path
+
+    changes = diff_runs(old_run, new_run)
+    if output:
+        with open(output, mode="w", encoding=Config().encoding) as out_file:
+            for change in changes:
+                out_file.write(json.dumps(asdict(change), ensure_ascii=False) + "\n")
+        log.info(f"Runs diff is written into the file [{output}].")
+    else:
+        for change in changes:
+            log.info(f"Ship {change.kind}: {change.key}, changes: {change.changes}.")
+
+
 if __name__ == "__main__":
     print(MSG_MODULE_ISNT_RUNNABLE)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Scrapers Registry Module. Scrapers are registered by the source name with the import target
+    ('module:Class') and imported on the first use only - the scraper modules (and their heavy
+    dependencies: BeautifulSoup, requests, openpyxl etc.) aren't loaded by the lightweight commands.
+    Built-in scrapers - the lazy import table below, additional scrapers - the package entry points
+    of the group 'wfleet.scraper.scrapers' (name = module:Class), built-in names can't be overridden.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import logging
+import importlib
+from typing import Dict, List, Optional, Tuple, Type
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+SCRAPERS_ENTRY_POINTS_GROUP: str = "wfleet.scraper.scrapers"
+
+# built-in scrapers: source name -> import target (module:class)
+BUILTIN_SCRAPERS: Dict[str, str] = {
+    "clarksonsnet": "wfleet.scraper.engine.scrapers.scraper_clarksonsnet:ClarksonsNetScraper",
+    "gims": "wfleet.scraper.engine.scrapers.scraper_gims:GimsRuScraper",
+    "rivregru": "wfleet.scraper.engine.scrapers.scraper_rivregru:RivRegRuScraper",
+    "morflotru": "wfleet.scraper.engine.scrapers.scraper_morflotru:MorflotRuScraper",
+    "marinetrafficcom": "wfleet.scraper.engine.scrapers.scraper_marinetrafficcom:MarineTrafficComScraper",
+    "vesselfindercom": "wfleet.scraper.engine.scrapers.scraper_vesselfindercom:VesselFinderComScraper",
+    "rsclassorg": "wfleet.scraper.engine.scrapers.scraper_rsclassorg:RsClassOrgScraper",
+    "seaweb": "wfleet.scraper.engine.scrapers.seaweb.seaweb:SeawebScraper",
+}
+# scrapers of the 'scrap all data' run (in the order of execution), Seaweb has the separate commands
+DEFAULT_SCRAPERS: Tuple[str, ...] = ("clarksonsnet", "gims", "rivregru", "morflotru", "marinetrafficcom",
+                                     "vesselfindercom", "rsclassorg")
+
+
+class ScraperRegistry:
+    """Registry of the scrapers by the source name, scraper classes are imported on the first use."""
+
+    def __init__(self, targets: Optional[Dict[str, str]] = None,
+                 group: str = SCRAPERS_ENTRY_POINTS_GROUP) -> None:
+        self.__targets: Dict[str, str] = dict(BUILTIN_SCRAPERS if targets is None else targets)
+        self.__classes: Dict[str, type] = dict()
+        self.__group: str = group
+        self.__plugins_loaded: bool = False
+
+    def __load_plugins(self) -> None:
+        """Scrapers from the package entry points (once, on demand - metadata scan isn't free)."""
+        if self.__plugins_loaded:
+            return
+        self.__plugins_loaded = True
+        from importlib.metadata import entry_points  # isn't cheap to import - only when plugins are needed
+        points = entry_points()
+        # python 3.10+ - select(), older versions - dictionary
+        selected = points.select(group=self.__group) if hasattr(points, "select") else \
+            points.get(self.__group, ())
+        for point in selected:
+            if point.name in self.__targets:
+                log.warning(f"Scraper [{point.name}] from the entry point [{point.value}] is ignored - "
+                            f"already registered as [{self.__targets[point.name]}].")
+                continue
+            self.__targets[point.name] = point.value
+
+    def register(self, name: str, target: str) -> None:
+        """Register scraper by the import target (module:Class)."""
+        if not name or ":" not in target:  # fail-fast - wrong registration
+            raise ScraperException(f"Wrong scraper registration: [{name}] -> [{target}]!")
+        self.__targets[name] = target
+        self.__classes.pop(name, None)
+
+    def names(self) -> List[str]:
+        """Names of all registered scrapers (built-in and from the entry points), nothing is imported."""
+        self.__load_plugins()
+        return list(self.__targets)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self.__classes
+
+    def get(self, name: str) -> Type:
+        """Scraper class by the name, its module is imported on the first call."""
+        scraper_class: Optional[type] = self.__classes.get(name)
+        if scraper_class is not None:
+            return scraper_class
+        if name not in self.__targets:  # not built-in - may be a plugin
+            self.__load_plugins()
+        if name not in self.__targets:  # fail-fast - unknown scraper
+            raise ScraperException(f"Unknown scraper [{name}], registered: {self.names()}!")
+
+        module_name, _, class_name = self.__targets[name].partition(":")
+        log.debug(f"Loading scraper [{name}] from [{module_name}].")
+        scraper_class = getattr(importlib.import_module(module_name), class_name)
+        self.__classes[name] = scraper_class
+        return scraper_class
+
+    def create(self, name: str):
+        """New scraper instance by the name."""
+        return self.get(name)()
+
+
+SCRAPERS: ScraperRegistry = ScraperRegistry()  # scrapers registry instance
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
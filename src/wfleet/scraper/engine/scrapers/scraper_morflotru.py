@@ -12,83 +12,64 @@
       - (direct link to excel - 11.06.2021) https://morflot.gov.ru/files/docslist/3926-5792-ts_razdel_3+.xlsx
 
     Created:  Dmitrii Gusev, 29.05.2021
-    Modified: Dmitrii Gusev, 28.03.2021
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
 import logging
-import warnings
-from openpyxl import load_workbook
-from typing import List
+from typing import Dict, Iterator, Optional
 from datetime import datetime
 from wfleet.scraper.utils.utilities_http import perform_file_download_over_http
-from wfleet.scraper.utils.utilities_xls import process_scraper_dry_run, save_ships_2_excel
+from wfleet.scraper.utils.utilities_xls import process_scraper_dry_run, read_ships_from_workbook
 from wfleet.scraper.engine.scraper_abstract import ScraperAbstractClass, SCRAPE_RESULT_OK
 from wfleet.scraper.config.scraper_config import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.cache.scraper_cache import cache_get_raw_dir
+from wfleet.scraper.engine.sinks import write_ships
+from wfleet.scraper.config.scraper_settings import source_settings
 from wfleet.scraper.entities.ship import ShipDto
 
-# todo: implement unit tests for this module!
 # todo: implement search for new excel file on the page above (see above marker -> *)
 # todo: implement processing 'not found' situation (HTTP 404)
 
+SYSTEM_MORFLOTRU = "scraper_morflotru"  # source system name (used for the cache dirs)
+
 # direct URL to excel file
 # MORFLOT_DATA_URL = 'http://morflot.gov.ru/files/docslist/3926-6154-ts_razdel_3.xlsx'
 # MORFLOT_DATA_URL = 'http://morflot.gov.ru/files/docslist/3926-5792-ts_razdel_3+.xlsx'
 MORFLOT_DATA_URL = "http://morflot.gov.ru/files/docslist/3926-4267-ts_razdel_3+.xlsx"
 
+# raw data excel file layout: header rows number and columns map (ship field -> column number)
+MORFLOT_HEADER_ROWS: int = 2
+MORFLOT_COLUMNS: Dict[str, int] = {
+    "main_name": 4,
+    "project": 5,
+    "imo_number": 6,
+    "proprietary_number1": 7,
+    "proprietary_number2": 8,
+    "home_port": 9,
+    "owner": 10,
+    "owner_address": 11,
+    "owner_ogrn": 12,
+    "owner_ogrn_date": 13,
+}
+
 # module logging setup
-# log = logging.getLogger(const.SYSTEM_MORFLOTRU)
 log = logging.getLogger(__name__)
 log.debug(f"Logging for module {__name__} is configured.")
 
 
-def parse_raw_data(raw_data_file: str) -> List[ShipDto]:
-    """Parse raw data excel file and return list of ShipDto objects.
-    :param raw_data_file:
-    :return:
+def parse_raw_data(raw_data_file: str, timestamp: Optional[datetime] = None) -> Iterator[ShipDto]:
+    """Parse raw data excel file (streaming) and return iterator of ShipDto objects.
+    :param raw_data_file: raw data excel file
+    :param timestamp: ships timestamp (scraper run timestamp)
+    :return: ships iterator
     """
     log.debug(f"Parsing RAW Morflot data: {raw_data_file}")
 
     if raw_data_file is None or len(raw_data_file.strip()) == 0:
         raise ValueError("Provided empty path to raw data!")
 
-    result: List[ShipDto] = list()
-
-    wb = load_workbook(filename=raw_data_file)
-    sheet = wb.active
-
-    counter = 0
-    for i in range(3, sheet.max_row):  # index rows/cols starts with 1, skip the first 2 rows (header)
-
-        # get base key (identity) data for the ship
-        imo_number: str = sheet.cell(row=i, column=6).value
-        proprietary_number1: str = sheet.cell(row=i, column=7).value
-        proprietary_number2: str = sheet.cell(row=i, column=8).value
-
-        # skip empty row (won't create empty ship)
-        if imo_number is None and proprietary_number1 is None and proprietary_number2 is None:
-            # todo: implement counter for empty rows and report it - too much output!
-            log.debug(f"Skipping empty row...")
-            continue
-
-        # create new ship object
-        ship: ShipDto = ShipDto(imo_number, proprietary_number1, proprietary_number2, SYSTEM_MORFLOTRU)
-
-        # additional ship info
-        ship.main_name = sheet.cell(row=i, column=4).value
-        ship.home_port = sheet.cell(row=i, column=9).value
-        ship.project = sheet.cell(row=i, column=5).value
-        ship.owner = sheet.cell(row=i, column=10).value
-        ship.owner_address = sheet.cell(row=i, column=11).value
-        ship.owner_ogrn = sheet.cell(row=i, column=12).value
-        ship.owner_ogrn_date = sheet.cell(row=i, column=13).value
-
-        counter += 1  # increase counter
-        log.debug(f"Ship #{counter}: {ship}")
-
-        # add ship to the list
-        result.append(ship)
-
-    return result
+    return read_ships_from_workbook(raw_data_file, MORFLOT_COLUMNS, SYSTEM_MORFLOTRU, MORFLOT_HEADER_ROWS,
+                                    timestamp)
 
 
 class MorflotRuScraper(ScraperAbstractClass):
@@ -97,27 +78,25 @@ class MorflotRuScraper(ScraperAbstractClass):
     def __init__(self):
         log.info("MorflotRuScraper: initializing.")
 
-    def scrap(self, dtimestamp: datetime, dry_run: bool, requests_limit: int = 0):
+    def scrap(self, timestamp: datetime, dry_run: bool, requests_limit: int = 0):
         """Morflot data scraper."""
         log.info("scrap(): processing morflot.ru")
 
-        # not implemented warning
-        warnings.warn("This module is not implemented yet!", Warning, stacklevel=2)
-
-        if dry_run:  # dry run mode - won't do anything!
+        if dry_run:  # dry run mode - only empty data file in the dry run dir
+            process_scraper_dry_run(SYSTEM_MORFLOTRU)
             return SCRAPE_RESULT_OK
 
-        # # generate scraper cache directory path
-        # scraper_cache_dir: str = self.cache_path + "/" + generate_timed_filename(self.source_name)
-        # # download raw data file
-        # downloaded_file: str = perform_file_download_over_http(MORFLOT_DATA_URL, scraper_cache_dir)
-        # self.log.info(f"Downloaded raw data file: {downloaded_file}")
-        # # parse raw data into list of ShipDto objects
-        # ships: List[ShipDto] = parse_raw_data(downloaded_file)
-        # self.log.info(f"Parsed row data and found {len(ships)} ship(s).")
-        # excel_file: str = scraper_cache_dir + "/" + const.EXCEL_SHIPS_DATA
-        # save_ships_2_excel(ships, excel_file)
-        # self.log.info(f"Found ships saved into {excel_file} file.")
+        # scraper cache run directory path
+        raw_dir: str = cache_get_raw_dir(SYSTEM_MORFLOTRU, timestamp, dry_run, requests_limit)
+        # download raw data file
+        timeout: Optional[float] = source_settings("morflotru").http_timeout
+        downloaded_file: str = perform_file_download_over_http(MORFLOT_DATA_URL, raw_dir, timeout=timeout)
+        log.info(f"Downloaded raw data file: {downloaded_file}")
+        # parse raw data into ShipDto objects and write them into the sinks (streaming, by batches)
+        with self.open_sink(raw_dir) as sink:
+            count: int = write_ships(sink, parse_raw_data(downloaded_file, timestamp),
+                                     source_settings("morflotru").batch_size)
+        log.info(f"Found {count} ship(s), saved into the run dir {raw_dir}.")
 
         return SCRAPE_RESULT_OK
 
@@ -10,76 +10,54 @@
       - (excel direct link) https://www.rivreg.ru/assets/Uploads/Registrovaya-kniga3.xlsx
 
     Created:  Gusev Dmitrii, 04.05.2021
-    Modified: Dmitrii Gusev, 28.03.2021
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
 import logging
-import warnings
-from openpyxl import load_workbook
-from typing import List
+from typing import Dict, Iterator, Optional
 from datetime import datetime
 from wfleet.scraper.utils.utilities_http import perform_file_download_over_http
-from wfleet.scraper.utils.utilities_xls import process_scraper_dry_run, save_ships_2_excel
+from wfleet.scraper.utils.utilities_xls import process_scraper_dry_run, read_ships_from_workbook
 from wfleet.scraper.engine.scraper_abstract import ScraperAbstractClass, SCRAPE_RESULT_OK
 from wfleet.scraper.config.scraper_config import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.cache.scraper_cache import cache_get_raw_dir
+from wfleet.scraper.engine.sinks import write_ships
+from wfleet.scraper.config.scraper_settings import source_settings
 from wfleet.scraper.entities.ship import ShipDto
 
-# todo: implement the module content (scraping)!
-# todo: implement unit tests for this module!
-
+SYSTEM_RIVREGRU = "scraper_rivregru"  # source system name (used for the cache dirs)
 RIVER_REG_BOOK_URL = "https://www.rivreg.ru/assets/Uploads/Registrovaya-kniga3.xlsx"
 
+# raw data excel file layout: header rows number and columns map (ship field -> column number)
+RIVREG_HEADER_ROWS: int = 1
+RIVREG_COLUMNS: Dict[str, int] = {
+    "proprietary_number1": 1,
+    "main_name": 2,
+    "build_number": 3,
+    "project": 4,
+    "ship_type": 5,
+    "build_date": 6,
+    "build_place": 7,
+}
+
 # module logging setup
 log = logging.getLogger(__name__)
 log.debug(f"Logging for module {__name__} is configured.")
 
 
-def parse_raw_data(raw_data_file: str) -> List[ShipDto]:
-    """Parse raw data excel file from River Register web-site and return list of ShipDto objects.
-    :param raw_data_file:
-    :return:
+def parse_raw_data(raw_data_file: str, timestamp: Optional[datetime] = None) -> Iterator[ShipDto]:
+    """Parse raw data excel file from River Register web-site (streaming), return iterator of ShipDto objects.
+    :param raw_data_file: raw data excel file
+    :param timestamp: ships timestamp (scraper run timestamp)
+    :return: ships iterator
     """
     log.debug(f"Parsing RAW River Register data: {raw_data_file}")
 
     if raw_data_file is None or len(raw_data_file.strip()) == 0:
         raise ValueError("Provided empty path to raw data!")
 
-    result: List[ShipDto] = list()
-
-    wb = load_workbook(filename=raw_data_file)
-    sheet = wb.active
-
-    counter = 0
-    for i in range(2, sheet.max_row):  # index rows/cols starts with 1, skip the first row (header)
-
-        # get base key (identity) data for the ship
-        imo_number: str = ""
-        proprietary_number1: str = sheet.cell(row=i, column=1).value
-        proprietary_number2: str = ""
-
-        # skip empty row (won't create empty ship)
-        if imo_number is None and proprietary_number1 is None and proprietary_number2 is None:
-            log.debug("Skipping empty row...")
-            continue
-
-        # create new ship object
-        ship: ShipDto = ShipDto(imo_number, proprietary_number1, proprietary_number2, SYSTEM_RIVREGRU)
-
-        # additional ship info
-        ship.main_name = sheet.cell(row=i, column=2).value
-        ship.project = sheet.cell(row=i, column=4).value
-        ship.build_number = sheet.cell(row=i, column=3).value
-        ship.ship_type = sheet.cell(row=i, column=5).value
-        ship.build_date = sheet.cell(row=i, column=6).value
-        ship.build_place = sheet.cell(row=i, column=7).value
-
-        counter += 1  # increase counter
-        log.debug(f"Ship #{counter}: {ship}")
-
-        # add ship to the list
-        result.append(ship)
-
-    return result
+    return read_ships_from_workbook(raw_data_file, RIVREG_COLUMNS, SYSTEM_RIVREGRU, RIVREG_HEADER_ROWS,
+                                    timestamp)
 
 
 class RivRegRuScraper(ScraperAbstractClass):
@@ -92,23 +70,21 @@ class RivRegRuScraper(ScraperAbstractClass):
         """River Register data scraper."""
         log.info("scrap(): processing rivreg.ru")
 
-        # not implemented warning
-        warnings.warn("This module is not implemented yet!", Warning, stacklevel=2)
-
-        if dry_run:  # dry run mode - won't do anything!
+        if dry_run:  # dry run mode - only empty data file in the dry run dir
+            process_scraper_dry_run(SYSTEM_RIVREGRU)
             return SCRAPE_RESULT_OK
 
-        # # generate scraper cache directory path
-        # scraper_cache_dir: str = self.cache_path + "/" + generate_timed_filename(self.source_name)
-        # # download raw data file
-        # downloaded_file: str = perform_file_download_over_http(RIVER_REG_BOOK_URL, scraper_cache_dir)
-        # log.info(f"Downloaded raw data file: {downloaded_file}")
-        # # parse raw data into list of ShipDto objects
-        # ships: List[ShipDto] = parse_raw_data(downloaded_file)
-        # log.info(f"Parsed row data and found {len(ships)} ship(s).")
-        # excel_file: str = scraper_cache_dir + "/" + const.EXCEL_SHIPS_DATA
-        # save_ships_2_excel(ships, excel_file)
-        # log.info(f"Found ships saved into {excel_file} file.")
+        # scraper cache run directory path
+        raw_dir: str = cache_get_raw_dir(SYSTEM_RIVREGRU, timestamp, dry_run, requests_limit)
+        # download raw data file
+        timeout: Optional[float] = source_settings("rivregru").http_timeout
+        downloaded_file: str = perform_file_download_over_http(RIVER_REG_BOOK_URL, raw_dir, timeout=timeout)
+        log.info(f"Downloaded raw data file: {downloaded_file}")
+        # parse raw data into ShipDto objects and write them into the sinks (streaming, by batches)
+        with self.open_sink(raw_dir) as sink:
+            count: int = write_ships(sink, parse_raw_data(downloaded_file, timestamp),
+                                     source_settings("rivregru").batch_size)
+        log.info(f"Found {count} ship(s), saved into the run dir {raw_dir}.")
 
         return SCRAPE_RESULT_OK
 
@@ -116,4 +92,3 @@ class RivRegRuScraper(ScraperAbstractClass):
 # main part of the script
 if __name__ == "__main__":
     print(MSG_MODULE_ISNT_RUNNABLE)
-    # parse_raw_data("../cache/02-Jun-2021_17-02-54-scraper_riveregru/Registrovaya-kniga3.xlsx")
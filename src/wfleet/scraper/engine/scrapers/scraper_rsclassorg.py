@@ -9,7 +9,7 @@
       - ???
 
     Created:  Gusev Dmitrii, 10.01.2021
-    Modified: Gusev Dmitrii, 24.04.2022
+    Modified: Gusev Dmitrii, 19.10.2026
 """
 
 import sys
@@ -18,28 +18,26 @@ import logging
 import requests
 import threading
 from datetime import datetime
+from typing import Callable, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
 
 from wfleet.scraper.utils.utilities import build_variations_list
-from wfleet.scraper.utils.utilities_xls import save_ships_2_excel
-from wfleet.scraper.utils.utilities_http import perform_http_post_request
+from wfleet.scraper.utils.utilities_http import perform_http_post_request, RateLimiter
+from wfleet.scraper.config.scraper_settings import SourceSettings, source_settings
 from wfleet.scraper.config.scraper_config import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.cache.scraper_cache import cache_get_raw_dir
 from wfleet.scraper.engine.scraper_abstract import ScraperAbstractClass, SCRAPE_RESULT_OK
 from wfleet.scraper.entities.ship import ShipDto
 
 # todo: implement unit tests for this module!
 
 # useful constants / configuration
+SYSTEM_RSCLASSORG = "scraper_rsclassorg"  # source system name (used for the cache dirs)
+SOURCE_RSCLASSORG = "rsclassorg"  # source name (scraper registry, settings)
 MAIN_URL = "https://lk.rs-class.org/regbook/regbookVessel?ln=ru"
 ERROR_OVER_1000_RECORDS = "Результат запроса более 1000 записей! Уточните параметры запроса"
 
-# 10 workers -> 650 sec on my Mac
-# 20 workers -> 409 sec on my Mac
-# 40 workers -> 323 sec on my Mac
-# 100 workers -> 304 sec on my Mac
-WORKERS_COUNT = 30  # workers (threads) count for multi-threaded scraping
-
 # module logging setup
 log = logging.getLogger(__name__)
 log.debug(f"Logging for module {__name__} is configured.")
@@ -90,16 +88,14 @@ def parse_data(html: str) -> dict:
                 imo_number = cells[5].text  # get tag content (text value)
                 proprietary_number = cells[4].text  # get tag content (text value)
 
-                # create base ship class instance
-                ship: ShipDto = ShipDto(imo_number, proprietary_number, "", SYSTEM_RSCLASSORG)
-
-                # fill in the main value for base ship
-                ship.flag = cells[0].img["title"]  # get attribute 'title' of tag <img>
-                ship.main_name = cells[1].contents[0]  # get 0 element fro the cell content
-                ship.secondary_name = cells[1].div.text  # get value of the tag <div> inside the cell
-                ship.home_port = cells[2].text  # get tag content (text value)
-                ship.call_sign = cells[3].text  # get tag content (text value)
-                ship.extended_info_url = "-"  # todo: implement parsing this value
+                # create base ship class instance with the main values (categorical values are interned)
+                ship: ShipDto = ShipDto(imo_number, proprietary_number, "", SYSTEM_RSCLASSORG,
+                                        flag=cells[0].img["title"],  # get attribute 'title' of tag <img>
+                                        main_name=str(cells[1].contents[0]),  # 0 element fro the cell content
+                                        secondary_name=cells[1].div.text,  # value of the <div> in the cell
+                                        home_port=cells[2].text,  # get tag content (text value)
+                                        call_sign=cells[3].text,  # get tag content (text value)
+                                        extended_info_url="-")  # todo: implement parsing this value
 
                 # put ship into dictionary
                 ships_dict[(imo_number, proprietary_number)] = ship
@@ -108,23 +104,42 @@ def parse_data(html: str) -> dict:
 
 
 def perform_one_request(
-    search_string: str,
+    search_string: str, settings: Optional[SourceSettings] = None, rate_limiter: Optional[RateLimiter] = None
 ) -> dict:  # todo: this method is needed for multi-threading - refactor
     """Perform one request to RSCLASS.ORG and parse the output.
     :param search_string:
+    :param settings: source settings (retries, timeout), default - settings of the rs-class.org source
+    :param rate_limiter: requests rate limiter, None - no limit
     :return:
     """
-    ships = parse_data(perform_http_post_request(MAIN_URL, {"namer": search_string}, retry_count=5))
+    settings = settings if settings else source_settings(SOURCE_RSCLASSORG)
+    ships = parse_data(perform_http_post_request(MAIN_URL, {"namer": search_string},
+                                                 retry_count=settings.retries, timeout=settings.http_timeout,
+                                                 rate_limiter=rate_limiter))
     log.info("Found ship(s): {}, search string: {}".format(len(ships), search_string))
     return ships
 
 
+def _update_ships(local_ships: dict, ships: dict,
+                  on_batch: Optional[Callable[[List[ShipDto]], None]]) -> None:
+    """Update found ships dictionary, newly found ships (by key) are passed to the batch callback."""
+    if on_batch is not None:
+        new_ships: List[ShipDto] = [ship for key, ship in ships.items() if key not in local_ships]
+        if new_ships:
+            on_batch(new_ships)
+    local_ships.update(ships)
+
+
 # todo: merge single-threaded with multi-threaded processing?
-def perform_ships_base_search_single_thread(symbols_variations: list, requests_limit: int = 0) -> dict:
+def perform_ships_base_search_single_thread(symbols_variations: list, requests_limit: int = 0,
+                                            on_batch: Optional[Callable[[List[ShipDto]], None]] = None,
+                                            settings: Optional[SourceSettings] = None) -> dict:
     """Process list of strings for the search in single thread.
     :param symbols_variations: symbols variations for search
     :param requests_limit: limit for performed HTTP requests to the source system, default = 0 (no limit).
             Any value <= 0 - no limit.
+    :param on_batch: callback for the newly found ships (called as they are found, e.g. sink writer)
+    :param settings: source settings (retries, timeout, rate), default - settings of the rs-class.org source
     :return: ships dictionary for the given list of symbols variations
     """
     log.debug(
@@ -134,6 +149,8 @@ def perform_ships_base_search_single_thread(symbols_variations: list, requests_l
     if symbols_variations is None or not isinstance(symbols_variations, list):
         raise ValueError(f"Provided empty list [{symbols_variations}] or it isn't a list!")
 
+    settings = settings if settings else source_settings(SOURCE_RSCLASSORG)
+    rate_limiter: RateLimiter = RateLimiter(settings.rate_limit)
     local_ships = {}  # result of the ships search
     counter = 1
 
@@ -141,10 +158,8 @@ def perform_ships_base_search_single_thread(symbols_variations: list, requests_l
 
     for search_string in symbols_variations:
         log.debug(f"Currently processing: {search_string} ({counter} out of {variations_length})")
-        ships = parse_data(
-            perform_http_post_request(MAIN_URL, {"namer": search_string})
-        )  # HTTP request for base data
-        local_ships.update(ships)  # update main dictionary with found data
+        ships = perform_one_request(search_string, settings, rate_limiter)  # HTTP request for base data
+        _update_ships(local_ships, ships, on_batch)  # update main dictionary with found data
         log.info(f"Found ship(s): {len(ships)}, total: {len(local_ships)}, search string: {search_string}")
 
         if 0 < requests_limit <= counter:  # in case limit is set - use it
@@ -156,13 +171,16 @@ def perform_ships_base_search_single_thread(symbols_variations: list, requests_l
 
 
 def perform_ships_base_search_multiple_threads(
-    symbols_variations: list, workers_count: int, requests_limit: int = 0
+    symbols_variations: list, workers_count: int, requests_limit: int = 0,
+    on_batch: Optional[Callable[[List[ShipDto]], None]] = None, settings: Optional[SourceSettings] = None
 ) -> dict:
     """Process list of strings for the search in multiple threads.
     :param symbols_variations: symbols variations for search
     :param workers_count: number of threads for multi-threaded processing
     :param requests_limit: limit for performed HTTP requests to the source system, default = 0 (no limit).
             Any value <= 0 - no limit.
+    :param on_batch: callback for the newly found ships (called as they are found, e.g. sink writer)
+    :param settings: source settings (retries, timeout, rate), default - settings of the rs-class.org source
     :return: ships dictionary for the given list of symbols variations
     """
     log.debug("perform_ships_base_search_multiple_threads(): perform multi-threaded search.")
@@ -175,13 +193,15 @@ def perform_ships_base_search_multiple_threads(
     if workers_count < 2:  # fail-fast - check workers count
         raise ValueError("Provided workers count < 2, use single-threaded function!")
 
+    settings = settings if settings else source_settings(SOURCE_RSCLASSORG)
+    rate_limiter: RateLimiter = RateLimiter(settings.rate_limit)  # shared by all threads
     local_ships = {}  # result of the ships search
 
     # run processing in multiple threads
     with ThreadPoolExecutor(max_workers=workers_count) as executor:
         counter = 1
         for symbol in symbols_variations:
-            future = executor.submit(perform_one_request, symbol)
+            future = executor.submit(perform_one_request, symbol, settings, rate_limiter)
             futures.append(future)
 
             if 0 < requests_limit <= counter:  # in case limit is set - use it
@@ -197,7 +217,7 @@ def perform_ships_base_search_multiple_threads(
         # option #2: iterate over completed threads and get results
         for task in as_completed(futures):
             result = task.result()
-            local_ships.update(result)
+            _update_ships(local_ships, result, on_batch)
 
         log.info(f"Found total ships: {len(local_ships)}.")
 
@@ -219,51 +239,46 @@ class RsClassOrgScraper(ScraperAbstractClass):
             return SCRAPE_RESULT_OK
 
         main_ships: dict = {}  # ships search result
+        settings: SourceSettings = source_settings(SOURCE_RSCLASSORG)  # workers, retries, timeout, rate
 
         # build list of variations for search strings + measure time
         start_time = time.time()  # todo: replace with decorator measurements
         variations = build_variations_list()
         log.debug(f"Built variations [{len(variations)}] in {time.time() - start_time} second(s).")
 
-        try:
-            # process all generated variations strings + measure time - multi-/single-threaded processing
-            start_time = time.time()
-            if WORKERS_COUNT <= 1:  # single-threaded processing
-                log.info("Processing mode: [SINGLE THREADED].")
-                main_ships.update(
-                    perform_ships_base_search_single_thread(variations, requests_limit=requests_limit)
-                )
-            else:
-                log.info("Processing mode: [MULTI THREADED].")
-                main_ships.update(
-                    perform_ships_base_search_multiple_threads(
-                        variations,
-                        workers_count=WORKERS_COUNT,
-                        requests_limit=requests_limit,
+        # found ships are written into the sinks in the scraper cache dir as they are found (run dir is
+        # marked appropriately in case of the requests limited run)
+        raw_dir: str = cache_get_raw_dir(SYSTEM_RSCLASSORG, timestamp, dry_run, requests_limit)
+        with self.open_sink(raw_dir) as sink:
+            try:
+                # process all generated variations strings + measure time - multi-/single-threaded processing
+                start_time = time.time()
+                if settings.workers <= 1:  # single-threaded processing
+                    log.info("Processing mode: [SINGLE THREADED].")
+                    main_ships.update(
+                        perform_ships_base_search_single_thread(variations, requests_limit=requests_limit,
+                                                                on_batch=sink.write_batch, settings=settings)
+                    )
+                else:
+                    log.info("Processing mode: [MULTI THREADED].")
+                    main_ships.update(
+                        perform_ships_base_search_multiple_threads(
+                            variations,
+                            workers_count=settings.workers,
+                            requests_limit=requests_limit,
+                            on_batch=sink.write_batch,
+                            settings=settings,
+                        )
                     )
-                )
-            scrap_duration = time.time() - start_time
-            log.info(f"Found total ship(s): {len(main_ships)} in {scrap_duration} seconds.")
-        except ValueError as err:  # value error
-            return f"Value error: {err}"
-        except Exception:  # default case - any unexpected error
-            print("Unexpected error:", sys.exc_info()[0])
-            raise
-
-        # path to cache directory for the current scraper run
-        # todo: replace with cache management module
-        if requests_limit > 0:  # mark limited run directory appropriately
-            suffix = self.source_name + SCRAPER_CACHE_LIMITED_RUN_DIR_SUFFIX
-        else:
-            suffix = self.source_name
-            
-        xls_path: str = self.cache_path + "/" + generate_timed_filename(suffix) + "/"
-
-        # save ships info into the raw data file in the scraper cache dir
-        xls_base_file = xls_path + EXCEL_SHIPS_DATA
-        
-        save_ships_2_excel(list(main_ships.values()), xls_base_file)
-        log.info(f"Saved ships info to file {xls_base_file}")
+                scrap_duration = time.time() - start_time
+                log.info(f"Found total ship(s): {len(main_ships)} in {scrap_duration} seconds.")
+            except ValueError as err:  # value error
+                return f"Value error: {err}"
+            except Exception:  # default case - any unexpected error
+                print("Unexpected error:", sys.exc_info()[0])
+                raise
+
+        log.info(f"Saved ships info into the run dir {raw_dir}")
 
         return SCRAPE_RESULT_OK
 
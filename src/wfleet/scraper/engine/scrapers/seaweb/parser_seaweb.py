@@ -6,7 +6,7 @@
     Main data source address is https://maritime.ihs.com
 
     Created:  Gusev Dmitrii, 17.04.2022
-    Modified: Gusev Dmitrii, 29.05.2022
+    Modified: Gusev Dmitrii, 19.10.2026
 """
 
 import os
@@ -14,12 +14,14 @@ import logging
 from bs4 import BeautifulSoup
 from datetime import datetime
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
 
 from wfleet.scraper.entities.ship import ShipDto
 from wfleet.scraper.config.scraper_config import Config
 from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE, MSG_NOT_IMPLEMENTED
 from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
 from wfleet.scraper.utils.utilities import get_last_part_of_the_url, read_file_as_text
+from wfleet.scraper.cache.cache_manifest import CacheManifest, MANIFEST_ENTITY_SHIP
 
 EMPTY_HTML_MSG: str = "Empty HTML text for parsing!"
 
@@ -159,15 +161,50 @@ def _parse_ship_xxx9(html_text: str) -> dict[str, str]:
     raise NotImplementedError(MSG_NOT_IMPLEMENTED)
 
 
-def parse_one_ship(ship_dir: str) -> ShipDto:
+def _parse_ship_panel(html_text: str, page_key: str) -> dict[str, str]:
+    """Parse ship data panel (key/value rows, as on the main page) into the dictionary, keys are
+    prefixed by the panel page key (panels data isn't mapped to the ShipDto fields yet)."""
+
+    if not html_text:  # fail-fast behaviour
+        raise ScraperException(EMPTY_HTML_MSG)
+
+    soup = BeautifulSoup(html_text, "html.parser")  # parser
+    panel_data: dict[str, str] = dict()
+    for row in soup.find_all("div", class_="col-sm-12 col-md-6 col-lg-6"):  # data rows
+        key = row.find("div", class_="col-4 keytext")
+        value = row.find("div", class_=["col-8 valuetext", "col-8 valuetext alert_red"])
+        if key is not None and value is not None:
+            panel_data[f"{page_key}: {key.text.strip()}"] = value.text.strip()
+
+    return panel_data
+
+
+# ship data panels (page key -> panel parser), parsed after the main page
+SHIP_PANELS_PARSERS: Dict[str, Callable[[str, str], dict[str, str]]] = {
+    "ro_ro": _parse_ship_panel,
+    "hatches": _parse_ship_panel,
+    "tanks": _parse_ship_panel,
+}
+
+
+def parse_one_ship(ship_dir: str, manifest: Optional[CacheManifest] = None) -> ShipDto:
+    """Parse ship from the raw pages in the ship dir. If the cache manifest is provided - ship panels
+    with the known 'empty' content hash aren't read and parsed."""
     log.debug(f"parse_one_ship(): parsing ship [{ship_dir}].")
 
     # read and parse main ship data
     text: str = read_file_as_text(ship_dir + "/" + config.main_ship_data_file)
     ship_dict = _parse_ship_main(text)
 
-    # read XXX data
-    # todo: implement!
+    # read and parse ship data panels, skip the known empty ones and not fetched ones
+    empty_pages: Set[str] = manifest.empty_pages(MANIFEST_ENTITY_SHIP, Path(ship_dir).name) \
+        if manifest is not None else set()
+    for page_key, parser in SHIP_PANELS_PARSERS.items():
+        panel_file: str = ship_dir + "/" + page_key + ".html"
+        if page_key in empty_pages or not Path(panel_file).is_file():
+            log.debug(f"Skipped empty or missing panel [{page_key}] of the ship [{ship_dir}].")
+            continue
+        ship_dict.update(parser(read_file_as_text(panel_file), page_key))
 
     # build Ship object from dictionary
     ship = ShipDto.ship_from_dict(ship_dict)
@@ -176,7 +213,7 @@ def parse_one_ship(ship_dir: str) -> ShipDto:
     return ship
 
 
-def parse_all_ships(raw_ships_dir: str) -> list[ShipDto]:
+def parse_all_ships(raw_ships_dir: str, manifest: Optional[CacheManifest] = None) -> list[ShipDto]:
     log.debug(f"parse_all_ships(): parsing ships in [{raw_ships_dir}].")
 
     if raw_ships_dir is None:  # fail-fast - empty dir
@@ -186,7 +223,13 @@ def parse_all_ships(raw_ships_dir: str) -> list[ShipDto]:
     if not Path(raw_ships_dir).exists() or not Path(raw_ships_dir).is_dir():
         raise ValueError(f"Provided ships dir [{raw_ships_dir}] doesn't exist or not a dir!")
 
-    ships_dirs = os.listdir(raw_ships_dir)
+    ships_dirs: List[str]
+    if manifest is not None:  # cached ships (with the main page) - from the manifest, no dir listing,
+        page_key: str = os.path.splitext(config.main_ship_data_file)[0]  # known empty pages are skipped
+        ships_dirs = manifest.entity_ids(MANIFEST_ENTITY_SHIP, page_key=page_key,
+                                         exclude_hashes=manifest.empty_hashes())
+    else:
+        ships_dirs = os.listdir(raw_ships_dir)
     log.debug(f"Found total ships/directories: {len(ships_dirs)}.")
 
     ships_list: list[ShipDto] = list()
@@ -204,7 +247,7 @@ def parse_all_ships(raw_ships_dir: str) -> list[ShipDto]:
             log.warning(f"Skipped current number [{ship}].")
             continue
 
-        ships_list.append(parse_one_ship(ship_dir))
+        ships_list.append(parse_one_ship(ship_dir, manifest))
 
     return ships_list
 
@@ -6,25 +6,35 @@
     Main data source address is https://maritime.ihs.com
 
     Created:  Gusev Dmitrii, 03.04.2022
-    Modified: Gusev Dmitrii, 08.06.2022
+    Modified: Gusev Dmitrii, 19.10.2026
 """
 
-import os
 import logging
-import shutil
 from pathlib import Path
-from typing import Set, Dict
+from collections import deque
+from typing import Set, Dict, Deque, Optional, Tuple
 from wfleet.scraper.utils.utilities import read_file_as_text
 from wfleet.scraper.config.scraper_config import Config
-from wfleet.scraper.utils.utilities_http import WebClient, process_urls
+from wfleet.scraper.utils.utilities_http import WebClient, RateLimiter, process_urls
+from wfleet.scraper.config.scraper_settings import SourceSettings, source_settings
 from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
 from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
 from wfleet.scraper.utils.codes_engine import CodesProcessor, CodesProcessorFactory
+from wfleet.scraper.cache.cache_manifest import (CacheManifest, MANIFEST_ENTITY_SHIP,
+                                                 MANIFEST_ENTITY_SHIPCOMPANY, MANIFEST_ENTITY_SHIPBUILDER)
+from wfleet.scraper.cache.cache_blobs import BlobStore
 from wfleet.scraper.engine.scrapers.seaweb.parser_seaweb import _parse_ship_main
 
 log = logging.getLogger(__name__)
 log.debug(f"Logging for module {__name__} is configured.")
 
+# crawled entities types (the same as in the cache manifest)
+ENTITY_SHIP: str = MANIFEST_ENTITY_SHIP
+ENTITY_SHIPCOMPANY: str = MANIFEST_ENTITY_SHIPCOMPANY
+ENTITY_SHIPBUILDER: str = MANIFEST_ENTITY_SHIPBUILDER
+# number of frontier entities (companies/builders) processed after each ship
+FRONTIER_ENTITIES_PER_SHIP: int = 2
+
 # ship URLs for additional details
 ship_urls = {
     "ship_main": "https://maritime.ihs.com/Ships/Details/Index/",
@@ -137,7 +147,7 @@ session_headers = {
 
 
 def scrap_entity(web_client: WebClient, entity_dict: Dict[str, str],
-                 entity_id: str, entity_dir: str) -> None:
+                 entity_id: str, entity_dir: str, entity: str = '') -> None:
 
     log.debug(f'scrap_entity() is working. Dir: [{entity_dir}], ID: [{entity_id}].')
 
@@ -155,11 +165,11 @@ def scrap_entity(web_client: WebClient, entity_dict: Dict[str, str],
     processed_dict: Dict[str, str] = process_urls(entity_dict, postfix=entity_id)
 
     # download all urls by entity dictionary
-    web_client.get_text_2_files(processed_dict, entity_dir, True, True)
+    web_client.get_text_2_files(processed_dict, entity_dir, True, True, entity, entity_id)
 
 
 def scrap_entities(web_client: WebClient, entity_dict: Dict[str, str], entities_ids: Set[str],
-                   entities_dir: str, req_limit: int = 0) -> None:
+                   entities_dir: str, req_limit: int = 0, entity: str = '') -> None:
 
     log.debug('scrap_entities() is working.')
     # fail-fast checks
@@ -182,104 +192,190 @@ def scrap_entities(web_client: WebClient, entity_dict: Dict[str, str], entities_
         entity_dir: str = entities_dir + '/' + str(id)
         log.info(f'Processing: ID #{id} ({counter}/{ids_length}). Dir: [{entity_dir}].')
 
-        scrap_entity(web_client, entity_dict, id, entity_dir)
+        scrap_entity(web_client, entity_dict, id, entity_dir, entity)
 
     log.info(f'Processed IDs: {ids_length}.')
 
 
-def scrap_all(rebuild_codes: bool = False, delete_invalid: bool = False):
-    log.debug('scrap_all() is working.')
+class SeawebFrontier:
+    """Deduplicated frontier of Seaweb ship's companies and ship's builders codes. The frontier is
+    filled during the ships crawl (codes are extracted from each ship main page as soon as it is
+    fetched) and is processed alongside the ships."""
 
-    # get configuration class instance
+    def __init__(self, shipcompanies: CodesProcessor, shipbuilders: CodesProcessor) -> None:
+        log.debug('__init__(): initializing SeawebFrontier.')
+        if shipcompanies is None or shipbuilders is None:  # fail-fast for the missing codes processors
+            raise ScraperException('Provided empty codes processor(s)!')
+
+        # init internal state
+        self.__processors: Dict[str, CodesProcessor] = {
+            ENTITY_SHIPCOMPANY: shipcompanies,
+            ENTITY_SHIPBUILDER: shipbuilders,
+        }
+        self.__queue: Deque[Tuple[str, str]] = deque()  # pending entities: (entity type, code)
+        self.__seen: Set[Tuple[str, str]] = set()  # all entities ever pushed to the frontier
+
+    def push(self, entity: str, code: str) -> bool:
+        """Push entity code to the frontier, returns True if the code is new for the frontier."""
+        if entity not in self.__processors:
+            raise ScraperException(f'Unknown frontier entity type: [{entity}]!')
+
+        if not code or code == '-' or (entity, code) in self.__seen:  # empty or duplicate code
+            return False
+
+        self.__seen.add((entity, code))
+        self.__queue.append((entity, code))
+        if not self.__processors[entity].contains(code):  # persist newly discovered code
+            self.__processors[entity].add(code)
+            log.debug(f'Discovered new {entity} code: {code}.')
+
+        return True
+
+    def push_known(self) -> None:
+        """Seed the frontier with all already known codes (loaded from the codes files)."""
+        for entity, processor in self.__processors.items():
+            for code in sorted(processor.codes()):
+                self.push(entity, code)
+        log.debug(f'Frontier is seeded with known codes, pending: {len(self)}.')
+
+    def pop(self) -> Optional[Tuple[str, str]]:
+        """Pop the next pending entity (entity type, code) or None if the frontier is empty."""
+        if not self.__queue:
+            return None
+        return self.__queue.popleft()
+
+    def __len__(self) -> int:
+        return len(self.__queue)
+
+
+def _extract_ship_frontier_codes(ship_id: str, ship_dir: str, frontier: SeawebFrontier) -> bool:
+    """Extract ship operator and ship builder codes from the just fetched ship main page and put
+    them into the frontier, returns True if the ship data is found."""
+
+    ship_main_file: str = ship_dir + "/" + Config().main_ship_data_file  # ship main file
+    if not Path(ship_main_file).is_file():  # main page wasn't fetched (empty response)
+        log.warning(f'Ship main page not found for: {ship_id}!')
+        return False
+
+    ship_data: str = read_file_as_text(ship_main_file)
+    if "Access is denied." in ship_data:  # no data for the ship
+        log.warning(f'Skipped the current number [{ship_id}] - no data (Access is denied)!')
+        return False
+
+    ship_dict: dict = _parse_ship_main(ship_data, interest_keys={'Operator', 'Shipbuilder'})
+    if 'ship_builder_seaweb_id' not in ship_dict or 'ship_operator_seaweb_id' not in ship_dict:
+        log.error(f'Found invalid ship data for: {ship_id}!')  # key(s) not in the ship - invalid ship info
+
+    frontier.push(ENTITY_SHIPCOMPANY, ship_dict.get('ship_operator_seaweb_id', '-'))
+    frontier.push(ENTITY_SHIPBUILDER, ship_dict.get('ship_builder_seaweb_id', '-'))
+    return True
+
+
+def _scrap_frontier_entity(web_client: WebClient, entity: str, code: str) -> None:
     config = Config()
-    log.debug('Got application configuration.')
+    if entity == ENTITY_SHIPCOMPANY:
+        scrap_entity(web_client, ship_company_urls, code, f"{config.seaweb_raw_companies_dir}/{code}", entity)
+    else:
+        scrap_entity(web_client, ship_builder_urls, code, f"{config.seaweb_raw_builders_dir}/{code}", entity)
+
+
+def _scrap_frontier_ship(web_client: WebClient, ship_id: str, frontier: SeawebFrontier,
+                         verified_codes: Optional[CodesProcessor]) -> None:
+    """Fetch ship, put its companies/builders codes into the frontier and verify the IMO candidate
+    (ship with the found data is added to the verified codes, if provided)."""
+    ship_dir: str = Config().seaweb_raw_ships_dir + '/' + str(ship_id)
+    scrap_entity(web_client, ship_urls, ship_id, ship_dir, ENTITY_SHIP)
+    if _extract_ship_frontier_codes(ship_id, ship_dir, frontier) and verified_codes is not None \
+            and ship_id not in verified_codes:
+        verified_codes.add(ship_id)  # verified IMO candidate
+        log.info(f'IMO candidate [{ship_id}] is verified.')
+
+
+def scrap_ships_with_frontier(web_client: WebClient, ships_ids: Set[str], frontier: SeawebFrontier,
+                              req_limit: int = 0, verified_codes: Optional[CodesProcessor] = None) -> None:
+    """Crawl ships and, alongside, ship's companies/builders from the frontier. After each ship up to
+    FRONTIER_ENTITIES_PER_SHIP frontier entities are processed, the rest of the frontier is drained
+    after all ships are done. Ships with the found data are added to the verified codes (if provided),
+    so IMO candidates become IMO codes after the successful fetch only."""
+
+    log.debug('scrap_ships_with_frontier() is working.')
+    # fail-fast checks
+    if not web_client:
+        raise ScraperException('Provided empty web client!')
+    if ships_ids is None:  # empty set is ok (all ships are scraped) - the frontier is drained anyway
+        raise ScraperException('Provided empty ships IDs set!')
+    if frontier is None:
+        raise ScraperException('Provided empty frontier!')
 
-    if rebuild_codes:
-        log.info('Rebuilding ship\'s companies and ship\'s builders codes...')
-        _build_ship_builders_and_companies_codes(delete_invalid=delete_invalid)
+    ids_length = len(ships_ids)
+    entities_counter: int = 0
+    for counter, id in enumerate(sorted(ships_ids)):
 
-    # create web client instance
-    web_client = WebClient(headers=session_headers, cookies={})
-    log.debug('Created WebClient instance.')
+        if req_limit > 0 and counter > req_limit:  # just a stopper (sentinel)
+            break
 
-    # scrap all ships
-    ships: CodesProcessor = CodesProcessorFactory.imo_codes()
-    scrap_entities(web_client, ship_urls, ships.codes(), config.seaweb_raw_ships_dir,
-                   config.default_requests_limit)
-    log.info('Scrap ships data: done.')
+        log.info(f'Processing: ship #{id} ({counter}/{ids_length}), frontier: {len(frontier)}.')
+        _scrap_frontier_ship(web_client, id, frontier, verified_codes)
+
+        # process some entities from the frontier alongside the ships
+        for _ in range(FRONTIER_ENTITIES_PER_SHIP):
+            entity = frontier.pop()
+            if not entity:
+                break
+            _scrap_frontier_entity(web_client, *entity)
+            entities_counter += 1
+
+    log.info(f'Processed ships IDs: {ids_length}. Draining the frontier: {len(frontier)}.')
 
-    # scrap all ship operating companies
-    shipcompanies: CodesProcessor = CodesProcessorFactory.seaweb_shipcompanies_codes()
-    scrap_entities(web_client, ship_company_urls, shipcompanies.codes(), config.seaweb_raw_companies_dir,
-                   config.default_requests_limit)
-    log.info('Scrap ship\'s operating companies: done.')
+    # drain the rest of the frontier (the limit is checked before the pop - entity isn't lost)
+    while not (req_limit > 0 and entities_counter > req_limit):  # just a stopper (sentinel)
+        entity = frontier.pop()
+        if not entity:
+            break
+        _scrap_frontier_entity(web_client, *entity)
+        entities_counter += 1
 
-    # scrap all ship  builders
-    shipbuilders: CodesProcessor = CodesProcessorFactory.seaweb_shipbuildes_codes()
-    scrap_entities(web_client, ship_builder_urls, shipbuilders.codes(), config.seaweb_raw_builders_dir,
-                   config.default_requests_limit)
-    log.info('Scrap ship\'s builders: done.')
+    log.info(f'Processed ship\'s companies/builders: {entities_counter}.')
 
 
-def _build_ship_builders_and_companies_codes(delete_invalid=False) -> None:
-    log.debug("_build_ship_builders_and_companies_codes() is working.")
+def scrap_all(requests_limit: int = 0):
+    """Scrap ships, ship's companies and ship's builders.
+    :param requests_limit: ships requests limit, 0 - limit from the seaweb source settings.
+    """
+    log.debug(f'scrap_all() is working. Requests limit: {requests_limit}.')
 
+    # get configuration class instance
     config = Config()
-    ships_dirs_list: list[str] = os.listdir(config.seaweb_raw_ships_dir)
-    log.debug(f"Found total ships/directories: {len(ships_dirs_list)}.")
-
-    # main processing cycle
-    shipbuilders: CodesProcessor = CodesProcessorFactory.seaweb_shipbuildes_codes()
-    shipcompanies: CodesProcessor = CodesProcessorFactory.seaweb_shipcompanies_codes()
-    invalid_ships: Set[str] = set()  # set of invalid ships (wrong info)
-    for counter, ship in enumerate(ships_dirs_list):  # iterate over all dirs/ships and process data
-        log.debug(f'Currently processing: {ship} ({counter}/{len(ships_dirs_list)})')
-
-        if not ship.isnumeric():  # skip non-numeric dirs
-            log.warning(f"Skipped the current number [{ship}] - non-numeric object!")
-            continue
-
-        # check - if we can parse this ship - raw info file contains 'Access is denied.'
-        ship_dir: str = config.seaweb_raw_ships_dir + "/" + ship  # ship directory
-        ship_main_file: str = ship_dir + "/" + config.main_ship_data_file  # ship main file
-        ship_data: str = read_file_as_text(ship_main_file)
-        if "Access is denied." in ship_data:
-            log.warning(f"Skipped the current number [{ship}] - no data (Access is denied)!")
-            continue
-
-        # get parsed ship dictionary
-        ship_dict: dict = _parse_ship_main(ship_data, interest_keys={'Operator', 'Shipbuilder'})
-
-        # get ship builder code
-        builder_code: str = ship_dict.get('ship_builder_seaweb_id', 'x')
-        if builder_code != '-' and builder_code != 'x':  # shipbuilder code is OK
-            shipbuilders.add(builder_code)
-            log.debug(f'Added ship builder code: {builder_code}')
-        elif builder_code == '-':  # builder code not found in the ship
-            log.warn(f'Ship builder code not found for: {ship}!')
-        elif builder_code == 'x':  # builder code key not in the ship - invalid ship info!
-            log.error(f'Found invalid ship data for: {ship}!')
-            invalid_ships.add(ship)
-            if delete_invalid:  # if key is set - remove invalid ship folder
-                log.warn(f'Deleting: [{ship_dir}]!')
-                shutil.rmtree(ship_dir, ignore_errors=True)  # remove directory with invalid ship data
-
-        # get ship operator code
-        operator_code: str = ship_dict.get('ship_operator_seaweb_id', 'x')
-        if operator_code != '-' and operator_code != 'x':  # shipoperator code is OK
-            shipcompanies.add(operator_code)
-            log.debug(f'Added ship operator code: {operator_code}')
-        elif operator_code == '-':  # operator code not found in the ship
-            log.warn(f'Ship operator code not found for: {ship}!')
-        elif operator_code == 'x':  # operator code not in the ship - invalid ship info!
-            log.error(f'Found invalid ship data for: {ship}!')
-            invalid_ships.add(ship)
-            if delete_invalid:  # if key is set - remove invalid ship folder
-                log.warn(f'Deleting: [{ship_dir}]!')
-                shutil.rmtree(ship_dir, ignore_errors=True)  # remove directory with invalid ship data
-
-    if len(invalid_ships) > 0:  # if there were invalid ships - put info to the console
-        log.warn(f'Fould invalid ships: {invalid_ships}!')
+    log.debug('Got application configuration.')
+
+    settings: SourceSettings = source_settings("seaweb")  # requests limit, timeout, rate
+
+    # create web client instance (all written raw files are recorded in the cache manifest, identical
+    # files are deduplicated)
+    manifest = CacheManifest()
+    web_client = WebClient(headers=session_headers, cookies={}, manifest=manifest,
+                           blobs=BlobStore() if config.cache_dedup else None, timeout=settings.http_timeout,
+                           rate_limiter=RateLimiter(settings.rate_limit))
+    log.debug('Created WebClient instance.')
+
+    # frontier for ship's companies and ship's builders - seeded by known codes and filled in
+    # with the new codes while crawling ships
+    frontier = SeawebFrontier(CodesProcessorFactory.seaweb_shipcompanies_codes(),
+                              CodesProcessorFactory.seaweb_shipbuildes_codes())
+    frontier.push_known()
+
+    # scrap ships by the IMO index plan (known + candidates - scraped - denied) + ship's companies + ship's
+    # builders, fetched IMO candidates with the ship data are added to the IMO codes
+    ships: CodesProcessor = CodesProcessorFactory.imo_codes()
+    candidates: CodesProcessor = CodesProcessorFactory.imo_candidates()
+    ships_ids: Set[str] = CodesProcessorFactory.imo_index().plan(ships.codes() | candidates.codes()).codes()
+    log.info(f'IMO codes: {len(ships)}, candidates: {len(candidates)}, '
+             f'planned for the crawl: {len(ships_ids)}.')
+    scrap_ships_with_frontier(web_client, ships_ids, frontier, requests_limit or settings.requests_limit,
+                              verified_codes=ships)
+    CodesProcessorFactory.close_all()  # flush discovered codes to the codes files
+    manifest.close()
+    log.info('Scrap ships, ship\'s companies and ship\'s builders data: done.')
 
 
 if __name__ == '__main__':
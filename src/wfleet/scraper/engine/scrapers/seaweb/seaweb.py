@@ -6,12 +6,17 @@
     Main data source address is https://maritime.ihs.com
 
     Created:  Gusev Dmitrii, 04.05.2022
-    Modified: Gusev Dmitrii, 09.06.2022
+    Modified: Gusev Dmitrii, 19.10.2026
 """
 
 import logging
 from datetime import datetime
+from typing import List
+from wfleet.scraper.entities.ship import ShipDto
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.cache.cache_manifest import CacheManifest
 from wfleet.scraper.engine.scrapers.seaweb.scraper_seaweb import scrap_all
+from wfleet.scraper.engine.scrapers.seaweb.parser_seaweb import parse_all_ships
 from wfleet.scraper.config.scraper_config import MSG_MODULE_ISNT_RUNNABLE
 from wfleet.scraper.engine.scraper_abstract import ScraperAbstractClass, SCRAPE_RESULT_OK
 
@@ -32,9 +37,9 @@ class SeawebScraper(ScraperAbstractClass):
         if dry_run:  # dry run mode - won't do anything!
             return SCRAPE_RESULT_OK
 
-        # scrap all data: ships, ship's companies, ship's builders
-        # based on the params - may rebuild shipbuilders/shipcompanies codes list
-        scrap_all()
+        # scrap all data: ships, ship's companies, ship's builders (companies/builders codes
+        # are discovered on the fly, while crawling ships)
+        scrap_all(requests_limit)
 
         return SCRAPE_RESULT_OK
 
@@ -45,6 +50,14 @@ class SeawebScraper(ScraperAbstractClass):
         if dry_run:  # dry run mode - won't do anything!
             return SCRAPE_RESULT_OK
 
+        # cached ships and the known 'empty' pages - from the cache manifest (empty pages aren't parsed)
+        manifest = CacheManifest()
+        try:
+            ships: List[ShipDto] = parse_all_ships(Config().seaweb_raw_ships_dir, manifest)
+        finally:
+            manifest.close()
+        log.info(f"parse(): parsed ships: {len(ships)}.")
+
         return SCRAPE_RESULT_OK
 
 
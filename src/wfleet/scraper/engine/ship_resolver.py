@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Ship Resolver Module. Cross-source ship entity resolution: records from different sources (RS-Class,
+    RivReg, Morflot, GIMS, Seaweb, etc.) are linked into golden ship entities. No pairwise comparison -
+    records are linked by hash indexes on the identity keys (IMO, MMSI) and by blocking keys (call sign +
+    normalized name, normalized name + build year), linked records are grouped by union-find.
+    Records with different valid IMO/MMSI numbers are never merged.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import re
+import logging
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS, SHIP_TIMESTAMP_FIELDS
+from wfleet.scraper.entities.ship_batch import ShipBatch
+from wfleet.scraper.utils.imo_index import imo_check_digits_valid, is_valid_imo
+from wfleet.scraper.utils.utilities import RUS_CHARS
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+# source system name for the golden ship entities
+SYSTEM_GOLDEN: str = "wfleet"
+# linking rules names (in the order of application - the strongest first)
+RULE_IMO: str = "imo"
+RULE_MMSI: str = "mmsi"
+RULE_CALL_SIGN_NAME: str = "call_sign+name"
+RULE_NAME_BUILD_YEAR: str = "name+build_year"
+# values, meaning 'no value'
+EMPTY_VALUES: Tuple[str, ...] = ("", "-", "0", "N/A", "n/a")
+# ship's fields, not merged into the golden ship (identity of the source record and tech info)
+NOT_MERGED_FIELDS: Tuple[str, ...] = ("proprietary_number1", "proprietary_number2", "source_system",
+                                      "extended_info_url") + SHIP_TIMESTAMP_FIELDS
+
+# transliteration (russian -> latin) for the names normalization
+TRANSLIT_RUS: List[str] = ["A", "B", "V", "G", "D", "E", "E", "ZH", "Z", "I", "Y", "K", "L", "M", "N", "O",
+                           "P", "R", "S", "T", "U", "F", "KH", "TS", "CH", "SH", "SHCH", "", "Y", "", "E",
+                           "YU", "YA"]
+TRANSLIT_TABLE: Dict[int, str] = {ord(char): latin for char, latin in zip(RUS_CHARS, TRANSLIT_RUS)}
+NON_ALNUM_REGEX = re.compile(r"[^0-9A-Z]+")
+YEAR_REGEX = re.compile(r"(1[89]\d\d|20\d\d)")
+DIGITS_REGEX = re.compile(r"\D+")
+
+
+def normalize_imo(value: str) -> str:
+    """Normalized IMO number: 7 digits with the valid check digit, otherwise - empty string."""
+    digits: str = DIGITS_REGEX.sub("", value) if value else ""
+    return digits if len(digits) == 7 and is_valid_imo(int(digits)) else ""
+
+
+def normalize_imos(values: Sequence[str]) -> List[str]:
+    """Vectorized normalize_imo() for the many values (check digits are validated at once)."""
+    digits: List[str] = [DIGITS_REGEX.sub("", value) if value else "" for value in values]
+    candidates: List[int] = [int(value) if len(value) == 7 else 0 for value in digits]
+    valid: np.ndarray = imo_check_digits_valid(candidates) if candidates else np.zeros(0, dtype=bool)
+    return [value if is_valid else "" for value, is_valid in zip(digits, valid.tolist())]
+
+
+def normalize_mmsi(value: str) -> str:
+    """Normalized MMSI number: 9 digits (not all zeroes), otherwise - empty string."""
+    digits: str = DIGITS_REGEX.sub("", value) if value else ""
+    return digits if len(digits) == 9 and digits != "000000000" else ""
+
+
+def normalize_call_sign(value: str) -> str:
+    """Normalized call sign: upper-case latin letters and digits only."""
+    if not value or value in EMPTY_VALUES:
+        return ""
+    return NON_ALNUM_REGEX.sub("", value.upper().translate(TRANSLIT_TABLE))
+
+
+def normalize_name(value: str) -> str:
+    """Normalized ship name: upper-case, transliterated, only latin letters/digits separated by spaces."""
+    if not value or value in EMPTY_VALUES:
+        return ""
+    return NON_ALNUM_REGEX.sub(" ", value.upper().translate(TRANSLIT_TABLE)).strip()
+
+
+def normalize_build_year(value: str) -> str:
+    match = YEAR_REGEX.search(value) if value else None
+    return match.group(1) if match else ""
+
+
+class _DisjointSet:
+    """Union-find with path compression and union by size. Each set tracks its strong identity keys
+    (IMO/MMSI) - sets with different keys are never united."""
+
+    def __init__(self, imo: List[str], mmsi: List[str]) -> None:
+        self.parent: List[int] = list(range(len(imo)))
+        self.size: List[int] = [1] * len(imo)
+        self.imo: List[str] = list(imo)
+        self.mmsi: List[str] = list(mmsi)
+
+    def find(self, item: int) -> int:
+        root: int = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:  # path compression
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first: int, second: int) -> Optional[bool]:
+        """Unite sets. Returns True - united, False - already in one set, None - conflicting keys."""
+        root1, root2 = self.find(first), self.find(second)
+        if root1 == root2:
+            return False
+        imo1, imo2, mmsi1, mmsi2 = self.imo[root1], self.imo[root2], self.mmsi[root1], self.mmsi[root2]
+        if (imo1 and imo2 and imo1 != imo2) or (mmsi1 and mmsi2 and mmsi1 != mmsi2):
+            return None
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        self.imo[root1], self.mmsi[root1] = imo1 or imo2, mmsi1 or mmsi2
+        return True
+
+    def labels(self) -> np.ndarray:
+        """Dense cluster labels for all items (clusters are numbered in the order of the first item)."""
+        roots: np.ndarray = np.fromiter((self.find(item) for item in range(len(self.parent))), dtype=np.int64,
+                                        count=len(self.parent))
+        _, first, inverse = np.unique(roots, return_index=True, return_inverse=True)
+        order: np.ndarray = np.argsort(first, kind="stable")
+        ranks: np.ndarray = np.empty_like(order)
+        ranks[order] = np.arange(len(order))
+        return ranks[inverse.reshape(-1)]
+
+
+@dataclass
+class GoldenShip:
+    """Golden ship entity - merged ship and source records (indexes in the resolved sequence)."""
+    golden_id: int
+    ship: ShipDto
+    records: List[int] = field(default_factory=list)
+    sources: List[Tuple[str, str, str]] = field(default_factory=list)  # (source system, number1, number2)
+
+
+class ShipResolver:
+    """Cross-source ship entity resolution. Linking rules (the strongest first): the same IMO, the same
+    MMSI, the same call sign and name, the same name and build year. Merged values of the golden ship -
+    the first non-empty value by the sources priority (sources not in the priority list - after them,
+    in the order of records)."""
+
+    def __init__(self, source_priority: Sequence[str] = ()) -> None:
+        self.source_priority: Dict[str, int] = {source: index for index, source in enumerate(source_priority)}
+        self.stats: Dict[str, int] = dict()  # statistics of the last resolution: links by rules, conflicts
+
+    def link(self, columns: Dict[str, Sequence[str]]) -> np.ndarray:
+        """Link records into clusters.
+        :param columns: ships fields values (field -> values) - at least identity, name and build fields
+        :return: cluster label for each record (dense numbers, in the order of the first record)
+        """
+        length: int = len(columns["imo_number"])
+        imo: List[str] = normalize_imos(columns["imo_number"])
+        mmsi: List[str] = [normalize_mmsi(value) for value in columns["mmsi_number"]]
+        names: List[str] = [normalize_name(value) for value in columns["main_name"]]
+        call_signs: List[str] = [normalize_call_sign(value) for value in columns["call_sign"]]
+        years: List[str] = [normalize_build_year(value) for value in columns["build_date"]]
+
+        # blocking keys for the rules - key is empty if any of its parts is empty
+        rules: List[Tuple[str, Callable[[int], object]]] = [
+            (RULE_IMO, lambda index: imo[index]),
+            (RULE_MMSI, lambda index: mmsi[index]),
+            (RULE_CALL_SIGN_NAME, lambda index: (call_signs[index], names[index])
+                if call_signs[index] and names[index] else None),
+            (RULE_NAME_BUILD_YEAR, lambda index: (names[index], years[index])
+                if names[index] and years[index] else None),
+        ]
+
+        disjoint_set = _DisjointSet(imo, mmsi)
+        self.stats = {"records": length, "conflicts": 0}
+        for rule, key_function in rules:
+            key_index: Dict[object, int] = dict()  # hash index: key -> the first record with the key
+            links: int = 0
+            for record in range(length):
+                key = key_function(record)
+                if not key:
+                    continue
+                first: Optional[int] = key_index.setdefault(key, record)
+                if first == record:
+                    continue
+                united: Optional[bool] = disjoint_set.union(first, record)
+                if united:
+                    links += 1
+                elif united is None:
+                    self.stats["conflicts"] += 1
+            self.stats[rule] = links
+            log.debug(f"Resolution rule [{rule}]: links {links}.")
+
+        labels: np.ndarray = disjoint_set.labels()
+        self.stats["entities"] = int(labels.max()) + 1 if length else 0
+        log.info(f"Ships resolution: {self.stats}.")
+        return labels
+
+    def merge(self, columns: Dict[str, Sequence], labels: np.ndarray) -> List[GoldenShip]:
+        """Merge linked records into golden ships."""
+        length: int = len(labels)
+        priority: np.ndarray = np.fromiter((self.source_priority.get(source, len(self.source_priority))
+                                            for source in columns["source_system"]),
+                                           dtype=np.int64, count=length)
+        # records grouped by clusters, inside of a cluster - by source priority, then by record order
+        order: np.ndarray = np.lexsort((np.arange(length), priority, labels))
+        bounds: np.ndarray = np.flatnonzero(np.diff(labels[order])) + 1
+        merged_fields: List[str] = [name for name in SHIP_FIELDS if name not in NOT_MERGED_FIELDS]
+
+        result: List[GoldenShip] = list()
+        for golden_id, group in enumerate(np.split(order, bounds) if length else []):
+            records: List[int] = group.tolist()
+            values: Dict[str, str] = dict()
+            for name in merged_fields:
+                column = columns[name]
+                values[name] = next((column[record] for record in records
+                                     if column[record] not in EMPTY_VALUES), "")
+            normalized = (normalize_imo(columns["imo_number"][record]) for record in records)
+            values["imo_number"] = next((imo for imo in normalized if imo), values["imo_number"])
+            ship: ShipDto = ShipDto(proprietary_number1=str(golden_id), proprietary_number2="",
+                                    source_system=SYSTEM_GOLDEN, **values)
+            sources = [(columns["source_system"][record], columns["proprietary_number1"][record],
+                        columns["proprietary_number2"][record]) for record in records]
+            result.append(GoldenShip(golden_id, ship, sorted(records), sources))
+        return result
+
+    def resolve(self, ships: Sequence[ShipDto]) -> List[GoldenShip]:
+        """Resolve ships into golden ships (records - indexes in the provided sequence)."""
+        columns: Dict[str, List] = {name: [getattr(ship, name) for ship in ships] for name in SHIP_FIELDS}
+        return self.merge(columns, self.link(columns))
+
+    def resolve_batch(self, batch: ShipBatch) -> List[GoldenShip]:
+        """Resolve columnar batch of ships into golden ships (records - indexes in the batch)."""
+        columns: Dict[str, List] = {name: batch.column(name).tolist() for name in SHIP_FIELDS
+                                    if name not in SHIP_TIMESTAMP_FIELDS}
+        return self.merge(columns, self.link(columns))
+
+
+def resolve_ships(ships: Sequence[ShipDto], source_priority: Sequence[str] = ()) -> List[GoldenShip]:
+    """Resolve ships from all sources into golden ships (see ShipResolver)."""
+    return ShipResolver(source_priority).resolve(ships)
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
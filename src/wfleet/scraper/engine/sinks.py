@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Output Sinks Module. Scraped ships are written into the sinks by batches, as they are produced:
+    scraper DB (primary output), Excel (xlsx), CSV, JSON lines, Parquet (optional dependency - pyarrow)
+    and SQLite (run DB file). Several sinks may be used at once - background sink writes batches into
+    all of them in the separate thread (bounded queue), so writing output overlaps with scraping.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import csv
+import json
+import queue
+import logging
+import threading
+from pathlib import Path
+from itertools import islice
+from concurrent.futures import Future
+from datetime import datetime
+from operator import attrgetter
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Type
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS, SHIP_TIMESTAMP_FIELDS, iter_ships_from_tuples
+from wfleet.scraper.utils.utilities_xls import ShipsXlsxWriter, verify_and_process_xls_file
+from wfleet.scraper.utils.utilities_xls import iter_ships_from_excel
+from wfleet.scraper.db.scraper_db_sqlite import ScraperSQLiteDB
+from wfleet.scraper.db.scraper_db_writer import ScraperDbWriter
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+# sinks names
+SINK_EXCEL: str = "excel"
+SINK_CSV: str = "csv"
+SINK_JSONL: str = "jsonl"
+SINK_PARQUET: str = "parquet"
+SINK_SQLITE: str = "sqlite"
+SINK_DB: str = "db"
+
+PARQUET_ROW_GROUP_SIZE: int = 65536  # ships buffered into one parquet row group
+
+_ship_values = attrgetter(*SHIP_FIELDS)  # ship -> values tuple (in the fields order)
+_TIMESTAMP_POSITIONS: tuple = tuple(SHIP_FIELDS.index(name) for name in SHIP_TIMESTAMP_FIELDS)
+
+
+def ship_text_values(ship: ShipDto, timestamp_pattern: str) -> list:
+    """Ship values for the text formats - timestamps are formatted by the pattern."""
+    values: list = list(_ship_values(ship))
+    for position in _TIMESTAMP_POSITIONS:
+        if isinstance(values[position], datetime):
+            values[position] = values[position].strftime(timestamp_pattern)
+    return values
+
+
+class ShipSink(ABC):
+    """Base class for the ships output sinks. Ships are written by batches, sink is finalized on close."""
+    name: str = ""
+    extension: str = ""
+    shared: bool = False  # sink writes into the shared (not run dir) file
+
+    def __init__(self, file: str) -> None:
+        self.file: str = file
+        self.rows: int = 0  # ships written
+
+    @abstractmethod
+    def write_batch(self, ships: Sequence[ShipDto]) -> None:
+        """Write the batch of ships into the sink."""
+
+    def close(self) -> None:
+        """Finalize the sink (flush and close files)."""
+
+    def __enter__(self) -> "ShipSink":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class ExcelSink(ShipSink):
+    """Excel (xlsx) sink - streaming xlsx writer."""
+    name: str = SINK_EXCEL
+    extension: str = ".xlsx"
+
+    def __init__(self, file: str) -> None:
+        super().__init__(file)
+        self.__writer: ShipsXlsxWriter = ShipsXlsxWriter(file)
+
+    def write_batch(self, ships: Sequence[ShipDto]) -> None:
+        self.rows += self.__writer.write_many(ships)
+
+    def close(self) -> None:
+        self.__writer.close()
+
+
+class CsvSink(ShipSink):
+    """CSV sink - header row with the ship fields names, timestamps by the config pattern."""
+    name: str = SINK_CSV
+    extension: str = ".csv"
+
+    def __init__(self, file: str) -> None:
+        super().__init__(file)
+        verify_and_process_xls_file(file)
+        config = Config()
+        self.__pattern: str = config.timestamp_pattern
+        self.__file = open(file, mode="w", encoding=config.encoding, newline="")
+        self.__writer = csv.writer(self.__file)
+        self.__writer.writerow(SHIP_FIELDS)
+
+    def write_batch(self, ships: Sequence[ShipDto]) -> None:
+        self.__writer.writerows(ship_text_values(ship, self.__pattern) for ship in ships)
+        self.rows += len(ships)
+
+    def close(self) -> None:
+        self.__file.close()
+
+
+class JsonlSink(ShipSink):
+    """JSON lines sink - one ship (object with the ship fields) per line, timestamps by the config pattern."""
+    name: str = SINK_JSONL
+    extension: str = ".jsonl"
+
+    def __init__(self, file: str) -> None:
+        super().__init__(file)
+        verify_and_process_xls_file(file)
+        config = Config()
+        self.__pattern: str = config.timestamp_pattern
+        self.__file = open(file, mode="w", encoding=config.encoding)
+
+    def write_batch(self, ships: Sequence[ShipDto]) -> None:
+        self.__file.write("".join(json.dumps(dict(zip(SHIP_FIELDS, ship_text_values(ship, self.__pattern))),
+                                             ensure_ascii=False) + "\n" for ship in ships))
+        self.rows += len(ships)
+
+    def close(self) -> None:
+        self.__file.close()
+
+
+class ParquetSink(ShipSink):
+    """Parquet sink (optional dependency - pyarrow), ships are buffered into the row groups."""
+    name: str = SINK_PARQUET
+    extension: str = ".parquet"
+
+    def __init__(self, file: str) -> None:
+        super().__init__(file)
+        try:  # optional dependency - imported only when the sink is used
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ScraperException("Parquet sink requires [pyarrow] package, please install it!") from error
+
+        verify_and_process_xls_file(file)
+        self.__pyarrow = pyarrow
+        self.__schema = pyarrow.schema([(name, pyarrow.timestamp("us") if name in SHIP_TIMESTAMP_FIELDS
+                                         else pyarrow.string()) for name in SHIP_FIELDS])
+        self.__writer = pyarrow.parquet.ParquetWriter(file, self.__schema)
+        self.__buffer: List[ShipDto] = list()
+
+    def __flush(self) -> None:
+        if not self.__buffer:
+            return
+        columns = zip(*(_ship_values(ship) for ship in self.__buffer))
+        table = self.__pyarrow.Table.from_arrays([self.__pyarrow.array(column, type=ship_field.type) for
+                                                  column, ship_field in zip(columns, self.__schema)],
+                                                 schema=self.__schema)
+        self.__writer.write_table(table)
+        self.__buffer.clear()
+
+    def write_batch(self, ships: Sequence[ShipDto]) -> None:
+        self.__buffer.extend(ships)
+        self.rows += len(ships)
+        if len(self.__buffer) >= PARQUET_ROW_GROUP_SIZE:
+            self.__flush()
+
+    def close(self) -> None:
+        self.__flush()
+        self.__writer.close()
+
+
+class SQLiteSink(ShipSink):
+    """SQLite sink - run DB file with the ships table (scraper DB layout), upsert by the ship identity."""
+    name: str = SINK_SQLITE
+    extension: str = ".sqlite"
+
+    def __init__(self, file: str) -> None:
+        super().__init__(file)
+        verify_and_process_xls_file(file)
+        self._db: ScraperSQLiteDB = ScraperSQLiteDB(file)
+
+    def write_batch(self, ships: Sequence[ShipDto]) -> None:
+        self.rows += self._db.upsert_ships(ships)  # one transaction per batch
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class DbSink(ShipSink):
+    """Scraper DB sink - ships are upserted into the scraper DB (primary output, shared by all runs) by the
+    single DB writer thread. Written batches are checked (durability) on the next writes and on close."""
+    name: str = SINK_DB
+    extension: str = ""
+    shared: bool = True
+
+    def __init__(self, file: str, writer: Optional[ScraperDbWriter] = None) -> None:
+        """
+        :param file: scraper DB file
+        :param writer: DB writer of the scraper run (owned by the caller - isn't closed by the sink),
+                       default - own DB connection and writer
+        """
+        super().__init__(file)
+        self.__db: Optional[ScraperSQLiteDB] = None if writer else ScraperSQLiteDB(file)
+        self.__writer: ScraperDbWriter = writer if writer else ScraperDbWriter(self.__db)
+        self.__pending: List[Future] = list()
+
+    def __check(self, wait: bool = False) -> None:
+        pending: List[Future] = list()
+        for future in self.__pending:
+            if wait or future.done():
+                future.result()  # raises the write error
+            else:
+                pending.append(future)
+        self.__pending = pending
+
+    def write_batch(self, ships: Sequence[ShipDto]) -> None:
+        self.__check()
+        self.__pending.append(self.__writer.submit_ships(ships))
+        self.rows += len(ships)
+
+    def close(self) -> None:
+        if not self.__db:  # writer of the scraper run - only the written batches are checked
+            self.__check(wait=True)
+            return
+        try:
+            self.__writer.close()
+            self.__check(wait=True)
+        finally:
+            self.__db.close()
+
+
+# sinks registry: name -> sink class
+SINKS: Dict[str, Type[ShipSink]] = {sink.name: sink for sink in (DbSink, ExcelSink, CsvSink, JsonlSink,
+                                                                 ParquetSink, SQLiteSink)}
+
+
+def iter_ships_from_csv(file: str) -> Iterator[ShipDto]:
+    """Stream ships from the CSV sink file (header row - ship fields names)."""
+    config = Config()
+    with open(file, mode="r", encoding=config.encoding, newline="") as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, None)
+        if header:
+            yield from iter_ships_from_tuples(reader, header, config.timestamp_pattern)
+
+
+def iter_ships_from_jsonl(file: str) -> Iterator[ShipDto]:
+    """Stream ships from the JSON lines sink file (one ship object per line)."""
+    config = Config()
+    with open(file, mode="r", encoding=config.encoding) as jsonl_file:
+        rows = (tuple(json.loads(line).get(name) for name in SHIP_FIELDS)
+                for line in jsonl_file if line.strip())
+        yield from iter_ships_from_tuples(rows, SHIP_FIELDS, config.timestamp_pattern)
+
+
+def iter_ships_from_sqlite(file: str) -> Iterator[ShipDto]:
+    """Stream ships from the SQLite sink file (run DB), DB is closed when ships are consumed."""
+    with ScraperSQLiteDB(file) as db:
+        yield from db.iter_ships()
+
+
+# ships loaders for the run dir sinks files: extension -> loader, in the order of preference (legacy
+# xls - the previous raw data file format), the shared scraper DB isn't a run snapshot
+SINKS_LOADERS: Dict[str, Callable[[str], Iterable[ShipDto]]] = {
+    ExcelSink.extension: iter_ships_from_excel,
+    ".xls": iter_ships_from_excel,
+    CsvSink.extension: iter_ships_from_csv,
+    JsonlSink.extension: iter_ships_from_jsonl,
+    SQLiteSink.extension: iter_ships_from_sqlite,
+}
+
+
+class BackgroundSink(ShipSink):
+    """Writes batches into the sinks in the background thread. Queue is bounded - the producer waits, if the
+    writer is behind. Errors of the sinks are raised in the producer thread (on the next write or close)."""
+    name: str = "background"
+
+    def __init__(self, sinks: Sequence[ShipSink], queue_size: Optional[int] = None) -> None:
+        super().__init__("")
+        if not sinks:  # fail-fast - nothing to write into
+            raise ScraperException("No sinks provided!")
+        self.sinks: List[ShipSink] = list(sinks)
+        self.__queue: queue.Queue = queue.Queue(maxsize=queue_size if queue_size
+                                                else Config().sink_queue_size)
+        self.__error: Optional[BaseException] = None
+        self.__thread: Optional[threading.Thread] = threading.Thread(target=self.__run,
+                                                                     name="ships-sink-writer", daemon=True)
+        self.__thread.start()
+
+    def __run(self) -> None:
+        while True:
+            ships = self.__queue.get()
+            if ships is None:  # sink is closed
+                return
+            if self.__error is not None:  # drain the queue after the error
+                continue
+            try:
+                for sink in self.sinks:
+                    sink.write_batch(ships)
+            except BaseException as error:  # raised in the producer thread
+                log.error(f"Sink write error: {error}")
+                self.__error = error
+
+    def __check(self) -> None:
+        if self.__error is not None:
+            raise ScraperException(f"Ships sink failed: {self.__error}") from self.__error
+
+    def write_batch(self, ships: Sequence[ShipDto]) -> None:
+        self.__check()
+        if self.__thread is None:  # fail-fast - closed sink
+            raise ScraperException("Sink is closed!")
+        batch: List[ShipDto] = list(ships)
+        if batch:
+            self.__queue.put(batch)
+            self.rows += len(batch)
+
+    def close(self) -> None:
+        if self.__thread is None:
+            return
+        self.__queue.put(None)
+        self.__thread.join()
+        self.__thread = None
+        for sink in self.sinks:  # close all sinks, the first error is raised
+            try:
+                sink.close()
+            except BaseException as error:
+                self.__error = self.__error or error
+        self.__check()
+        log.info(f"Written {self.rows} ship(s) into the sinks: {[sink.file for sink in self.sinks]}.")
+
+
+def create_sink(names: Sequence[str], directory: str, background: bool = True,
+                db_writer: Optional[ScraperDbWriter] = None) -> ShipSink:
+    """Create sink(s) for the scraper run dir, files are named by the raw data file name (with the sink
+    extension), shared sinks - the scraper DB. Several sinks (or background mode) - all of them are written
+    by the background sink.
+    :param names: sinks names, empty - default sinks from the config
+    :param directory: dir for the output files (scraper run dir)
+    :param background: write in the background thread
+    :param db_writer: scraper DB writer of the run (one writer of the DB), used by the shared sinks
+    """
+    config = Config()
+    names = tuple(dict.fromkeys(names if names else config.default_sinks))  # unique names, in the order
+    unknown: List[str] = [name for name in names if name not in SINKS]
+    if unknown:  # fail-fast - unknown sinks
+        raise ScraperException(f"Unknown sinks: {unknown}, known sinks: {list(SINKS)}!")
+
+    stem: str = Path(config.raw_data_file).stem
+    sinks: List[ShipSink] = list()
+    try:
+        for name in names:
+            sink_class: Type[ShipSink] = SINKS[name]
+            if not sink_class.shared:
+                sinks.append(sink_class(directory + "/" + stem + sink_class.extension))
+            elif db_writer:  # scraper DB - by the DB writer of the run
+                sinks.append(sink_class(config.db_name, db_writer))
+            else:
+                sinks.append(sink_class(config.db_name))
+    except BaseException:  # close already opened sinks
+        for sink in sinks:
+            sink.close()
+        raise
+    log.debug(f"Created sinks: {[sink.file for sink in sinks]}.")
+
+    return BackgroundSink(sinks) if background or len(sinks) > 1 else sinks[0]
+
+
+def write_ships(sink: ShipSink, ships: Iterable[ShipDto], batch_size: Optional[int] = None) -> int:
+    """Write ships (any iterable, consumed once) into the sink by batches, returns number of written ships."""
+    size: int = batch_size if batch_size else Config().sink_batch_size
+    iterator = iter(ships)
+    count: int = 0
+    batch: List[ShipDto] = list(islice(iterator, size))
+    while batch:
+        sink.write_batch(batch)
+        count += len(batch)
+        batch = list(islice(iterator, size))
+    return count
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Snapshot Diff Module. Diff of two ships snapshots (i.e. two scraper runs): ships are keyed by the
+    composite identity (imo number, proprietary numbers, source system), compared fields (all fields,
+    except identity and timestamps) are hashed, diff emits added, removed and changed ships with the
+    field-level changes. Snapshots may be larger than RAM - partitioned hash join is used: both
+    snapshots are partitioned by the identity hash into the temporary files, then partitions are
+    joined one by one (only one partition of the old snapshot is in memory).
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from dataclasses import dataclass, field, fields
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.entities.ship import ShipDto
+from wfleet.scraper.engine.sinks import SINKS_LOADERS
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+# changes types
+CHANGE_ADDED: str = "added"
+CHANGE_REMOVED: str = "removed"
+CHANGE_CHANGED: str = "changed"
+
+# ship's composite identity
+SHIP_IDENTITY_FIELDS: Tuple[str, ...] = ("imo_number", "proprietary_number1", "proprietary_number2",
+                                         "source_system")
+# ship's compared fields (timestamps are excluded from comparison)
+SHIP_COMPARED_FIELDS: Tuple[str, ...] = tuple(ship_field.name for ship_field in fields(ShipDto)
+                                              if ship_field.compare and
+                                              ship_field.name not in SHIP_IDENTITY_FIELDS)
+# number of records, written to the partition file at once
+PARTITION_CHUNK_SIZE: int = 1000
+# values separator for the hashing
+HASH_SEPARATOR: str = "\x1f"
+
+
+@dataclass
+class ShipChange:
+    """One change between snapshots: field -> (old value, new value). For the added/removed ships -
+    all non-empty values (None - on the other side)."""
+    kind: str
+    key: Tuple[str, ...]
+    changes: Dict[str, Tuple[Optional[str], Optional[str]]] = field(default_factory=dict)
+
+
+@dataclass
+class DiffStats:
+    old: int = 0
+    new: int = 0
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    duplicates: int = 0  # ships with the same identity in one snapshot (the first one is used)
+
+
+def _ship_record(ship: ShipDto) -> Tuple[Tuple[str, ...], bytes, Tuple[str, ...]]:
+    """Ship record for the diff: (identity key, digest of compared values, compared values)."""
+    key: Tuple[str, ...] = tuple(str(getattr(ship, name)) for name in SHIP_IDENTITY_FIELDS)
+    values: Tuple[str, ...] = tuple(str(getattr(ship, name)) for name in SHIP_COMPARED_FIELDS)
+    digest: bytes = hashlib.blake2b(HASH_SEPARATOR.join(values).encode("utf-8"), digest_size=16).digest()
+    return key, digest, values
+
+
+class _PartitionsWriter:
+    """Writes records into the partition files (by the key hash), records are written by chunks."""
+
+    def __init__(self, directory: str, prefix: str, partitions: int) -> None:
+        self.files: List[str] = [f"{directory}/{prefix}-{number}.bin" for number in range(partitions)]
+        self.__handles: List[BinaryIO] = [open(file, mode="wb") for file in self.files]
+        self.__buffers: List[list] = [list() for _ in range(partitions)]
+        self.count: int = 0
+
+    def write(self, record: tuple) -> None:
+        number: int = hash(record[0]) % len(self.__buffers)
+        buffer: list = self.__buffers[number]
+        buffer.append(record)
+        self.count += 1
+        if len(buffer) >= PARTITION_CHUNK_SIZE:
+            pickle.dump(buffer, self.__handles[number], protocol=pickle.HIGHEST_PROTOCOL)
+            buffer.clear()
+
+    def close(self) -> None:
+        for buffer, handle in zip(self.__buffers, self.__handles):
+            if buffer:
+                pickle.dump(buffer, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                buffer.clear()
+            handle.close()
+
+
+def _read_partition(file: str) -> Iterator[tuple]:
+    with open(file, mode="rb") as handle:
+        while True:
+            try:
+                chunk: list = pickle.load(handle)
+            except EOFError:
+                return
+            yield from chunk
+
+
+class SnapshotDiff:
+    """Diff of two ships snapshots by the partitioned hash join. Statistics of the last diff - in stats."""
+
+    def __init__(self, partitions: Optional[int] = None, tmp_dir: Optional[str] = None) -> None:
+        config = Config()
+        self.partitions: int = partitions if partitions else config.diff_partitions
+        self.tmp_dir: str = tmp_dir if tmp_dir else config.cache_tmp_dir
+        if self.partitions <= 0:  # fail-fast - wrong partitions number
+            raise ScraperException(f"Wrong number of partitions: {self.partitions}!")
+        self.stats: DiffStats = DiffStats()
+
+    def diff(self, old: Iterable[ShipDto], new: Iterable[ShipDto]) -> Iterator[ShipChange]:
+        """Stream changes between the old and the new snapshots (ships are consumed once)."""
+        log.debug(f"diff(): snapshots diff, partitions: {self.partitions}.")
+        self.stats = DiffStats()
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+        with tempfile.TemporaryDirectory(dir=self.tmp_dir, prefix="diff-") as directory:
+            # phase 1 - partition both snapshots
+            writers: List[_PartitionsWriter] = list()
+            for prefix, ships in (("old", old), ("new", new)):
+                writer = _PartitionsWriter(directory, prefix, self.partitions)
+                try:
+                    for ship in ships:
+                        writer.write(_ship_record(ship))
+                finally:
+                    writer.close()
+                writers.append(writer)
+            self.stats.old, self.stats.new = writers[0].count, writers[1].count
+
+            # phase 2 - join partitions one by one
+            for old_file, new_file in zip(writers[0].files, writers[1].files):
+                yield from self.__join_partition(old_file, new_file)
+                os.remove(old_file)
+                os.remove(new_file)
+
+        log.info(f"Snapshots diff: {self.stats}.")
+
+    def __join_partition(self, old_file: str, new_file: str) -> Iterator[ShipChange]:
+        old_records: Dict[Tuple[str, ...], Tuple[bytes, Tuple[str, ...]]] = dict()
+        for key, digest, values in _read_partition(old_file):
+            if key in old_records:  # duplicate - the first one is used (as for the new snapshot)
+                self.stats.duplicates += 1
+                continue
+            old_records[key] = (digest, values)
+
+        new_keys: set = set()
+        for key, digest, values in _read_partition(new_file):
+            if key in new_keys:  # duplicate - the first one is used (as for the old snapshot)
+                self.stats.duplicates += 1
+                continue
+            new_keys.add(key)
+
+            old_record = old_records.pop(key, None)
+            if old_record is None:  # new ship
+                self.stats.added += 1
+                yield ShipChange(CHANGE_ADDED, key, {name: (None, value) for name, value
+                                                     in zip(SHIP_COMPARED_FIELDS, values) if value})
+            elif old_record[0] != digest:  # changed ship - field level changes
+                self.stats.changed += 1
+                yield ShipChange(CHANGE_CHANGED, key, {name: (old_value, value) for name, old_value, value
+                                                       in zip(SHIP_COMPARED_FIELDS, old_record[1], values)
+                                                       if old_value != value})
+            else:
+                self.stats.unchanged += 1
+
+        for key, (_, values) in old_records.items():  # the rest of the old ships - removed
+            self.stats.removed += 1
+            yield ShipChange(CHANGE_REMOVED, key, {name: (value, None) for name, value
+                                                   in zip(SHIP_COMPARED_FIELDS, values) if value})
+
+
+def diff_snapshots(old: Iterable[ShipDto], new: Iterable[ShipDto],
+                   partitions: Optional[int] = None) -> Iterator[ShipChange]:
+    """Stream changes between two ships snapshots (see SnapshotDiff)."""
+    return SnapshotDiff(partitions).diff(old, new)
+
+
+def find_run_data_file(run_dir: str) -> Tuple[str, Callable[[str], Iterable[ShipDto]]]:
+    """Find the ships data file in the scraper run dir: raw data file or any sink file of the run (named by
+    the raw data file, see SINKS_LOADERS for the order of preference).
+    :param run_dir: dir of the run
+    :return: tuple (data file, ships loader for the file)
+    """
+    stem: str = Path(Config().raw_data_file).stem
+    for extension, loader in SINKS_LOADERS.items():
+        file: str = run_dir + "/" + stem + extension
+        if Path(file).is_file():
+            return file, loader
+    # fail-fast - run without data file
+    raise ScraperException(f"Ships data file [{stem}{list(SINKS_LOADERS)}] doesn't exist in the run dir "
+                           f"[{run_dir}]!")
+
+
+def diff_runs(old_run_dir: str, new_run_dir: str, loader: Optional[Callable[[str], Iterable[ShipDto]]] = None,
+              partitions: Optional[int] = None) -> Iterator[ShipChange]:
+    """Stream changes between two cached scraper runs (ships data files in the run dirs).
+    :param old_run_dir: dir of the old run
+    :param new_run_dir: dir of the new run
+    :param loader: ships loader for the data files (file -> ships), default - by the data file type
+    """
+    log.debug(f"diff_runs(): diff of the runs [{old_run_dir}] and [{new_run_dir}].")
+    snapshots: List[Iterable[ShipDto]] = list()
+    for run_dir in (old_run_dir, new_run_dir):
+        file, file_loader = find_run_data_file(run_dir)
+        log.debug(f"Run [{run_dir}] data file: {file}.")
+        snapshots.append((loader if loader else file_loader)(file))
+
+    return diff_snapshots(snapshots[0], snapshots[1], partitions)
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
@@ -4,22 +4,57 @@
 """
     Ships related DTOs for data scraping.
     Currently supports:
-      - BaseShipDto - class contains basic ship info alongside with some necessary tech info
-      - ExtendedShipDto - class contains extended ship info
+      - ShipDto - class contains ship info alongside with some necessary tech info. Class is slotted
+        (no per-instance __dict__), values of the categorical fields (flag, type, status, etc.) are
+        interned - they repeat across hundreds of thousands of ships.
+    For the large sets of ships see the columnar container ShipBatch (module ship_batch).
 
     Created:  Gusev Dmitrii, 10.01.2021
-    Modified: Dmitrii Gusev, 09.06.2022
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
-# todo: implement creation of dataclass from dictionary, see the link below
-# todo: https://www.reddit.com/r/learnpython/comments/9h74no/convert_dict_to_dataclass/
-
+import sys
 from datetime import datetime
-from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, fields, MISSING
 from dataclasses import asdict, astuple, field
 from wfleet.scraper.config.scraper_config import Config
-
-
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.utils.utilities import dataclass_slots
+
+# ship's categorical fields - small number of distinct values, repeated across many ships (interned)
+SHIP_CATEGORICAL_FIELDS: Tuple[str, ...] = ("source_system", "flag", "home_port", "ship_type", "build_place",
+                                            "status", "ship_operator", "ship_builder")
+# ship's timestamps fields
+SHIP_TIMESTAMP_FIELDS: Tuple[str, ...] = ("timestamp", "init_datetime")
+
+# mapping of the ship dictionary keys (i.e. parsed Seaweb ship) to the ShipDto fields: field -> key
+SHIP_DICT_MAPPING: Dict[str, str] = {
+    "imo_number": "imo_number",
+    "source_system": "source_system",
+    "timestamp": "timestamp",
+    "main_name": "ship_name",
+    "ship_type": "ship_type",
+    "gross": "gross",
+    "deadweight": "deadweight",
+    "call_sign": "call_sign",
+    "mmsi_number": "mmsi_no",
+    "build_date": "build_year",
+    "flag": "flag",
+    "status": "status",
+    "ship_operator": "ship_operator",
+    "ship_operator_address": "ship_operator_address",
+    "ship_operator_seaweb_id": "ship_operator_seaweb_id",
+    "ship_builder": "ship_builder",
+    "ship_builder_seaweb_id": "ship_builder_seaweb_id",
+}
+# default values for the ShipDto fields, missing in the ship dictionary
+SHIP_DICT_DEFAULTS: Dict[str, Any] = {"proprietary_number1": "-", "proprietary_number2": "-"}
+
+
+@dataclass_slots
 @dataclass
 class ShipDto:
     """Ship DTO object - ship with base attributes, used for all scrapers."""
@@ -31,7 +66,7 @@ class ShipDto:
     source_system: str        # (ID) source system name where ship data was retrieved
 
     # timestamp for the ship entity (field is excluded from comparison)
-    timestamp: datetime = field(compare=False)
+    timestamp: datetime = field(default_factory=datetime.now, compare=False)
 
     # full ship's data
     flag: str = ""             # ship's flag
@@ -59,8 +94,15 @@ class ShipDto:
     ship_builder_seaweb_id: str = ""   #
 
     # some tech info
-    extended_info_url: str = ""               # URL for ship extended info (usually - separated page)
-    init_datetime: datetime = datetime.now()  # timestamp of creating ship instance
+    extended_info_url: str = ""  # URL for ship extended info (usually - separated page)
+    # timestamp of creating ship instance (field is excluded from comparison)
+    init_datetime: datetime = field(default_factory=datetime.now, compare=False)
+
+    def __post_init__(self):
+        for name in SHIP_CATEGORICAL_FIELDS:  # intern repeated values (str() - i.e. for bs4 strings)
+            value = getattr(self, name)
+            if value:
+                setattr(self, name, sys.intern(str(value)))
 
     @classmethod
     def ship_from_dict(cls, ship_dict: dict[str, str]):
@@ -68,34 +110,133 @@ class ShipDto:
         if not ship_dict:
             raise ValueError("Provided empty dictionary for building a ShipDto instance!")
 
-        config = Config()  # get system config instance
-
-        # base parameters for the constructor
-        imo_number: str = ship_dict['imo_number']
-        number1: str = "-"
-        number2: str = "-"
-        source_system: str = ship_dict['source_system']
-        timestamp: datetime = datetime.strptime(ship_dict['timestamp'], config.timestamp_pattern)
-        # construct the instance of ShipDto dataclass
-        ship = cls(imo_number, number1, number2, source_system, timestamp)
-
-        # additional data for the ship
-        ship.main_name = ship_dict['ship_name']
-        ship.ship_type = ship_dict['ship_type']
-        ship.gross = ship_dict['gross']
-        ship.deadweight = ship_dict['deadweight']
-        ship.call_sign = ship_dict['call_sign']
-        ship.mmsi_number = ship_dict['mmsi_no']
-        ship.build_date = ship_dict['build_year']
-        ship.flag = ship_dict['flag']
-        ship.status = ship_dict['status']
-        ship.ship_operator = ship_dict['ship_operator']
-        ship.ship_operator_address = ship_dict['ship_operator_address']
-        ship.ship_operator_seaweb_id = ship_dict['ship_operator_seaweb_id']
-        ship.ship_builder = ship_dict['ship_builder']
-        ship.ship_builder_seaweb_id = ship_dict['ship_builder_seaweb_id']
-
-        return ship
+        return ships_from_dicts([ship_dict])[0]
+
+
+# all ShipDto fields names (in the constructor order)
+SHIP_FIELDS: Tuple[str, ...] = tuple(ship_field.name for ship_field in fields(ShipDto))
+
+
+@lru_cache(maxsize=4096)
+def parse_ship_timestamp(value: str, pattern: str) -> datetime:
+    """Parse ship timestamp (memoized - most ships of one parse share the timestamp string)."""
+    return datetime.strptime(value, pattern)
+
+
+def ship_tuples_from_dicts(rows: Iterable[Dict[str, Any]], mapping: Optional[Dict[str, str]] = None,
+                           defaults: Optional[Dict[str, Any]] = None
+                           ) -> Tuple[Tuple[str, ...], Iterator[tuple]]:
+    """Convert ships dictionaries (rows) into tuples by the precomputed mapping (missing keys - defaults).
+    Keys of the required fields (ShipDto fields without defaults, i.e. imo_number) can't be missing -
+    ScraperException is raised (corrupted input).
+    :param rows: ships dictionaries
+    :param mapping: ShipDto fields -> dictionary keys, default - SHIP_DICT_MAPPING
+    :param defaults: default values for the fields, default - SHIP_DICT_DEFAULTS
+    :return: tuple (fields names of the tuples values, iterator of tuples)
+    """
+    keys: Dict[str, str] = dict(mapping if mapping is not None else SHIP_DICT_MAPPING)
+    base: Dict[str, Any] = dict(defaults if defaults is not None else SHIP_DICT_DEFAULTS)
+    names: Tuple[str, ...] = tuple(name for name in SHIP_FIELDS if name in keys or name in base)
+    mapped: Tuple[str, ...] = tuple(name for name in names if name in keys)
+    constant: Tuple[Any, ...] = tuple(base[name] for name in names if name not in keys)
+    names = mapped + tuple(name for name in names if name not in keys)  # mapped values go first
+
+    # missing keys values: defaults, ShipDto field defaults or current time (timestamps)
+    now: datetime = datetime.now()
+    ship_fields = {ship_field.name: ship_field for ship_field in fields(ShipDto)}
+    fallback: Tuple[Any, ...] = tuple(
+        base[name] if name in base else now if name in SHIP_TIMESTAMP_FIELDS else
+        None if ship_fields[name].default is MISSING else ship_fields[name].default for name in mapped)
+    required: Tuple[str, ...] = tuple(keys[name] for name in mapped if name not in base and
+                                      name not in SHIP_TIMESTAMP_FIELDS and
+                                      ship_fields[name].default is MISSING)
+    getter = itemgetter(*(keys[name] for name in mapped)) if len(mapped) > 1 else \
+        (lambda row: (row[keys[mapped[0]]],)) if mapped else (lambda row: ())
+
+    def convert() -> Iterator[tuple]:
+        for row in rows:
+            try:  # fast path - all keys are present
+                values = getter(row)
+            except KeyError:
+                missing: List[str] = [key for key in required if key not in row]
+                if missing:  # fail-fast - corrupted input
+                    raise ScraperException(f"Missing required ship key(s) {missing} in: {row}!")
+                values = tuple(row.get(keys[name], value) for name, value in zip(mapped, fallback))
+            yield values + constant
+
+    return names, convert()
+
+
+def _ship_args_builder(names: Tuple[str, ...]) -> Callable[[Sequence[Any]], tuple]:
+    """Build converter: values of the provided fields -> all ShipDto constructor args (positional).
+    Missing fields get ShipDto defaults (timestamps - current time, the same for the whole bulk)."""
+    unknown = set(names) - set(SHIP_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown ShipDto fields: {sorted(unknown)}!")
+
+    now: datetime = datetime.now()
+    tail: list = list()
+    indexes: List[int] = list()
+    for ship_field in fields(ShipDto):
+        if ship_field.name in names:
+            indexes.append(names.index(ship_field.name))
+        elif ship_field.name in SHIP_TIMESTAMP_FIELDS:
+            indexes.append(len(names) + len(tail))
+            tail.append(now)
+        elif ship_field.default is not MISSING:
+            indexes.append(len(names) + len(tail))
+            tail.append(ship_field.default)
+        else:
+            raise ValueError(f"Missing required ShipDto field: {ship_field.name}!")
+
+    if not tail and indexes == list(range(len(SHIP_FIELDS))):  # all fields in the constructor order
+        return tuple
+    getter = itemgetter(*indexes)
+    tail_tuple: tuple = tuple(tail)
+    return lambda row: getter(tuple(row) + tail_tuple)
+
+
+def iter_ships_from_tuples(rows: Iterable[Sequence[Any]], fields_names: Sequence[str] = SHIP_FIELDS,
+                           timestamp_pattern: Optional[str] = None) -> Iterator[ShipDto]:
+    """Streaming construction of ships from the tuples (rows) - see ships_from_tuples()."""
+    build_args = _ship_args_builder(tuple(fields_names))
+    pattern: str = timestamp_pattern if timestamp_pattern else Config().timestamp_pattern
+    positions: Tuple[int, ...] = tuple(SHIP_FIELDS.index(name) for name in SHIP_TIMESTAMP_FIELDS)
+
+    for row in rows:
+        args = build_args(row)
+        if any(isinstance(args[position], str) for position in positions):  # memoized timestamps parsing
+            args = list(args)
+            for position in positions:
+                if isinstance(args[position], str):
+                    args[position] = parse_ship_timestamp(args[position], pattern)
+        yield ShipDto(*args)
+
+
+def ships_from_tuples(rows: Iterable[Sequence[Any]], fields_names: Sequence[str] = SHIP_FIELDS,
+                      timestamp_pattern: Optional[str] = None) -> List[ShipDto]:
+    """Bulk construction of ships from the tuples (rows).
+    :param rows: ships tuples, values in the order of the fields names
+    :param fields_names: ShipDto fields names for the tuples values, default - all fields in the constructor
+                         order
+    :param timestamp_pattern: pattern for the string timestamps, default - from the config
+    :return: list of ships
+    """
+    return list(iter_ships_from_tuples(rows, fields_names, timestamp_pattern))
+
+
+def ships_from_dicts(rows: Iterable[Dict[str, Any]], mapping: Optional[Dict[str, str]] = None,
+                     defaults: Optional[Dict[str, Any]] = None,
+                     timestamp_pattern: Optional[str] = None) -> List[ShipDto]:
+    """Bulk construction of ships from the dictionaries (rows).
+    :param rows: ships dictionaries, missing keys - fields get defaults
+    :param mapping: ShipDto fields -> dictionary keys, default - SHIP_DICT_MAPPING
+    :param defaults: default values for the fields, default - SHIP_DICT_DEFAULTS
+    :param timestamp_pattern: pattern for the string timestamps, default - from the config
+    :return: list of ships
+    """
+    names, tuples = ship_tuples_from_dicts(rows, mapping, defaults)
+    return ships_from_tuples(tuples, names, timestamp_pattern)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Columnar container for the large sets of ships (rs-class, Seaweb, etc.). Ships fields are stored
+    as arrays (one array per field): categorical fields are dictionary-encoded (int32 codes + list of
+    distinct values), timestamps - as datetime64 arrays, other fields - as object arrays. Batch is
+    converted to/from list of ShipDto.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import logging
+import dataclasses
+import numpy as np
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.entities.ship import (ShipDto, SHIP_FIELDS, SHIP_CATEGORICAL_FIELDS,
+                                          SHIP_TIMESTAMP_FIELDS, parse_ship_timestamp, ship_tuples_from_dicts)
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+# init module logging
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+# type of the timestamp arrays
+TIMESTAMP_DTYPE: str = "datetime64[us]"
+# type of the categorical codes arrays
+CODES_DTYPE = np.int32
+
+
+def _encode(values: Sequence[str]) -> tuple:
+    """Dictionary-encode values: returns tuple (codes array, list of distinct values - categories)."""
+    index: Dict[str, int] = dict()
+    codes: np.ndarray = np.fromiter((index.setdefault(value, len(index)) for value in values),
+                                    dtype=CODES_DTYPE, count=len(values))
+    return codes, list(index)
+
+
+class ShipBatch:
+    """Columnar batch of ships. Batch is immutable - operations return new batches."""
+
+    def __init__(self, columns: Dict[str, np.ndarray],
+                 categories: Optional[Dict[str, List[str]]] = None) -> None:
+        self.__categories: Dict[str, List[str]] = categories if categories else dict()
+
+        # fail-fast checks - all fields are present and have the same length
+        missing = set(SHIP_FIELDS) - set(columns)
+        if missing:
+            raise ScraperException(f"Missing ship batch columns: {sorted(missing)}!")
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ScraperException(f"Ship batch columns have different lengths: {sorted(lengths)}!")
+        for name in self.__categories:
+            if name not in SHIP_CATEGORICAL_FIELDS:
+                raise ScraperException(f"Column [{name}] isn't categorical!")
+
+        self.__columns: Dict[str, np.ndarray] = {name: columns[name] for name in SHIP_FIELDS}
+        self.__length: int = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_values(cls, values: Dict[str, Sequence[Any]], length: int) -> "ShipBatch":
+        """Build columnar batch from the fields values (field -> values list). Missing fields get
+        default values (missing timestamps - the same current time for the whole batch)."""
+        now: datetime = datetime.now()
+        columns: Dict[str, np.ndarray] = dict()
+        categories: Dict[str, List[str]] = dict()
+        for ship_field in dataclasses.fields(ShipDto):
+            name: str = ship_field.name
+            column_values = values.get(name)
+            if column_values is None:  # missing field - default values
+                column_values = [now if name in SHIP_TIMESTAMP_FIELDS else ship_field.default] * length
+            if name in SHIP_CATEGORICAL_FIELDS:
+                columns[name], categories[name] = _encode(column_values)
+            elif name in SHIP_TIMESTAMP_FIELDS:
+                columns[name] = np.array(column_values, dtype=TIMESTAMP_DTYPE)
+            else:
+                column: np.ndarray = np.empty(length, dtype=object)
+                column[:] = column_values
+                columns[name] = column
+        return cls(columns, categories)
+
+    @classmethod
+    def from_ships(cls, ships: Sequence[ShipDto]) -> "ShipBatch":
+        """Build columnar batch from the list of ships."""
+        values: Dict[str, List[Any]] = {name: [getattr(ship, name) for ship in ships] for name in SHIP_FIELDS}
+        return cls.from_values(values, len(ships))
+
+    @classmethod
+    def from_tuples(cls, rows: Iterable[Sequence[Any]], fields_names: Sequence[str] = SHIP_FIELDS,
+                    timestamp_pattern: Optional[str] = None) -> "ShipBatch":
+        """Build columnar batch from the tuples (rows) directly - without ShipDto instances.
+        :param rows: ships tuples, values in the order of the fields names
+        :param fields_names: ShipDto fields names for the tuples values
+        :param timestamp_pattern: pattern for the string timestamps, default - from the config
+        """
+        names: tuple = tuple(fields_names)
+        unknown = set(names) - set(SHIP_FIELDS)
+        if unknown:
+            raise ScraperException(f"Unknown ShipDto fields: {sorted(unknown)}!")
+
+        rows_list: list = list(rows)
+        transposed: list = list(zip(*rows_list)) if rows_list else [()] * len(names)
+        values: Dict[str, Sequence[Any]] = dict(zip(names, transposed))
+
+        pattern: str = timestamp_pattern if timestamp_pattern else Config().timestamp_pattern
+        for name in SHIP_TIMESTAMP_FIELDS:  # string timestamps - memoized parsing
+            if name in values:
+                values[name] = [parse_ship_timestamp(value, pattern) if isinstance(value, str) else value
+                                for value in values[name]]
+        for name in SHIP_CATEGORICAL_FIELDS:  # the same as in the ShipDto (i.e. for bs4 strings)
+            if name in values:
+                values[name] = [str(value) for value in values[name]]
+
+        return cls.from_values(values, len(rows_list))
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]], mapping: Optional[Dict[str, str]] = None,
+                   defaults: Optional[Dict[str, Any]] = None,
+                   timestamp_pattern: Optional[str] = None) -> "ShipBatch":
+        """Build columnar batch from the dictionaries (rows) directly - without ShipDto instances.
+        Parameters are the same as for the ships_from_dicts() function (ship module)."""
+        names, rows_tuples = ship_tuples_from_dicts(rows, mapping, defaults)
+        return cls.from_tuples(rows_tuples, names, timestamp_pattern)
+
+    @classmethod
+    def concat(cls, batches: Sequence["ShipBatch"]) -> "ShipBatch":
+        """Concatenate batches into one (categories are merged and codes are re-mapped)."""
+        if not batches:
+            return cls.from_ships([])
+
+        columns: Dict[str, np.ndarray] = dict()
+        categories: Dict[str, List[str]] = dict()
+        for name in SHIP_FIELDS:
+            if name not in SHIP_CATEGORICAL_FIELDS:
+                columns[name] = np.concatenate([batch.__columns[name] for batch in batches])
+                continue
+            index: Dict[str, int] = dict()
+            parts: List[np.ndarray] = list()
+            for batch in batches:  # re-map batch codes into the merged categories
+                values: List[str] = batch.categories(name)
+                mapping = np.fromiter((index.setdefault(value, len(index)) for value in values),
+                                      dtype=CODES_DTYPE, count=len(values))
+                parts.append(mapping[batch.codes(name)] if len(mapping) else batch.codes(name))
+            columns[name], categories[name] = np.concatenate(parts), list(index)
+        return cls(columns, categories)
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def codes(self, name: str) -> np.ndarray:
+        """Codes of the categorical column."""
+        if name not in self.__categories:
+            raise ScraperException(f"Column [{name}] isn't categorical!")
+        return self.__columns[name]
+
+    def categories(self, name: str) -> List[str]:
+        """Distinct values of the categorical column (value index - code)."""
+        if name not in self.__categories:
+            raise ScraperException(f"Column [{name}] isn't categorical!")
+        return self.__categories[name]
+
+    def column(self, name: str) -> np.ndarray:
+        """Column values (categorical column is decoded into object array)."""
+        if name not in self.__columns:
+            raise ScraperException(f"Unknown ship batch column: [{name}]!")
+        if name in self.__categories:
+            categories: np.ndarray = np.empty(len(self.__categories[name]), dtype=object)
+            categories[:] = self.__categories[name]
+            return categories[self.__columns[name]]
+        return self.__columns[name]
+
+    def filter(self, selector: np.ndarray) -> "ShipBatch":
+        """New batch with the selected ships (boolean mask or indexes array), categories are kept."""
+        return ShipBatch({name: column[selector] for name, column in self.__columns.items()},
+                         dict(self.__categories))
+
+    def to_ships(self) -> List[ShipDto]:
+        """Convert batch into the list of ships (categorical values are shared between ships)."""
+        values: List[list] = [self.column(name).tolist() for name in SHIP_FIELDS]
+        return [ShipDto(*row) for row in zip(*values)]
+
+    def __iter__(self) -> Iterator[ShipDto]:
+        return iter(self.to_ships())
+
+    def __getitem__(self, index: int) -> ShipDto:
+        if index < -self.__length or index >= self.__length:
+            raise IndexError(f"Ship batch index {index} out of range!")
+        row: list = list()
+        for name in SHIP_FIELDS:
+            value = self.__columns[name][index]
+            if name in self.__categories:
+                value = self.__categories[name][value]
+            elif name in SHIP_TIMESTAMP_FIELDS:
+                value = value.item()
+            row.append(value)
+        return ShipDto(*row)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the batch arrays (object arrays - size of the references only)."""
+        return sum(column.nbytes for column in self.__columns.values())
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
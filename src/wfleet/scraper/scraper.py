@@ -14,7 +14,7 @@
       - (click library) https://click.palletsprojects.com/en/8.0.x/
 
     Created:  Gusev Dmitrii, 10.01.2021
-    Modified: Dmitrii Gusev, 04.05.2022
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
 # todo: create unit tests for dry run mode
@@ -25,11 +25,17 @@ import sys
 import click
 import logging
 import logging.config
+from typing import Callable, Iterable, Optional, Tuple
 from wfleet.scraper import VERSION
 from wfleet.scraper.config.scraper_config import Config
 from wfleet.scraper.config.logging_config import LOGGING_CONFIG
-from wfleet.scraper.cache.scraper_cache import cache_cleanup
-from wfleet.scraper.engine.scraper_engine import scrap_all_data, execute_seaweb_parse, execute_seaweb_scrap
+from wfleet.scraper.config.scraper_settings import SETTINGS
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.engine.scraper_registry import SCRAPERS
+
+# note: scraper engine, sinks and scrapers (with BeautifulSoup, requests, openpyxl, numpy etc.) are imported
+# by the commands on the first use - lightweight commands (--version, --help, cleanup) don't pay for them,
+# see benchmarks/bench_cli_startup.py
 
 # context object keys
 CONTEXT_DRYRUN: str = 'DRYRUN'
@@ -39,8 +45,46 @@ log = logging.getLogger("wfleet.scraper")  # main module logger
 config = Config()  # get config instance
 
 
+class LazyChoice(click.Choice):
+    """Choice parameter type with the choices loaded on the first use (i.e. from the lazily imported
+    module)."""
+
+    def __init__(self, load_choices: Callable[[], Iterable[str]], case_sensitive: bool = True) -> None:
+        self.__load_choices: Callable[[], Iterable[str]] = load_choices
+        self.__choices: Optional[Tuple[str, ...]] = None
+        super().__init__((), case_sensitive)
+
+    @property
+    def choices(self) -> Tuple[str, ...]:
+        if self.__choices is None:
+            self.__choices = tuple(self.__load_choices())
+        return self.__choices
+
+    @choices.setter
+    def choices(self, value) -> None:  # set by the base class constructor - choices are loaded lazily
+        pass
+
+
+def _sinks_names() -> Iterable[str]:
+    from wfleet.scraper.engine.sinks import SINKS
+    return SINKS
+
+
+def _set_settings(context, param, overrides: Tuple[str, ...]) -> Tuple[str, ...]:
+    """CLI layer of the source settings (see scraper_settings), validated on the command line parsing."""
+    try:
+        SETTINGS.set_overrides(overrides)
+    except ScraperException as error:
+        raise click.BadParameter(str(error)) from error
+    return overrides
+
+
 @click.group()
 @click.option('--dry-run', default=False, is_flag=True, help='Dry run mode for Scraper (no action).')
+@click.option('--set', 'settings', multiple=True, callback=_set_settings, expose_value=False,
+              metavar='[SOURCE.]KEY=VALUE',
+              help='Source setting (may be repeated): workers, rate_limit, timeout, retries, batch_size, '
+                   'requests_limit, sinks. Overrides the settings file and the environment.')
 @click.version_option(version=VERSION, prog_name=config.app_name)
 @click.pass_context  # pass context to other sub command(s)
 def main(context, dry_run: bool):
@@ -71,18 +115,39 @@ def main(context, dry_run: bool):
 @click.pass_context
 def cleanup(context):
     log.debug("Executing command: cleanup.")
+    from wfleet.scraper.cache.cache_manifest import CacheManifest
+    from wfleet.scraper.cache.scraper_cache import cache_cleanup, cache_enforce_quota
     # click.echo(f"DRYRUN is {'on' if context.obj[CONTEXT_DRYRUN] else 'off'}")
-    cache_cleanup(context.obj[CONTEXT_DRYRUN])
+    manifest = CacheManifest()
+    try:
+        cache_cleanup(context.obj[CONTEXT_DRYRUN], manifest=manifest)
+        cache_enforce_quota(context.obj[CONTEXT_DRYRUN], manifest=manifest)
+    finally:
+        manifest.close()
 
 
 @main.command(help="Scraper :: perform data scraping from sources.")
-@click.option('--req-count', default=0, help='Limit number of requests for parsers, 0 - no limit.',
+@click.option('--req-count', default=0,
+              help='Limit number of requests for parsers, 0 - limits from the source settings.',
               type=int, show_default=True)
+@click.option('--sink', 'sinks', multiple=True, type=LazyChoice(_sinks_names),
+              help='Output sink for the scraped ships (may be repeated), by default - from the config.')
+@click.option('--scraper', 'scrapers', multiple=True, type=LazyChoice(SCRAPERS.names),
+              help='Scraper to run (may be repeated), by default - all default scrapers.')
 @click.pass_context
-def scrap(context, req_count: int):
-    log.debug(f"Executing command: scrap. Requests limit: {req_count}."
+def scrap(context, req_count: int, sinks: tuple, scrapers: tuple):
+    log.debug(f"Executing command: scrap. Requests limit: {req_count}. Sinks: {sinks}. Scrapers: {scrapers}. "
               f"Dry run: {context.obj[CONTEXT_DRYRUN]}.")
-    scrap_all_data(context.obj[CONTEXT_DRYRUN], req_count)
+    from wfleet.scraper.engine.scraper_engine import scrap_all_data
+    scrap_all_data(context.obj[CONTEXT_DRYRUN], req_count, sinks, scrapers)
+
+
+@main.command(help="Scraper :: list registered scrapers (built-in and plugins).")
+@click.pass_context
+def scrapers_list(context):
+    log.debug("Executing command: scrapers list.")
+    from wfleet.scraper.engine.scraper_engine import execute_scrapers_list
+    execute_scrapers_list()
 
 
 @main.command(help="Scraper :: run Seaweb scraper engine.")
@@ -90,6 +155,7 @@ def scrap(context, req_count: int):
 @click.pass_context
 def seaweb_scrap(context):
     log.debug(f"Executing command: seaweb scrap. Dry run: {context.obj[CONTEXT_DRYRUN]}.")
+    from wfleet.scraper.engine.scraper_engine import execute_seaweb_scrap
     execute_seaweb_scrap(context.obj[CONTEXT_DRYRUN])
 
 
@@ -98,8 +164,66 @@ def seaweb_scrap(context):
 @click.pass_context
 def seaweb_parse(context):
     log.debug(f"Executing command: seaweb parse. Dry run: {context.obj[CONTEXT_DRYRUN]}.")
+    from wfleet.scraper.engine.scraper_engine import execute_seaweb_parse
     execute_seaweb_parse(context.obj[CONTEXT_DRYRUN])
 
 
+@main.command(help="Scraper :: (re)build IMO numbers index (known/denied/scraped).")
+@click.pass_context
+def imo_index(context):
+    log.debug(f"Executing command: imo index. Dry run: {context.obj[CONTEXT_DRYRUN]}.")
+    from wfleet.scraper.engine.scraper_engine import execute_imo_index_build
+    execute_imo_index_build(context.obj[CONTEXT_DRYRUN])
+
+
+@main.command(help="Scraper :: seed IMO candidates (verified by the Seaweb crawl) with generated plausible "
+                   "numbers.")
+@click.option('--limit', default=10000, help='Max number of IMO candidates, 0 - no limit.',
+              type=int, show_default=True)
+@click.pass_context
+def imo_candidates(context, limit: int):
+    log.debug(f"Executing command: imo candidates. Limit: {limit}. Dry run: {context.obj[CONTEXT_DRYRUN]}.")
+    from wfleet.scraper.engine.scraper_engine import execute_imo_candidates_seed
+    execute_imo_candidates_seed(context.obj[CONTEXT_DRYRUN], limit)
+
+
+@main.command(help="Scraper :: rebuild cache manifest (cached raw files) from the disk.")
+@click.pass_context
+def manifest_rebuild(context):
+    log.debug(f"Executing command: manifest rebuild. Dry run: {context.obj[CONTEXT_DRYRUN]}.")
+    from wfleet.scraper.engine.scraper_engine import execute_manifest_rebuild
+    execute_manifest_rebuild(context.obj[CONTEXT_DRYRUN])
+
+
+@main.command(help="Scraper :: cache manifest report (cached/failed/stale raw files).")
+@click.option('--stale-days', default=30, help='Raw files fetched earlier are stale, 0 - no stale check.',
+              type=int, show_default=True)
+@click.pass_context
+def manifest_report(context, stale_days: int):
+    log.debug(f"Executing command: manifest report. Stale days: {stale_days}.")
+    from wfleet.scraper.engine.scraper_engine import execute_manifest_report
+    execute_manifest_report(stale_days)
+
+
+@main.command(help="Scraper :: deduplicate identical raw files in the cache (hardlinks to blobs).")
+@click.pass_context
+def cache_dedup(context):
+    log.debug(f"Executing command: cache dedup. Dry run: {context.obj[CONTEXT_DRYRUN]}.")
+    from wfleet.scraper.engine.scraper_engine import execute_cache_dedup
+    execute_cache_dedup(context.obj[CONTEXT_DRYRUN])
+
+
+@main.command(help="Scraper :: diff of two cached scraper runs (added/removed/changed ships).")
+@click.argument('scraper_name')
+@click.option('--old-run', default='', help='Old run dir, by default - the previous run of the scraper.')
+@click.option('--new-run', default='', help='New run dir, by default - the last run of the scraper.')
+@click.option('--output', default='', help='Output file for the changes (JSON lines), by default - log.')
+@click.pass_context
+def runs_diff(context, scraper_name: str, old_run: str, new_run: str, output: str):
+    log.debug(f"Executing command: runs diff. Scraper: {scraper_name}.")
+    from wfleet.scraper.engine.scraper_engine import execute_runs_diff
+    execute_runs_diff(scraper_name, old_run, new_run, output)
+
+
 if __name__ == '__main__':
     main(obj={})
@@ -5,26 +5,40 @@
     Codes processor module for the Fleet Scraper.
 
     Created:  Gusev Dmitrii, 27.05.2022
-    Modified: Gusev Dmitrii, 19.06.2022
+    Modified: Gusev Dmitrii, 19.10.2026
 """
 
+import os
 import csv
+import atexit
 import logging
+import threading
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Optional, Set
 from wfleet.scraper.config.scraper_config import Config
-from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE, MSG_NOT_IMPLEMENTED
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
 from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.utils.imo_index import ImoBitmap, ImoIndex, generate_imo_candidates
 
 # init module logger
 log = logging.getLogger(__name__)
 log.debug(f"Logging for module {__name__} is configured.")
 
+# append-only log file suffix (log file is placed near the codes CSV file)
+CODES_LOG_SUFFIX: str = ".log"
+# default number of added codes buffered in memory before flush to the append-only log
+CODES_FLUSH_SIZE: int = 100
+# default number of codes in the append-only log before compaction into the sorted CSV file
+CODES_COMPACT_SIZE: int = 10000
+
 
 class CodesProcessor:
-    """CSV-file backed processor for codes list."""
+    """CSV-file backed processor for codes list. Codes are kept in memory in a set (O(1) membership
+    check), newly added codes are written (in batches) to the append-only log file, the log is
+    periodically compacted into the sorted CSV file. Processor is thread-safe."""
 
-    def __init__(self, file_name: str) -> None:
+    def __init__(self, file_name: str, flush_size: int = CODES_FLUSH_SIZE,
+                 compact_size: int = CODES_COMPACT_SIZE) -> None:
         log.debug(f'__init__(): initializing CodesListProcessor with file [{file_name}].')
         if not file_name:  # fail-fast for the empty file name
             raise ScraperException("Provided empty file name!")
@@ -34,49 +48,131 @@ class CodesProcessor:
 
         # init internal state
         self.__file_name: str = file_name
+        self.__log_file_name: str = file_name + CODES_LOG_SUFFIX
+        self.__flush_size: int = max(flush_size, 1)
+        self.__compact_size: int = max(compact_size, 1)
+        self.__lock = threading.RLock()
         self.__codes_list: Set[str] = set()
+        self.__sorted_codes: Optional[List[str]] = None  # cache for the sorted codes (for ranges)
+        self.__pending: List[str] = list()  # added codes, not flushed to the log yet
+        self.__log_size: int = 0  # number of codes in the log, not compacted yet
         self.__load_list()
 
     def __load_list(self) -> None:
         log.debug(f'__load_list(): loading codes from [{self.__file_name}].')
         codes: Set[str] = set()
-        with open(self.__file_name, mode='r') as file:  # read CSV file into internal set
-            csv_reader = csv.reader(file, delimiter=';')
-            for row in csv_reader:  # process all rows in a file
-                codes.add(row[0])
-        log.debug(f'Loaded #{len(codes)} codes from [{self.__file_name}].')
-        self.__codes_list = sorted(codes)
+        if Path(self.__file_name).exists():
+            with open(self.__file_name, mode='r') as file:  # read CSV file into internal set
+                csv_reader = csv.reader(file, delimiter=';')
+                for row in csv_reader:  # process all rows in a file
+                    if row:
+                        codes.add(row[0])
+
+        # replay append-only log (codes added after the last compaction)
+        if Path(self.__log_file_name).exists():
+            with open(self.__log_file_name, mode='r') as log_file:
+                for line in log_file:
+                    code: str = line.strip()
+                    if code:
+                        codes.add(code)
+                        self.__log_size += 1
+
+        log.debug(f'Loaded #{len(codes)} codes from [{self.__file_name}], log size: {self.__log_size}.')
+        self.__codes_list = codes
 
     def __save_list(self) -> None:
         log.debug(f'__save_list(): saving codes to [{self.__file_name}].')
-        with open(self.__file_name, mode='w') as file:  # save codes list to CSV file
+        tmp_file_name: str = self.__file_name + '.tmp'
+        Path(self.__file_name).parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file_name, mode='w') as file:  # save codes list to the temporary CSV file
             csv_writer = csv.writer(file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            for code in sorted(self.__codes_list):  # write codes to CSV file
+            for code in self.__get_sorted():  # write codes to CSV file
                 csv_writer.writerow([code])
+        os.replace(tmp_file_name, self.__file_name)  # atomic replace of the codes file
         log.debug(f'Saved #{len(self.__codes_list)} codes to [{self.__file_name}].')
 
+    def __get_sorted(self) -> List[str]:
+        if self.__sorted_codes is None:  # sort codes only once after any change
+            self.__sorted_codes = sorted(self.__codes_list)
+        return self.__sorted_codes
+
+    def flush(self) -> None:
+        """Write pending (added) codes to the append-only log, compact the log if it's too big."""
+        with self.__lock:
+            if self.__pending:
+                Path(self.__log_file_name).parent.mkdir(parents=True, exist_ok=True)
+                with open(self.__log_file_name, mode='a') as log_file:
+                    log_file.write('\n'.join(self.__pending) + '\n')
+                self.__log_size += len(self.__pending)
+                log.debug(f'flush(): flushed #{len(self.__pending)} codes to [{self.__log_file_name}].')
+                self.__pending.clear()
+
+            if self.__log_size >= self.__compact_size:
+                self.compact()
+
+    def compact(self) -> None:
+        """Compact append-only log into the sorted CSV file (log is removed)."""
+        with self.__lock:
+            log.debug(f'compact(): compacting codes log [{self.__log_file_name}].')
+            self.__pending.clear()  # all pending codes are in the memory set - will be saved
+            self.__save_list()
+            Path(self.__log_file_name).unlink(missing_ok=True)
+            self.__log_size = 0
+
+    def close(self) -> None:
+        """Flush pending codes and compact the log."""
+        with self.__lock:
+            self.flush()
+            if self.__log_size > 0:
+                self.compact()
+
     def codes(self) -> Set[str]:
         log.debug('codes(): returning codes list.')
-        return self.__codes_list
+        with self.__lock:
+            return set(self.__codes_list)
 
     def add(self, code: str) -> None:
         log.debug(f'add(): adding code {code}.')
-        # if code not empty and not in the list - add and save list
-        if code and code not in self.__codes_list:
-            self.__codes_list.add(code)
-            self.__save_list()
+        with self.__lock:
+            # if code not empty and not in the list - add and (maybe) flush
+            if code and code not in self.__codes_list:
+                self.__codes_list.add(code)
+                self.__sorted_codes = None
+                self.__pending.append(code)
+                if len(self.__pending) >= self.__flush_size:
+                    self.flush()
 
-    def add_all(self, codes: Set[str]) -> None:
+    def add_all(self, codes: Iterable[str]) -> None:
         log.debug('add_all(): adding a list of codes.')
         # if codes list is not empty - adding all codes
         if codes:
-            self.__codes_list.update(codes)
-            self.__save_list()
+            with self.__lock:
+                new_codes: Set[str] = {code for code in codes if code} - self.__codes_list
+                if new_codes:
+                    self.__codes_list.update(new_codes)
+                    self.__sorted_codes = None
+                    self.__pending.extend(sorted(new_codes))
+                    self.flush()
 
     def ranges(self, num_of_ranges: int) -> List[Set[str]]:
-        log.debug('ranges(): ...')
-        # todo: implementation!
-        raise NotImplementedError(MSG_NOT_IMPLEMENTED)
+        """Split codes into the provided number of ranges. Each range is a contiguous block of
+        sorted codes (for IMO numbers - contiguous block of numbers), sizes of ranges differ at
+        most by one code. If there are fewer codes than ranges - returns only non-empty ranges."""
+        log.debug(f'ranges(): splitting codes into {num_of_ranges} range(s).')
+        if num_of_ranges <= 0:
+            raise ScraperException(f"Invalid number of ranges: {num_of_ranges}!")
+
+        with self.__lock:
+            codes: List[str] = self.__get_sorted()
+            size, remainder = divmod(len(codes), num_of_ranges)
+            result: List[Set[str]] = list()
+            start: int = 0
+            for counter in range(num_of_ranges):
+                end: int = start + size + (1 if counter < remainder else 0)
+                if end > start:
+                    result.append(set(codes[start:end]))
+                start = end
+            return result
 
     def contains(self, code: str) -> bool:
         if not code:
@@ -86,41 +182,96 @@ class CodesProcessor:
         log.debug(f'contains(): codes list contains code {code} = {result}.')
         return result
 
+    def __contains__(self, code: str) -> bool:
+        return self.contains(code)
+
+    def __len__(self) -> int:
+        return len(self.__codes_list)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
 
 class CodesProcessorFactory:
-    """Simple hard-coded factory class for the CodesProcessor instances."""
+    """Simple hard-coded factory class for the CodesProcessor instances. Factory is thread-safe."""
 
     # todo: remove hardcoded values
     # todo: make methods for getting codes more genric
 
     # class variables
     processors: Dict[str, CodesProcessor] = dict()
+    indexes: Dict[str, ImoIndex] = dict()
     config: Config = Config()
+    lock = threading.Lock()
+
+    @classmethod
+    def _get_processor(cls, key: str, file_name: str) -> CodesProcessor:
+        with cls.lock:
+            if key not in cls.processors:  # processor may be empty (falsy) - check the presence only
+                log.debug(f'Processor [{key}] is not initialized yet, initializing.')
+                if not cls.processors:  # the first processor - flush all processors on exit
+                    atexit.register(cls.close_all)
+                cls.processors[key] = CodesProcessor(file_name)
+            return cls.processors[key]
 
     @classmethod
     def imo_codes(cls) -> CodesProcessor:
         log.debug('imo_codes(): working.')
-        if not cls.processors.get('imo', None):
-            log.debug('IMO processor is not initialized yet, initializing.')
-            cls.processors['imo'] = CodesProcessor(cls.config.imo_file)
-        return cls.processors['imo']
+        return cls._get_processor('imo', cls.config.imo_file)
+
+    @classmethod
+    def imo_candidates(cls) -> CodesProcessor:
+        """Unverified IMO candidates - become IMO codes after the successful fetch only."""
+        log.debug('imo_candidates(): working.')
+        return cls._get_processor('imo_candidates', cls.config.imo_candidates_file)
 
     @classmethod
-    def seaweb_shipbuildes_codes(cls):
+    def seaweb_shipbuildes_codes(cls) -> CodesProcessor:
         log.debug('seaweb_shipbuildes_codes(): working.')
-        if not cls.processors.get('seaweb_shipbuilders', None):
-            log.debug('Seaweb Shipbuilders processor is not initialized yet, initializing.')
-            cls.processors['seaweb_shipbuilders'] = CodesProcessor(cls.config.seaweb_shipbuilders_codes_file)
-        return cls.processors['seaweb_shipbuilders']
+        return cls._get_processor('seaweb_shipbuilders', cls.config.seaweb_shipbuilders_codes_file)
 
     @classmethod
-    def seaweb_shipcompanies_codes(cls):
+    def seaweb_shipcompanies_codes(cls) -> CodesProcessor:
         log.debug('seaweb_shipcompanies_codes(): working.')
-        if not cls.processors.get('seaweb_shipcompanies', None):
-            log.debug('Seaweb Shipcompanies processor is not initialized yet, initializing.')
-            cls.processors['seaweb_shipcompanies'] = \
-                CodesProcessor(cls.config.seaweb_shipcompanies_codes_file)
-        return cls.processors['seaweb_shipcompanies']
+        return cls._get_processor('seaweb_shipcompanies', cls.config.seaweb_shipcompanies_codes_file)
+
+    @classmethod
+    def imo_index(cls) -> ImoIndex:
+        """IMO numbers bitmap index (known/denied/scraped), bitmaps are memory-mapped on first use."""
+        log.debug('imo_index(): working.')
+        with cls.lock:
+            if 'imo' not in cls.indexes:  # index may be empty (falsy) - check the presence only
+                cls.indexes['imo'] = ImoIndex(cls.config.imo_index_dir)
+            return cls.indexes['imo']
+
+    @classmethod
+    def seed_imo_candidates(cls, limit: int = 0) -> int:
+        """Generate IMO candidates (by the configured ranges) and add them to the IMO candidates (not to
+        the IMO codes - candidates aren't known until verified by the crawl, so they don't affect the
+        known numbers density), returns number of added candidates."""
+        log.debug(f'seed_imo_candidates(): working, limit: {limit}.')
+        index: ImoIndex = cls.imo_index()
+        imo_candidates: CodesProcessor = cls.imo_candidates()
+        known: ImoBitmap = index.known() | ImoBitmap.from_codes(cls.imo_codes().codes())  # verified numbers
+        # denied + pending candidates
+        excluded: ImoBitmap = index.denied() | ImoBitmap.from_codes(imo_candidates.codes())
+        candidates = generate_imo_candidates(cls.config.imo_candidates_ranges, known, excluded,
+                                             window=cls.config.imo_candidates_window,
+                                             min_density=cls.config.imo_candidates_min_density, limit=limit)
+        before: int = len(imo_candidates)
+        imo_candidates.add_all({str(candidate) for candidate in candidates.tolist()})
+        return len(imo_candidates) - before
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Flush and compact all created processors."""
+        log.debug('close_all(): closing all codes processors.')
+        with cls.lock:
+            for processor in cls.processors.values():
+                processor.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    IMO numbers index module for the Fleet Scraper. IMO number is a 7-digit number, the last
+    digit is a check digit: (d1*7 + d2*6 + d3*5 + d4*4 + d5*3 + d6*2) mod 10 = d7.
+
+    The whole IMO numbers space (10M numbers) is represented as a bitmap (1 bit per number, about
+    1.2MB per bitmap). Index keeps separate bitmaps for known, denied and scraped IMO numbers, the
+    bitmaps are stored as numpy (.npy) files and loaded as memory-mapped arrays.
+
+    Useful materials:
+      - https://en.wikipedia.org/wiki/IMO_number
+      - https://numpy.org/doc/stable/reference/generated/numpy.load.html (mmap_mode)
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import os
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
+from wfleet.scraper.cache.cache_manifest import CacheManifest, MANIFEST_ENTITY_SHIP
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+# init module logger
+log = logging.getLogger(__name__)
+log.debug(f"Logging for module {__name__} is configured.")
+
+# IMO numbers space constants
+IMO_SPACE_SIZE: int = 10_000_000  # all 7-digit numbers (bitmap size in bits)
+IMO_MIN: int = 1_000_000  # the lowest 7-digit number
+IMO_MAX: int = IMO_SPACE_SIZE - 1  # the highest 7-digit number
+IMO_CHECK_WEIGHTS = np.array([7, 6, 5, 4, 3, 2], dtype=np.int64)  # weights for the check digit
+IMO_DIGITS_DIVISORS = np.array([10 ** 6, 10 ** 5, 10 ** 4, 10 ** 3, 10 ** 2, 10], dtype=np.int64)
+# numbers processed at once by the candidates generator (bounds the memory of the temporary arrays)
+IMO_CANDIDATES_CHUNK_SIZE: int = 1_000_000
+
+# index bitmaps kinds
+IMO_KNOWN: str = "known"  # known IMO numbers (codes file)
+IMO_DENIED: str = "denied"  # IMO numbers without data in the source (access is denied)
+IMO_SCRAPED: str = "scraped"  # already scraped IMO numbers
+IMO_INDEX_KINDS: Tuple[str, ...] = (IMO_KNOWN, IMO_DENIED, IMO_SCRAPED)
+
+# number of set bits for each byte value (used for the fast bits counting)
+_POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def imo_check_digits_valid(numbers: Union[np.ndarray, Iterable[int]]) -> np.ndarray:
+    """Vectorized IMO number validation: returns boolean mask for the provided numbers - number
+    is valid if it is 7-digit number with the correct check digit."""
+    values = np.asarray(numbers, dtype=np.int64)
+    check_sum = np.zeros(values.shape, dtype=np.int64)
+    for divisor, weight in zip(IMO_DIGITS_DIVISORS.tolist(), IMO_CHECK_WEIGHTS.tolist()):  # first 6 digits
+        check_sum += (values // divisor) % 10 * weight  # digit by digit - no (numbers x digits) matrix
+    return (values >= IMO_MIN) & (values <= IMO_MAX) & (check_sum % 10 == values % 10)
+
+
+def is_valid_imo(code: Union[str, int]) -> bool:
+    """Check one IMO number (as string or int)."""
+    if isinstance(code, str):
+        code = code.strip()
+        if not code.isdigit():
+            return False
+    return bool(imo_check_digits_valid([int(code)])[0])
+
+
+class ImoBitmap:
+    """Compact bitmap over the whole IMO numbers space (bit #N is set - number N is in the bitmap)."""
+
+    def __init__(self, bits: Optional[np.ndarray] = None) -> None:
+        if bits is None:  # empty bitmap
+            bits = np.zeros(IMO_SPACE_SIZE // 8, dtype=np.uint8)
+        if bits.dtype != np.uint8 or bits.shape != (IMO_SPACE_SIZE // 8,):
+            raise ScraperException(f"Invalid IMO bitmap: {bits.dtype}, {bits.shape}!")
+        self.__bits: np.ndarray = bits
+
+    @classmethod
+    def from_numbers(cls, numbers: Union[np.ndarray, Iterable[int]]) -> "ImoBitmap":
+        bitmap = cls()
+        bitmap.add(numbers)
+        return bitmap
+
+    @classmethod
+    def from_codes(cls, codes: Iterable[str]) -> "ImoBitmap":
+        """Build bitmap from string codes, non-numeric codes are skipped."""
+        numbers = [int(code) for code in codes if code and code.isdigit()]
+        return cls.from_numbers(numbers)
+
+    @classmethod
+    def load(cls, file_name: str) -> "ImoBitmap":
+        """Load bitmap from the numpy file as a memory-mapped (read-only) array."""
+        log.debug(f"load(): loading IMO bitmap from [{file_name}].")
+        if not file_name or not Path(file_name).is_file():
+            raise ScraperException(f"IMO bitmap file [{file_name}] is empty or not a file!")
+        return cls(np.load(file_name, mmap_mode="r"))
+
+    def save(self, file_name: str) -> None:
+        """Save bitmap to the numpy file (file is replaced atomically)."""
+        log.debug(f"save(): saving IMO bitmap to [{file_name}].")
+        if not file_name:
+            raise ScraperException("Provided empty file name!")
+        Path(file_name).parent.mkdir(parents=True, exist_ok=True)
+        tmp_file_name: str = file_name + ".tmp.npy"
+        np.save(tmp_file_name, np.asarray(self.__bits))
+        os.replace(tmp_file_name, file_name)
+
+    @property
+    def bits(self) -> np.ndarray:
+        return self.__bits
+
+    def add(self, numbers: Union[np.ndarray, Iterable[int]]) -> None:
+        """Add numbers to the bitmap, numbers outside of the IMO space are ignored."""
+        values = np.asarray(list(numbers) if not isinstance(numbers, np.ndarray) else numbers, dtype=np.int64)
+        values = values[(values >= 0) & (values < IMO_SPACE_SIZE)]
+        if not self.__bits.flags.writeable:  # memory-mapped (read-only) bitmap - copy on write
+            self.__bits = np.array(self.__bits)
+        # set bits in place (unbuffered - duplicated numbers in the same byte are handled correctly)
+        np.bitwise_or.at(self.__bits, values >> 3, (0x80 >> (values & 7)).astype(np.uint8))
+
+    def mask(self, start: int = 0, end: int = IMO_SPACE_SIZE) -> np.ndarray:
+        """Boolean mask for the numbers range [start, end)."""
+        byte_start, byte_end = start // 8, (end + 7) // 8
+        unpacked = np.unpackbits(self.__bits[byte_start:byte_end])
+        return unpacked[start - byte_start * 8:end - byte_start * 8].astype(bool)
+
+    def numbers(self, start: int = 0, end: int = IMO_SPACE_SIZE) -> np.ndarray:
+        """Sorted array of numbers in the bitmap in the range [start, end)."""
+        return np.flatnonzero(self.mask(start, end)) + start
+
+    def codes(self) -> Set[str]:
+        return {str(number) for number in self.numbers().tolist()}
+
+    def ranges(self, start: int = 0, end: int = IMO_SPACE_SIZE) -> Iterator[Tuple[int, int]]:
+        """Iterate over contiguous ranges [range_start, range_end) of numbers in the bitmap."""
+        mask = self.mask(start, end).astype(np.int8)
+        edges = np.flatnonzero(np.diff(mask, prepend=0, append=0))  # starts and ends of the runs
+        for range_start, range_end in zip(edges[0::2], edges[1::2]):
+            yield int(range_start) + start, int(range_end) + start
+
+    def __contains__(self, number: Union[int, str]) -> bool:
+        if isinstance(number, str):
+            if not number.isdigit():
+                return False
+            number = int(number)
+        if number < 0 or number >= IMO_SPACE_SIZE:
+            return False
+        return bool(self.__bits[number >> 3] & (0x80 >> (number & 7)))
+
+    def __len__(self) -> int:
+        return int(_POPCOUNT_TABLE[self.__bits].sum(dtype=np.int64))
+
+    def __and__(self, other: "ImoBitmap") -> "ImoBitmap":
+        return ImoBitmap(np.bitwise_and(self.__bits, other.bits))
+
+    def __or__(self, other: "ImoBitmap") -> "ImoBitmap":
+        return ImoBitmap(np.bitwise_or(self.__bits, other.bits))
+
+    def __sub__(self, other: "ImoBitmap") -> "ImoBitmap":
+        return ImoBitmap(np.bitwise_and(self.__bits, np.invert(other.bits)))
+
+    def __xor__(self, other: "ImoBitmap") -> "ImoBitmap":
+        return ImoBitmap(np.bitwise_xor(self.__bits, other.bits))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ImoBitmap) and np.array_equal(self.__bits, other.bits)
+
+
+class ImoIndex:
+    """IMO numbers index: known, denied and scraped IMO bitmaps stored in the index directory.
+    Bitmaps are loaded lazily (memory-mapped) on the first access."""
+
+    def __init__(self, index_dir: str) -> None:
+        log.debug(f"__init__(): initializing ImoIndex in [{index_dir}].")
+        if not index_dir:
+            raise ScraperException("Provided empty index dir!")
+        if Path(index_dir).exists() and not Path(index_dir).is_dir():
+            raise ScraperException(f"Provided index dir [{index_dir}] is not a dir!")
+
+        self.__index_dir: str = index_dir
+        self.__bitmaps: Dict[str, ImoBitmap] = dict()
+
+    def _bitmap_file(self, kind: str) -> str:
+        if kind not in IMO_INDEX_KINDS:
+            raise ScraperException(f"Unknown IMO index kind: [{kind}]!")
+        return self.__index_dir + "/imo_" + kind + ".npy"
+
+    def bitmap(self, kind: str) -> ImoBitmap:
+        """Get bitmap of the provided kind, missing bitmap is empty."""
+        if kind not in self.__bitmaps:
+            file_name: str = self._bitmap_file(kind)
+            self.__bitmaps[kind] = ImoBitmap.load(file_name) if Path(file_name).is_file() else ImoBitmap()
+        return self.__bitmaps[kind]
+
+    def update(self, kind: str, bitmap: ImoBitmap) -> None:
+        """Replace bitmap of the provided kind and save it to the index dir."""
+        bitmap.save(self._bitmap_file(kind))
+        self.__bitmaps[kind] = bitmap
+
+    def known(self) -> ImoBitmap:
+        return self.bitmap(IMO_KNOWN)
+
+    def denied(self) -> ImoBitmap:
+        return self.bitmap(IMO_DENIED)
+
+    def scraped(self) -> ImoBitmap:
+        return self.bitmap(IMO_SCRAPED)
+
+    def plan(self, known_codes: Optional[Iterable[str]] = None) -> ImoBitmap:
+        """IMO numbers for the next crawl: known (+ provided codes, added after the index build) -
+        scraped - denied."""
+        known: ImoBitmap = self.known()
+        if known_codes is not None:
+            known = known | ImoBitmap.from_codes(known_codes)
+        return known - self.scraped() - self.denied()
+
+
+def build_imo_index(index: ImoIndex, known_codes: Iterable[str], ships_dir: str,
+                    main_file_name: str, manifest: Optional[CacheManifest] = None) -> ImoIndex:
+    """(Re)build IMO index: known numbers - from the provided codes, scraped and denied numbers -
+    from the raw ships directory (ship main page with 'Access is denied.' - denied number). If the
+    cache manifest is provided - scraped/denied numbers are taken from it (no ships dir walk)."""
+    log.debug(f"build_imo_index(): building IMO index, ships dir [{ships_dir}].")
+
+    scraped: list = list()
+    denied: list = list()
+    if manifest is not None:
+        page_key: str = os.path.splitext(main_file_name)[0]
+        denied_ids, scraped_ids = manifest.split_by_marker(MANIFEST_ENTITY_SHIP, page_key,
+                                                           "Access is denied.")
+        denied = [int(ship_id) for ship_id in denied_ids if ship_id.isdigit()]
+        scraped = [int(ship_id) for ship_id in scraped_ids if ship_id.isdigit()]
+    elif ships_dir and Path(ships_dir).is_dir():
+        with os.scandir(ships_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir() or not entry.name.isdigit():  # skip non-numeric entries
+                    continue
+                main_file: str = entry.path + "/" + main_file_name
+                if not Path(main_file).is_file():  # ship isn't scraped (yet)
+                    continue
+                with open(main_file, mode="r") as file:
+                    if "Access is denied." in file.read():
+                        denied.append(int(entry.name))
+                    else:
+                        scraped.append(int(entry.name))
+
+    index.update(IMO_KNOWN, ImoBitmap.from_codes(known_codes))
+    index.update(IMO_SCRAPED, ImoBitmap.from_numbers(scraped))
+    index.update(IMO_DENIED, ImoBitmap.from_numbers(denied))
+    log.info(f"Built IMO index: known {len(index.known())}, scraped {len(scraped)}, denied {len(denied)}.")
+
+    return index
+
+
+def _range_chunks(ranges: Sequence[Tuple[int, int]],
+                  chunk_size: int = IMO_CANDIDATES_CHUNK_SIZE) -> Iterator[Tuple[int, int]]:
+    """Split the numbers ranges [start, end) (limited by the IMO space) into chunks [start, end)."""
+    for start, end in ranges:
+        start, end = max(start, IMO_MIN), min(end, IMO_SPACE_SIZE)
+        for chunk_start in range(start, end, chunk_size):
+            yield chunk_start, min(chunk_start + chunk_size, end)
+
+
+def generate_imo_candidates(ranges: Sequence[Tuple[int, int]], known: ImoBitmap,
+                            denied: Optional[ImoBitmap] = None, window: int = 1000,
+                            min_density: int = 1, limit: int = 0) -> np.ndarray:
+    """Generate IMO candidates for the discovery: all check-digit-valid numbers in the provided
+    ranges [start, end), except already known and denied ones. Candidates are ordered by the density
+    of known numbers nearby (number of known numbers in the [n - window, n + window] neighbourhood),
+    candidates with the density lower than min_density are dropped.
+    :param ranges: list of numbers ranges [start, end) for the candidates generation
+    :param known: bitmap of known IMO numbers
+    :param denied: bitmap of denied IMO numbers (optional)
+    :param window: half-size of the neighbourhood for the density calculation
+    :param min_density: min number of known numbers in the neighbourhood of the candidate
+    :param limit: max number of candidates, 0 or less - no limit
+    :return: array of candidates (the densest first, same density - ascending order)
+    """
+    log.debug(f"generate_imo_candidates(): ranges {ranges}, window {window}, min density {min_density}.")
+
+    if not ranges:
+        raise ScraperException("Provided empty ranges for IMO candidates!")
+    if window < 0:
+        raise ScraperException(f"Invalid density window: {window}!")
+
+    excluded: ImoBitmap = known | denied if denied is not None else known
+    candidates_list: List[np.ndarray] = list()
+    densities_list: List[np.ndarray] = list()
+    # by chunks - temporary arrays are bounded by the chunk size
+    for start, end in _range_chunks(ranges, IMO_CANDIDATES_CHUNK_SIZE):
+        numbers = np.arange(start, end, dtype=np.int64)
+        selected = numbers[imo_check_digits_valid(numbers) & ~excluded.mask(start, end)]  # valid and new
+
+        # density of known numbers: prefix sums over the chunk, extended by the window
+        ext_start, ext_end = max(start - window, 0), min(end + window, IMO_SPACE_SIZE)
+        prefix = np.concatenate(([0], np.cumsum(known.mask(ext_start, ext_end), dtype=np.int32)))
+        positions = selected - ext_start
+        lower = np.maximum(positions - window, 0)
+        upper = np.minimum(positions + window + 1, ext_end - ext_start)
+        density = prefix[upper] - prefix[lower]
+
+        dense = density >= min_density
+        candidates_list.append(selected[dense])
+        densities_list.append(density[dense])
+
+    if not candidates_list:
+        return np.empty(0, dtype=np.int64)
+
+    candidates = np.concatenate(candidates_list)
+    densities = np.concatenate(densities_list)
+    order = np.lexsort((candidates, -densities))  # the densest first, then by number
+    result = candidates[order]
+
+    if limit > 0:
+        result = result[:limit]
+    log.debug(f"Generated #{len(result)} IMO candidates.")
+
+    return result
+
+
+if __name__ == "__main__":
+    print(MSG_MODULE_ISNT_RUNNABLE)
@@ -8,11 +8,12 @@
       - (datetime) https://docs.python.org/3/library/datetime.html#strftime-strptime-behavior
 
     Created:  Gusev Dmitrii, 26.04.2021
-    Modified: Gusev Dmitrii, 19.06.2022
+    Modified: Gusev Dmitrii, 19.10.2026
 """
 
 import logging
 import hashlib
+import dataclasses
 from typing import Dict, Any
 from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
 from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
@@ -46,6 +47,29 @@ def singleton(class_):
     return getinstance
 
 
+def dataclass_slots(class_):
+    """Dataclass decorator - adds __slots__ (by dataclass fields) to the dataclass, so its instances
+    have no per-instance __dict__. Should be applied over the @dataclass decorator (dataclass(slots=True)
+    is available only since python 3.10). Decorated class shouldn't use zero-argument super().
+    """
+    if not dataclasses.is_dataclass(class_):
+        raise ScraperException(f"Class {class_.__name__} isn't a dataclass!")
+    if "__slots__" in class_.__dict__:
+        raise ScraperException(f"Class {class_.__name__} already has __slots__!")
+
+    class_dict = dict(class_.__dict__)
+    field_names = tuple(field.name for field in dataclasses.fields(class_))
+    class_dict["__slots__"] = field_names
+    for name in field_names:  # class attributes (defaults) conflict with the slots
+        class_dict.pop(name, None)
+    class_dict.pop("__dict__", None)
+    class_dict.pop("__weakref__", None)
+
+    slotted_class = type(class_)(class_.__name__, class_.__bases__, class_dict)
+    slotted_class.__qualname__ = class_.__qualname__
+    return slotted_class
+
+
 def get_hash_bucket_number(value: str, buckets: int) -> int:
     """Generate hash bucket number for the given value, generated bucket number
     will be less than provided buckets count.
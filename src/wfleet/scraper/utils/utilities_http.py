@@ -8,19 +8,23 @@
         - (download file) https://stackoverflow.com/questions/7243750/download-file-from-web-in-python-3
 
     Created:  Dmitrii Gusev, 01.06.2021
-    Modified: Dmitrii Gusev, 19.06.2022
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
 import os
 import ssl
+import time
 import logging
 import shutil
+import threading
 import requests
 from pathlib import Path
 from requests import Response
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from urllib import request, parse, error
 from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.cache.cache_manifest import CacheManifest
+from wfleet.scraper.cache.cache_blobs import BlobStore, is_empty_page
 from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
 from wfleet.scraper.config.scraper_messages import MSG_MODULE_ISNT_RUNNABLE
 
@@ -35,13 +39,39 @@ TIMEOUT_URLLIB_URLOPEN = 5
 config = Config()
 
 
+class RateLimiter:
+    """Requests rate limiter (thread-safe): each wait() returns not earlier than 1/rate seconds after the
+    previous one. Rate <= 0 - no limit."""
+
+    def __init__(self, rate: float = 0) -> None:
+        self.__interval: float = 1 / rate if rate > 0 else 0
+        self.__next: float = 0  # monotonic time of the next allowed request
+        self.__lock = threading.Lock()
+
+    def wait(self) -> None:
+        if self.__interval <= 0:
+            return
+        with self.__lock:  # request slots are reserved in the order of the calls
+            now: float = time.monotonic()
+            slot: float = max(now, self.__next)
+            self.__next = slot + self.__interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 class WebClient():
     """Simple WebClient Singleton class (based on [requests] module)."""
 
-    def __init__(self, headers: dict, cookies: dict) -> None:
+    def __init__(self, headers: dict, cookies: dict, manifest: Optional[CacheManifest] = None,
+                 blobs: Optional[BlobStore] = None, timeout: Optional[float] = None,
+                 rate_limiter: Optional[RateLimiter] = None) -> None:
         log.debug("Initializing WebCLient() singleton instance.")
         self.headers = headers
         self.cookies = cookies
+        self.manifest = manifest  # cache manifest - updated on every written file (if provided)
+        self.blobs = blobs  # blobs store - identical files are deduplicated (if provided)
+        self.timeout = timeout  # requests timeout, seconds (None - no timeout)
+        self.rate_limiter = rate_limiter  # requests rate limiter (if provided)
         self.session = requests.Session()
 
         if headers and len(headers) > 0:  # add headers
@@ -62,7 +92,9 @@ class WebClient():
         if not url:
             raise ScraperException("Empty URL for get request!")
 
-        response = self.session.get(url, allow_redirects=allow_redirects)
+        if self.rate_limiter:
+            self.rate_limiter.wait()
+        response = self.session.get(url, allow_redirects=allow_redirects, timeout=self.timeout)
         if response.status_code != 200 and fail_on_error:  # fail on purpose - by parameter
             raise ScraperException(f"Get request [{url}] failed with [{response.status_code}]!")
 
@@ -76,20 +108,39 @@ class WebClient():
 
         return ''
 
-    def get_text_2_file(self, url: str, file: str, allow_redicrects: bool, fail_on_error: bool) -> None:
+    def get_text_2_file(self, url: str, file: str, allow_redicrects: bool, fail_on_error: bool,
+                        entity: str = '', entity_id: str = '', page_key: str = '') -> None:
         log.debug(f'get_text_2_file(): saving response text to file {file}.')
 
         if not file or Path(file).exists():
             raise ScraperException(f'File name {file} is empty or file already exists!')
 
-        response_text: str = self.get_text(url, allow_redicrects, fail_on_error)
+        response = self.get(url, allow_redicrects, fail_on_error=False)
+        if response.status_code != 200:  # failed request - record it in the manifest and (maybe) fail
+            if self.manifest:
+                self.manifest.record(file, entity, entity_id, page_key, None, response.status_code)
+            if fail_on_error:  # fail on purpose - by parameter
+                raise ScraperException(f"Get request [{url}] failed with [{response.status_code}]!")
+            return  # error page isn't cached - it will be requested again
+
+        response_text: str = response.text
         if response_text:
-            with open(Path(file), 'w') as f:  # write content to the file
-                f.write(response_text)
-                log.debug(f"Written file: {file}")
+            content: bytes = response_text.encode(config.encoding)
+            digest: Optional[str] = None
+            if self.blobs:  # write content as a link to the blob (deduplicated)
+                digest, created = self.blobs.write(content, file)
+                if created and self.manifest and is_empty_page(content):  # new content without data
+                    self.manifest.mark_empty(digest, page_key)
+            else:
+                with open(Path(file), 'wb') as f:  # write content to the file
+                    f.write(content)
+            log.debug(f"Written file: {file}")
+            if self.manifest:
+                self.manifest.record(file, entity, entity_id, page_key, content, response.status_code,
+                                     digest=digest)
 
     def get_text_2_files(self, urls: Dict[str, str], dir: str, allow_redicrects: bool,
-                         fail_on_error: bool) -> None:
+                         fail_on_error: bool, entity: str = '', entity_id: str = '') -> None:
         log.debug(f'get_text_2_files(): saving multiple urls to dir: {dir}.')
 
         if not urls:
@@ -105,7 +156,7 @@ class WebClient():
             file = dir + "/" + key + ".html"
             if not Path(file).exists():  # if file doesn't exist - request it
                 # HTTP GET request + save to file
-                self.get_text_2_file(urls[key], file, allow_redicrects, fail_on_error)
+                self.get_text_2_file(urls[key], file, allow_redicrects, fail_on_error, entity, entity_id, key)
 
 
 # todo: add perform_http_get_request() method + appropriately rename the method below
@@ -119,12 +170,16 @@ def perform_http_get_request(url: str) -> str:  # todo: refactor - generalize
     return ""
 
 
-def perform_http_post_request(url: str, request_params: dict, retry_count: int = 0) -> str:
+def perform_http_post_request(url: str, request_params: dict, retry_count: int = 0,
+                              timeout: float = TIMEOUT_URLLIB_URLOPEN,
+                              rate_limiter: Optional[RateLimiter] = None) -> str:
     """Perform one HTTP POST request with one form parameter for search.
     :param url:
     :param request_params:
     :param retry_count: number of retries. 0 -> no retries (one request), less than 0 -> no requests at all,
                         greater than 0 -> (retry_count + 1) - such number of requests
+    :param timeout: request timeout, seconds, None - no timeout
+    :param rate_limiter: requests rate limiter (each try waits for it), None - no limit
     :return: HTML output with found data
     """
 
@@ -140,8 +195,10 @@ def perform_http_post_request(url: str, request_params: dict, retry_count: int =
     my_response = None
     while tries_counter <= retry_count and not response_ok:  # perform specified number of requests
         log.debug(f"HTTP POST: URL: {url}, data: {request_params}, try #{tries_counter}/{retry_count}.")
+        if rate_limiter:
+            rate_limiter.wait()
         try:
-            my_response = request.urlopen(req, context=context, timeout=TIMEOUT_URLLIB_URLOPEN)
+            my_response = request.urlopen(req, context=context, timeout=timeout)
             response_ok = True  # after successfully done request we should stop requests
         except (TimeoutError, error.URLError) as e:
             log.error(
@@ -159,11 +216,13 @@ def perform_http_post_request(url: str, request_params: dict, retry_count: int =
     return result
 
 
-def perform_file_download_over_http(url: str, target_dir: str, target_file: str = None) -> str:
+def perform_file_download_over_http(url: str, target_dir: str, target_file: str = None,
+                                    timeout: Optional[float] = None) -> str:
     """Downloads file via HTTP protocol.
     :param url: URL for file download, shouldn't be empty.
     :param target_dir: local dir to save file, if empty - save to the current dir
     :param target_file: local file name to save, if empty - file name will be derived from URL
+    :param timeout: connect/read timeout, seconds, None - no timeout
     :return: path to locally saved file, that was downloaded
     """
     log.debug(
@@ -194,7 +253,7 @@ def perform_file_download_over_http(url: str, target_dir: str, target_file: str
     log.debug(f"Generated local full path: {local_path}")
 
     # download the file from the provided `url` and save it locally under certain `file_name`:
-    with request.urlopen(url) as my_response, open(local_path, "wb") as out_file:
+    with request.urlopen(url, timeout=timeout) as my_response, open(local_path, "wb") as out_file:
         shutil.copyfileobj(my_response, out_file)
     log.info(f"Downloaded file: {url} and put here: {local_path}")
 
@@ -2,29 +2,82 @@
 # -*- coding: utf-8 -*-
 
 """
-    Excel-related utilities module for Fleet DB Scraper.
+    Excel-related utilities module for Fleet DB Scraper. Ships are saved into xlsx files by the
+    streaming writer: sheet xml is written row by row directly into the xlsx (zip) archive (inline
+    strings, no shared strings table, no cell objects), so memory is flat for any number of ships.
+    Sheet is rolled over at the xlsx rows limit. Exported files (legacy xls and xlsx) are loaded back
+    by the streaming loaders, columns are mapped by the header row.
 
     Useful resources:
         - (excel)       http://www.python-excel.org/
+        - (xlsx format) http://officeopenxml.com/anatomyofOOXML-xlsx.php
         - (pathlib - 1) https://habr.com/ru/post/453862/
         - (pathlib - 2) https://habr.com/ru/company/otus/blog/540380/ (!)
 
     Created:  Dmitrii Gusev, 24.05.2021
-    Modified: Dmitrii Gusev, 19.06.2022
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
-import xlwt
+import io
+import re
+import zipfile
+import xlrd
 import logging
 from pathlib import Path
-
-from typing import List
-from wfleet.scraper.entities.ship import ShipDto
+from itertools import islice
+from datetime import datetime
+from operator import attrgetter
+from openpyxl import Workbook, load_workbook
+from openpyxl.utils import get_column_letter
+from xml.sax.saxutils import escape, quoteattr
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.cache.scraper_cache import cache_get_raw_file
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS, SHIP_TIMESTAMP_FIELDS
+from wfleet.scraper.entities.ship import iter_ships_from_tuples, parse_ship_timestamp
+from wfleet.scraper.entities.ship_batch import ShipBatch
 
 # init module logger
-# log = logging.getLogger(const.LOGGING_UTILITIES_XLS_LOGGER)
 log = logging.getLogger(__name__)
 log.debug(f"Logging for module {__name__} is configured.")
 
+EXCEL_DEFAULT_SHEET_NAME: str = "ships"  # the first sheet name, the next sheets - with the number suffix
+EXCEL_MAX_ROWS: int = 1048576  # max rows in the xlsx sheet (including the header row)
+EXCEL_EPOCH: datetime = datetime(1899, 12, 30)  # excel dates serial numbers epoch
+EXCEL_ROWS_BUFFER: int = 1000  # rows buffered before the write into the archive
+EXCEL_DATE_PATTERN: str = "%d.%m.%Y"  # date cells (without time) -> ship fields values
+# ship's identity fields - row without identity values is empty (skipped on reading)
+SHIP_IDENTITY_FIELDS: tuple = ("imo_number", "proprietary_number1", "proprietary_number2")
+XLS_SIGNATURE: bytes = b"\xd0\xcf\x11\xe0"  # legacy xls file (OLE2 compound document) signature
+# legacy xls exports header -> ShipDto field
+EXCEL_HEADER_ALIASES: Dict[str, str] = {"datetime": "init_datetime"}
+
+# xlsx package parts (static)
+XLSX_XML_HEADER: str = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+XLSX_MAIN_NS: str = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_REL_NS: str = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XLSX_PKG_REL_NS: str = "http://schemas.openxmlformats.org/package/2006/relationships"
+XLSX_CONTENT_TYPE: str = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+XLSX_ROOT_RELS: str = (XLSX_XML_HEADER + f'<Relationships xmlns="{XLSX_PKG_REL_NS}"><Relationship Id="rId1" '
+                       f'Type="{XLSX_REL_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>')
+# styles: 0 - default, 1 - date and time (built-in number format 22)
+XLSX_STYLES: str = (XLSX_XML_HEADER + f'<styleSheet xmlns="{XLSX_MAIN_NS}">'
+                    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+                    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+                    '<fill><patternFill patternType="gray125"/></fill></fills>'
+                    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+                    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/>'
+                    '</cellStyleXfs>'
+                    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+                    '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+                    '</cellXfs>'
+                    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+                    '</styleSheet>')
+# chars, that should be escaped (&, <, >) or removed (not allowed in xml control chars) in the cell text
+XML_SPECIAL_CHARS_REGEX = re.compile(r"[&<>\x00-\x08\x0b\x0c\x0e-\x1f]")
+XML_ILLEGAL_CHARS_REGEX = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
 # todo: move to cache management dir
 def verify_and_process_xls_file(xls_file: str) -> None:
     """Verification of the provided file name and creating all necessary parent dirs in
@@ -43,102 +96,395 @@ def verify_and_process_xls_file(xls_file: str) -> None:
     xls_file_path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def save_ships_2_excel(ships: List[ShipDto], xls_file: str) -> None:
-    """Save provided list of ships dto's to xls file. For sheet name default value is used.
-    :param ships: ships list to save, if list empty/None - empty excel file will be created
+def _xlsx_cell(ref: str, value) -> str:
+    """Cell xml: strings - inline strings, datetimes - serial numbers with the date style, numbers - as is."""
+    if value.__class__ is str:
+        if XML_SPECIAL_CHARS_REGEX.search(value):
+            value = escape(XML_ILLEGAL_CHARS_REGEX.sub("", value))
+        return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{value}</t></is></c>'
+    if isinstance(value, datetime):
+        return f'<c r="{ref}" s="1"><v>{(value - EXCEL_EPOCH).total_seconds() / 86400!r}</v></c>'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c r="{ref}"><v>{value!r}</v></c>'
+    return _xlsx_cell(ref, str(value))
+
+
+class ShipsXlsxWriter:
+    """Streaming (constant memory) ships writer into the xlsx file. Columns - ShipDto fields (by default
+    all of them), the header row is repeated on each sheet, new sheet is started at the rows limit.
+    Empty values are written as empty cells. Use as context manager (the file is finalized on close)."""
+
+    def __init__(self, xlsx_file: str, columns: Sequence[str] = SHIP_FIELDS,
+                 sheet_name: str = EXCEL_DEFAULT_SHEET_NAME, max_rows: int = EXCEL_MAX_ROWS) -> None:
+        log.debug(f"__init__(): initializing ShipsXlsxWriter for the file: {xlsx_file}.")
+        verify_and_process_xls_file(xlsx_file)  # verify and process xlsx file
+
+        if not columns or set(columns) - set(SHIP_FIELDS):  # fail-fast - empty or unknown columns
+            raise ValueError(f"Wrong ships columns: {columns}!")
+        if not 2 <= max_rows <= EXCEL_MAX_ROWS:  # fail-fast - no room for the header and data or over limit
+            raise ValueError(f"Wrong max rows number: {max_rows}!")
+
+        self.xlsx_file: str = xlsx_file
+        self.columns: tuple = tuple(columns)
+        self.sheet_name: str = sheet_name
+        self.max_rows: int = max_rows
+        self.rows: int = 0  # ships written
+        self.sheets: int = 0  # sheets created
+        self.__getter = attrgetter(*self.columns) if len(self.columns) > 1 else \
+            (lambda ship: (getattr(ship, self.columns[0]),))
+        self.__letters: List[str] = [get_column_letter(column) for column in range(1, len(self.columns) + 1)]
+        self.__archive: Optional[zipfile.ZipFile] = zipfile.ZipFile(xlsx_file, mode="w",
+                                                                    compression=zipfile.ZIP_DEFLATED)
+        self.__sheet: Optional[TextIO] = None
+        self.__sheet_rows: int = 0
+        self.__buffer: List[str] = list()
+
+    def __row(self, values: Iterable) -> None:
+        self.__sheet_rows += 1
+        number: str = str(self.__sheet_rows)
+        cells: str = "".join([_xlsx_cell(letter + number, value)
+                              for letter, value in zip(self.__letters, values)
+                              if value is not None and value != ""])
+        self.__buffer.append(f'<row r="{number}">{cells}</row>')
+        if len(self.__buffer) >= EXCEL_ROWS_BUFFER:
+            self.__flush()
+
+    def __flush(self) -> None:
+        self.__sheet.write("".join(self.__buffer))
+        self.__buffer.clear()
+
+    def __close_sheet(self) -> None:
+        if self.__sheet is None:
+            return
+        self.__flush()
+        self.__sheet.write("</sheetData></worksheet>")
+        self.__sheet.close()
+        self.__sheet = None
+
+    def __new_sheet(self) -> None:
+        self.__close_sheet()
+        self.sheets += 1
+        entry = self.__archive.open(f"xl/worksheets/sheet{self.sheets}.xml", mode="w", force_zip64=True)
+        self.__sheet = io.TextIOWrapper(entry, encoding="utf-8")
+        self.__sheet.write(XLSX_XML_HEADER + f'<worksheet xmlns="{XLSX_MAIN_NS}"><sheetData>')
+        self.__sheet_rows = 0
+        self.__row(self.columns)  # header row
+
+    def write(self, ship: ShipDto) -> None:
+        if self.__sheet is None or self.__sheet_rows >= self.max_rows:  # roll over to the new sheet
+            self.__new_sheet()
+        self.__row(self.__getter(ship))
+        self.rows += 1
+
+    def write_many(self, ships: Iterable[ShipDto]) -> int:
+        """Write ships (any iterable, consumed once), returns number of written ships."""
+        count: int = self.rows
+        for ship in ships:
+            self.write(ship)
+        return self.rows - count
+
+    def close(self) -> None:
+        if self.__archive is None:
+            return
+        if self.sheets == 0:  # no ships - file with the header only
+            self.__new_sheet()
+        self.__close_sheet()
+
+        names: List[str] = [self.sheet_name if number == 1 else f"{self.sheet_name}_{number}"
+                            for number in range(1, self.sheets + 1)]
+        sheets: str = "".join(f'<sheet name={quoteattr(name)} sheetId="{number}" r:id="rId{number}"/>'
+                              for number, name in enumerate(names, start=1))
+        rels: str = "".join(f'<Relationship Id="rId{number}" Type="{XLSX_REL_NS}/worksheet" '
+                            f'Target="worksheets/sheet{number}.xml"/>'
+                            for number in range(1, self.sheets + 1))
+        overrides: str = "".join(f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+                                 f'ContentType="{XLSX_CONTENT_TYPE}.worksheet+xml"/>'
+                                 for number in range(1, self.sheets + 1))
+        self.__archive.writestr("[Content_Types].xml", XLSX_XML_HEADER +
+                                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-'
+                                'package.relationships+xml"/>'
+                                '<Default Extension="xml" ContentType="application/xml"/>'
+                                '<Override PartName="/xl/workbook.xml" '
+                                f'ContentType="{XLSX_CONTENT_TYPE}.sheet.main+xml"/>'
+                                '<Override PartName="/xl/styles.xml" '
+                                f'ContentType="{XLSX_CONTENT_TYPE}.styles+xml"/>{overrides}</Types>')
+        self.__archive.writestr("_rels/.rels", XLSX_ROOT_RELS)
+        self.__archive.writestr("xl/workbook.xml", XLSX_XML_HEADER + f'<workbook xmlns="{XLSX_MAIN_NS}" '
+                                f'xmlns:r="{XLSX_REL_NS}"><sheets>{sheets}</sheets></workbook>')
+        self.__archive.writestr("xl/_rels/workbook.xml.rels", XLSX_XML_HEADER +
+                                f'<Relationships xmlns="{XLSX_PKG_REL_NS}">{rels}'
+                                f'<Relationship Id="rId{self.sheets + 1}" Type="{XLSX_REL_NS}/styles" '
+                                'Target="styles.xml"/></Relationships>')
+        self.__archive.writestr("xl/styles.xml", XLSX_STYLES)
+        self.__archive.close()
+        self.__archive = None
+        log.debug(f"Saved {self.rows} ship(s) into {self.sheets} sheet(s) of the file: {self.xlsx_file}.")
+
+    def __enter__(self) -> "ShipsXlsxWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def save_ships_2_excel(ships: Iterable[ShipDto], xls_file: str) -> int:
+    """Save provided ships dto's to xlsx file (streaming, see ShipsXlsxWriter).
+    :param ships: ships to save (list or any iterable/generator), if empty - excel file with the header
+            only will be created
     :param xls_file: excel file to save provided ships, mustn't be empty. Overrides existing file
             by default. If provided path is existing directory - error. If provided long path with
             non-existent directories - all necessary directories will be created.
-    :return: None ???
+    :return: number of saved ships
     """
-    log.debug(f"save_ships_2_excel(): save provided ships list to xls file: {xls_file}.")
-
-    if not isinstance(ships, list):  # fail-fast -> provided list of ships
-        raise ValueError("Not a list provided (ships)!")
-
-    verify_and_process_xls_file(xls_file)  # verify and process xls file
-
-    book = xlwt.Workbook()  # create workbook
-    sheet = book.add_sheet(const.EXCEL_DEFAULT_SHEET_NAME)  # create new sheet
-
-    # create header row
-    row = sheet.row(0)
-
-    # ship's identity
-    row.write(0, "imo_number")
-    row.write(1, "proprietary_number1")
-    row.write(2, "proprietary_number2")
-    row.write(3, "source_system")
-
-    # ship's main value
-    row.write(4, "flag")
-    row.write(5, "main_name")
-    row.write(6, "secondary_name")
-    row.write(7, "home_port")
-    row.write(8, "call_sign")
-    row.write(9, "project")
-    row.write(10, "owner")
-    row.write(11, "owner_address")
-    row.write(12, "owner_ogrn")
-    row.write(13, "owner_ogrn_date")
-
-    # ship's additional data
-    row.write(14, "build_number")
-    row.write(15, "ship_type")
-    row.write(16, "build_date")
-    row.write(17, "build_place")
-
-    # ship's system info
-    # row.write(14, 'extended_url')  # todo: do we need to save it?
-    row.write(18, "datetime")
-
-    row_counter = 1
-    for ship in ships:  # iterate over ships map with keys / values
-        row = sheet.row(row_counter)  # create new row
-
-        # ship's identity
-        row.write(0, ship.imo_number)
-        row.write(1, ship.proprietary_number1)
-        row.write(2, ship.proprietary_number2)
-        row.write(3, ship.source_system)
-
-        # ship's main value
-        row.write(4, ship.flag)
-        row.write(5, ship.main_name)
-        row.write(6, ship.secondary_name)
-        row.write(7, ship.home_port)
-        row.write(8, ship.call_sign)
-        row.write(9, ship.project)
-        row.write(10, ship.owner)
-        row.write(11, ship.owner_address)
-        row.write(12, ship.owner_ogrn)
-        row.write(13, ship.owner_ogrn_date)
-
-        # ship's additional data
-        row.write(14, ship.build_number)
-        row.write(15, ship.ship_type)
-        row.write(16, ship.build_date)
-        row.write(17, ship.build_place)
-
-        # ship's system info
-        # row.write(9, ship.extended_info_url)  # todo: do we need to save it?
-        # convert datetime to human-readable format
-        row.write(18, ship.init_datetime.strftime(const.EXCEL_DEFAULT_TIMESTAMP_PATTERN))
-
-        row_counter += 1
+    log.debug(f"save_ships_2_excel(): save provided ships to xlsx file: {xls_file}.")
+
+    if ships is None or isinstance(ships, (str, dict)) or not hasattr(ships, "__iter__"):  # fail-fast
+        raise ValueError("Not an iterable provided (ships)!")
+
+    with ShipsXlsxWriter(xls_file) as writer:
+        return writer.write_many(ships)
+
+
+def _cell_value(value) -> str:
+    """Workbook cell value -> ship field value (string): integers without fraction, dates by the pattern."""
+    if value is None:
+        return ""
+    if value.__class__ is str:
+        return value.strip()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.strftime(EXCEL_DATE_PATTERN if value.time() == datetime.min.time()
+                              else Config().timestamp_pattern)
+    return str(value)
+
+
+def iter_workbook_rows(xlsx_file: str, header_rows: int = 1, sheet_name: Optional[str] = None,
+                       max_column: Optional[int] = None) -> Iterator[tuple]:
+    """Stream rows values of the workbook sheet: read-only mode, sheet xml is parsed on the fly (the
+    workbook isn't loaded into memory). Rows are padded/cut to the max column (if provided).
+    :param xlsx_file: workbook file
+    :param header_rows: number of the header rows (skipped)
+    :param sheet_name: sheet name, default - active sheet
+    :param max_column: max column number (1-based)
+    """
+    log.debug(f"iter_workbook_rows(): streaming rows of the workbook: {xlsx_file}.")
+    if not xlsx_file or not Path(xlsx_file).is_file():  # fail-fast - no workbook file
+        raise ValueError(f"Workbook file [{xlsx_file}] doesn't exist!")
+
+    book = load_workbook(filename=xlsx_file, read_only=True, data_only=True)
+    try:
+        sheet = book[sheet_name] if sheet_name else book.active
+        sheet.reset_dimensions()  # dimensions in the files from the sources are unreliable
+        yield from sheet.iter_rows(min_row=header_rows + 1, max_col=max_column, values_only=True)
+    finally:
+        book.close()
+
+
+def read_ships_from_workbook(xlsx_file: str, columns: Dict[str, int], source_system: str,
+                             header_rows: int = 1, timestamp: Optional[datetime] = None,
+                             sheet_name: Optional[str] = None) -> Iterator[ShipDto]:
+    """Stream ships from the workbook sheet by the declarative column map (see iter_workbook_rows()).
+    Rows without identity values are skipped, missing identity fields - empty strings.
+    :param xlsx_file: workbook file
+    :param columns: column map - ShipDto field -> column number (1-based, as in excel)
+    :param source_system: source system of the ships
+    :param header_rows: number of the header rows (skipped)
+    :param timestamp: ships timestamp, default - current time
+    :param sheet_name: sheet name, default - active sheet
+    """
+    # fail-fast - wrong column map
+    if not columns or min(columns.values()) < 1 or set(columns) - set(SHIP_FIELDS):
+        raise ValueError(f"Wrong column map: {columns}!")
+
+    names: tuple = tuple(columns)
+    indexes: List[int] = [columns[name] - 1 for name in names]
+    identity: List[int] = [position for position, name in enumerate(names)
+                           if name in SHIP_IDENTITY_FIELDS] or list(range(len(names)))
+    constant_names: tuple = ("source_system", "timestamp") + \
+        tuple(name for name in SHIP_IDENTITY_FIELDS if name not in columns)
+    constant: tuple = (source_system, timestamp if timestamp else datetime.now()) + \
+        ("",) * (len(constant_names) - 2)
+
+    def rows() -> Iterator[tuple]:
+        counter, skipped = 0, 0
+        for row in iter_workbook_rows(xlsx_file, header_rows, sheet_name, max(indexes) + 1):
+            values: List[str] = [_cell_value(row[index]) for index in indexes]
+            if not any(values[position] for position in identity):  # empty row - won't create empty ship
+                skipped += 1
+                continue
+            counter += 1
+            yield tuple(values) + constant
+        log.info(f"Read {counter} ship(s) from the workbook {xlsx_file}, skipped {skipped} empty row(s).")
+
+    return iter_ships_from_tuples(rows(), names + constant_names)
+
+
+def _xls_cell_value(cell, datemode: int):
+    """Legacy xls (xlrd) cell -> python value: date cells - datetime, empty cells - None."""
+    if cell.ctype == xlrd.XL_CELL_DATE:
+        return xlrd.xldate.xldate_as_datetime(cell.value, datemode)
+    if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+        return None
+    return cell.value
+
+
+def _iter_xls_sheet(book, index: int) -> Iterator[tuple]:
+    """Stream rows values of the legacy xls sheet, the sheet is unloaded after the last row."""
+    sheet = book.sheet_by_index(index)
+    try:
+        for row in range(sheet.nrows):
+            yield tuple(_xls_cell_value(cell, book.datemode) for cell in sheet.row(row))
+    finally:
+        book.unload_sheet(index)
+
+
+def iter_excel_sheets(xls_file: str) -> Iterator[Iterator[tuple]]:
+    """Stream all sheets of the excel file - rows values iterator (including the header row) for each
+    sheet. Format is detected by the file signature (not by the extension): legacy xls - xlrd with
+    loading of the sheets on demand, xlsx - read-only mode (see iter_workbook_rows()).
+    Each sheet rows should be consumed before the next sheet.
+    :param xls_file: excel file (xls or xlsx)
+    """
+    log.debug(f"iter_excel_sheets(): streaming sheets of the excel file: {xls_file}.")
+    if not xls_file or not Path(xls_file).is_file():  # fail-fast - no excel file
+        raise ValueError(f"Excel file [{xls_file}] doesn't exist!")
+
+    with open(xls_file, mode="rb") as file:
+        signature: bytes = file.read(len(XLS_SIGNATURE))
+
+    if signature == XLS_SIGNATURE:  # legacy xls (xlwt exports)
+        book = xlrd.open_workbook(xls_file, on_demand=True)
+        try:
+            for index in range(book.nsheets):
+                yield _iter_xls_sheet(book, index)
+        finally:
+            book.release_resources()
+    else:
+        book = load_workbook(filename=xls_file, read_only=True, data_only=True)
+        try:
+            for sheet in book.worksheets:
+                sheet.reset_dimensions()
+                yield sheet.iter_rows(values_only=True)
+        finally:
+            book.close()
+
+
+def _header_fields(header: Sequence) -> Dict[int, str]:
+    """Header row -> map: column index (0-based) -> ShipDto field. Unknown columns are ignored."""
+    result: Dict[int, str] = dict()
+    for index, value in enumerate(header):
+        name: str = _cell_value(value).lower()
+        name = EXCEL_HEADER_ALIASES.get(name, name)
+        if name in SHIP_FIELDS and name not in result.values():
+            result[index] = name
+    return result
+
+
+def _timestamp_value(value, pattern: str, default: datetime) -> datetime:
+    """Timestamp cell -> datetime: datetime cells as is, strings - by the pattern, others - default."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str) and value.strip():
+        try:
+            return parse_ship_timestamp(value.strip(), pattern)
+        except ValueError:
+            pass
+    return default
+
+
+def _sheet_ship_rows(sheet_rows: Iterator[tuple], columns: Dict[int, str], missing: int, pattern: str,
+                     now: datetime) -> Iterator[tuple]:
+    """Sheet rows -> ships tuples (values of the mapped columns + empty missing identity fields)."""
+    indexes: List[int] = list(columns)
+    names: List[str] = list(columns.values())
+    identity: List[int] = [position for position, name in enumerate(names) if name in SHIP_IDENTITY_FIELDS]
+    timestamps: List[int] = [position for position, name in enumerate(names) if name in SHIP_TIMESTAMP_FIELDS]
+    strings: List[int] = [position for position in range(len(names)) if position not in timestamps]
+    width: int = max(indexes) + 1
+    padding: tuple = ("",) * missing
+
+    for row in sheet_rows:
+        if len(row) < width:
+            row = tuple(row) + (None,) * (width - len(row))
+        values: list = [row[index] for index in indexes]
+        for position in strings:
+            values[position] = _cell_value(values[position])
+        # empty row - won't create empty ship
+        if identity and not any(values[position] for position in identity):
+            continue
+        for position in timestamps:
+            values[position] = _timestamp_value(values[position], pattern, now)
+        yield tuple(values) + padding
+
+
+def iter_ship_rows_from_excel(xls_file: str, timestamp_pattern: Optional[str] = None) \
+        -> Iterator[Tuple[Tuple[str, ...], Iterator[tuple]]]:
+    """Stream ships tuples from the exported excel file (xls or xlsx), sheet by sheet. Column mapping is
+    driven by the header row of each sheet (ShipDto fields names, legacy headers - by the aliases),
+    unknown columns are ignored, missing identity fields - empty strings. Rows without identity values
+    are skipped. Timestamps - datetime cells or strings by the pattern, unparsable - load time.
+    :param xls_file: excel file (xls or xlsx)
+    :param timestamp_pattern: pattern for the string timestamps, default - from the config
+    :return: iterator of (fields names, ships tuples iterator) for each sheet
+    """
+    pattern: str = timestamp_pattern if timestamp_pattern else Config().timestamp_pattern
+    now: datetime = datetime.now()
+
+    for sheet_rows in iter_excel_sheets(xls_file):
+        header = next(sheet_rows, None)
+        columns: Dict[int, str] = _header_fields(header) if header else dict()
+        if not columns:  # empty sheet or sheet without ships
+            log.warning(f"Sheet without ships header in the excel file {xls_file}, skipped.")
+            continue
+
+        missing: Tuple[str, ...] = tuple(name for name in SHIP_IDENTITY_FIELDS + ("source_system",)
+                                         if name not in columns.values())
+        yield (tuple(columns.values()) + missing,
+               _sheet_ship_rows(sheet_rows, columns, len(missing), pattern, now))
+
+
+def iter_ships_from_excel(xls_file: str, timestamp_pattern: Optional[str] = None) -> Iterator[ShipDto]:
+    """Stream ships (ShipDto's) from the exported excel file (xls or xlsx) - see iter_ship_rows_from_excel().
+    :param xls_file: excel file (xls or xlsx)
+    :param timestamp_pattern: pattern for the string timestamps, default - from the config
+    """
+    counter: int = 0
+    for names, rows in iter_ship_rows_from_excel(xls_file, timestamp_pattern):
+        for ship in iter_ships_from_tuples(rows, names):
+            counter += 1
+            yield ship
+    log.info(f"Loaded {counter} ship(s) from the excel file {xls_file}.")
+
+
+def iter_ship_batches_from_excel(xls_file: str, batch_size: Optional[int] = None,
+                                 timestamp_pattern: Optional[str] = None) -> Iterator[ShipBatch]:
+    """Stream columnar ships batches (ShipBatch, without ShipDto instances) from the exported excel file
+    (xls or xlsx) - see iter_ship_rows_from_excel(). Batch doesn't span the sheets.
+    :param xls_file: excel file (xls or xlsx)
+    :param batch_size: ships in one batch, default - sink batch size from the config
+    :param timestamp_pattern: pattern for the string timestamps, default - from the config
+    """
+    size: int = batch_size if batch_size else Config().sink_batch_size
+    if size < 1:  # fail-fast - wrong batch size
+        raise ValueError(f"Wrong batch size: {size}!")
 
-    book.save(xls_file)  # save created workbook
+    for names, rows in iter_ship_rows_from_excel(xls_file, timestamp_pattern):
+        chunk: List[tuple] = list(islice(rows, size))
+        while chunk:
+            yield ShipBatch.from_tuples(chunk, names)
+            chunk = list(islice(rows, size))
 
 
 def load_ships_from_excel(xls_file: str) -> List[ShipDto]:
-    """Load ships (ShipDto's) form provided excel file.
-    :param xls_file:
-    :return:
+    """Load ships (ShipDto's) form provided excel file (xls or xlsx). For the big files - use the
+    streaming iter_ships_from_excel() or iter_ship_batches_from_excel().
+    :param xls_file: excel file (xls or xlsx)
+    :return: list of ships
     """
-    log.debug(f"load_base_ships_from_excel(): load extended ships from xls file: {xls_file}.")
-    verify_and_process_xls_file(xls_file)  # verify and process xls file
-    # todo: implementation!
-    return list()
+    log.debug(f"load_ships_from_excel(): load ships from excel file: {xls_file}.")
+    return list(iter_ships_from_excel(xls_file))
 
 
 # todo: do we need this method?
@@ -157,41 +503,42 @@ def save_extended_ships_2_excel(ships: list, xls_file: str) -> None:
 
     verify_and_process_xls_file(xls_file)  # verify and process xls file
 
-    book = xlwt.Workbook()  # create workbook
-    sheet = book.add_sheet(const.EXCEL_DEFAULT_SHEET_NAME)  # create new sheet
-
-    # create header row
-    row_counter = 1
-    for ship in ships:  # iterate over ships map with keys / values
-        row = sheet.row(row_counter)  # create new row
-        # row.write(0, ship.flag) - etc for further values
-        row_counter += 1
-    # todo: implementation!
+    book = Workbook(write_only=True)  # create workbook
+    book.create_sheet(EXCEL_DEFAULT_SHEET_NAME)  # create new sheet
+    # todo: implementation! (rows - sheet.append(...))
     book.save(xls_file)  # save created workbook
 
 
-# todo: do we need this method?
-def load_extended_ships_from_excel(xls_file: str) -> list:
-    """Load ships (ExtendedShipDto's) form provided excel file.
-    :param xls_file:
-    :return:
+def iter_excel_records(xls_file: str) -> Iterator[Dict[str, str]]:
+    """Stream rows of the excel file (xls or xlsx) as records: header row value -> cell value (string).
+    Columns without header are ignored, empty rows are skipped.
+    :param xls_file: excel file (xls or xlsx)
     """
-    log.debug(f"load_extended_ships_from_excel(): load extended ships from xls file: {xls_file}.")
-    verify_and_process_xls_file(xls_file)  # verify and process xls file
-    # todo: implementation!
-    return list()
+    for sheet_rows in iter_excel_sheets(xls_file):
+        header = next(sheet_rows, None) or ()
+        names = (_cell_value(value) for value in header)
+        columns: Dict[int, str] = {index: name for index, name in enumerate(names) if name}
+        for row in sheet_rows:
+            record: Dict[str, str] = {name: _cell_value(row[index]) if index < len(row) else ""
+                                      for index, name in columns.items()}
+            if any(record.values()):
+                yield record
+
+
+def load_extended_ships_from_excel(xls_file: str) -> List[Dict[str, str]]:
+    """Load extended ships form provided excel file (xls or xlsx) - records by the header row, as the
+    extended ships have no fixed set of fields (see iter_excel_records()).
+    :param xls_file: excel file (xls or xlsx)
+    :return: list of records
+    """
+    log.debug(f"load_extended_ships_from_excel(): load extended ships from excel file: {xls_file}.")
+    return list(iter_excel_records(xls_file))
 
 
 def process_scraper_dry_run(system_name: str) -> None:
     log.warning("DRY RUN MODE IS ON!")
-    # save empty files to cache with specific postfix
-    cache_dir = (
-        const.SCRAPER_CACHE_PATH
-        + "/"
-        + generate_timed_filename(system_name + const.SCRAPER_CACHE_DRY_RUN_DIR_SUFFIX)
-    )
-    save_ships_2_excel(list(), cache_dir + "/" + const.EXCEL_SHIPS_DATA)
-    # save_extended_ships_2_excel(list(), cache_dir + '/' + const.EXCEL_EXTENDED_SHIPS_DATA)
+    # save empty file to the cache run dir with specific postfix
+    save_ships_2_excel(list(), cache_get_raw_file(system_name, Config().raw_data_file, dry_run=True))
 
 
 # todo: implement unit tests that module isn't runnable directly!
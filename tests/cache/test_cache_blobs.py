@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Scraper Cache Blobs module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import os
+import pytest
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.cache.cache_manifest import CacheManifest, MANIFEST_ENTITY_SHIP, content_hash
+from wfleet.scraper.cache.cache_blobs import BlobStore, dedup_cache, is_empty_page
+
+DENIED_PAGE: bytes = b"<html><body><h1>Access is denied.</h1></body></html>"
+
+
+@pytest.fixture
+def store(tmp_path) -> BlobStore:
+    return BlobStore(str(tmp_path / "blobs"))
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = CacheManifest(str(tmp_path / "manifest.sqlite"))
+    yield manifest
+    manifest.close()
+
+
+@pytest.mark.parametrize("content, expected", [
+    (DENIED_PAGE, True),
+    (b"", True),
+    (b"<div class='panel'>\n  <table></table>&nbsp;</div>", True),
+    (b"<script>var x = 'data';</script><div></div>", True),
+    (b"<div>Gross tonnage: 1000</div>", False),
+])
+def test_is_empty_page(content, expected):
+    assert is_empty_page(content) == expected
+
+
+def test_write_links_identical_content(tmp_path, store):
+    digest1, created1 = store.write(DENIED_PAGE, str(tmp_path / "a.html"))
+    digest2, created2 = store.write(DENIED_PAGE, str(tmp_path / "b.html"))
+
+    assert digest1 == digest2 == content_hash(DENIED_PAGE)
+    assert created1 and not created2
+    assert os.path.samefile(tmp_path / "a.html", tmp_path / "b.html")
+    assert (tmp_path / "b.html").read_bytes() == DENIED_PAGE
+
+    with pytest.raises(ScraperException):  # file already exists
+        store.write(DENIED_PAGE, str(tmp_path / "a.html"))
+
+
+def test_dedup_cache_and_prune(tmp_path, store, manifest):
+    ships_dir = tmp_path / "ships"
+    for ship_id, content in [("1000019", DENIED_PAGE), ("1000021", DENIED_PAGE), ("1000033", b"<p>ship</p>")]:
+        (ships_dir / ship_id).mkdir(parents=True)
+        path = ships_dir / ship_id / "ship_main.html"
+        path.write_bytes(content)
+        manifest.record(str(path), MANIFEST_ENTITY_SHIP, ship_id, "ship_main", content, 200)
+
+    report = dedup_cache(manifest, store)
+    assert (report.files, report.linked, report.saved, report.empty) == (3, 1, len(DENIED_PAGE), 1)
+    assert os.path.samefile(ships_dir / "1000019" / "ship_main.html",
+                            ships_dir / "1000021" / "ship_main.html")
+    assert manifest.empty_hashes() == {content_hash(DENIED_PAGE)}
+    assert manifest.empty_pages(MANIFEST_ENTITY_SHIP, "1000021") == {"ship_main"}
+    assert manifest.entity_ids(MANIFEST_ENTITY_SHIP, exclude_hashes=manifest.empty_hashes()) == ["1000033"]
+
+    # repeated sweep - nothing to do
+    assert dedup_cache(manifest, store).linked == 0
+
+    # all files are removed from the cache - blobs are orphans
+    for ship_id in ["1000019", "1000021", "1000033"]:
+        os.remove(ships_dir / ship_id / "ship_main.html")
+    assert store.prune() == (2, len(DENIED_PAGE) + len(b"<p>ship</p>"))
+
+
+def test_dedup_cache_skips_stale_files(tmp_path, store, manifest):
+    ships_dir = tmp_path / "ships"
+    for ship_id in ["1000019", "1000021"]:
+        (ships_dir / ship_id).mkdir(parents=True)
+        path = ships_dir / ship_id / "ship_main.html"
+        path.write_bytes(DENIED_PAGE)
+        manifest.record(str(path), MANIFEST_ENTITY_SHIP, ship_id, "ship_main", DENIED_PAGE, 200)
+    # both files are re-fetched after they were recorded - the manifest hash is stale
+    (ships_dir / "1000019" / "ship_main.html").write_bytes(b"<p>ship 1000019</p>")
+    (ships_dir / "1000021" / "ship_main.html").write_bytes(b"<p>ship 1000021</p>")
+
+    report = dedup_cache(manifest, store)
+    assert (report.files, report.linked, report.stale, report.empty) == (0, 0, 2, 0)
+    assert (ships_dir / "1000019" / "ship_main.html").read_bytes() == b"<p>ship 1000019</p>"
+    assert (ships_dir / "1000021" / "ship_main.html").read_bytes() == b"<p>ship 1000021</p>"
+    assert not os.path.exists(store.blob_path(content_hash(DENIED_PAGE)))  # no blob with the wrong content
+    assert manifest.empty_hashes() == set()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Scraper Cache Manifest module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import pytest
+from datetime import datetime
+from wfleet.scraper.cache.cache_manifest import (CacheManifest, content_hash, MANIFEST_ENTITY_SHIP,
+                                                 MANIFEST_ENTITY_SHIPCOMPANY, _scan_entities_dir)
+from wfleet.scraper.cache.scraper_cache import ScraperCache
+from wfleet.scraper.utils.imo_index import ImoIndex, build_imo_index
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = CacheManifest(str(tmp_path / "db" / "manifest.sqlite"))
+    yield manifest
+    manifest.close()
+
+
+def _write_page(path, text: str) -> bytes:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    content: bytes = text.encode("utf-8")
+    path.write_bytes(content)
+    return content
+
+
+def test_record_and_query(manifest):
+    manifest.record("/cache/ships/1000019/ship_main.html", MANIFEST_ENTITY_SHIP, "1000019", "ship_main",
+                    b"ship data", 200)
+    manifest.record("/cache/ships/1000019/class.html", MANIFEST_ENTITY_SHIP, "1000019", "class",
+                    b"class", 200)
+    manifest.record("/cache/ships/1000021/ship_main.html", MANIFEST_ENTITY_SHIP, "1000021", "ship_main",
+                    None, 503)
+
+    assert manifest.count() == 3
+    assert manifest.count(MANIFEST_ENTITY_SHIPCOMPANY) == 0
+    assert manifest.entity_ids(MANIFEST_ENTITY_SHIP, "ship_main") == ["1000019"]
+    assert manifest.entity_ids(MANIFEST_ENTITY_SHIP, http_status=None) == ["1000019", "1000021"]
+    assert manifest.pages(MANIFEST_ENTITY_SHIP, "1000019") == {
+        "ship_main": "/cache/ships/1000019/ship_main.html", "class": "/cache/ships/1000019/class.html"}
+    assert manifest.failed() == [(MANIFEST_ENTITY_SHIP, "1000021", "ship_main", 503)]
+
+    # re-fetched page - record is updated, not duplicated
+    manifest.record("/cache/ships/1000021/ship_main.html", MANIFEST_ENTITY_SHIP, "1000021", "ship_main",
+                    b"ok", 200)
+    assert manifest.count() == 3
+    assert manifest.failed() == []
+
+
+def test_exclude_hashes_and_report(manifest):
+    manifest.record("/s/1/ship_main.html", MANIFEST_ENTITY_SHIP, "1", "ship_main", b"denied", 200,
+                    datetime(2020, 1, 1))
+    manifest.record("/s/2/ship_main.html", MANIFEST_ENTITY_SHIP, "2", "ship_main", b"data", 200)
+    assert manifest.entity_ids(MANIFEST_ENTITY_SHIP, exclude_hashes={content_hash(b"denied")}) == ["2"]
+
+    report = manifest.report(datetime(2021, 1, 1))
+    assert report[MANIFEST_ENTITY_SHIP] == {"entities": 2, "files": 2, "size": 10, "failed": 0, "stale": 1}
+
+
+def test_remove_prefix(manifest):
+    manifest.record("/s/1/a.html", MANIFEST_ENTITY_SHIP, "1", "a", b"a", 200)
+    manifest.record("/s/10/a.html", MANIFEST_ENTITY_SHIP, "10", "a", b"a", 200)
+    assert manifest.remove_prefix("/s/1/") == 1
+    assert manifest.entity_ids(MANIFEST_ENTITY_SHIP) == ["10"]
+
+
+def test_remove_path(manifest):
+    manifest.record("/raw/ships.xlsx", MANIFEST_ENTITY_SHIP, "1", "ships", b"a", 200)  # top-level file
+    manifest.record("/raw/run/a.html", MANIFEST_ENTITY_SHIP, "2", "a", b"a", 200)
+    manifest.record("/raw/run/sub/b.html", MANIFEST_ENTITY_SHIP, "2", "b", b"b", 200)
+    manifest.record("/raw/run2/a.html", MANIFEST_ENTITY_SHIP, "3", "a", b"a", 200)
+    assert manifest.remove_path("/raw/ships.xlsx") == 1
+    assert manifest.remove_path("/raw/run") == 2
+    assert manifest.entity_ids(MANIFEST_ENTITY_SHIP) == ["3"]
+
+
+def test_scan_entities_dir_and_imo_index(tmp_path, manifest):
+    ships_dir = tmp_path / "ships"
+    _write_page(ships_dir / "1000019" / "ship_main.html", "<html>Access is denied.</html>")
+    _write_page(ships_dir / "1000021" / "ship_main.html", "<html>Access is denied.</html>")
+    _write_page(ships_dir / "1000033" / "ship_main.html", "<html>ship</html>")
+    (ships_dir / "codes.txt").write_text("1000019")
+
+    rows = list(_scan_entities_dir(str(ships_dir), MANIFEST_ENTITY_SHIP))
+    assert len(rows) == 3
+    manifest.record_many(rows)
+
+    denied, scraped = manifest.split_by_marker(MANIFEST_ENTITY_SHIP, "ship_main", "Access is denied.")
+    assert denied == {"1000019", "1000021"}
+    assert scraped == {"1000033"}
+    assert content_hash(b"<html>Access is denied.</html>") in manifest.empty_hashes()  # isn't read next time
+
+    index = build_imo_index(ImoIndex(str(tmp_path / "index")), ["1000019", "1000033"], "", "ship_main.html",
+                            manifest)
+    assert list(index.denied().numbers()) == [1000019, 1000021]
+    assert list(index.scraped().numbers()) == [1000033]
+
+
+def test_split_by_marker_single_and_flagged_pages(tmp_path, manifest):
+    ships_dir = tmp_path / "ships"
+    pages: dict = {"1000019": "<html>Access is denied.</html>", "1000021": "<html></html>",
+                   "1000033": "<html>ship</html>"}
+    for ship_id, text in pages.items():
+        content = _write_page(ships_dir / ship_id / "ship_main.html", text)
+        manifest.record(str(ships_dir / ship_id / "ship_main.html"), MANIFEST_ENTITY_SHIP, ship_id,
+                        "ship_main", content, 200)
+    manifest.mark_empty(content_hash(b"<html></html>"), "ship_main")  # empty page, flagged on write
+
+    # single denied page (unique hash) and flagged empty page are both marked
+    denied, scraped = manifest.split_by_marker(MANIFEST_ENTITY_SHIP, "ship_main", "Access is denied.")
+    assert (denied, scraped) == ({"1000019", "1000021"}, {"1000033"})
+
+
+def test_scraper_cache_sizes_by_manifest(tmp_path, manifest):
+    ships_dir = tmp_path / "ships"
+    content = _write_page(ships_dir / "1000019" / "ship_main.html", "ship data")
+    manifest.record(str(ships_dir / "1000019" / "ship_main.html"), MANIFEST_ENTITY_SHIP, "1000019",
+                    "ship_main", content, 200)
+
+    cache = ScraperCache(raw_files_dir=str(tmp_path / "raw"), entities_dirs=[str(ships_dir)],
+                         trash_dir=str(tmp_path / "trash"), manifest=manifest)
+    # custom entities dir isn't mapped to the manifest entity - scanned from the disk
+    assert cache.total_size() == len(content)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+"""
+    Unit tests for scraper cache module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import os
+import pytest
+from pathlib import Path
+from datetime import datetime
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.cache.cache_blobs import BlobStore
+from wfleet.scraper.cache import scraper_cache
+from wfleet.scraper.cache.cache_manifest import CacheManifest, MANIFEST_ENTITY_SHIP
+from wfleet.scraper.cache.scraper_cache import (
+    ScraperCache,
+    CacheTrash,
+    CleanupReport,
+    _cache_remove_invalid_entries,
+    _delete_tree,
+    CACHE_ENTRY_RUN,
+    CACHE_POLICY_AGE,
+    CACHE_POLICY_KEEP_LAST,
+    CACHE_POLICY_LRU,
+    CACHE_POLICY_NONE,
+    DIR_SUFFIX_DRY_RUN,
+    DIR_TIMESTAMP_REGEX,
+)
+
+
+def _make_dir(path: Path, size: int, time: float = 0) -> None:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "data.html").write_bytes(b"x" * size)
+    if time:
+        os.utime(path / "data.html", (time, time))
+
+
+@pytest.fixture
+def cache(tmp_path) -> ScraperCache:
+    raw_dir = tmp_path / "raw"
+    _make_dir(raw_dir / "2021-05-30_22-46-59-scraper_rsclassorg", 100)
+    _make_dir(raw_dir / "2021-06-01_23-39-18-scraper_rsclassorg", 200)
+    _make_dir(raw_dir / "2021-06-02_17-08-37-scraper_rsclassorg", 300)
+    _make_dir(raw_dir / "2021-06-01_23-33-57-scraper_morflotru", 400)
+    _make_dir(tmp_path / "ships" / "1000019", 50, time=1000.0)
+    _make_dir(tmp_path / "ships" / "1000021", 60, time=2000.0)
+    return ScraperCache(str(raw_dir), [str(tmp_path / "ships")], quota_bytes=0,
+                        policy=CACHE_POLICY_KEEP_LAST, max_age_days=0, keep_last=2,
+                        trash_dir=str(tmp_path / "trash"))
+
+
+def test_scraper_cache_unknown_policy(tmp_path):
+    with pytest.raises(ScraperException):
+        ScraperCache(str(tmp_path), [], policy="unknown")
+
+
+def test_scraper_cache_get_raw_dir_and_file(tmp_path):
+    cache = ScraperCache(str(tmp_path), [])
+    timestamp = datetime(2022, 1, 2, 3, 4, 5)
+
+    raw_dir: str = cache.get_raw_dir("scraper_x", timestamp)
+    assert raw_dir == str(tmp_path / "2022-01-02_03-04-05-scraper_x")
+    assert Path(raw_dir).is_dir()
+    assert DIR_TIMESTAMP_REGEX.search(Path(raw_dir).name)  # generated name is valid for the cleanup
+
+    assert cache.get_raw_dir("scraper_x", timestamp, dry_run=True).endswith(DIR_SUFFIX_DRY_RUN)
+    assert cache.get_raw_file("scraper_x", "ships.xlsx", timestamp) == raw_dir + "/ships.xlsx"
+    with pytest.raises(ScraperException):
+        cache.get_raw_file("scraper_x", "", timestamp)
+
+
+def test_scraper_cache_size_accounting(cache):
+    assert len(cache.entries()) == 6
+    assert cache.total_size() == 1110
+    assert cache.sizes_by_group() == {"scraper_rsclassorg": 600, "scraper_morflotru": 400, "ships": 110}
+
+
+def test_scraper_cache_keep_last(cache):
+    victims = cache.select_for_eviction()
+    assert [Path(victim.path).name for victim in victims] == ["2021-05-30_22-46-59-scraper_rsclassorg"]
+
+
+def test_scraper_cache_no_eviction_by_default(cache, tmp_path):
+    default = ScraperCache(cache.raw_files_dir, cache.entities_dirs, trash_dir=cache.trash_dir)
+    assert default.policy == CACHE_POLICY_NONE and default.quota_bytes == 0  # eviction is opt-in
+    assert default.enforce_quota(dry_run=False) == []
+    assert default.total_size() == 1110
+
+    cache.policy, cache.quota_bytes = CACHE_POLICY_NONE, 1000  # quota only - the oldest entries first
+    assert [Path(victim.path).name for victim in cache.select_for_eviction()] == ["1000019", "1000021"]
+
+
+def test_scraper_cache_quota_lru(cache):
+    cache.policy, cache.quota_bytes = CACHE_POLICY_LRU, 1050
+    victims = cache.enforce_quota(dry_run=False)
+    assert [Path(victim.path).name for victim in victims] == ["1000019", "1000021"]
+    assert not (Path(cache.entities_dirs[0]) / "1000019").exists()
+    assert cache.total_size() == 1000  # size accounting is updated after eviction
+    assert not any((Path(cache.trash_dir)).iterdir())  # trash is purged
+
+
+def test_scraper_cache_age_and_quota_dry_run(cache):
+    cache.policy, cache.max_age_days, cache.quota_bytes = CACHE_POLICY_AGE, 365, 500
+    victims = cache.enforce_quota(dry_run=True)
+    # all runs (from 2021) and entities (from 1970) are expired
+    assert len(victims) == 6
+    assert all(Path(victim.path).exists() for victim in victims)
+    assert {victim.kind for victim in victims if victim.group != "ships"} == {CACHE_ENTRY_RUN}
+
+
+def test_delete_tree(tmp_path):
+    _make_dir(tmp_path / "run" / "sub1", 10)
+    _make_dir(tmp_path / "run" / "sub2" / "sub3", 20)
+    (tmp_path / "file.txt").write_bytes(b"x" * 5)
+
+    assert _delete_tree(str(tmp_path / "run")) == CleanupReport(items=1, files=2, bytes=30)
+    assert _delete_tree(str(tmp_path / "file.txt")) == CleanupReport(items=1, files=1, bytes=5)
+    assert not any(tmp_path.iterdir())
+
+    _make_dir(tmp_path / "run", 10)
+    os.link(tmp_path / "run" / "data.html", tmp_path / "blob")
+    # linked - not freed, then the last link - freed
+    assert _delete_tree(str(tmp_path / "run")) == CleanupReport(items=1, files=1, bytes=0)
+    assert _delete_tree(str(tmp_path / "blob")) == CleanupReport(items=1, files=1, bytes=10)
+
+
+def test_cache_remove_invalid_entries_with_trash(tmp_path):
+    _make_dir(tmp_path / "cache" / "invalid_dir", 10)
+    (tmp_path / "cache" / "garbage.txt").write_bytes(b"x" * 7)
+    items = [str(tmp_path / "cache" / "invalid_dir"), str(tmp_path / "cache" / "garbage.txt")]
+
+    _cache_remove_invalid_entries(items, dry_run=True)  # dry run - nothing is removed
+    assert all(Path(item).exists() for item in items)
+
+    trash = CacheTrash(str(tmp_path / "trash"), workers=2)
+    _cache_remove_invalid_entries(items, dry_run=False, trash=trash)
+    assert not any(Path(item).exists() for item in items)  # moved to the trash at once
+    assert trash.wait() == CleanupReport(items=2, files=2, bytes=17)
+    assert not any((tmp_path / "trash").iterdir())
+
+
+def test_cache_trash_purge_leftovers(tmp_path):
+    _make_dir(tmp_path / "trash" / "leftover", 3)
+    trash = CacheTrash(str(tmp_path / "trash"), workers=1)
+    trash.purge()
+    assert trash.wait() == CleanupReport(items=1, files=1, bytes=3)
+
+
+@pytest.mark.parametrize("by_manifest", [False, True])
+def test_scraper_cache_hardlinked_blobs(tmp_path, by_manifest):
+    store = BlobStore(str(tmp_path / "blobs"))
+    ships_dir = tmp_path / "ships"
+    manifest = CacheManifest(str(tmp_path / "manifest.sqlite"))
+    for ship_id, time in [("1000019", 1000.0), ("1000021", 2000.0), ("1000033", 3000.0)]:
+        (ships_dir / ship_id).mkdir(parents=True)
+        # the 1st page is shared
+        for page, content in [("ship_main", b"x" * 100), ("owner", ship_id.encode())]:
+            file = ships_dir / ship_id / (page + ".html")
+            digest, _ = store.write(content, str(file))
+            manifest.record(str(file), MANIFEST_ENTITY_SHIP, ship_id, page, content, 200,
+                            datetime.fromtimestamp(time), digest)
+        os.utime(ships_dir / ship_id / "owner.html", (time, time))
+    os.utime(ships_dir / "1000019" / "ship_main.html", (1.0, 1.0))  # shared inode - the same time for all
+
+    cache = ScraperCache(str(tmp_path / "raw"), [str(ships_dir)], quota_bytes=110, policy=CACHE_POLICY_NONE,
+                         trash_dir=str(tmp_path / "trash"), blobs=store,
+                         manifest=manifest if by_manifest else None)
+    if by_manifest:  # custom entities dir -> map it to the manifest entity
+        cache._ScraperCache__manifest_entities[str(ships_dir)] = MANIFEST_ENTITY_SHIP
+    assert cache.total_size() == 100 + 3 * 7  # shared page is counted once
+    assert cache.sizes_by_group() == {"ships": 121}
+
+    # evicted linked entity frees only its own page, the shared page - with the last link
+    assert [Path(victim.path).name for victim in cache.select_for_eviction()] == ["1000019", "1000021"]
+    cache.quota_bytes = 10
+    assert len(cache.enforce_quota(dry_run=False)) == 3
+    assert not [blob for blob in (tmp_path / "blobs").rglob("*") if blob.is_file()]  # orphan blobs are pruned
+    manifest.close()
+
+
+def test_cache_enforce_quota_uses_caller_manifest(tmp_path, cache, monkeypatch):
+    manifest = CacheManifest(str(tmp_path / "manifest.sqlite"))
+    caches: list = []
+
+    def make_cache(manifest=None, blobs=None) -> ScraperCache:
+        cache.manifest = manifest
+        caches.append(cache)
+        return cache
+
+    monkeypatch.setattr(scraper_cache, "ScraperCache", make_cache)
+    scraper_cache.cache_enforce_quota(True, manifest=manifest)
+    assert caches == [cache] and cache.manifest is manifest
+    assert manifest.empty_hashes() == set()  # the manifest isn't closed - it's owned by the caller
+    manifest.close()
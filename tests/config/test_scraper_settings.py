@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Scraper Settings module (layered per-source settings).
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import json
+import pytest
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.config.scraper_settings import ScraperSettings, SourceSettings, parse_override
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.utils.utilities_http import RateLimiter
+
+
+def _settings_file(tmp_path, content) -> str:
+    file = tmp_path / "scraper_settings.json"
+    file.write_text(json.dumps(content), encoding="utf-8")
+    return str(file)
+
+
+def test_defaults(tmp_path):
+    settings = ScraperSettings(str(tmp_path / "missing.json"), environ={})
+    assert settings.source("rivregru") == SourceSettings(batch_size=Config().sink_batch_size,
+                                                         sinks=Config().default_sinks)
+    assert (settings.source("rsclassorg").workers, settings.source("rsclassorg").retries) == (30, 5)
+    assert settings.source("rsclassorg").http_timeout == 5.0
+    seaweb: SourceSettings = settings.source("seaweb")
+    assert seaweb.requests_limit == Config().default_requests_limit
+    assert (seaweb.timeout, seaweb.http_timeout) == (0, None)
+
+
+def test_layers_order(tmp_path):
+    file: str = _settings_file(tmp_path, {"timeout": 10, "workers": 4, "sinks": ["db", "jsonl"],
+                                          "sources": {"rsclassorg": {"workers": 40, "rate_limit": 2.5},
+                                                      "seaweb": {"timeout": 30}}})
+    environ: dict = {"WFLEET_TIMEOUT": "20", "WFLEET_RSCLASSORG_RATE_LIMIT": "5",
+                     "WFLEET_SEAWEB_SINKS": "csv, db", "WFLEET_OTHER_VARIABLE": "ignored", "PATH": "/bin"}
+    settings = ScraperSettings(file, environ)
+
+    rsclassorg: SourceSettings = settings.source("rsclassorg")
+    assert (rsclassorg.workers, rsclassorg.rate_limit, rsclassorg.timeout, rsclassorg.retries) == \
+        (40, 5.0, 20.0, 5)
+    seaweb: SourceSettings = settings.source("seaweb")
+    # env layer > file layer
+    assert (seaweb.workers, seaweb.timeout, seaweb.sinks) == (4, 20.0, ("csv", "db"))
+    assert settings.source("morflotru").sinks == ("db", "jsonl")
+
+    # CLI - the last layer
+    settings.set_overrides(["timeout=1", "rsclassorg.workers=2", "seaweb.sinks=excel"])
+    assert (settings.source("rsclassorg").workers, settings.source("rsclassorg").timeout) == (2, 1.0)
+    assert (settings.source("seaweb").timeout, settings.source("seaweb").sinks) == (1.0, ("excel",))
+    assert settings.source("seaweb").workers == 4
+
+
+def test_lazy_loading(tmp_path):
+    file: str = str(tmp_path / "scraper_settings.json")
+    settings = ScraperSettings(file, environ={})  # nothing is read yet
+    _settings_file(tmp_path, {"workers": 3})
+    assert settings.source("gims").workers == 3
+
+    _settings_file(tmp_path, {"workers": 5})
+    assert settings.source("gims").workers == 3  # loaded once
+    settings.reload()
+    assert settings.source("gims").workers == 5
+
+
+def test_wrong_settings(tmp_path):
+    with pytest.raises(ScraperException):
+        parse_override("workers")
+    with pytest.raises(ScraperException):
+        parse_override("rsclassorg.threads=4")
+    with pytest.raises(ScraperException):
+        parse_override("timeout=-1")
+    assert parse_override("seaweb.rate_limit=0.5") == ("seaweb", "rate_limit", 0.5)
+
+    with pytest.raises(ScraperException):
+        ScraperSettings(_settings_file(tmp_path, {"workers": "many"}), environ={}).source("gims")
+    with pytest.raises(ScraperException):
+        ScraperSettings(_settings_file(tmp_path, [1, 2]), environ={}).source("gims")
+    with pytest.raises(ScraperException):
+        ScraperSettings(str(tmp_path / "missing.json"), environ={"WFLEET_GIMS_RETRIES": "x"}).source("gims")
+
+
+def test_rate_limiter(monkeypatch):
+    sleeps: list = list()
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    monkeypatch.setattr("time.monotonic", lambda: 100.0)
+    limiter = RateLimiter(4)  # 0.25 sec between the requests
+    for _ in range(3):
+        limiter.wait()
+    assert sleeps == [0.25, 0.5]
+    RateLimiter(0).wait()  # no limit
+    assert len(sleeps) == 2
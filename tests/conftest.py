@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Common pytest fixtures for the unit tests.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import pytest
+from datetime import datetime
+from typing import Callable, List
+from wfleet.scraper.entities.ship import ShipDto
+
+# default timestamp of the generated ships
+SHIPS_TIMESTAMP: datetime = datetime(2026, 10, 1, 10, 0, 0)
+
+
+@pytest.fixture
+def make_ships() -> Callable[..., List[ShipDto]]:
+    """Factory of the test ships: imo number 1000000 + i and proprietary number i (i counts from start)."""
+
+    def factory(count: int, timestamp: datetime = SHIPS_TIMESTAMP, source_system: str = "rsclassorg",
+                start: int = 0) -> List[ShipDto]:
+        return [ShipDto(str(1000000 + i), str(i), "", source_system, timestamp, flag="Russia",
+                        main_name=f"SHIP {i}", init_datetime=timestamp) for i in range(start, start + count)]
+
+    return factory
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Geo Tree Traversal module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import sqlite3
+import pytest
+from wfleet.scraper.db import sqlitedb
+from wfleet.scraper.db.geo_traversal import GeoTreeTraversal, GeoNode, GEO_POINT_FAILED
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+LEVELS: int = 4  # levels of the synthetic tree (root - 1)
+
+
+def _expand(node: GeoNode) -> list:
+    """Synthetic CIK tree: 3 children for each node up to the last level."""
+    if node.levelid >= LEVELS:
+        return list()
+    return [(node.id * 10 + k, None, f"Point {node.id * 10 + k}", node.levelid + 1, "true")
+            for k in range(1, 4)]
+
+
+def _db(tmp_path) -> str:
+    dbname: str = str(tmp_path / "geo.sqlite")
+    sqlitedb.db_create(dbname)
+    sqlitedb.db_add_single_geo_point(dbname, 1, None, "Root", 1, "true", None)
+    return dbname
+
+
+def _count(dbname: str, where: str = "") -> int:
+    connection = sqlite3.connect(dbname)
+    count: int = connection.execute("SELECT count(*) FROM geo_points " + where).fetchone()[0]
+    connection.close()
+    return count
+
+
+def test_crawl_by_levels(tmp_path):
+    dbname: str = _db(tmp_path)
+    traversal = GeoTreeTraversal(dbname, _expand, workers=4, chunk_size=5)
+    stats = traversal.crawl()
+
+    assert _count(dbname) == 1 + 3 + 9 + 27 and _count(dbname, "WHERE processed = 0") == 0
+    assert (stats.levels, stats.processed, stats.added, stats.failed) == (4, 40, 39, 0)
+    assert stats.queries == 5 + 1 + 1 + 2 + 6  # frontiers selects + chunks transactions - not per node
+
+    nodes = traversal.subtree([1], max_depth=1)
+    assert [node.depth for node in nodes] == [0, 1, 1, 1] and nodes[1].id == 11
+    assert len(traversal.subtree([2])) == 1 + 3 + 9  # geo_point_id 2 - the first child
+    assert traversal.subtree([]) == list()
+
+
+def test_failed_nodes_and_recrawl(tmp_path):
+    dbname: str = _db(tmp_path)
+
+    def failing(node: GeoNode) -> list:
+        if node.id == 12:
+            raise IOError("CIK is not available")
+        return _expand(node)
+
+    stats = GeoTreeTraversal(dbname, failing).crawl()
+    assert stats.failed == 1 and _count(dbname, f"WHERE processed = {GEO_POINT_FAILED}") == 1
+    assert _count(dbname) == 40 - 12  # subtree of the failed node isn't crawled
+
+    traversal = GeoTreeTraversal(dbname, _expand)
+    failed_id: int = traversal.subtree([1], max_depth=1)[2].geo_point_id  # id 12
+    stats = traversal.recrawl([failed_id])
+    assert (stats.processed, stats.added) == (13, 12) and _count(dbname) == 40
+    assert GeoTreeTraversal(dbname, _expand).recrawl().processed == 40  # the whole tree, nothing duplicated
+    assert _count(dbname) == 40
+
+    with pytest.raises(ScraperException):
+        GeoTreeTraversal(dbname, _expand, workers=0)
+
+
+def test_no_cycles(tmp_path):
+    dbname: str = _db(tmp_path)
+
+    def looping(node: GeoNode) -> list:  # the last level links back to the root and to the first level
+        if node.levelid >= LEVELS:
+            return [(1, None, "Root", 1, "true"), (11, None, "Point 11", 2, "true")]
+        return _expand(node)
+
+    GeoTreeTraversal(dbname, looping).crawl()
+    assert _count(dbname) == 40
+    assert _count(dbname, "WHERE id = 1 AND parent_id IS NULL") == 1  # existing node isn't re-parented
+    assert len(GeoTreeTraversal(dbname, _expand).subtree([1])) == 40
+
+    connection = sqlite3.connect(dbname)  # cycle made by the older version: root -> 11 -> 111 -> root
+    with connection:
+        connection.execute("UPDATE geo_points SET parent_id = "
+                           "(SELECT geo_point_id FROM geo_points WHERE id = 111) WHERE id = 1")
+    connection.close()
+    traversal = GeoTreeTraversal(dbname, _expand)
+    nodes = traversal.subtree([1])  # recursion is capped, each node - once
+    assert len(nodes) == 40 and len({node.geo_point_id for node in nodes}) == 40
+    assert traversal.reset([1]) == 40
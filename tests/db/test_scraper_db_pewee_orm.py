@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Scraper Peewee ORM repository module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import peewee
+import pytest
+from datetime import datetime, timedelta
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.db.scraper_db_pewee_orm import (ScraperPeeweeRepository, Ship, ShipCompany, ShipHistory,
+                                                    ShipBuilderHistory, SQLITE_PRAGMAS)
+
+TIMESTAMP: datetime = datetime(2026, 10, 1, 10, 0, 0)
+
+
+class CountingSqliteDatabase(peewee.SqliteDatabase):
+    """SQLite DB, counting executed queries."""
+    queries: int = 0
+
+    def execute_sql(self, sql, params=None, *args, **kwargs):
+        self.queries += 1
+        return super().execute_sql(sql, params, *args, **kwargs)
+
+
+@pytest.fixture
+def make_orm_ships(make_ships):
+    """Test ships (see make_ships fixture) with ship's operators and builders."""
+
+    def factory(count: int, source_system: str = "rsclassorg") -> list:
+        ships = make_ships(count, TIMESTAMP, source_system)
+        for i, ship in enumerate(ships):
+            ship.ship_operator, ship.ship_operator_seaweb_id = f"Operator {i % 3}", str(100 + i % 3)
+            ship.ship_builder, ship.ship_builder_seaweb_id = ("Baltic Shipyard", "7") if i % 2 else ("", "-")
+        return ships
+
+    return factory
+
+
+@pytest.fixture
+def repository(tmp_path):
+    database = CountingSqliteDatabase(str(tmp_path / "scraper_orm.sqlite"), pragmas=SQLITE_PRAGMAS)
+    with ScraperPeeweeRepository(database, batch_size=10) as repository:
+        yield repository
+
+
+def test_save_ships(make_orm_ships, repository):
+    assert repository.save_ships(make_orm_ships(25)) == 25
+    assert repository.save_ships(make_orm_ships(5, "morflotru")) == 5
+    updated = make_orm_ships(10)
+    updated[0].main_name = "RENAMED"
+    assert repository.save_ships(updated) == 10  # upsert - the same identities
+
+    with repository.bound():
+        assert Ship.select().count() == 30 and ShipCompany.select().count() == 3
+    ships = repository.get_ships("rsclassorg")
+    assert [ship.to_dto() for ship in ships] == [updated[0]] + make_orm_ships(25)[1:]
+    assert ships[0].main_name == "RENAMED" and ships[0].init_datetime == TIMESTAMP
+
+
+def test_prefetch_without_n_plus_one(make_orm_ships, repository):
+    repository.save_ships(make_orm_ships(50))
+    with repository.bound():
+        ship_id: int = Ship.get(Ship.proprietary_number1 == "1").id
+    repository.add_history(ShipHistory, [{"ship": ship_id, "timestamp": TIMESTAMP + timedelta(days=day),
+                                          "field": "main_name", "value": f"NAME {day}"} for day in range(3)])
+
+    repository.database.queries = 0
+    ships = repository.get_ships(with_history=True)
+    names = [(ship.company.name, ship.builder.name if ship.builder else None, len(ship.history))
+             for ship in ships]
+    assert repository.database.queries == 4  # ships, companies, builders, history - not per ship
+    assert names[1] == ("Operator 1", "Baltic Shipyard", 3) and names[2] == ("Operator 2", None, 0)
+
+    repository.database.queries = 0
+    companies = repository.get_companies(with_ships=True)
+    assert sum(len(company.ships) for company in companies) == 50 and repository.database.queries == 2
+
+
+def test_history_and_runs(make_orm_ships, repository):
+    with pytest.raises(ScraperException):
+        repository.add_history(Ship, [])
+    repository.save_ships(make_orm_ships(2))
+    history: list = [{"builder": repository.get_builders()[0].id, "timestamp": TIMESTAMP, "field": "name",
+                      "value": "Old"}]
+    assert repository.add_history(ShipBuilderHistory, history) == 1
+    assert len(repository.get_builders(with_history=True)[0].history) == 1
+
+    run = repository.add_scraper_run("rsclassorg", TIMESTAMP)
+    run = repository.finish_scraper_run(run, 2, TIMESTAMP + timedelta(seconds=90))
+    assert (run.duration, run.ships_count) == (90, 2)
+
+    with pytest.raises(ScraperException):
+        ScraperPeeweeRepository(repository.database, batch_size=-1)
+
+
+def test_repositories_of_different_dbs(make_orm_ships, repository, tmp_path):
+    with ScraperPeeweeRepository(CountingSqliteDatabase(str(tmp_path / "other.sqlite"))) as other:
+        assert other.save_ships(make_orm_ships(3)) == 3
+        assert repository.save_ships(make_orm_ships(5)) == 5  # models aren't rebound to the other DB
+        assert len(other.get_ships()) == 3 and len(repository.get_ships()) == 5
+    assert Ship._meta.database is None  # binding is restored after the operations
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Scraper SQLite DB module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import sqlite3
+import pytest
+from datetime import datetime, timedelta
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.db.scraper_db_sqlite import ScraperSQLiteDB, SCRAPER_DB_SCRIPT, SHIPS_HISTORY_TABLE
+
+TIMESTAMP: datetime = datetime(2026, 10, 1, 10, 0, 0, 123456)
+
+
+def test_save_and_read_ships(make_ships, tmp_path):
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db:
+        assert db.save_ships(iter(make_ships(25, TIMESTAMP)), batch_size=10) == 25
+        assert db.save_ships(make_ships(5, TIMESTAMP, "morflotru")) == 5
+        assert db.save_ships(make_ships(10, TIMESTAMP)) == 10  # upsert - the same identities
+        assert db.ships_count() == 30 and db.ships_count("morflotru") == 5
+
+        ships = sorted(db.iter_ships("rsclassorg"), key=lambda ship: ship.proprietary_number1)
+        assert ships == sorted(make_ships(25, TIMESTAMP), key=lambda ship: ship.proprietary_number1)
+        assert ships[0].timestamp == TIMESTAMP and ships[0].init_datetime == TIMESTAMP
+        assert db.get_ship("1000003", "3", "", "morflotru") == make_ships(5, TIMESTAMP, "morflotru")[3]
+        assert db.get_ship("0", "0", "", "morflotru") is None
+
+
+def test_batched_upsert(make_ships, tmp_path):  # timing - see benchmarks/bench_db_upsert.py
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db:
+        assert db.upsert_ships(make_ships(3, TIMESTAMP)) == 3
+        changed = make_ships(5, TIMESTAMP + timedelta(days=1))
+        changed[0].flag = "Panama"
+        assert db.save_ships(changed, batch_size=2) == 5  # 2 updated + 3 new ships, 3 batches
+        assert db.ships_count() == 5
+        ship = db.get_ship("1000000", "0", "", "rsclassorg")
+        assert ship.flag == "Panama" and ship.init_datetime == TIMESTAMP  # first-seen time is kept
+
+
+def test_scraper_run_telemetry(tmp_path):
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db:
+        run_id: int = db.add_scraper_run_telemetry(TIMESTAMP)
+        assert db.add_scraper_run_telemetry() == run_id + 1
+        assert db.update_scraper_run_telemetry(run_id, TIMESTAMP + timedelta(seconds=90)) == 1
+        with pytest.raises(ScraperException):
+            db.update_scraper_run_telemetry(run_id + 100)
+
+    with pytest.raises(ScraperException):
+        ScraperSQLiteDB("")
+
+
+def test_search_ships(make_ships, tmp_path):
+    ships = make_ships(1000, TIMESTAMP) + [
+        ShipDto("9074729", "RS-1", "", "rsclassorg", main_name="Академик Фёдоров", owner="ФГБУ ААНИИ",
+                ship_operator="Arctic Research"),
+        ShipDto("", "RR-2", "", "rivregru", main_name="Волгонефть-263", home_port="Астрахань"),
+        ShipDto("", "RR-3", "", "rivregru", main_name="Нефтерудовоз", owner="Волга Шиппинг"),
+    ]
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db:
+        db.save_ships(ships)
+        # case, ё
+        assert [ship.proprietary_number1 for ship in db.search_ships("академик федоров")] == ["RS-1"]
+        # name first
+        assert [ship.proprietary_number1 for ship in db.search_ships("волг")] == ["RR-2", "RR-3"]
+        assert [ship.proprietary_number1 for ship in db.search_ships("волг", fields=["owner"])] == ["RR-3"]
+        assert len(db.search_ships("ship", limit=5)) == 5
+        assert db.search_ships("arctic", source_system="rivregru") == []
+        assert db.search_ships("  ,. ") == []
+
+        # incremental
+        db.save_ships([ShipDto("9074729", "RS-1", "", "rsclassorg", main_name="Трёхсвятитель")])
+        assert db.search_ships("академик") == []
+        assert [ship.main_name for ship in db.search_ships("трехсвят")] == ["Трёхсвятитель"]
+        with pytest.raises(ScraperException):
+            db.search_ships("x", fields=["flag"])
+
+    connection = sqlite3.connect(str(tmp_path / "scraper.sqlite"))
+    with connection:  # ships are removed, then VACUUM - ids (search index rowids) are kept
+        connection.execute("DELETE FROM ships WHERE source_system = 'rsclassorg' "
+                           "AND proprietary_number1 <> 'RS-1'")
+    connection.execute("VACUUM")
+    connection.close()
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db:  # reopened - the same index
+        assert [ship.main_name for ship in db.search_ships("трехсвятитель")] == ["Трёхсвятитель"]
+        assert [ship.proprietary_number1 for ship in db.search_ships("волг")] == ["RR-2", "RR-3"]
+        assert db.search_ships("ship") == []
+
+
+def test_search_index_for_existing_ships(tmp_path):
+    file: str = str(tmp_path / "scraper.sqlite")
+    connection = sqlite3.connect(file)  # DB of the previous version - without search index
+    connection.executescript(SCRAPER_DB_SCRIPT)
+    with connection:
+        connection.execute("INSERT INTO ships(imo_number, proprietary_number1, proprietary_number2, "
+                           "source_system, main_name) VALUES ('', 'RR-1', '', 'rivregru', 'Ёрш')")
+    connection.close()
+
+    with ScraperSQLiteDB(file) as db:
+        assert [ship.main_name for ship in db.search_ships("ерш")] == ["Ёрш"]
+
+
+def test_ships_table_of_previous_version(tmp_path):
+    file: str = str(tmp_path / "scraper.sqlite")
+    connection = sqlite3.connect(file)  # composite primary key, search index by the implicit rowid
+    connection.executescript(f"CREATE TABLE ships ({', '.join(SHIP_FIELDS)}, PRIMARY KEY (imo_number, "
+                             "proprietary_number1, proprietary_number2, source_system));"
+                             "CREATE VIRTUAL TABLE ships_search USING fts5(main_name);")
+    with connection:
+        connection.execute("INSERT INTO ships(imo_number, proprietary_number1, proprietary_number2, "
+                           "source_system, timestamp, main_name) "
+                           "VALUES ('', 'RR-1', '', 'rivregru', '2020-01-01 00:00:00', 'Ёрш')")
+        connection.execute("INSERT INTO ships_search(rowid, main_name) VALUES (1, 'Другой')")
+    connection.close()
+
+    with ScraperSQLiteDB(file) as db:
+        assert [ship.main_name for ship in db.search_ships("ерш")] == ["Ёрш"]
+        assert db.search_ships("другой") == []  # the old index is dropped
+        db.save_ships([ShipDto("", "RR-1", "", "rivregru", datetime(2021, 1, 1), main_name="Окунь")])
+        assert db.ships_count() == 1
+        assert db.ship_as_of("", "RR-1", "", "rivregru", datetime(2020, 6, 1)) == {"main_name": "Ёрш"}
+        assert db.ship_as_of("", "RR-1", "", "rivregru", datetime(2021, 6, 1))["main_name"] == "Окунь"
+    with ScraperSQLiteDB(file) as db:  # migrated once
+        assert [ship.main_name for ship in db.search_ships("окунь")] == ["Окунь"]
+
+
+def test_ships_history(make_ships, tmp_path):
+    identity: tuple = ("9074729", "RS-1", "", "rsclassorg")
+    runs: list = [("Russia", "ФГБУ ААНИИ"), ("Russia", "ФГБУ ААНИИ"), ("Panama", "ФГБУ ААНИИ"),
+                  ("Panama", "Arctic LLC"), ("Panama", "Arctic LLC")]  # flag and owner by the years
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db:
+        for year, (flag, owner) in enumerate(runs, start=2017):
+            db.save_ships([ShipDto(*identity, datetime(year, 1, 1), flag=flag, owner=owner,
+                                   main_name="Академик")])
+            db.save_ships(make_ships(3, TIMESTAMP))  # the same ships - nothing changes
+
+        history = db.ship_history(*identity, fields=["flag", "owner"])
+        assert [(version.field, version.value, version.valid_from.year,
+                 version.valid_to and version.valid_to.year) for version in history] == [
+            ("flag", "Russia", 2017, 2019), ("flag", "Panama", 2019, None),
+            ("owner", "ФГБУ ААНИИ", 2017, 2020), ("owner", "Arctic LLC", 2020, None)]
+        assert len(db.ship_history(*identity)) == 5  # + main name, empty attributes aren't versioned
+        assert db.ship_as_of(*identity, datetime(2019, 6, 1)) == {"flag": "Panama", "owner": "ФГБУ ААНИИ",
+                                                                  "main_name": "Академик"}
+        assert db.ship_as_of(*identity, datetime(2016, 6, 1)) == {}
+        assert db.fleet_as_of("owner", datetime(2021, 1, 1)) == {identity: "Arctic LLC"}
+        names = db.fleet_as_of("main_name", datetime(2030, 1, 1), "rsclassorg")
+        assert names[("1000002", "2", "", "rsclassorg")] == "SHIP 2"
+        with pytest.raises(ScraperException):
+            db.fleet_as_of("timestamp", datetime.now())
+
+        plan: str = " ".join(row[-1] for row in db.write_transaction([lambda connection: connection.execute(
+            f"EXPLAIN QUERY PLAN SELECT value FROM {SHIPS_HISTORY_TABLE} WHERE field = 'owner' AND "
+            f"valid_from <= '2019' AND (valid_to IS NULL OR valid_to > '2019')").fetchall()])[0])
+        assert "USING INDEX ships_history_as_of_idx" in plan
+
+
+def test_ships_history_out_of_order(tmp_path):
+    identity: tuple = ("9074729", "RS-1", "", "rsclassorg")
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db:
+        db.save_ships([ShipDto(*identity, datetime(2020, 1, 1), flag="Russia")])
+        db.save_ships([ShipDto(*identity, datetime(2022, 1, 1), flag="Panama")])
+        db.save_ships([ShipDto(*identity, datetime(2021, 1, 1), flag="Malta")])  # older run, loaded later
+
+        assert db.get_ship(*identity).flag == "Panama" and db.get_ship(*identity).timestamp.year == 2022
+        assert [(version.value, version.valid_from.year, version.valid_to and version.valid_to.year)
+                for version in db.ship_history(*identity)] == [("Russia", 2020, 2022), ("Panama", 2022, None)]
+        assert db.ship_as_of(*identity, datetime(2023, 1, 1)) == {"flag": "Panama"}
+
+        db.write_transaction([lambda connection: connection.execute(
+            "DELETE FROM ships WHERE proprietary_number1 = 'RS-1'")])
+        assert db.ship_as_of(*identity, datetime.now() + timedelta(days=1)) == {}  # interval is closed
+        assert db.ship_history(*identity)[-1].valid_to is not None
+
+
+def test_history_for_existing_ships(tmp_path):
+    file: str = str(tmp_path / "scraper.sqlite")
+    connection = sqlite3.connect(file)  # DB of the previous version - without history
+    connection.executescript(SCRAPER_DB_SCRIPT)
+    with connection:
+        connection.execute("INSERT INTO ships(imo_number, proprietary_number1, proprietary_number2, "
+                           "source_system, timestamp, main_name, flag) "
+                           "VALUES ('', 'RR-1', '', 'rivregru', '2020-01-01 00:00:00', 'Ёрш', '')")
+    connection.close()
+
+    with ScraperSQLiteDB(file) as db:
+        assert db.ship_as_of("", "RR-1", "", "rivregru", datetime(2021, 1, 1)) == {"main_name": "Ёрш"}
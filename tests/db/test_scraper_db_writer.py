@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Scraper DB Writer module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.db.scraper_db_sqlite import ScraperSQLiteDB
+from wfleet.scraper.db.scraper_db_writer import ScraperDbWriter
+
+
+def test_concurrent_producers(make_ships, tmp_path):
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db:
+        with ScraperDbWriter(db, queue_size=4) as writer:
+            def produce(worker: int) -> int:  # scraper worker - batches of the found ships
+                futures = [writer.submit_ships(make_ships(50, start=worker * 1000 + batch * 50))
+                           for batch in range(20)]
+                return sum(future.result() for future in futures)  # durable after the commit
+
+            with ThreadPoolExecutor(max_workers=30) as executor:
+                assert sum(executor.map(produce, range(30))) == 30000
+        assert db.ships_count() == 30000
+        assert writer.requests == 600 and writer.transactions <= writer.requests
+
+
+def test_group_commit(make_ships, tmp_path):
+    released = threading.Event()
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db, ScraperDbWriter(db) as writer:
+        blocking = writer.submit(lambda connection: released.wait(10))  # the writer is busy
+        futures = [writer.submit_ships(make_ships(10, start=i * 10)) for i in range(10)]
+        released.set()
+        writer.flush()
+
+        assert blocking.result() and [future.result() for future in futures] == [10] * 10
+        assert writer.requests == 12 and writer.transactions <= 2  # queued requests are grouped
+        assert db.ships_count() == 100
+
+
+def test_failed_request(make_ships, tmp_path):
+    released = threading.Event()
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db, ScraperDbWriter(db) as writer:
+        writer.submit(lambda connection: released.wait(10))
+        good = writer.submit_ships(make_ships(10, start=0))
+        bad = writer.submit_sql("INSERT INTO unknown_table VALUES (?)", [(1,)])
+        good_after = writer.submit_ships(make_ships(10, start=10))
+        released.set()
+
+        with pytest.raises(sqlite3.OperationalError):
+            bad.result()
+        assert good.result() == 10 and good_after.result() == 10  # not affected by the failed request
+        writer.flush()
+        assert db.ships_count() == 20
+
+    with pytest.raises(ScraperException):
+        writer.submit_ships(make_ships(1, start=0))
+
+
+def test_run_telemetry(tmp_path):
+    start: datetime = datetime(2026, 10, 1, 10, 0, 0)
+    with ScraperSQLiteDB(str(tmp_path / "scraper.sqlite")) as db, ScraperDbWriter(db) as writer:
+        run_id: int = writer.submit_run_start(start).result()
+        assert writer.submit_run_finish(run_id, start + timedelta(seconds=90)).result() == 1
+        with pytest.raises(ScraperException):  # unknown run - the future is failed
+            writer.submit_run_finish(run_id + 100).result()
+        assert db.update_scraper_run_telemetry(run_id, start + timedelta(seconds=30)) == 1  # the same records
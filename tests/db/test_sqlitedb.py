@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for SQLite persistence layer (GeoDB).
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import sqlite3
+from wfleet.scraper.db import sqlitedb
+from wfleet.scraper.db.sqlitedb import GeoDB
+
+
+def _db(tmp_path) -> str:
+    dbname: str = str(tmp_path / "geo.sqlite")
+    sqlitedb.db_create(dbname)
+    return dbname
+
+
+def test_geo_points_batch_load(tmp_path):
+    dbname: str = _db(tmp_path)
+    root_id = sqlitedb.db_add_single_geo_point(dbname, 1, None, "Россия 'RF'", 1, "true", None)
+    points = [(100 + i, i, f"Регион {i}", 2, "true", root_id, 0) for i in range(2500)]
+
+    geo_db = GeoDB(dbname)
+    geo_db.db_add_multiple_geo_points(dbname, points)
+    assert geo_db.db_get_geo_point_id(dbname, 100) == root_id + 1  # cached on insert
+    assert geo_db.db_get_geo_point_id(dbname, 1) == root_id
+    assert geo_db.db_get_geo_point_id(dbname, 999999) == -1
+
+    geo_db.db_mark_geo_point_as_processed(dbname, root_id)
+    geo_db.db_mark_geo_points_as_processed(dbname, range(root_id + 1, root_id + 1001))
+    geo_db.close()
+
+    assert len(sqlitedb.db_get_not_processed_geo_points_ids(dbname)) == 1500
+    # quotes - parameterized
+    assert sqlitedb.db_get_geo_point_id(dbname, 1, None, "Россия 'RF'", 1) == root_id
+    assert sqlitedb.db_get_geo_point_id(dbname, 101, 1, "Регион 1", 2) == root_id + 2
+    assert sqlitedb.db_get_geo_point_id(dbname, 101, 2, "Регион 1", 2) == -1
+
+
+def test_lookup_uses_index(tmp_path):
+    connection = sqlite3.connect(_db(tmp_path))
+    plan = connection.execute("EXPLAIN QUERY PLAN " + sqlitedb.SELECT_GEO_POINT_ID_SQL,
+                              (1, None, "x", 1)).fetchall()
+    connection.close()
+    assert "USING" in str(plan) and "INDEX" in str(plan)
+
+
+def test_areas_commissions_addresses(tmp_path):
+    dbname: str = _db(tmp_path)
+    sqlitedb.db_add_areas(dbname, ["North", "O'Brien"])
+    commission_id = sqlitedb.db_add_commission(dbname, "Moscow", "T-1", "S-1", 100)
+    assert sqlitedb.db_add_commissions(dbname, [("Kazan", "T-2", "S-2", 10)] * 3) == 3
+    assert sqlitedb.db_add_address(dbname, "Main st.", "1, 2", commission_id) == 1
+    assert sqlitedb.db_add_addresses(dbname, [("Second st.", "3", commission_id)] * 2) == 2
+
+    connection = sqlite3.connect(dbname)
+    assert connection.execute("SELECT count(*) FROM commissions").fetchone()[0] == 4
+    assert connection.execute("SELECT name FROM areas WHERE id = 2").fetchone()[0] == "O'Brien"
+    connection.close()
+
+
+def test_geo_db_single_rows_one_connection(tmp_path, monkeypatch):
+    dbname: str = _db(tmp_path)
+    connections: list = []
+    connect = sqlitedb.db_connect
+    monkeypatch.setattr(sqlitedb, "db_connect", lambda name: connections.append(name) or connect(name))
+    monkeypatch.setattr(sqlitedb, "DB_BATCH_SIZE", 2)
+
+    geo_db = GeoDB(dbname)
+    root_id = geo_db.db_add_single_geo_point(dbname, 1, None, "Root", 1, "true", None)
+    commission_id = geo_db.db_add_commission(dbname, "Moscow", "T-1", "S-1", 100)
+    assert geo_db.db_add_address(dbname, "Main st.", "1", commission_id) == 1
+    assert geo_db.db_get_geo_point_id(dbname, 1) == root_id  # cached on insert
+    assert len(sqlitedb.db_get_not_processed_geo_points_ids(dbname)) == 1  # committed by the batch
+    geo_db.close()  # the rest of the rows is committed
+
+    connection = sqlite3.connect(dbname)
+    assert connection.execute("SELECT count(*) FROM addresses").fetchone()[0] == 1
+    connection.close()
+    assert connections == [dbname, dbname]  # GeoDB connection + one select
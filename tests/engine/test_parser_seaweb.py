@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Seaweb parser (known 'empty' pages are skipped).
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import pytest
+import sqlite3
+from pathlib import Path
+from typing import List
+from wfleet.scraper.cache.cache_manifest import CacheManifest, MANIFEST_ENTITY_SHIP, content_hash
+from wfleet.scraper.engine.scrapers.seaweb import parser_seaweb, seaweb
+from wfleet.scraper.engine.scrapers.seaweb.seaweb import SeawebScraper
+
+ROW: str = ('<div class="col-sm-12 col-md-6 col-lg-6"><div class="col-4 keytext">{}</div>'
+            '<div class="col-8 valuetext">{}</div></div>')
+SHIP_MAIN_PAGE: bytes = ("<html><body>" + ROW.format("IMO/LR No.", "1000019") +
+                         ROW.format("Ship Name", "NEVA") + "</body></html>").encode()
+PANEL_PAGE: bytes = ("<html><body>" + ROW.format("Hatches", "4") + "</body></html>").encode()
+EMPTY_PANEL_PAGE: bytes = b"<html><body><div class='panel'>  </div></body></html>"
+
+
+@pytest.fixture
+def ship_dir(tmp_path) -> Path:
+    ship_dir: Path = tmp_path / "seaweb" / "1000019"
+    ship_dir.mkdir(parents=True)
+    for page, content in [("ship_main", SHIP_MAIN_PAGE), ("hatches", PANEL_PAGE), ("ro_ro", EMPTY_PANEL_PAGE),
+                          ("tanks", EMPTY_PANEL_PAGE)]:
+        (ship_dir / (page + ".html")).write_bytes(content)
+    return ship_dir
+
+
+@pytest.fixture
+def manifest(tmp_path, ship_dir) -> CacheManifest:
+    manifest = CacheManifest(str(tmp_path / "manifest.sqlite"))
+    for page in ("ship_main", "hatches", "ro_ro", "tanks"):
+        file: Path = ship_dir / (page + ".html")
+        manifest.record(str(file), MANIFEST_ENTITY_SHIP, "1000019", page, file.read_bytes(), 200)
+    manifest.mark_empty(content_hash(EMPTY_PANEL_PAGE), "ro_ro")
+    yield manifest
+    manifest.close()
+
+
+@pytest.fixture
+def parsed_panels(monkeypatch) -> List[str]:
+    """Page keys of the parsed ship panels."""
+    panels: List[str] = []
+
+    def parser(html_text: str, page_key: str) -> dict:
+        panels.append(page_key)
+        return parser_seaweb._parse_ship_panel(html_text, page_key)
+
+    for page_key in parser_seaweb.SHIP_PANELS_PARSERS:
+        monkeypatch.setitem(parser_seaweb.SHIP_PANELS_PARSERS, page_key, parser)
+    return panels
+
+
+def test_parse_ship_panel():
+    assert parser_seaweb._parse_ship_panel(PANEL_PAGE.decode(), "hatches") == {"hatches: Hatches": "4"}
+    assert parser_seaweb._parse_ship_panel(EMPTY_PANEL_PAGE.decode(), "ro_ro") == {}
+
+
+def test_parse_one_ship_skips_empty_panels(ship_dir, manifest, parsed_panels):
+    ship = parser_seaweb.parse_one_ship(str(ship_dir), manifest)
+    assert (ship.imo_number, ship.main_name) == ("1000019", "NEVA")
+    assert parsed_panels == ["hatches"]  # empty ro_ro/tanks panels (the same content) aren't parsed
+
+    parsed_panels.clear()
+    parser_seaweb.parse_one_ship(str(ship_dir))  # no manifest - all fetched panels are parsed
+    assert parsed_panels == ["ro_ro", "hatches", "tanks"]
+
+
+def test_parse_all_ships_with_manifest(ship_dir, manifest, parsed_panels):
+    ships = parser_seaweb.parse_all_ships(str(ship_dir.parent), manifest)
+    assert [ship.imo_number for ship in ships] == ["1000019"]
+    assert parsed_panels == ["hatches"]
+
+
+def test_seaweb_parse_uses_manifest(tmp_path, monkeypatch):
+    manifest = CacheManifest(str(tmp_path / "manifest.sqlite"))
+    parsed: list = []
+
+    def parse_all_ships(ships_dir: str, ships_manifest: CacheManifest) -> list:
+        parsed.append(ships_manifest)
+        return []
+
+    monkeypatch.setattr(seaweb, "CacheManifest", lambda: manifest)
+    monkeypatch.setattr(seaweb, "parse_all_ships", parse_all_ships)
+
+    SeawebScraper().parse(dry_run=False)
+    assert parsed == [manifest]  # the parse path gets the manifest (empty pages are skipped)...
+    with pytest.raises(sqlite3.ProgrammingError):  # ...and closes it
+        manifest.empty_hashes()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Scrapers Registry module (and lazy imports of the CLI).
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import os
+import sys
+import subprocess
+import importlib.metadata
+import pytest
+from pathlib import Path
+from wfleet.scraper.engine.scraper_registry import ScraperRegistry, BUILTIN_SCRAPERS, DEFAULT_SCRAPERS
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+
+GIMS_TARGET: str = BUILTIN_SCRAPERS["gims"]
+
+
+def test_scrapers_loaded_on_first_use():
+    registry = ScraperRegistry()
+    assert set(DEFAULT_SCRAPERS) < set(registry.names()) and len(BUILTIN_SCRAPERS) == 8
+    assert not registry.is_loaded("gims")
+
+    scraper_class = registry.get("gims")
+    assert scraper_class.__name__ == "GimsRuScraper" and registry.is_loaded("gims")
+    assert registry.get("gims") is scraper_class and not registry.is_loaded("rsclassorg")
+    assert type(registry.create("gims")) is scraper_class
+
+    with pytest.raises(ScraperException):
+        registry.get("unknown")
+    with pytest.raises(ScraperException):
+        registry.register("broken", "no.class.target")
+
+
+def test_plugin_scrapers_from_entry_points(monkeypatch):
+    points = importlib.metadata.EntryPoints([
+        importlib.metadata.EntryPoint("gims2", GIMS_TARGET, "wfleet.scraper.scrapers"),
+        # ignored - the name is registered already
+        importlib.metadata.EntryPoint("gims", "plugin.module:OtherScraper", "wfleet.scraper.scrapers"),
+        importlib.metadata.EntryPoint("other", "other.module:Other", "other.group"),
+    ])
+    monkeypatch.setattr(importlib.metadata, "entry_points", lambda: points)
+
+    registry = ScraperRegistry({"gims": GIMS_TARGET})
+    assert registry.get("gims2").__name__ == "GimsRuScraper"
+    assert registry.names() == ["gims", "gims2"]
+
+
+def test_cli_startup_doesnt_import_heavy_modules(tmp_path):
+    code: str = ("import sys, wfleet.scraper.scraper; "
+                 "print(' '.join(sorted(m for m in ('bs4', 'openpyxl', 'requests', 'numpy', 'xlwt', "
+                 "'wfleet.scraper.engine.scraper_engine', 'wfleet.scraper.engine.sinks') "
+                 "if m in sys.modules)))")
+    src: str = str(Path(__file__).parents[2] / "src")
+    env: dict = dict(os.environ, HOME=str(tmp_path),
+                     PYTHONPATH=src + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=tmp_path,
+                            env=env, check=True)
+    assert result.stdout.split() == []
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Seaweb scraper (crawl frontier of ship's companies and ship's builders).
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import pytest
+from typing import List, Tuple
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.utils.codes_engine import CodesProcessor
+from wfleet.scraper.engine.scrapers.seaweb import scraper_seaweb
+from wfleet.scraper.engine.scrapers.seaweb.scraper_seaweb import (
+    SeawebFrontier,
+    ENTITY_SHIP,
+    ENTITY_SHIPCOMPANY,
+    ENTITY_SHIPBUILDER,
+    FRONTIER_ENTITIES_PER_SHIP,
+)
+
+
+@pytest.fixture
+def frontier(tmp_path) -> SeawebFrontier:
+    (tmp_path / "companies.csv").write_text("C2;+\nC1;+\n")
+    (tmp_path / "builders.csv").write_text("B1;+\n")
+    return SeawebFrontier(CodesProcessor(str(tmp_path / "companies.csv")),
+                          CodesProcessor(str(tmp_path / "builders.csv")))
+
+
+@pytest.fixture
+def crawled(monkeypatch) -> List[Tuple[str, str]]:
+    """Crawled entities (entity type, code) in the crawl order, nothing is requested."""
+    entities: List[Tuple[str, str]] = []
+    monkeypatch.setattr(scraper_seaweb, "scrap_entity",
+                        lambda web_client, urls, code, entity_dir, entity: entities.append((entity, code)))
+    return entities
+
+
+def _drain(frontier: SeawebFrontier) -> List[Tuple[str, str]]:
+    entities: List[Tuple[str, str]] = []
+    entity = frontier.pop()
+    while entity:
+        entities.append(entity)
+        entity = frontier.pop()
+    return entities
+
+
+def test_frontier_accepts_empty_processors(tmp_path):
+    frontier = SeawebFrontier(CodesProcessor(str(tmp_path / "companies.csv")),
+                              CodesProcessor(str(tmp_path / "builders.csv")))
+    assert frontier.push(ENTITY_SHIPCOMPANY, '1000019')
+    with pytest.raises(ScraperException):
+        SeawebFrontier(None, CodesProcessor(str(tmp_path / "builders.csv")))
+
+
+def test_frontier_push_deduplicates(tmp_path):
+    companies = CodesProcessor(str(tmp_path / "companies.csv"))
+    frontier = SeawebFrontier(companies, CodesProcessor(str(tmp_path / "builders.csv")))
+
+    assert frontier.push(ENTITY_SHIPCOMPANY, 'C1')
+    assert not frontier.push(ENTITY_SHIPCOMPANY, 'C1')  # duplicate
+    assert frontier.push(ENTITY_SHIPBUILDER, 'C1')  # the same code of the other entity type
+    assert not frontier.push(ENTITY_SHIPCOMPANY, '-') and not frontier.push(ENTITY_SHIPCOMPANY, '')
+    assert len(frontier) == 2
+    assert companies.codes() == {'C1'}  # new code is persisted
+
+    frontier.pop()
+    assert not frontier.push(ENTITY_SHIPCOMPANY, 'C1')  # popped entity isn't pushed again
+    with pytest.raises(ScraperException):
+        frontier.push(ENTITY_SHIP, '1000019')
+
+
+def test_frontier_push_known_and_fifo_pop(frontier):
+    assert frontier.pop() is None and len(frontier) == 0
+    frontier.push_known()
+    assert len(frontier) == 3
+    frontier.push(ENTITY_SHIPBUILDER, 'B2')
+    # known codes first (sorted, by entity type), then the discovered ones - in the push order
+    assert _drain(frontier) == [(ENTITY_SHIPCOMPANY, 'C1'), (ENTITY_SHIPCOMPANY, 'C2'),
+                                (ENTITY_SHIPBUILDER, 'B1'), (ENTITY_SHIPBUILDER, 'B2')]
+    assert frontier.pop() is None
+
+
+def test_crawl_interleaves_frontier_entities(frontier, crawled, monkeypatch):
+    monkeypatch.setattr(scraper_seaweb, "_extract_ship_frontier_codes",  # each ship - new builder
+                        lambda ship_id, ship_dir, front: front.push(ENTITY_SHIPBUILDER, 'B' + ship_id))
+    frontier.push_known()
+
+    scraper_seaweb.scrap_ships_with_frontier(object(), {'1000019', '1000021'}, frontier)
+    assert FRONTIER_ENTITIES_PER_SHIP == 2
+    assert crawled == [(ENTITY_SHIP, '1000019'), (ENTITY_SHIPCOMPANY, 'C1'), (ENTITY_SHIPCOMPANY, 'C2'),
+                       (ENTITY_SHIP, '1000021'), (ENTITY_SHIPBUILDER, 'B1'), (ENTITY_SHIPBUILDER, 'B1000019'),
+                       (ENTITY_SHIPBUILDER, 'B1000021')]  # the rest of the frontier - drained after the ships
+    assert len(frontier) == 0
+
+
+def test_crawl_drain_stops_by_requests_limit(frontier, crawled):
+    for code in range(10):
+        frontier.push(ENTITY_SHIPCOMPANY, f'N{code}')
+
+    scraper_seaweb.scrap_ships_with_frontier(object(), set(), frontier, req_limit=4)
+    assert crawled == [(ENTITY_SHIPCOMPANY, f'N{code}') for code in range(5)]  # sentinel: counter > limit
+    assert len(frontier) == 5  # not processed entities are kept in the frontier
+
+
+def test_crawl_verifies_imo_candidates(tmp_path, crawled, monkeypatch):
+    fetched: dict = {'1000019': True, '1000033': True, '1000045': False}  # ship -> data found (not denied)
+    monkeypatch.setattr(scraper_seaweb, "_extract_ship_frontier_codes",
+                        lambda ship_id, *args: fetched[ship_id])
+    imo_codes = CodesProcessor(str(tmp_path / "imo.csv"))
+    imo_codes.add('1000019')
+    frontier = SeawebFrontier(CodesProcessor(str(tmp_path / "companies.csv")),
+                              CodesProcessor(str(tmp_path / "builders.csv")))
+
+    scraper_seaweb.scrap_ships_with_frontier(object(), set(fetched), frontier, verified_codes=imo_codes)
+    assert imo_codes.codes() == {'1000019', '1000033'}  # denied candidate isn't verified
+    assert [code for entity, code in crawled] == sorted(fetched)
+
+
+def test_crawl_wrong_arguments(frontier):
+    with pytest.raises(ScraperException):
+        scraper_seaweb.scrap_ships_with_frontier(None, set(), frontier)
+    with pytest.raises(ScraperException):
+        scraper_seaweb.scrap_ships_with_frontier(object(), None, frontier)
+    with pytest.raises(ScraperException):
+        scraper_seaweb.scrap_ships_with_frontier(object(), set(), None)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Ship Resolver module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import pytest
+from wfleet.scraper.entities.ship import ShipDto
+from wfleet.scraper.entities.ship_batch import ShipBatch
+from wfleet.scraper.engine.ship_resolver import (
+    ShipResolver,
+    resolve_ships,
+    normalize_call_sign,
+    normalize_imo,
+    normalize_imos,
+    normalize_name,
+    SYSTEM_GOLDEN,
+    RULE_CALL_SIGN_NAME,
+    RULE_IMO,
+    RULE_MMSI,
+    RULE_NAME_BUILD_YEAR,
+)
+
+
+def _ships() -> list:
+    return [
+        # 0, 1, 2 - the same ship: IMO (0, 1), MMSI (1, 2)
+        ShipDto("IMO 9074729", "RS-1", "", "rsclassorg", main_name="Нева", flag="Russia"),
+        ShipDto("9074729", "", "", "seaweb", main_name="NEVA", mmsi_number="273111111", ship_type="Tanker"),
+        ShipDto("", "RR-1", "", "rivregru", main_name="Нева", mmsi_number="273 111 111", home_port="Moscow"),
+        # 3, 4 - the same ship: call sign + name (different spelling)
+        ShipDto("-", "RS-2", "", "rsclassorg", main_name="Volga-1", call_sign="UBCD"),
+        ShipDto("", "GM-2", "", "gims", main_name="ВОЛГА 1", call_sign="ubcd", flag="Russia"),
+        # 5, 6 - the same name and build year
+        ShipDto("", "MF-3", "", "morflotru", main_name="Don", build_date="1999"),
+        ShipDto("", "RR-3", "", "rivregru", main_name="DON", build_date="01.05.1999"),
+        # 7 - the same name and build year as 5/6, but different IMO than 8 (conflict by the call sign)
+        ShipDto("9176187", "", "", "seaweb", main_name="Amur", call_sign="UAAA"),
+        ShipDto("8814275", "", "", "seaweb", main_name="Amur", call_sign="UAAA"),
+    ]
+
+
+@pytest.mark.parametrize("function, value, expected", [
+    (normalize_imo, "IMO 9074729", "9074729"),
+    (normalize_imo, "9074720", ""),  # wrong check digit
+    (normalize_imo, "-", ""),
+    (normalize_name, "ВОЛГА-1", "VOLGA 1"),
+    (normalize_name, " m/v  Neva ", "M V NEVA"),
+    (normalize_call_sign, "u-bcd", "UBCD"),
+    (normalize_call_sign, "-", ""),
+])
+def test_normalization(function, value, expected):
+    assert function(value) == expected
+
+
+def test_normalize_imos():
+    assert normalize_imos(["IMO 9074729", "9074720", "", "-", "8814275"]) == \
+        ["9074729", "", "", "", "8814275"]
+    assert normalize_imos([]) == []
+
+
+def test_link():
+    resolver = ShipResolver()
+    ships = _ships()
+    columns = {name: [getattr(ship, name) for ship in ships]
+               for name in ("imo_number", "mmsi_number", "main_name", "call_sign", "build_date")}
+    labels = resolver.link(columns)
+
+    assert labels.tolist() == [0, 0, 0, 1, 1, 2, 2, 3, 4]
+    assert resolver.stats[RULE_IMO] == 1
+    assert resolver.stats[RULE_MMSI] == 1
+    assert resolver.stats[RULE_CALL_SIGN_NAME] == 1
+    assert resolver.stats[RULE_NAME_BUILD_YEAR] == 1
+    assert resolver.stats["conflicts"] == 1
+    assert resolver.stats["entities"] == 5
+
+
+def test_resolve_golden_ships():
+    golden = resolve_ships(_ships(), source_priority=("seaweb", "rsclassorg"))
+    assert len(golden) == 5
+
+    neva = golden[0]
+    assert neva.records == [0, 1, 2]
+    assert neva.ship.source_system == SYSTEM_GOLDEN
+    assert neva.ship.imo_number == "9074729"
+    assert neva.ship.main_name == "NEVA"  # seaweb - the highest priority
+    assert (neva.ship.flag, neva.ship.ship_type, neva.ship.home_port) == ("Russia", "Tanker", "Moscow")
+    assert ("rivregru", "RR-1", "") in neva.sources
+
+    volga = golden[1]
+    assert volga.ship.main_name == "Volga-1"  # rsclassorg - before not prioritized gims
+    assert volga.ship.imo_number == ""
+
+
+def test_resolve_batch():
+    ships = _ships()
+    golden = ShipResolver().resolve_batch(ShipBatch.from_ships(ships))
+    assert [ship.records for ship in golden] == [ship.records for ship in resolve_ships(ships)]
+    assert ShipResolver().resolve([]) == []
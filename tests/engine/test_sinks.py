@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Output Sinks module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import csv
+import json
+import sqlite3
+import pytest
+from datetime import datetime
+from openpyxl import load_workbook
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS, ships_from_dicts
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.db.scraper_db_sqlite import ScraperSQLiteDB
+from wfleet.scraper.db.scraper_db_writer import ScraperDbWriter
+from wfleet.scraper.engine.sinks import (
+    BackgroundSink,
+    CsvSink,
+    DbSink,
+    JsonlSink,
+    ParquetSink,
+    ShipSink,
+    SQLiteSink,
+    create_sink,
+    write_ships,
+    SINKS,
+    SINK_CSV,
+    SINK_DB,
+    SINK_EXCEL,
+    SINK_JSONL,
+    SINK_SQLITE,
+)
+
+TIMESTAMP: datetime = datetime(2026, 10, 1, 10, 0, 0)
+
+
+class _SharedSink(ShipSink):
+    name: str = SINK_DB
+    shared: bool = True
+
+    def write_batch(self, ships) -> None:
+        self.rows += len(ships)
+
+
+class _FailingSink(ShipSink):
+    def write_batch(self, ships) -> None:
+        raise IOError("disk is full")
+
+
+def test_csv_and_jsonl_sinks(make_ships, tmp_path):
+    with CsvSink(str(tmp_path / "ships.csv")) as csv_sink, \
+            JsonlSink(str(tmp_path / "ships.jsonl")) as jsonl_sink:
+        for sink in (csv_sink, jsonl_sink):
+            assert write_ships(sink, iter(make_ships(5)), batch_size=2) == 5
+
+    with open(tmp_path / "ships.csv", encoding="utf-8", newline="") as csv_file:
+        rows = list(csv.reader(csv_file))
+    assert tuple(rows[0]) == SHIP_FIELDS
+    assert len(rows) == 6 and rows[1][SHIP_FIELDS.index("main_name")] == "SHIP 0"
+
+    with open(tmp_path / "ships.jsonl", encoding="utf-8") as jsonl_file:
+        records = [json.loads(line) for line in jsonl_file]
+    assert [record["main_name"] for record in records] == [f"SHIP {i}" for i in range(5)]
+    assert records[0]["timestamp"] == TIMESTAMP.strftime(Config().timestamp_pattern)
+    # round trip
+    assert ships_from_dicts(records, mapping={name: name for name in SHIP_FIELDS}) == make_ships(5)
+
+
+def test_sqlite_sink_upsert(make_ships, tmp_path):
+    file: str = str(tmp_path / "ships.sqlite")
+    with SQLiteSink(file) as sink:
+        sink.write_batch(make_ships(3))
+        changed = make_ships(1)[0]
+        changed.flag = "Panama"
+        sink.write_batch([changed])  # the same identity - replaced
+
+    connection = sqlite3.connect(file)
+    assert connection.execute("SELECT count(*) FROM ships").fetchone()[0] == 3
+    assert connection.execute("SELECT flag FROM ships "
+                              "WHERE proprietary_number1 = '0'").fetchone()[0] == "Panama"
+    connection.close()
+
+
+def test_create_sink_several_sinks(make_ships, tmp_path):
+    sink = create_sink([SINK_EXCEL, SINK_CSV, SINK_JSONL, SINK_SQLITE, SINK_CSV], str(tmp_path))
+    assert isinstance(sink, BackgroundSink)
+    with sink:
+        assert write_ships(sink, make_ships(2500)) == 2500
+
+    stem: str = Config().raw_data_file.rsplit(".", 1)[0]
+    assert sorted(path.name for path in tmp_path.iterdir() if not path.name.endswith(("-wal", "-shm"))) == \
+        sorted(stem + extension for extension in (".xlsx", ".csv", ".jsonl", ".sqlite"))
+    assert [inner.rows for inner in sink.sinks] == [2500] * 4
+    book = load_workbook(str(tmp_path / (stem + ".xlsx")), read_only=True)
+    assert sum(1 for _ in book.active.iter_rows(values_only=True)) == 2501
+    book.close()
+
+
+def test_create_sink_defaults_and_errors(tmp_path, monkeypatch):
+    monkeypatch.setitem(SINKS, SINK_DB, _SharedSink)  # scraper DB isn't touched
+    sink = create_sink((), str(tmp_path), background=False)
+    assert [inner.name for inner in sink.sinks] == list(Config().default_sinks)
+    assert sink.sinks[0].file == Config().db_name  # shared sink - scraper DB file
+    sink.close()
+    with pytest.raises(ScraperException):
+        create_sink(["unknown"], str(tmp_path))
+
+
+def test_db_sink_keeps_init_datetime(make_ships, tmp_path):
+    file: str = str(tmp_path / "scraperdb.sqlite")
+    ships = make_ships(2)
+    with DbSink(file) as sink:
+        sink.write_batch(ships)
+        changed = ShipDto("1000000", "0", "", "rsclassorg", datetime(2026, 10, 2), flag="Panama",
+                          init_datetime=datetime(2026, 10, 2))
+        sink.write_batch([changed])
+    assert sink.rows == 3
+
+    with ScraperSQLiteDB(file) as db:
+        ship = db.get_ship("1000000", "0", "", "rsclassorg")
+    assert ship.flag == "Panama" and ship.timestamp == datetime(2026, 10, 2)
+    assert ship.init_datetime == ships[0].init_datetime  # the first time the ship is seen
+
+
+def test_db_sink_with_run_writer(make_ships, tmp_path):
+    with ScraperSQLiteDB(str(tmp_path / "scraperdb.sqlite")) as db:
+        writer = ScraperDbWriter(db)
+        run_id: int = writer.submit_run_start().result()
+        sink = create_sink([SINK_DB], str(tmp_path), background=False, db_writer=writer)
+        assert isinstance(sink, DbSink)
+        assert write_ships(sink, iter(make_ships(3)), batch_size=2) == 3
+        sink.close()  # written batches are checked, the writer of the run isn't closed
+        assert db.ships_count() == 3
+        assert writer.submit_run_finish(run_id).result() == 1
+        writer.close()
+
+
+def test_background_sink_error(make_ships, tmp_path):
+    sink = BackgroundSink([_FailingSink(str(tmp_path / "failing"))], queue_size=1)
+    sink.write_batch(make_ships(1))
+    with pytest.raises(ScraperException):
+        for _ in range(10):  # error is raised on the next writes
+            sink.write_batch(make_ships(1))
+    with pytest.raises(ScraperException):  # and on close
+        sink.close()
+    sink.close()  # already closed
+    with pytest.raises(ScraperException):
+        BackgroundSink([])
+
+
+def test_parquet_sink(make_ships, tmp_path):
+    try:
+        import pyarrow.parquet as parquet
+    except ImportError:  # optional dependency - sink reports it
+        with pytest.raises(ScraperException):
+            ParquetSink(str(tmp_path / "ships.parquet"))
+        return
+
+    with ParquetSink(str(tmp_path / "ships.parquet")) as sink:
+        write_ships(sink, make_ships(10), batch_size=3)
+    table = parquet.read_table(str(tmp_path / "ships.parquet"))
+    assert table.num_rows == 10 and table.column("main_name").to_pylist()[9] == "SHIP 9"
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for Snapshot Diff module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import pytest
+from pathlib import Path
+from datetime import datetime
+from wfleet.scraper.config.scraper_config import Config
+from wfleet.scraper.entities.ship import ShipDto
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.engine.sinks import CsvSink, ExcelSink, JsonlSink, SQLiteSink, write_ships
+from wfleet.scraper.engine.snapshot_diff import (
+    SnapshotDiff,
+    diff_runs,
+    find_run_data_file,
+    CHANGE_ADDED,
+    CHANGE_CHANGED,
+    CHANGE_REMOVED,
+    SHIP_COMPARED_FIELDS,
+    SHIP_IDENTITY_FIELDS,
+)
+
+
+def test_compared_fields():
+    assert "timestamp" not in SHIP_COMPARED_FIELDS and "init_datetime" not in SHIP_COMPARED_FIELDS
+    assert "imo_number" not in SHIP_COMPARED_FIELDS and "main_name" in SHIP_COMPARED_FIELDS
+
+
+@pytest.mark.parametrize("partitions", [1, 3, 64])
+def test_diff(make_ships, tmp_path, partitions):
+    old = make_ships(100, datetime(2026, 1, 1))
+    new = make_ships(100, datetime(2026, 2, 1))  # only timestamps are changed - no changes
+    new[5].main_name = "NEVA"
+    new[7].flag = "Panama"
+    del new[10]
+    new.append(ShipDto("9074729", "X-1", "", "rsclassorg", main_name="VOLGA"))
+
+    differ = SnapshotDiff(partitions, str(tmp_path))
+    changes = {change.key: change for change in differ.diff(iter(old), iter(new))}
+
+    assert len(changes) == 4
+    assert changes[("1000005", "5", "", "rsclassorg")].changes == {"main_name": ("SHIP 5", "NEVA")}
+    assert changes[("1000007", "7", "", "rsclassorg")].changes == {"flag": ("Russia", "Panama")}
+    assert changes[("1000010", "10", "", "rsclassorg")].kind == CHANGE_REMOVED
+    added = changes[("9074729", "X-1", "", "rsclassorg")]
+    assert (added.kind, added.changes) == (CHANGE_ADDED, {"main_name": (None, "VOLGA")})
+    assert changes[("1000005", "5", "", "rsclassorg")].kind == CHANGE_CHANGED
+
+    stats = differ.stats
+    assert (stats.old, stats.new, stats.added, stats.removed, stats.changed, stats.unchanged) == \
+        (100, 100, 1, 1, 2, 97)
+    assert list(tmp_path.iterdir()) == []  # temporary partitions are removed
+
+
+def test_diff_duplicates(make_ships, tmp_path):
+    old = make_ships(3, datetime(2026, 1, 1))
+    differ = SnapshotDiff(2, str(tmp_path))
+    assert list(differ.diff(old + old[:1], old)) == []
+    assert differ.stats.duplicates == 1
+
+    # the first duplicate is used on both sides
+    renamed = ShipDto(old[0].imo_number, old[0].proprietary_number1, "", "rsclassorg", main_name="NEVA")
+    assert list(differ.diff(old + [renamed], old)) == []
+    assert list(differ.diff(old, old + [renamed])) == []
+    assert differ.stats.duplicates == 1
+
+
+def test_diff_wrong_partitions():
+    with pytest.raises(ScraperException):
+        SnapshotDiff(-1)
+
+
+def test_diff_runs(make_ships, tmp_path):
+    old_run, new_run = tmp_path / "old", tmp_path / "new"
+    data_file: str = Config().raw_data_file
+    for run_dir in (old_run, new_run):
+        run_dir.mkdir()
+        (run_dir / data_file).write_text("")
+    snapshots = {str(old_run / data_file): make_ships(2, datetime(2026, 1, 1)),
+                 str(new_run / data_file): make_ships(3, datetime(2026, 2, 1))}
+
+    changes = list(diff_runs(str(old_run), str(new_run), lambda file: snapshots[file]))
+    assert [change.kind for change in changes] == [CHANGE_ADDED]
+    with pytest.raises(ScraperException):
+        diff_runs(str(old_run), str(tmp_path / "missing"), lambda file: [])
+
+
+@pytest.mark.parametrize("old_sink, new_sink", [(ExcelSink, CsvSink), (CsvSink, JsonlSink),
+                                                (JsonlSink, SQLiteSink), (SQLiteSink, ExcelSink)])
+def test_diff_runs_by_data_file_type(make_ships, tmp_path, old_sink, new_sink):
+    stem: str = Path(Config().raw_data_file).stem
+    runs = {tmp_path / "old": (old_sink, make_ships(2, datetime(2026, 1, 1))),
+            tmp_path / "new": (new_sink, make_ships(3, datetime(2026, 2, 1)))}
+    for run_dir, (sink_class, ships) in runs.items():
+        run_dir.mkdir()
+        with sink_class(str(run_dir / (stem + sink_class.extension))) as sink:
+            write_ships(sink, ships)
+
+    assert find_run_data_file(str(tmp_path / "new"))[0] == str(tmp_path / "new" / (stem + new_sink.extension))
+    changes = list(diff_runs(str(tmp_path / "old"), str(tmp_path / "new")))
+    assert [change.kind for change in changes] == [CHANGE_ADDED]
+    added_ship = runs[tmp_path / "new"][1][2]
+    assert changes[0].key == tuple(str(getattr(added_ship, name)) for name in SHIP_IDENTITY_FIELDS)
+
+
+def test_find_run_data_file_legacy_xls(tmp_path):
+    stem: str = Path(Config().raw_data_file).stem
+    (tmp_path / (stem + ".xls")).write_text("")
+    (tmp_path / (stem + ".csv")).write_text("")
+    assert find_run_data_file(str(tmp_path))[0] == str(tmp_path / (stem + ".xls"))  # in the preference order
+    with pytest.raises(ScraperException):
+        find_run_data_file(str(tmp_path / "missing"))
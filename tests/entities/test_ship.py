@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+    Unit tests for ShipDto and ShipBatch entities.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime
+from dataclasses import asdict
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS, ships_from_dicts, ships_from_tuples
+from wfleet.scraper.entities.ship_batch import ShipBatch
+
+
+SEAWEB_SHIP_DICT: dict = {
+    "imo_number": "1000019", "source_system": "seaweb", "timestamp": "01-Oct-2026 10:00:00",
+    "ship_name": "Neva", "ship_type": "Tanker", "gross": "100", "deadweight": "200", "call_sign": "UBCD",
+    "mmsi_no": "273000000", "build_year": "1999", "flag": "Russia", "status": "In Service",
+    "ship_operator": "Operator", "ship_operator_address": "Address", "ship_operator_seaweb_id": "123",
+    "ship_builder": "Builder", "ship_builder_seaweb_id": "456",
+}
+
+
+def _ships() -> list:
+    return [
+        ShipDto("1000019", "1", "", "rsclassorg", flag="Russia", ship_type="Tanker", main_name="Neva"),
+        ShipDto("1000021", "2", "", "rsclassorg", flag="Panama", ship_type="Tanker", main_name="Volga"),
+        ShipDto("1000033", "3", "", "rsclassorg", flag="Russia", ship_type="Tug", main_name="Don"),
+    ]
+
+
+def test_ship_slots():
+    ship = ShipDto("1000019", "1", "", "system")
+    assert not hasattr(ship, "__dict__")
+    with pytest.raises(AttributeError):
+        ship.unknown_field = "value"
+    assert SHIP_FIELDS[:5] == ("imo_number", "proprietary_number1", "proprietary_number2", "source_system",
+                               "timestamp")
+    assert asdict(ship)["imo_number"] == "1000019"
+
+
+def test_ship_per_instance_timestamps():
+    ship1 = ShipDto("1000019", "1", "", "system")
+    ship2 = ShipDto("1000019", "1", "", "system")
+    assert ship2.init_datetime >= ship1.init_datetime > datetime(2020, 1, 1)
+    assert ship1 == ship2  # timestamps are excluded from comparison
+
+
+def test_ship_categorical_values_interned():
+    ship1 = ShipDto("1", "", "", "system", flag="".join(["Rus", "sia"]))
+    ship2 = ShipDto("2", "", "", "system", flag="".join(["Russ", "ia"]))
+    assert ship1.flag is ship2.flag
+
+
+def test_ship_batch_round_trip():
+    ships = _ships()
+    batch = ShipBatch.from_ships(ships)
+
+    assert len(batch) == 3
+    assert batch.categories("flag") == ["Russia", "Panama"]
+    assert batch.codes("flag").tolist() == [0, 1, 0]
+    assert batch.column("flag").tolist() == ["Russia", "Panama", "Russia"]
+    assert batch.to_ships() == ships
+    assert batch[1] == ships[1]
+    assert batch[-1].init_datetime == ships[-1].init_datetime
+
+    with pytest.raises(ScraperException):
+        batch.codes("main_name")  # not categorical column
+    with pytest.raises(IndexError):
+        batch[3]
+
+
+def test_ship_batch_filter_and_concat():
+    batch = ShipBatch.from_ships(_ships())
+    tankers = batch.filter(batch.column("ship_type") == "Tanker")
+    assert [ship.main_name for ship in tankers] == ["Neva", "Volga"]
+
+    other = ShipBatch.from_ships([ShipDto("1000045", "4", "", "seaweb", flag="Panama", ship_type="Tug")])
+    merged = ShipBatch.concat([tankers, other])
+    assert len(merged) == 3
+    assert merged.column("flag").tolist() == ["Russia", "Panama", "Panama"]
+    assert merged.column("source_system").tolist() == ["rsclassorg", "rsclassorg", "seaweb"]
+    assert len(ShipBatch.concat([])) == 0
+
+
+def test_ship_batch_invalid_columns():
+    with pytest.raises(ScraperException):
+        ShipBatch({"imo_number": np.array(["1"], dtype=object)})
+
+
+def test_ship_from_dict():
+    ship = ShipDto.ship_from_dict(SEAWEB_SHIP_DICT)
+    assert (ship.imo_number, ship.proprietary_number1, ship.main_name, ship.mmsi_number) == \
+        ("1000019", "-", "Neva", "273000000")
+    assert ship.timestamp == datetime(2026, 10, 1, 10, 0, 0)
+    with pytest.raises(ValueError):
+        ShipDto.ship_from_dict({})
+
+
+@pytest.mark.parametrize("missing_key", ["imo_number", "source_system"])
+def test_ship_from_dict_missing_required_key(missing_key):
+    ship_dict: dict = {key: value for key, value in SEAWEB_SHIP_DICT.items() if key != missing_key}
+    with pytest.raises(ScraperException):
+        ShipDto.ship_from_dict(ship_dict)
+    with pytest.raises(ScraperException):
+        ShipBatch.from_dicts([SEAWEB_SHIP_DICT, ship_dict])
+
+
+def test_ships_from_dicts_and_tuples():
+    ships = ships_from_dicts([SEAWEB_SHIP_DICT, dict(SEAWEB_SHIP_DICT, imo_number="1000021")])
+    assert [ship.imo_number for ship in ships] == ["1000019", "1000021"]
+    assert ships[0].timestamp is ships[1].timestamp  # memoized timestamp parsing
+
+    rows = [("1000019", "1", "", "rsclassorg", "01-Oct-2026 10:00:00", "Russia"),
+            ("1000021", "2", "", "rsclassorg", datetime(2026, 1, 1), "Panama")]
+    ships = ships_from_tuples(rows, SHIP_FIELDS[:6])
+    assert [ship.flag for ship in ships] == ["Russia", "Panama"]
+    assert ships[0].timestamp == datetime(2026, 10, 1, 10, 0, 0)
+
+    ships = ships_from_tuples([("Neva", "1000019", "", "", "seaweb")],
+                              ("main_name", "imo_number", "proprietary_number1", "proprietary_number2",
+                               "source_system"))
+    assert ships == [ShipDto("1000019", "", "", "seaweb", main_name="Neva")]
+    with pytest.raises(ValueError):
+        ships_from_tuples([("x",)], ("unknown_field",))
+
+
+def test_ship_batch_from_dicts_and_tuples():
+    batch = ShipBatch.from_dicts([SEAWEB_SHIP_DICT, {"imo_number": "1000021", "source_system": "seaweb"}])
+    assert len(batch) == 2
+    assert batch.to_ships()[0] == ShipDto.ship_from_dict(SEAWEB_SHIP_DICT)
+    assert batch[1].flag == "" and batch[1].proprietary_number1 == "-"
+
+    rows = [("1000019", "1", "", "rsclassorg", "01-Oct-2026 10:00:00"),
+            ("1000021", "2", "", "rsclassorg", "01-Oct-2026 10:00:00")]
+    batch = ShipBatch.from_tuples(rows, SHIP_FIELDS[:5])
+    assert batch.to_ships() == ships_from_tuples(rows, SHIP_FIELDS[:5])
+    assert batch.categories("source_system") == ["rsclassorg"]
+    assert len(ShipBatch.from_tuples([], SHIP_FIELDS[:5])) == 0
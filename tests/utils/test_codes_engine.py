@@ -5,5 +5,122 @@
     Unit tests for Codes Engine module.
 
     Created:  Dmitrii Gusev, 05.06.2022
-    Modified:
+    Modified: Dmitrii Gusev, 19.10.2026
 """
+
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.utils.codes_engine import CodesProcessor, CodesProcessorFactory, CODES_LOG_SUFFIX
+
+
+@pytest.fixture
+def codes_file(tmp_path) -> str:
+    file: Path = tmp_path / "codes.csv"
+    file.write_text("1000019;+\n1000000;+\n1000021;+\n")
+    return str(file)
+
+
+@pytest.mark.parametrize("value", [None, ''])
+def test_codes_processor_empty_file_name(value):
+    with pytest.raises(ScraperException):
+        CodesProcessor(value)
+
+
+def test_codes_processor_load_and_contains(codes_file):
+    processor = CodesProcessor(codes_file)
+    assert len(processor) == 3
+    assert isinstance(processor.codes(), set)
+    assert processor.contains('1000019')
+    assert '1000021' in processor
+    assert not processor.contains('9999999')
+    assert not processor.contains('')
+
+
+def test_codes_processor_add_goes_to_log(codes_file):
+    processor = CodesProcessor(codes_file, flush_size=2, compact_size=100)
+    processor.add('1000033')
+    assert not Path(codes_file + CODES_LOG_SUFFIX).exists()  # buffered, not flushed yet
+    processor.add('1000045')
+    processor.add('1000045')  # duplicate - ignored
+    assert Path(codes_file + CODES_LOG_SUFFIX).read_text().split() == ['1000033', '1000045']
+    assert Path(codes_file).read_text().count('\n') == 3  # CSV file isn't rewritten
+
+    # new processor replays the log
+    assert CodesProcessor(codes_file).codes() == {'1000000', '1000019', '1000021', '1000033', '1000045'}
+
+
+def test_codes_processor_compaction(codes_file):
+    processor = CodesProcessor(codes_file, flush_size=1, compact_size=2)
+    processor.add_all({'1000057', '1000069', ''})
+    assert not Path(codes_file + CODES_LOG_SUFFIX).exists()
+    assert Path(codes_file).read_text().split() == ['1000000', '1000019', '1000021', '1000057', '1000069']
+
+
+def test_codes_processor_close(codes_file):
+    with CodesProcessor(codes_file) as processor:
+        processor.add('1000033')
+    assert not Path(codes_file + CODES_LOG_SUFFIX).exists()
+    assert '1000033' in Path(codes_file).read_text().split()
+
+
+def test_codes_processor_missing_file(tmp_path):
+    processor = CodesProcessor(str(tmp_path / "missing.csv"))
+    assert len(processor) == 0
+
+
+@pytest.mark.parametrize("num_of_ranges, expected", [
+        (1, [{'1000000', '1000019', '1000021'}]),
+        (2, [{'1000000', '1000019'}, {'1000021'}]),
+        (3, [{'1000000'}, {'1000019'}, {'1000021'}]),
+        (5, [{'1000000'}, {'1000019'}, {'1000021'}]),
+    ]
+)
+def test_codes_processor_ranges(codes_file, num_of_ranges, expected):
+    assert CodesProcessor(codes_file).ranges(num_of_ranges) == expected
+
+
+def test_codes_processor_ranges_invalid(codes_file):
+    with pytest.raises(ScraperException):
+        CodesProcessor(codes_file).ranges(0)
+
+
+def test_codes_processor_thread_safe_add(codes_file):
+    processor = CodesProcessor(codes_file, flush_size=7, compact_size=50)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        executor.map(processor.add, [str(2000000 + i) for i in range(1000)])
+    processor.close()
+    assert len(CodesProcessor(codes_file)) == 1003
+
+
+def test_codes_processor_factory_reuses_empty_processor(tmp_path):
+    file_name: str = str(tmp_path / "empty.csv")
+    try:
+        processor = CodesProcessorFactory._get_processor('test_empty', file_name)
+        assert len(processor) == 0 and not processor  # empty processor is falsy
+        processor.add('1000033')  # buffered, not flushed yet
+        assert CodesProcessorFactory._get_processor('test_empty', file_name) is processor
+        assert '1000033' in CodesProcessorFactory._get_processor('test_empty', file_name)
+    finally:
+        CodesProcessorFactory.processors.pop('test_empty').close()
+    assert CodesProcessor(file_name).codes() == {'1000033'}
+
+
+def test_seed_imo_candidates_kept_apart_from_imo_codes(tmp_path, monkeypatch):
+    (tmp_path / "imo.csv").write_text("1000019;+\n1000021;+\n")
+    config = SimpleNamespace(imo_file=str(tmp_path / "imo.csv"),
+                             imo_candidates_file=str(tmp_path / "candidates.csv"),
+                             imo_index_dir=str(tmp_path / "index"),
+                             imo_candidates_ranges=((1000000, 1000100),),
+                             imo_candidates_window=30, imo_candidates_min_density=1)
+    monkeypatch.setattr(CodesProcessorFactory, "config", config)
+    monkeypatch.setattr(CodesProcessorFactory, "processors", dict())
+    monkeypatch.setattr(CodesProcessorFactory, "indexes", dict())
+
+    added: int = CodesProcessorFactory.seed_imo_candidates()
+    candidates = CodesProcessorFactory.imo_candidates().codes()
+    assert added == len(candidates) > 0 and not candidates & {'1000019', '1000021'}
+    assert CodesProcessorFactory.imo_codes().codes() == {'1000019', '1000021'}  # candidates aren't known
+    assert CodesProcessorFactory.seed_imo_candidates() == 0  # the same candidates aren't added twice
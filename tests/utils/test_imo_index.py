@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+"""
+    Unit tests for IMO numbers index module.
+
+    Created:  Dmitrii Gusev, 19.10.2026
+    Modified:
+"""
+
+import pytest
+import numpy as np
+from wfleet.scraper.exceptions.scraper_exceptions import ScraperException
+from wfleet.scraper.utils import imo_index
+from wfleet.scraper.utils.imo_index import (
+    ImoBitmap,
+    ImoIndex,
+    IMO_KNOWN,
+    IMO_DENIED,
+    IMO_SCRAPED,
+    IMO_SPACE_SIZE,
+    build_imo_index,
+    generate_imo_candidates,
+    imo_check_digits_valid,
+    is_valid_imo,
+)
+
+
+@pytest.mark.parametrize("code, expected", [
+        ('9074729', True),
+        ('1000019', True),
+        ('1000007', True),
+        ('1000000', False),
+        ('9074728', False),
+        ('0907472', False),
+        ('123', False),
+        ('abc', False),
+        (9176187, True),
+    ]
+)
+def test_is_valid_imo(code, expected):
+    assert is_valid_imo(code) == expected
+
+
+def test_imo_check_digits_valid_vectorized():
+    numbers = np.arange(1000000, 1000100)
+    valid = numbers[imo_check_digits_valid(numbers)]
+    assert valid.tolist() == [1000007, 1000019, 1000021, 1000033, 1000045, 1000057, 1000069, 1000071,
+                              1000083, 1000095]
+
+
+def test_imo_bitmap_set_algebra():
+    known = ImoBitmap.from_codes(['1000000', '1000019', '1000021', '1000033', 'xxx'])
+    scraped = ImoBitmap.from_numbers([1000019])
+    denied = ImoBitmap.from_numbers([1000033, 9999999])
+
+    assert len(known) == 4
+    assert '1000021' in known and 1000000 in known and '1000045' not in known
+    assert (known - scraped - denied).codes() == {'1000000', '1000021'}
+    assert len(known | denied) == 5
+    assert (known & denied).numbers().tolist() == [1000033]
+
+
+def test_imo_bitmap_ranges():
+    bitmap = ImoBitmap.from_numbers([5, 6, 7, 10, 9999999])
+    assert list(bitmap.ranges()) == [(5, 8), (10, 11), (9999999, 10000000)]
+    assert list(bitmap.ranges(6, 11)) == [(6, 8), (10, 11)]
+
+
+def test_imo_bitmap_save_load_mmap(tmp_path):
+    file_name: str = str(tmp_path / "bitmap.npy")
+    ImoBitmap.from_numbers([1000000, 1000019]).save(file_name)
+
+    loaded = ImoBitmap.load(file_name)
+    assert isinstance(loaded.bits, np.memmap)
+    assert loaded.numbers().tolist() == [1000000, 1000019]
+
+    loaded.add([1000021])  # copy on write - file isn't changed
+    assert len(loaded) == 3
+    assert len(ImoBitmap.load(file_name)) == 2
+
+
+def test_imo_index_build_and_plan(tmp_path):
+    ships_dir = tmp_path / "ships"
+    for number, text in [('1000000', 'ship data'), ('1000019', 'Access is denied.')]:
+        (ships_dir / number).mkdir(parents=True)
+        (ships_dir / number / "ship_main.html").write_text(text)
+
+    index = build_imo_index(ImoIndex(str(tmp_path / "index")), ['1000000', '1000019', '1000021'],
+                            str(ships_dir), "ship_main.html")
+    assert index.plan().codes() == {'1000021'}
+    assert index.plan(['1000000', '1000033']).codes() == {'1000021', '1000033'}  # codes added after the build
+
+    reloaded = ImoIndex(str(tmp_path / "index"))  # bitmaps are loaded from files
+    assert reloaded.bitmap(IMO_SCRAPED).codes() == {'1000000'}
+    assert reloaded.bitmap(IMO_DENIED).codes() == {'1000019'}
+    assert len(reloaded.bitmap(IMO_KNOWN)) == 3
+
+
+def test_imo_bitmap_add_in_place():
+    bitmap = ImoBitmap()
+    bits = bitmap.bits
+    # same byte, duplicates, out of space
+    bitmap.add([1000000, 1000001, 1000001, 1000007, IMO_SPACE_SIZE, -1])
+    assert bitmap.bits is bits  # no new bitmap allocated
+    assert bitmap.numbers().tolist() == [1000000, 1000001, 1000007]
+
+
+def test_imo_index_unknown_kind(tmp_path):
+    with pytest.raises(ScraperException):
+        ImoIndex(str(tmp_path)).bitmap('unknown')
+
+
+def test_generate_imo_candidates():
+    known = ImoBitmap.from_numbers([1000019, 1000021, 1000033, 2000000])
+    denied = ImoBitmap.from_numbers([1000045])
+    candidates = generate_imo_candidates([(1000000, 1000100)], known, denied, window=30)
+
+    assert imo_check_digits_valid(candidates).all()
+    assert not set(candidates.tolist()) & {1000019, 1000021, 1000033, 1000045}
+    # the densest neighbourhood first (3 known numbers around), then less dense ones, numbers without
+    # known neighbours are dropped
+    assert candidates.tolist() == [1000007, 1000057]
+
+
+def test_generate_imo_candidates_by_chunks(monkeypatch):
+    known = ImoBitmap.from_numbers([1000019, 1000021, 1000033, 1000108, 2000000])
+    ranges = [(999990, 1000150), (1000200, 1000230)]
+    expected = generate_imo_candidates(ranges, known, window=30).tolist()
+    monkeypatch.setattr(imo_index, "IMO_CANDIDATES_CHUNK_SIZE", 7)  # density windows cross the chunks
+    assert generate_imo_candidates(ranges, known, window=30).tolist() == expected
+    assert len(expected) > 2
+
+
+def test_generate_imo_candidates_limit_and_density():
+    known = ImoBitmap.from_numbers([1000019])
+    assert len(generate_imo_candidates([(1000000, 1000100)], known, window=20, limit=2)) == 2
+    assert len(generate_imo_candidates([(1000000, 1000100)], known, window=20, min_density=2)) == 0
+    assert len(generate_imo_candidates([(0, 100)], known)) == 0  # out of IMO space
+
+
+def test_generate_imo_candidates_empty_ranges():
+    with pytest.raises(ScraperException):
+        generate_imo_candidates([], ImoBitmap())
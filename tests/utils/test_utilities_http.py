@@ -8,9 +8,14 @@
     Modified: Dmitrii Gusev, 05.06.2022
 """
 
+import io
 import pytest
+from types import SimpleNamespace
+from urllib import request
+from wfleet.scraper.cache.cache_manifest import CacheManifest, MANIFEST_ENTITY_SHIP
 from wfleet.scraper.utils.utilities_http import (
     # perform_file_download_over_http,
+    WebClient,
     perform_file_download_over_http,
     process_url,
     # process_urls,
@@ -23,6 +28,20 @@ def test_perform_file_download_over_http_invalid_url(value):
         perform_file_download_over_http(value, "dir")
 
 
+def test_perform_file_download_over_http_timeout(tmp_path, monkeypatch):
+    timeouts: list = []
+
+    def urlopen(url, **kwargs):
+        timeouts.append(kwargs.get("timeout"))
+        return io.BytesIO(b"data")
+
+    monkeypatch.setattr(request, "urlopen", urlopen)
+    file: str = perform_file_download_over_http("http://host/file.xls", str(tmp_path), timeout=7.5)
+    assert open(file, "rb").read() == b"data"
+    perform_file_download_over_http("http://host/file.xls", str(tmp_path))
+    assert timeouts == [7.5, None]
+
+
 # todo: fix the test - use responses module
 # @responses.activate
 # def test_downloads_file(self):
@@ -48,3 +67,18 @@ def test_perform_file_download_over_http_invalid_url(value):
 )
 def test_process_url(url, postfix, format_params, expected):
     assert process_url(url, postfix, format_params) == expected
+
+
+def test_web_client_doesnt_cache_failed_response(tmp_path):
+    manifest = CacheManifest(str(tmp_path / "manifest.sqlite"))
+    client = WebClient(headers={}, cookies={}, manifest=manifest)
+    client.session.get = lambda url, **kwargs: SimpleNamespace(status_code=503,
+                                                               text="<html>Unavailable</html>")
+    file: str = str(tmp_path / "ship_main.html")
+
+    client.get_text_2_file("http://host/ship", file, True, False, MANIFEST_ENTITY_SHIP, "1000019",
+                           "ship_main")
+    assert not (tmp_path / "ship_main.html").exists()  # error page isn't cached - will be requested again
+    assert manifest.failed() == [(MANIFEST_ENTITY_SHIP, "1000019", "ship_main", 503)]
+    assert manifest.count() == 1
+    manifest.close()
@@ -5,24 +5,37 @@
     Test for excel-related utilities class.
 
     Created:  Dmitrii Gusev, 24.05.2021
-    Modified: Dmitrii Gusev, 30.05.2021
+    Modified: Dmitrii Gusev, 19.10.2026
 """
 
+import xlwt
 import unittest
 import logging
 from pathlib import Path
+from datetime import datetime
+from openpyxl import Workbook, load_workbook
 from pyutilities.pylog import setup_logging
-from wfleet.scraper.entities.ship import ShipDto  # , ExtendedShipDto
-from wfleet.scraper.utils.utilities_xls import save_ships_2_excel
+from wfleet.scraper.entities.ship import ShipDto, SHIP_FIELDS  # , ExtendedShipDto
+from wfleet.scraper.utils.utilities_xls import save_ships_2_excel, ShipsXlsxWriter, EXCEL_DEFAULT_SHEET_NAME
+from wfleet.scraper.utils.utilities_xls import read_ships_from_workbook, load_ships_from_excel
+from wfleet.scraper.utils.utilities_xls import iter_ships_from_excel
+from wfleet.scraper.utils.utilities_xls import iter_ship_batches_from_excel, load_extended_ships_from_excel
+from wfleet.scraper.engine.scrapers.scraper_morflotru import parse_raw_data as parse_morflot_raw_data
+from wfleet.scraper.engine.scrapers.scraper_rivregru import parse_raw_data as parse_rivreg_raw_data
+from wfleet.scraper.engine.scrapers.scraper_rivregru import SYSTEM_RIVREGRU
 
 # some useful constants
 LOGGER_NAME = "scraper_rsclassorg_test"
 LOGGER_CONFIG_FILE = "../../test_logging.yml"
 
 DIRECTORY_NAME_EMPTY = "empty_dir"
-EXCEL_FILE_NAME_EMPTY = "empty_excel_file_name.xls"
-EXCEL_FILE_NAME_SAVE = "excel_file_for_save.xls"
-EXCEL_FILE_NAME_LOAD = "excel_file_for_load.xls"
+EXCEL_FILE_NAME_EMPTY = "empty_excel_file_name.xlsx"
+EXCEL_FILE_NAME_SAVE = "excel_file_for_save.xlsx"
+EXCEL_FILE_NAME_LOAD = "excel_file_for_load.xlsx"
+EXCEL_FILE_NAME_ROLLOVER = "excel_file_for_rollover.xlsx"
+EXCEL_FILE_NAME_RAW = "excel_file_raw_data.xlsx"
+EXCEL_FILE_NAME_LEGACY = "excel_file_legacy.xls"
+EXCEL_FILE_NAME_TEST = str(Path(__file__).parent / "utils_test_files" / "excel.xls")
 
 
 class TestUtilitiesXls(unittest.TestCase):
@@ -51,17 +64,25 @@ class TestUtilitiesXls(unittest.TestCase):
         xls.unlink(missing_ok=True)
         xls: Path = Path(EXCEL_FILE_NAME_SAVE)
         xls.unlink(missing_ok=True)
+        xls: Path = Path(EXCEL_FILE_NAME_ROLLOVER)
+        xls.unlink(missing_ok=True)
+        xls: Path = Path(EXCEL_FILE_NAME_RAW)
+        xls.unlink(missing_ok=True)
+        xls: Path = Path(EXCEL_FILE_NAME_LOAD)
+        xls.unlink(missing_ok=True)
+        xls: Path = Path(EXCEL_FILE_NAME_LEGACY)
+        xls.unlink(missing_ok=True)
 
     def test_verify_and_process_xls_file(self):
         # todo: implementation!
         pass
 
-    def _test_save_base_ships_2_excel_empty_xls_file_name(self):
+    def test_save_base_ships_2_excel_empty_xls_file_name(self):
         self.assertRaises(ValueError, lambda: save_ships_2_excel(list(), None))
         self.assertRaises(ValueError, lambda: save_ships_2_excel(list(), ""))
         self.assertRaises(ValueError, lambda: save_ships_2_excel(list(), "     "))
 
-    def _test_save_base_ships_2_excel_xls_file_is_a_directory(self):
+    def test_save_base_ships_2_excel_xls_file_is_a_directory(self):
         # create empty dir in the current folder
         empty_dir: Path = Path(DIRECTORY_NAME_EMPTY)
         empty_dir.mkdir()
@@ -70,13 +91,15 @@ class TestUtilitiesXls(unittest.TestCase):
         # cleanup - remove created dir
         empty_dir.rmdir()
 
-    def _test_save_base_ships_2_excel_empty_ships_list(self):
+    def test_save_base_ships_2_excel_empty_ships_list(self):
         save_ships_2_excel(list(), EXCEL_FILE_NAME_EMPTY)
         empty_file: Path = Path(EXCEL_FILE_NAME_EMPTY)
-        self.assertTrue(empty_file.exists())  # todo: add more checks / content checks
+        self.assertTrue(empty_file.exists())
         self.assertTrue(empty_file.is_file())
+        rows = list(load_workbook(EXCEL_FILE_NAME_EMPTY, read_only=True)[EXCEL_DEFAULT_SHEET_NAME].values)
+        self.assertEqual([SHIP_FIELDS], rows)  # header only
 
-    def _test_save_base_ships_2_excel(self):
+    def test_save_base_ships_2_excel(self):
         ship1: ShipDto = ShipDto("123456", "987654", "", "system1")
         ship1.flag = "flag1"
         ship1.main_name = "name1"
@@ -94,11 +117,109 @@ class TestUtilitiesXls(unittest.TestCase):
         ship2.extended_info_url = "URL2"
 
         ships: list = [ship1, ship2]
-        save_ships_2_excel(ships, EXCEL_FILE_NAME_SAVE)
+        self.assertEqual(2, save_ships_2_excel(iter(ships), EXCEL_FILE_NAME_SAVE))  # any iterable
 
         xls_file: Path = Path(EXCEL_FILE_NAME_SAVE)
-        self.assertTrue(xls_file.exists())  # todo: add more checks / content checks
+        self.assertTrue(xls_file.exists())
         self.assertTrue(xls_file.is_file())
+        rows = list(load_workbook(EXCEL_FILE_NAME_SAVE, read_only=True)[EXCEL_DEFAULT_SHEET_NAME].values)
+        self.assertEqual(3, len(rows))
+        saved = dict(zip(rows[0], rows[2]))
+        self.assertEqual(("1234567", "system2", "name2", "URL2"),
+                         (saved["imo_number"], saved["source_system"], saved["main_name"],
+                          saved["extended_info_url"]))
+        self.assertIsInstance(saved["timestamp"], datetime)
+
+    def test_save_ships_2_excel_not_iterable(self):
+        self.assertRaises(ValueError, lambda: save_ships_2_excel(None, EXCEL_FILE_NAME_SAVE))
+        self.assertRaises(ValueError,
+                          lambda: save_ships_2_excel(ShipDto("1", "", "", "system"), EXCEL_FILE_NAME_SAVE))
+
+    def test_ships_xlsx_writer_sheets_rollover(self):
+        ships = (ShipDto(str(1000000 + i), str(i), "", "system") for i in range(7))
+        with ShipsXlsxWriter(EXCEL_FILE_NAME_ROLLOVER, columns=SHIP_FIELDS[:4], max_rows=4) as writer:
+            self.assertEqual(7, writer.write_many(ships))
+        self.assertEqual(3, writer.sheets)
+
+        book = load_workbook(EXCEL_FILE_NAME_ROLLOVER, read_only=True)
+        self.assertEqual([EXCEL_DEFAULT_SHEET_NAME, EXCEL_DEFAULT_SHEET_NAME + "_2",
+                          EXCEL_DEFAULT_SHEET_NAME + "_3"], book.sheetnames)
+        rows = [list(sheet.values) for sheet in book.worksheets]
+        self.assertEqual([4, 4, 2], [len(sheet_rows) for sheet_rows in rows])
+        self.assertTrue(all(sheet_rows[0] == SHIP_FIELDS[:4] for sheet_rows in rows))  # header on each sheet
+        self.assertEqual(("1000006", "6", None, "system"), rows[2][1])
+        book.close()
+
+    def test_ships_xlsx_writer_special_chars(self):
+        ship = ShipDto("1000019", "1", "", "system", main_name="A&B <Neva>\x01", home_port="  port ")
+        save_ships_2_excel([ship], EXCEL_FILE_NAME_SAVE)
+        rows = list(load_workbook(EXCEL_FILE_NAME_SAVE, read_only=True)[EXCEL_DEFAULT_SHEET_NAME].values)
+        saved = dict(zip(rows[0], rows[1]))
+        self.assertEqual(("A&B <Neva>", "  port "), (saved["main_name"], saved["home_port"]))
+
+    def test_ships_xlsx_writer_wrong_columns(self):
+        self.assertRaises(ValueError, lambda: ShipsXlsxWriter(EXCEL_FILE_NAME_SAVE, columns=("unknown",)))
+        self.assertRaises(ValueError, lambda: ShipsXlsxWriter(EXCEL_FILE_NAME_SAVE, max_rows=1))
+
+    def test_read_ships_from_workbook(self):
+        book = Workbook()
+        sheet = book.active
+        sheet.append(["Number", "Name", "Built"])  # header row
+        sheet.append(["RR-1", "Neva", datetime(1999, 5, 1)])
+        sheet.append([None, None, None])  # empty row - skipped
+        sheet.append([12345.0, " Volga ", 2001])
+        book.save(EXCEL_FILE_NAME_RAW)
+
+        timestamp = datetime(2026, 10, 1)
+        columns = {"proprietary_number1": 1, "main_name": 2, "build_date": 3}
+        ships = list(read_ships_from_workbook(EXCEL_FILE_NAME_RAW, columns, "rivreg", timestamp=timestamp))
+        self.assertEqual([ShipDto("", "RR-1", "", "rivreg", timestamp, main_name="Neva",
+                                  build_date="01.05.1999"),
+                          ShipDto("", "12345", "", "rivreg", timestamp, main_name="Volga",
+                                  build_date="2001")], ships)
+        self.assertEqual(timestamp, ships[0].timestamp)
+
+        self.assertRaises(ValueError,
+                          lambda: read_ships_from_workbook(EXCEL_FILE_NAME_RAW, {"unknown": 1}, "s"))
+        self.assertRaises(ValueError,
+                          lambda: read_ships_from_workbook(EXCEL_FILE_NAME_RAW, {"main_name": 0}, "s"))
+        self.assertRaises(ValueError,
+                          lambda: list(read_ships_from_workbook("missing.xlsx", {"main_name": 1}, "s")))
+
+    def test_parse_morflot_raw_data(self):
+        book = Workbook()
+        sheet = book.active
+        sheet.append(["Header"])
+        sheet.append(["Header 2"])
+        sheet.append([1, "", "", "Neva", "P-1", 9074729, "M-1", None, "Moscow", "Owner", "Address", "123",
+                      "01.01.2020"])
+        sheet.append([2])  # no identity values - skipped
+        book.save(EXCEL_FILE_NAME_RAW)
+
+        ships = list(parse_morflot_raw_data(EXCEL_FILE_NAME_RAW))
+        self.assertEqual(1, len(ships))
+        self.assertEqual(("9074729", "M-1", "", "Neva", "Moscow", "01.01.2020"),
+                         (ships[0].imo_number, ships[0].proprietary_number1, ships[0].proprietary_number2,
+                          ships[0].main_name, ships[0].home_port, ships[0].owner_ogrn_date))
+
+    def test_parse_rivreg_raw_data(self):
+        timestamp = datetime(2026, 10, 1, 10, 30, 0)
+        book = Workbook()
+        sheet = book.active
+        sheet.append(["Header"])
+        sheet.append(["R-100", "Volga", "B-7", "P-588", "Tanker", 1985, "Gorky"])
+        sheet.append([None, "Ghost"])  # no identity values - skipped
+        book.save(EXCEL_FILE_NAME_RAW)
+
+        ships = list(parse_rivreg_raw_data(EXCEL_FILE_NAME_RAW, timestamp))
+        self.assertEqual(1, len(ships))
+        self.assertEqual(("", "R-100", "", SYSTEM_RIVREGRU, timestamp),
+                         (ships[0].imo_number, ships[0].proprietary_number1, ships[0].proprietary_number2,
+                          ships[0].source_system, ships[0].timestamp))
+        self.assertEqual(("Volga", "B-7", "P-588", "Tanker", "1985", "Gorky"),
+                         (ships[0].main_name, ships[0].build_number, ships[0].project, ships[0].ship_type,
+                          ships[0].build_date, ships[0].build_place))
+        self.assertRaises(ValueError, lambda: parse_rivreg_raw_data(" "))
 
     # def test_save_extended_ships_2_excel_empty_ships(self):
     #     pass
@@ -106,11 +227,48 @@ class TestUtilitiesXls(unittest.TestCase):
     # def test_save_extended_ships_2_excel(self):
     #     pass
     #
-    # def test_load_base_ships_from_excel(self):
-    #     pass
-    #
-    # def test_load_extended_ships_from_excel(self):
-    #     pass
+    def test_load_base_ships_from_excel(self):
+        timestamp = datetime(2026, 10, 1, 10, 30, 0)
+        ships = [ShipDto(str(1000000 + i), str(i), "", "rsclassorg", timestamp, flag="Russia",
+                         main_name=f"SHIP {i}") for i in range(5)]
+        save_ships_2_excel(iter(ships), EXCEL_FILE_NAME_LOAD)
+
+        self.assertEqual(ships, load_ships_from_excel(EXCEL_FILE_NAME_LOAD))  # round trip
+        self.assertEqual(timestamp, next(iter_ships_from_excel(EXCEL_FILE_NAME_LOAD)).timestamp)
+        batches = list(iter_ship_batches_from_excel(EXCEL_FILE_NAME_LOAD, batch_size=2))
+        self.assertEqual([2, 2, 1], [len(batch) for batch in batches])
+        self.assertEqual(ships, [ship for batch in batches for ship in batch])
+
+        self.assertRaises(ValueError, lambda: load_ships_from_excel("missing.xlsx"))
+        self.assertRaises(ValueError, lambda: list(iter_ship_batches_from_excel(EXCEL_FILE_NAME_LOAD, -1)))
+
+    def test_load_base_ships_from_legacy_xls(self):
+        book = xlwt.Workbook()  # legacy export layout - header "datetime" and string timestamps
+        sheet = book.add_sheet(EXCEL_DEFAULT_SHEET_NAME)
+        for column, value in enumerate(("imo_number", "proprietary_number1", "source_system", "main_name",
+                                        "unknown", "datetime")):
+            sheet.write(0, column, value)
+        for column, value in enumerate((9074729, "RS-1", "rsclassorg", "Neva", "x", "01-Oct-2026 10:30:00")):
+            sheet.write(1, column, value)
+        sheet.write(2, 4, "no identity - skipped")
+        book.save(EXCEL_FILE_NAME_LEGACY)
+
+        ships = load_ships_from_excel(EXCEL_FILE_NAME_LEGACY)
+        self.assertEqual([ShipDto("9074729", "RS-1", "", "rsclassorg", main_name="Neva")], ships)
+        self.assertEqual(datetime(2026, 10, 1, 10, 30, 0), ships[0].init_datetime)
+
+        self.assertEqual(list(), load_ships_from_excel(EXCEL_FILE_NAME_TEST))  # no ships header
+
+    def test_load_extended_ships_from_excel(self):
+        book = Workbook()
+        book.active.append(["name", "", "length"])
+        book.active.append(["Neva", "ignored", 120.0])
+        book.active.append([None, None, None])  # empty row - skipped
+        book.save(EXCEL_FILE_NAME_LOAD)
+
+        self.assertEqual([{"name": "Neva", "length": "120"}],
+                         load_extended_ships_from_excel(EXCEL_FILE_NAME_LOAD))
+        self.assertEqual(list(), load_extended_ships_from_excel(EXCEL_FILE_NAME_TEST))  # header only
 
 
 if __name__ == "__main__":